@@ -1202,8 +1202,71 @@ async def get_campaign_report(oid: str):
         logger.error(f"get_campaign_report error: {e}")
         return {"success": False, "message": str(e)}
 
+_report_http_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_report_http_client() -> httpx.AsyncClient:
+    """리포트 프록시용 공유 httpx 클라이언트 (커넥션 재사용)"""
+    global _report_http_client
+    if _report_http_client is None or _report_http_client.is_closed:
+        _report_http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(60.0, connect=10.0),
+            follow_redirects=True,
+        )
+    return _report_http_client
+
+
+def _cached_report_response(request: Request, cached, disposition: str):
+    """디스크 캐시 히트 응답 — If-None-Match(304) / Range(206) 처리"""
+    from fastapi.responses import FileResponse, Response
+    from ....services.campaigns.report_cache import (
+        parse_range_header, etag_matches, iter_file_range,
+    )
+
+    base_headers = {
+        "ETag": cached.etag,
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": disposition,
+        "Cache-Control": "private, max-age=0, must-revalidate",
+    }
+    if etag_matches(request.headers.get("if-none-match"), cached.etag):
+        return Response(status_code=304, headers=base_headers)
+
+    # If-Range가 현재 ETag와 다르면 Range 무시하고 전체 응답
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and if_range and if_range.strip() != cached.etag:
+        range_header = None
+
+    byte_range = parse_range_header(range_header, cached.size)
+    if byte_range == (-1, -1):
+        return Response(
+            status_code=416,
+            headers={**base_headers, "Content-Range": f"bytes */{cached.size}"},
+        )
+    if byte_range is not None:
+        start, end = byte_range
+        return StreamingResponse(
+            iter_file_range(cached.path, start, end),
+            status_code=206,
+            media_type=cached.content_type,
+            headers={
+                **base_headers,
+                "Content-Range": f"bytes {start}-{end}/{cached.size}",
+                "Content-Length": str(end - start + 1),
+            },
+        )
+    # FileResponse: 서버가 지원하면 zero-copy(sendfile) 경로로 전송
+    return FileResponse(
+        cached.path,
+        media_type=cached.content_type,
+        headers=base_headers,
+    )
+
+
 @router.get("/disease-prediction/report/download")
 async def download_campaign_report(
+    request: Request,
     oid: str = Query(..., description="주문번호"),
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
 ):
@@ -1213,6 +1276,10 @@ async def download_campaign_report(
     접근 제어:
     - oid로 결제 정보 확인 (이미 결제 완료된 상태)
     - 추가 인증이 필요한 경우 JWT 토큰 확인 가능
+
+    전송:
+    - 디스크 캐시 히트: 업스트림 호출 없이 파일 서빙 (Range/ETag 지원)
+    - 캐시 미스: 업스트림을 청크 단위로 중계하면서 캐시에 기록
     
     Args:
         oid: 주문번호
@@ -1221,6 +1288,9 @@ async def download_campaign_report(
     Returns:
         PDF 파일 스트림
     """
+    from urllib.parse import quote
+    from ....services.campaigns.report_cache import get_report_cache
+
     try:
         with db_manager.get_connection() as conn:
             with conn.cursor() as cur:
@@ -1232,98 +1302,123 @@ async def download_campaign_report(
                 """, (oid,))
                 row = cur.fetchone()
                 
-                if not row:
-                    raise HTTPException(status_code=404, detail="주문 정보를 찾을 수 없습니다.")
+        if not row:
+            raise HTTPException(status_code=404, detail="주문 정보를 찾을 수 없습니다.")
+        
+        # 결제 상태 확인 (접근 제어)
+        payment_status = row[5]  # status
+        if payment_status not in ('COMPLETED', 'REPORT_WAITING', 'TILKO_READY'):  # CRITICAL-1 fix: 대문자 상태값으로 수정
+            logger.warning(f"⚠️ [Campaign 다운로드] 접근 거부: 결제 미완료 (oid={oid}, status={payment_status})")
+            raise HTTPException(
+                status_code=403,
+                detail="결제가 완료되지 않은 주문입니다."
+            )
+        
+        # JWT 토큰이 있는 경우 추가 검증 (선택적)
+        if credentials:
+            try:
+                from ....core.security import verify_token
+                token_payload = verify_token(credentials.credentials)
+                token_uuid = token_payload.get("sub")
                 
-                # 결제 상태 확인 (접근 제어)
-                payment_status = row[5]  # status
-                if payment_status not in ('COMPLETED', 'REPORT_WAITING', 'TILKO_READY'):  # CRITICAL-1 fix: 대문자 상태값으로 수정
-                    logger.warning(f"⚠️ [Campaign 다운로드] 접근 거부: 결제 미완료 (oid={oid}, status={payment_status})")
+                # 토큰의 uuid와 결제 정보의 uuid 일치 확인
+                payment_uuid = row[3]  # uuid
+                if payment_uuid and token_uuid != payment_uuid:
+                    logger.warning(f"⚠️ [Campaign 다운로드] 접근 거부: 토큰 UUID 불일치 (oid={oid})")
                     raise HTTPException(
                         status_code=403,
-                        detail="결제가 완료되지 않은 주문입니다."
+                        detail="다른 사용자의 리포트에 접근할 수 없습니다."
                     )
                 
-                # JWT 토큰이 있는 경우 추가 검증 (선택적)
-                if credentials:
-                    try:
-                        from ....core.security import verify_token
-                        token_payload = verify_token(credentials.credentials)
-                        token_uuid = token_payload.get("sub")
-                        
-                        # 토큰의 uuid와 결제 정보의 uuid 일치 확인
-                        payment_uuid = row[3]  # uuid
-                        if payment_uuid and token_uuid != payment_uuid:
-                            logger.warning(f"⚠️ [Campaign 다운로드] 접근 거부: 토큰 UUID 불일치 (oid={oid})")
-                            raise HTTPException(
-                                status_code=403,
-                                detail="다른 사용자의 리포트에 접근할 수 없습니다."
-                            )
-                        
-                        logger.info(f"✅ [Campaign 다운로드] JWT 토큰 인증 성공: oid={oid}")
-                    except HTTPException:
-                        raise
-                    except Exception as e:
-                        logger.warning(f"⚠️ [Campaign 다운로드] 토큰 검증 실패 (무시): {str(e)}")
-                        # 토큰 검증 실패해도 계속 진행 (결제 정보만으로도 충분)
-                
-                report_url = row[0]
-                mediarc_response = row[1]
-                user_name = row[2] or "사용자"
-                
-                # mediarc_response에서 URL 확인 (만료된 경우 대비)
-                if not report_url or report_url == '':
-                    if mediarc_response and isinstance(mediarc_response, dict):
-                        report_url = mediarc_response.get('report_url') or (mediarc_response.get('data', {}) or {}).get('report_url')
-                
-                if not report_url:
-                    raise HTTPException(status_code=404, detail="리포트 URL을 찾을 수 없습니다.")
-                
-                logger.info(f"📥 [Campaign 다운로드] 리포트 다운로드 시작: oid={oid}, url={report_url[:100]}...")
-                
-                # Presigned URL에서 파일 다운로드
-                async with httpx.AsyncClient(timeout=60.0, follow_redirects=True) as client:
-                    try:
-                        response = await client.get(report_url)
-                        response.raise_for_status()
-                        
-                        content_type = response.headers.get('content-type', 'application/pdf')
-                        
-                        # 파일명 생성 (한글 인코딩 처리)
-                        from urllib.parse import quote
-                        filename_base = f"질병예측리포트_{user_name}_{oid[:8]}.pdf"
-                        filename_encoded = quote(filename_base.encode('utf-8'))
-                        
-                        logger.info(f"✅ [Campaign 다운로드] 다운로드 성공: {len(response.content)} bytes")
-                        
-                        return StreamingResponse(
-                            iter([response.content]),
-                            media_type=content_type,
-                            headers={
-                                "Content-Disposition": f"attachment; filename*=UTF-8''{filename_encoded}",
-                                "Content-Length": str(len(response.content))
-                            }
-                        )
-                        
-                    except httpx.HTTPStatusError as e:
-                        if e.response.status_code == 403:
-                            logger.error(f"❌ [Campaign 다운로드] URL 만료 (403): oid={oid}")
-                            raise HTTPException(
-                                status_code=410,
-                                detail="리포트 URL이 만료되었습니다. 리포트를 다시 생성해주세요."
-                            )
-                        else:
-                            logger.error(f"❌ [Campaign 다운로드] HTTP 오류: {e.response.status_code}")
-                            raise HTTPException(
-                                status_code=502,
-                                detail=f"리포트 다운로드 실패: HTTP {e.response.status_code}"
-                            )
-                    except httpx.TimeoutException:
-                        logger.error(f"❌ [Campaign 다운로드] 타임아웃: oid={oid}")
-                        raise HTTPException(status_code=504, detail="리포트 다운로드 타임아웃")
-                    except Exception as e:
-                        logger.error(f"❌ [Campaign 다운로드] 오류: {str(e)}")
-                        raise HTTPException(status_code=500, detail=f"리포트 다운로드 실패: {str(e)}")
+                logger.info(f"✅ [Campaign 다운로드] JWT 토큰 인증 성공: oid={oid}")
+            except HTTPException:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️ [Campaign 다운로드] 토큰 검증 실패 (무시): {str(e)}")
+                # 토큰 검증 실패해도 계속 진행 (결제 정보만으로도 충분)
+        
+        report_url = row[0]
+        mediarc_response = row[1]
+        user_name = row[2] or "사용자"
+
+        # 파일명 생성 (한글 인코딩 처리)
+        filename_base = f"질병예측리포트_{user_name}_{oid[:8]}.pdf"
+        filename_encoded = quote(filename_base.encode('utf-8'))
+        disposition = f"attachment; filename*=UTF-8''{filename_encoded}"
+
+        # mediarc_response에서 URL 확인 (만료된 경우 대비)
+        if not report_url or report_url == '':
+            if mediarc_response and isinstance(mediarc_response, dict):
+                report_url = mediarc_response.get('report_url') or (mediarc_response.get('data', {}) or {}).get('report_url')
+        
+        # 디스크 캐시 히트 → 업스트림 호출 없음 (report_url 지문 불일치 = 재생성된 리포트 → miss)
+        report_cache = get_report_cache()
+        cached = await asyncio.to_thread(report_cache.lookup, oid, report_url or None)
+        if cached:
+            logger.info(f"📦 [Campaign 다운로드] 캐시 히트: oid={oid}, {cached.size} bytes")
+            return _cached_report_response(request, cached, disposition)
+
+        if not report_url:
+            raise HTTPException(status_code=404, detail="리포트 URL을 찾을 수 없습니다.")
+        
+        logger.info(f"📥 [Campaign 다운로드] 리포트 다운로드 시작: oid={oid}, url={report_url[:100]}...")
+        
+        # Presigned URL에서 스트리밍 다운로드 (전체 버퍼링 없음)
+        client = _get_report_http_client()
+        try:
+            upstream = await client.send(client.build_request("GET", report_url), stream=True)
+        except httpx.TimeoutException:
+            logger.error(f"❌ [Campaign 다운로드] 타임아웃: oid={oid}")
+            raise HTTPException(status_code=504, detail="리포트 다운로드 타임아웃")
+        except Exception as e:
+            logger.error(f"❌ [Campaign 다운로드] 오류: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"리포트 다운로드 실패: {str(e)}")
+
+        if upstream.status_code >= 400:
+            await upstream.aclose()
+            if upstream.status_code == 403:
+                logger.error(f"❌ [Campaign 다운로드] URL 만료 (403): oid={oid}")
+                raise HTTPException(
+                    status_code=410,
+                    detail="리포트 URL이 만료되었습니다. 리포트를 다시 생성해주세요."
+                )
+            logger.error(f"❌ [Campaign 다운로드] HTTP 오류: {upstream.status_code}")
+            raise HTTPException(
+                status_code=502,
+                detail=f"리포트 다운로드 실패: HTTP {upstream.status_code}"
+            )
+
+        content_type = upstream.headers.get('content-type', 'application/pdf')
+
+        async def _relay():
+            # 디스크 기록은 이벤트 루프를 막지 않도록 스레드에서 수행
+            writer = await asyncio.to_thread(report_cache.open_writer, oid, report_url)
+            completed = False
+            try:
+                async for chunk in upstream.aiter_bytes():
+                    await asyncio.to_thread(writer.write, chunk)
+                    yield chunk
+                completed = True
+            except Exception as e:
+                logger.error(f"❌ [Campaign 다운로드] 스트리밍 중단: oid={oid}, {e}")
+                raise
+            finally:
+                await upstream.aclose()
+                if completed:
+                    await asyncio.to_thread(writer.commit, content_type)
+                    logger.info(f"✅ [Campaign 다운로드] 다운로드 성공: {writer.size} bytes")
+                else:
+                    await asyncio.to_thread(writer.abort)
+
+        headers = {
+            "Content-Disposition": disposition,
+            "Cache-Control": "private, max-age=0, must-revalidate",
+        }
+        upstream_length = upstream.headers.get('content-length')
+        if upstream_length and not upstream.headers.get('content-encoding'):
+            headers["Content-Length"] = upstream_length
+
+        return StreamingResponse(_relay(), media_type=content_type, headers=headers)
         
     except HTTPException:
         raise
@@ -13,6 +13,7 @@ from datetime import datetime
 import os
 import json
 import time
+import asyncio
 import asyncpg
 
 from ....services.exceptions import PatientNotFoundError, CheckupDesignError
@@ -30,6 +31,7 @@ from ....services.checkup_design import (
     CHECKUP_DESIGN_SYSTEM_MESSAGE_STEP2
 )
 from ....services.welno_data_service import WelnoDataService
+from ....services.patient_context import GENERIC_HOSPITAL_ID, load_patient_context, use_patient_context
 from ....services.session_logger import get_session_logger
 from ....services.worry_service import worry_service # 추가
 from ....services.checkup_design import rag_service
@@ -49,7 +51,7 @@ def _build_generic_hospital_fallback() -> Dict[str, Any]:
     "담당 병원에서 추가 안내" 일반 문구를 작성하도록 지시한다.
     """
     return {
-        "hospital_id": "_GENERIC_",
+        "hospital_id": GENERIC_HOSPITAL_ID,
         "hospital_name": "WELNO 일반 검진 안내",
         "name": "WELNO 일반 검진 안내",
         "phone": "",
@@ -307,10 +309,11 @@ async def create_checkup_design(
         logger.info(f"🔍 [검진설계] request.uuid 타입: {type(request.uuid)}")
         logger.info(f"🔍 [검진설계] request.hospital_id 타입: {type(request.hospital_id)}")
         
-        # 1. 환자 정보 조회
+        # 1. 환자 정보 조회 (환자/병원/건강/처방 동시 조회 — STEP 1/2 가 그대로 재사용)
         data_start = time.time()
         logger.info(f"🔍 [검진설계] 환자 정보 조회 시작...")
-        patient_info = await welno_data_service.get_patient_by_uuid(request.uuid)
+        patient_context = await load_patient_context(welno_data_service, request.uuid, request.hospital_id)
+        patient_info = patient_context.patient_info
         logger.info(f"🔍 [검진설계] patient_info 타입: {type(patient_info)}")
         
         if not isinstance(patient_info, dict):
@@ -331,15 +334,12 @@ async def create_checkup_design(
         
         # 1-1. 병원 정보 조회 (검진 항목 포함)
         # [v10] hospital_id 누락 시 환자 last_auth hospital 자동 조회 → 그래도 없으면 일반검진 폴백
-        resolved_hospital_id = request.hospital_id
-        if not resolved_hospital_id:
-            resolved_hospital_id = await welno_data_service.find_hospital_id_by_uuid(request.uuid)
-            logger.info(f"🔍 [v10] hospital_id 자동 조회: {resolved_hospital_id or 'None (폴백)'}")
+        resolved_hospital_id = patient_context.resolved_hospital_id
+        if not request.hospital_id:
+            logger.info(f"🔍 [v10] hospital_id 자동 조회: {resolved_hospital_id}")
 
         logger.info(f"🏥 [검진설계] 병원 정보 조회 시작 - hospital_id: {resolved_hospital_id}")
-        hospital_info: Dict[str, Any] = {}
-        if resolved_hospital_id:
-            hospital_info = await welno_data_service.get_hospital_by_id(resolved_hospital_id)
+        hospital_info: Dict[str, Any] = patient_context.hospital_info
         logger.info(f"🔍 [검진설계] hospital_info 타입: {type(hospital_info)}")
 
         # [v10] 병원 정보 없거나 error 시 일반검진 폴백 (HTTPException 대신)
@@ -378,7 +378,7 @@ async def create_checkup_design(
         logger.info(f"⏱️  [타이밍] 환자/병원 정보 조회: {time.time() - data_start:.2f}초")
         health_start = time.time()
         logger.info(f"🔍 [검진설계] 건강 데이터 조회 시작...")
-        health_data_result = await welno_data_service.get_patient_health_data(request.uuid, resolved_hospital_id)
+        health_data_result = patient_context.health_result
         logger.info(f"🔍 [검진설계] health_data_result 타입: {type(health_data_result)}")
         
         if not isinstance(health_data_result, dict):
@@ -397,7 +397,7 @@ async def create_checkup_design(
         if not request.prescription_analysis_text:
             # 분석 결과 텍스트가 없을 때만 원본 데이터 조회 (하위 호환성)
             logger.info(f"🔍 [검진설계] 처방전 데이터 조회 시작...")
-            prescription_data_result = await welno_data_service.get_patient_prescription_data(request.uuid, resolved_hospital_id)
+            prescription_data_result = patient_context.prescription_result
             logger.info(f"🔍 [검진설계] prescription_data_result 타입: {type(prescription_data_result)}")
             
             if not isinstance(prescription_data_result, dict):
@@ -472,7 +472,8 @@ async def create_checkup_design(
         # STEP 1: 빠른 분석 수행
         step1_start = time.time()
         logger.info(f"📊 [검진설계] STEP 1: 빠른 분석 시작...")
-        step1_response = await create_checkup_design_step1(request)
+        with use_patient_context(patient_context):
+            step1_response = await create_checkup_design_step1(request)
         if not step1_response.success:
             logger.error(f"❌ [검진설계] STEP 1 실패")
             raise ValueError("STEP 1 분석 실패")
@@ -518,7 +519,8 @@ async def create_checkup_design(
             )
             
             # STEP 2 호출
-            step2_response = await create_checkup_design_step2(step2_request)
+            with use_patient_context(patient_context):
+                step2_response = await create_checkup_design_step2(step2_request)
             step2_result = None
             if not step2_response.success:
                 logger.error(f"❌ [검진설계] STEP 2 실패")
@@ -883,8 +885,9 @@ async def create_checkup_design_step1(
         )
         logger.info(f"🎬 [SessionLogger] 세션 시작: {session_id}")
         
-        # 1. 환자 정보 조회
-        patient_info = await welno_data_service.get_patient_by_uuid(request.uuid)
+        # 1. 환자 정보 조회 (/create 에서 호출되면 이미 조회한 컨텍스트 재사용)
+        patient_context = await load_patient_context(welno_data_service, request.uuid, request.hospital_id)
+        patient_info = patient_context.patient_info
         if "error" in patient_info:
             raise HTTPException(status_code=404, detail=patient_info["error"])
         
@@ -900,15 +903,12 @@ async def create_checkup_design_step1(
         
         # 2. 병원 정보 조회 (검진 항목 포함)
         # [v10] hospital_id 자동 조회 + 일반검진 폴백
-        resolved_hospital_id = request.hospital_id
-        if not resolved_hospital_id:
-            resolved_hospital_id = await welno_data_service.find_hospital_id_by_uuid(request.uuid)
-            logger.info(f"🔍 [v10 STEP1] hospital_id 자동 조회: {resolved_hospital_id or 'None'}")
+        resolved_hospital_id = patient_context.resolved_hospital_id
+        if not request.hospital_id:
+            logger.info(f"🔍 [v10 STEP1] hospital_id 자동 조회: {resolved_hospital_id}")
 
         logger.info(f"🏥 [STEP1-분석] 병원 정보 조회 시작 - hospital_id: {resolved_hospital_id}")
-        hospital_info: Dict[str, Any] = {}
-        if resolved_hospital_id:
-            hospital_info = await welno_data_service.get_hospital_by_id(resolved_hospital_id)
+        hospital_info: Dict[str, Any] = patient_context.hospital_info
         if not isinstance(hospital_info, dict) or not hospital_info or "error" in hospital_info:
             logger.warning(f"⚠️ [v10 STEP1] 병원 정보 없음 — 일반검진 폴백")
             hospital_info = _build_generic_hospital_fallback()
@@ -919,7 +919,7 @@ async def create_checkup_design_step1(
         logger.info(f"📊 [STEP1-분석] 기본 검진 항목: {len(hospital_national_checkup) if hospital_national_checkup else 0}개")
 
         # 3. 건강 데이터 조회 (기존 방식과 동일) — resolved_hospital_id 사용
-        health_data_result = await welno_data_service.get_patient_health_data(request.uuid, resolved_hospital_id)
+        health_data_result = patient_context.health_result
         if "error" in health_data_result:
             logger.warning(f"⚠️ [STEP1-분석] 건강 데이터 조회 실패: {health_data_result['error']}")
             health_data = []
@@ -930,7 +930,7 @@ async def create_checkup_design_step1(
         # 4. 처방전 데이터 조회 (기존 방식과 동일)
         prescription_data = []
         if not request.prescription_analysis_text:
-            prescription_data_result = await welno_data_service.get_patient_prescription_data(request.uuid, resolved_hospital_id)
+            prescription_data_result = patient_context.prescription_result
             if "error" in prescription_data_result:
                 logger.warning(f"⚠️ [STEP1-분석] 처방전 데이터 조회 실패: {prescription_data_result['error']}")
                 prescription_data = []
@@ -1347,6 +1347,237 @@ async def delete_checkup_design(
         raise HTTPException(status_code=500, detail=f"검진 설계 삭제 중 오류: {str(e)}")
 
 
+# ====================================================================
+# STEP 2 분기 실행 헬퍼 — Priority 1 / Upselling 을 동시에 실행
+# ====================================================================
+
+def _step2_session_dir(request) -> str:
+    """STEP 2 프롬프트/응답 txt 로그 디렉터리 (세션별)"""
+    if request.session_id:
+        log_base_dir = f"logs/planning_{request.session_id.split('_')[0]}"
+        session_dir = os.path.join(log_base_dir, request.session_id)
+    else:
+        log_base_dir = f"logs/planning_{datetime.now().strftime('%Y%m%d')}"
+        timestamp = datetime.now().strftime("%H%M%S")
+        short_uuid = request.uuid.split('-')[0]
+        session_dir = os.path.join(log_base_dir, f"{timestamp}_{short_uuid}")
+    try:
+        os.makedirs(session_dir, exist_ok=True)
+    except Exception as e:
+        logger.warning(f"⚠️ [STEP2] 로그 디렉터리 생성 실패: {str(e)}")
+    return session_dir
+
+
+def _write_step2_prompt_log(session_dir: str, step: str, user_message: str, model: str, max_tokens: int, session_id: Optional[str]) -> None:
+    """📝 [LOGGING] STEP 2-x 프롬프트 txt 저장 (실패해도 진행)"""
+    try:
+        path = os.path.join(session_dir, f"step{step.replace('-', '_')}_prompt.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("=" * 80 + "\n")
+            f.write(f"STEP {step} FULL PROMPT (실제 API에 전달되는 전체 내용)\n")
+            f.write("=" * 80 + "\n\n")
+            f.write("=" * 80 + "\n")
+            f.write("SYSTEM MESSAGE\n")
+            f.write("=" * 80 + "\n\n")
+            f.write(CHECKUP_DESIGN_SYSTEM_MESSAGE_STEP2)
+            f.write("\n\n")
+            f.write("=" * 80 + "\n")
+            f.write("USER MESSAGE\n")
+            f.write("=" * 80 + "\n\n")
+            f.write(user_message)
+            f.write("\n\n")
+            f.write("=" * 80 + "\n")
+            f.write("METADATA\n")
+            f.write("=" * 80 + "\n")
+            f.write(f"Model: {model}\n")
+            f.write(f"Temperature: 0.5\n")
+            f.write(f"Max Tokens: {max_tokens}\n")
+            f.write(f"Session ID: {session_id or 'N/A'}\n")
+            f.write(f"Timestamp: {datetime.now().isoformat()}\n")
+        logger.info(f"💾 [STEP{step}] 프롬프트 txt 저장 완료: {path}")
+    except Exception as e:
+        logger.warning(f"⚠️ [STEP{step}] 프롬프트 txt 저장 실패: {str(e)}")
+
+
+def _write_step2_result_log(session_dir: str, step: str, content: str, parsed: Dict[str, Any]) -> None:
+    """📝 [LOGGING] STEP 2-x 응답 txt 저장 (실패해도 진행)"""
+    try:
+        path = os.path.join(session_dir, f"step{step.replace('-', '_')}_result.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("=" * 80 + "\n")
+            f.write(f"STEP {step} RESPONSE (원본)\n")
+            f.write("=" * 80 + "\n\n")
+            f.write(content)
+            f.write("\n\n")
+            f.write("=" * 80 + "\n")
+            f.write(f"STEP {step} RESPONSE (파싱된 JSON)\n")
+            f.write("=" * 80 + "\n\n")
+            f.write(json.dumps(parsed, ensure_ascii=False, indent=2))
+            f.write("\n\n")
+            f.write("=" * 80 + "\n")
+            f.write("METADATA\n")
+            f.write("=" * 80 + "\n")
+            f.write(f"Response Length: {len(content) if content else 0}\n")
+            f.write(f"Timestamp: {datetime.now().isoformat()}\n")
+        logger.info(f"💾 [STEP{step}] 응답 txt 저장 완료: {path}")
+    except Exception as e:
+        logger.warning(f"⚠️ [STEP{step}] 응답 txt 저장 실패: {str(e)}")
+
+
+async def _run_step2_priority1(
+    request,
+    session_dir: str,
+    model: str,
+    prompt_kwargs: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    STEP 2-1 분기: Priority 1 프롬프트(+RAG) 생성 → Gemini 호출 → JSON 파싱.
+    Returns: {"result", "evidences", "rag_context", "elapsed"} / 실패 시 ValueError
+    """
+    start = time.time()
+    logger.info(f"📋 [STEP2-1] Priority 1 프롬프트 생성 시작...")
+    user_message, evidences, rag_context = await create_checkup_design_prompt_step2_priority1(**prompt_kwargs)
+    logger.info(f"✅ [STEP2-1] Priority 1 프롬프트 생성 완료 - 길이: {len(user_message):,}자 ({len(user_message)/1024:.1f}KB)")
+    logger.info(f"💊 [STEP2-1] RAG Context 획득 완료 - 길이: {len(rag_context):,}자")
+    _write_step2_prompt_log(session_dir, "2-1", user_message, model, 2000, request.session_id)
+
+    logger.info(f"🤖 [STEP2-1] Gemini API 호출 중... (모델: {model})")
+    # 검진설계 전용 키 (JERRY_PLANNING)
+    gemini_request = GeminiRequest(
+        prompt=user_message,
+        model=model,
+        temperature=0.5,
+        max_tokens=5000,
+        response_format={"type": "json_object"},
+        system_instruction=CHECKUP_DESIGN_SYSTEM_MESSAGE_STEP2,
+        api_key=settings.google_gemini_planning_api_key or None,
+    )
+
+    max_retries = 2
+    for retry_count in range(max_retries):
+        try:
+            if retry_count > 0:
+                logger.warning(f"🔄 [STEP2-1] 재시도 {retry_count}/{max_retries-1}")
+
+            response = await llm_router.call_api(
+                gemini_request,
+                endpoint="checkup_design",
+                save_log=True,
+                patient_uuid=request.uuid,
+                session_id=request.session_id or None,
+                step_number="2-1",
+                step_name="Priority 1 - 일반검진 주의 항목"
+            )
+            elapsed = time.time() - start
+            logger.info(f"✅ [STEP2-1] Gemini 응답 완료 - {elapsed:.1f}초 (시도 {retry_count+1}/{max_retries})")
+
+            if not response.success:
+                logger.error(f"❌ [STEP2-1] Gemini 호출 실패: {response.error}")
+                if retry_count == max_retries - 1:
+                    raise ValueError(f"STEP 2-1 실패: {response.error}")
+                continue
+
+            result = parse_json_with_recovery(response.content, step_name="STEP2-1", session_id=request.session_id)
+            logger.info(f"✅ [STEP2-1] JSON 파싱 성공 - 키: {list(result.keys())}")
+            _write_step2_result_log(session_dir, "2-1", response.content, result)
+            return {"result": result, "evidences": evidences, "rag_context": rag_context, "elapsed": elapsed}
+
+        except ValueError as ve:
+            if "응답 불완전" in str(ve) or "응답이 너무 짧음" in str(ve):
+                logger.warning(f"⚠️ [STEP2-1] 응답 불완전 감지: {str(ve)}")
+                if retry_count == max_retries - 1:
+                    logger.error(f"❌ [STEP2-1] 재시도 {max_retries}회 모두 실패")
+                    raise
+                continue
+            raise
+
+    raise ValueError(f"STEP 2-1 실패: {max_retries}회 재시도 후에도 성공하지 못함")
+
+
+async def _run_step2_upselling(
+    request,
+    session_dir: str,
+    upselling_request: Any,
+    step1_for_step2_2: Dict[str, Any],
+    anchor_summary: Dict[str, Any],
+    prev_rag_context: str,
+) -> Dict[str, Any]:
+    """
+    STEP 2-2 분기: RAG 엔진 → Upselling 프롬프트 생성 → LLM 호출 → JSON 파싱.
+    기본 검진 Anchor 는 STEP 1 의 priority_1 을 쓰므로 STEP 2-1 응답을 기다리지 않는다.
+    Returns: {"result", "evidences", "elapsed"} / 실패 시 예외
+    """
+    start = time.time()
+    rag_engine = await rag_service.init_rag_engine()
+
+    logger.info(f"📋 [STEP2-2] Upselling 프롬프트 생성 시작...")
+    user_message, evidences, _rag_context = await create_checkup_design_prompt_step2_upselling(
+        request=upselling_request,
+        step1_result=step1_for_step2_2,
+        step2_1_summary=json.dumps(anchor_summary, ensure_ascii=False, indent=2),  # JSON 문자열로 변환하여 전달
+        rag_service_instance=rag_engine,
+        prev_rag_context=prev_rag_context
+    )
+    logger.info(f"✅ [STEP2-2] Upselling 프롬프트 생성 완료 - 길이: {len(user_message):,}자 ({len(user_message)/1024:.1f}KB)")
+    _write_step2_prompt_log(session_dir, "2-2", user_message, settings.google_gemini_model, 3000, request.session_id)
+
+    logger.info(f"🤖 [STEP2-2] LLM API 호출 중... (모델: {settings.google_gemini_model})")
+    gemini_request = GeminiRequest(
+        prompt=user_message,
+        model=settings.google_gemini_model,
+        temperature=0.5,
+        max_tokens=5000,  # Upselling (multi-year + strategies 대응)
+        response_format={"type": "json_object"},
+        system_instruction=CHECKUP_DESIGN_SYSTEM_MESSAGE_STEP2,
+    )
+    response = await llm_router.call_api(
+        gemini_request,
+        endpoint="checkup_design",
+        save_log=True,
+        patient_uuid=request.uuid,
+        session_id=request.session_id or None,
+        step_number="2-2",
+        step_name="Priority 2, 3 - Upselling 전략",
+    )
+    elapsed = time.time() - start
+    logger.info(f"✅ [STEP2-2] LLM 응답 완료 - {elapsed:.1f}초")
+    if not response.success:
+        raise ValueError(f"STEP 2-2 실패: {response.error}")
+
+    result = parse_json_with_recovery(response.content, step_name="STEP2-2", session_id=request.session_id)
+    logger.info(f"✅ [STEP2-2] JSON 파싱 성공 - 키: {list(result.keys())}")
+    _write_step2_result_log(session_dir, "2-2", response.content, result)
+    return {"result": result, "evidences": evidences, "elapsed": elapsed}
+
+
+async def _run_step2_branches(
+    branches: Dict[str, Any],
+    on_done: Optional[Any] = None,
+) -> Dict[str, Any]:
+    """
+    STEP 2 분기 동시 실행 — {name: (코루틴 팩토리, timeout초)} → {name: 결과 dict | Exception}
+    분기별 타임아웃, 한 분기 실패가 다른 분기를 취소하지 않음.
+    on_done(name, result): 분기 성공 즉시 호출 (부분 결과 저장용, 예외 무시).
+    """
+    async def _one(name: str, factory, timeout: float):
+        try:
+            result = await asyncio.wait_for(factory(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"⏱️ [STEP2] {name} 분기 타임아웃 ({timeout:.0f}초)")
+            return name, TimeoutError(f"{name} 분기 {timeout:.0f}초 초과")
+        except Exception as e:
+            return name, e
+        if on_done:
+            try:
+                await on_done(name, result)
+            except Exception as e:
+                logger.warning(f"⚠️ [STEP2] {name} 부분 결과 저장 실패: {str(e)}")
+        return name, result
+
+    pairs = await asyncio.gather(*(_one(name, factory, timeout) for name, (factory, timeout) in branches.items()))
+    return dict(pairs)
+
+
 @router.post("/create-step2", response_model=CheckupDesignResponse)
 async def create_checkup_design_step2(
     request: CheckupDesignStep2Request
@@ -1358,10 +1589,11 @@ async def create_checkup_design_step2(
     """
     try:
         # [v10] hospital_id 자동 조회 (함수 전체에서 사용) — fallback 분기/메인 분기 공통
-        resolved_hospital_id = request.hospital_id
-        if not resolved_hospital_id:
-            resolved_hospital_id = await welno_data_service.find_hospital_id_by_uuid(request.uuid)
-            logger.info(f"🔍 [v10 STEP2-시작] hospital_id 자동 조회: {resolved_hospital_id or 'None (폴백 예정)'}")
+        # 환자/병원/건강/처방 동시 조회 (/create 에서 호출되면 이미 조회한 컨텍스트 재사용)
+        patient_context = await load_patient_context(welno_data_service, request.uuid, request.hospital_id)
+        resolved_hospital_id = patient_context.resolved_hospital_id
+        if not request.hospital_id:
+            logger.info(f"🔍 [v10 STEP2-시작] hospital_id 자동 조회: {resolved_hospital_id}")
         logger.info(f"🔍 [STEP2-설계] 요청 시작 - UUID: {request.uuid}, STEP 1 결과 수신 완료")
         
         # STEP 1 결과를 Dict로 변환
@@ -1369,7 +1601,7 @@ async def create_checkup_design_step2(
         logger.info(f"📊 [STEP2-설계] STEP 1 결과 키: {list(step1_result_dict.keys())}")
         
         # 1. 환자 정보 조회
-        patient_info = await welno_data_service.get_patient_by_uuid(request.uuid)
+        patient_info = patient_context.patient_info
         if "error" in patient_info:
             raise HTTPException(status_code=404, detail=patient_info["error"])
         
@@ -1398,14 +1630,14 @@ async def create_checkup_design_step2(
                 
                 try:
                     logger.debug(f"🔍 [DEBUG] 페르소나 재계산용 데이터 조회 시작 - UUID: {request.uuid}")
-                    health_result = await welno_data_service.get_patient_health_data(request.uuid, resolved_hospital_id)
+                    health_result = patient_context.health_result
                     if "error" not in health_result:
                         health_data_for_persona = health_result.get("health_data", [])
                         logger.debug(f"🔍 [DEBUG] 건강 데이터 조회 완료: {len(health_data_for_persona)}건")
                     else:
                         logger.warning(f"⚠️ [STEP2-설계] 건강 데이터 조회 실패: {health_result.get('error')}")
 
-                    prescription_result = await welno_data_service.get_patient_prescription_data(request.uuid, resolved_hospital_id)
+                    prescription_result = patient_context.prescription_result
                     if "error" not in prescription_result:
                         prescription_data_for_persona = prescription_result.get("prescription_data", [])
                         logger.debug(f"🔍 [DEBUG] 처방전 데이터 조회 완료: {len(prescription_data_for_persona)}건")
@@ -1442,16 +1674,9 @@ async def create_checkup_design_step2(
                     "tone": "전문적이면서도 친근한 어조"
                 }
 
-        # 2. 병원 정보 조회 (검진 항목 포함) - [v10] 자동 조회 + 일반검진 폴백
-        resolved_hospital_id = request.hospital_id
-        if not resolved_hospital_id:
-            resolved_hospital_id = await welno_data_service.find_hospital_id_by_uuid(request.uuid)
-            logger.info(f"🔍 [v10 STEP2] hospital_id 자동 조회: {resolved_hospital_id or 'None'}")
-
+        # 2. 병원 정보 (검진 항목 포함) - [v10] 자동 조회 + 일반검진 폴백
         logger.info(f"🏥 [STEP2-설계] 병원 정보 조회 시작 - hospital_id: {resolved_hospital_id}")
-        hospital_info: Dict[str, Any] = {}
-        if resolved_hospital_id:
-            hospital_info = await welno_data_service.get_hospital_by_id(resolved_hospital_id)
+        hospital_info: Dict[str, Any] = patient_context.hospital_info
         if not isinstance(hospital_info, dict) or not hospital_info or "error" in hospital_info:
             logger.warning(f"⚠️ [v10 STEP2] 병원 정보 없음 — 일반검진 폴백")
             hospital_info = _build_generic_hospital_fallback()
@@ -1467,7 +1692,7 @@ async def create_checkup_design_step2(
         logger.info(f"  - 외부 검사 항목: {len(hospital_external_checkup)}개")
 
         # 3. 건강 데이터 조회 (기존 방식과 동일) — resolved_hospital_id 사용
-        health_data_result = await welno_data_service.get_patient_health_data(request.uuid, resolved_hospital_id)
+        health_data_result = patient_context.health_result
         if "error" in health_data_result:
             logger.warning(f"⚠️ [STEP2-설계] 건강 데이터 조회 실패: {health_data_result['error']}")
             health_data = []
@@ -1478,7 +1703,7 @@ async def create_checkup_design_step2(
         # 4. 처방전 데이터 조회 (기존 방식과 동일)
         prescription_data = []
         if not request.prescription_analysis_text:
-            prescription_data_result = await welno_data_service.get_patient_prescription_data(request.uuid, resolved_hospital_id)
+            prescription_data_result = patient_context.prescription_result
             if "error" in prescription_data_result:
                 logger.warning(f"⚠️ [STEP2-설계] 처방전 데이터 조회 실패: {prescription_data_result['error']}")
                 prescription_data = []
@@ -1530,187 +1755,22 @@ async def create_checkup_design_step2(
         powerful_model = getattr(settings, 'google_gemini_model', 'gemini-3-flash-preview')
         
         # ====================================================================
-        # STEP 2-1: Priority 1 (일반검진 주의 항목)
+        # STEP 2-1 (Priority 1) + STEP 2-2 (Upselling) 동시 실행
+        # - Upselling 의 기본 검진 Anchor 는 STEP 1 의 priority_1 → 두 분기는 서로 독립
+        # - 분기별 타임아웃, 먼저 끝난 분기는 step2_result._partial 에 저장 → 재시도 시 재사용
         # ====================================================================
-        import time
-
-        # Phase 3: v2 파이프라인은 step2_1 스킵
+        design_request_id = step1_result_dict.get('design_request_id')
         pipeline_version = getattr(settings, 'checkup_design_pipeline_version', 'v2')
-        if pipeline_version == 'v2':
-            step2_1_result = {
-                "summary": step1_result_dict.get("summary", {}),
-                "priority_1": step1_result_dict.get("priority_1",
-                              step1_result_dict.get("basic_checkup_guide", {}))
-            }
-            evidences_p1 = step1_result_dict.get("_structured_evidences", [])
-            rag_evidence_context_p1 = step1_result_dict.get("_rag_evidence_context", "")
-            elapsed_p1 = 0
-            logger.info(f"✅ [STEP2-1] SKIPPED (v2) — step1의 priority_1 직접 사용")
-        else:
-            # v3: 기존 3-STEP 경로 (하위 호환)
-            start_time_p1 = time.time()
-
-            # step2_1에는 UI 전용 + 중복 필드 제거 (loading_messages, basic_checkup_guide)
-            step1_for_step2_1 = {k: v for k, v in step1_result_dict.items()
-                                 if k not in ('loading_messages', 'basic_checkup_guide')}
+        session_dir = _step2_session_dir(request)
 
-            logger.info(f"📋 [STEP2-1] Priority 1 프롬프트 생성 시작...")
-            user_message_p1, evidences_p1, rag_evidence_context_p1 = await create_checkup_design_prompt_step2_priority1(
-                step1_result=step1_for_step2_1,
-                patient_name=patient_name,
-                patient_age=patient_age,
-                patient_gender=patient_gender,
-                health_data=health_data,
-                prescription_data=prescription_data,
-                selected_concerns=selected_concerns,
-                survey_responses=survey_responses_clean,
-                hospital_national_checkup=hospital_national_checkup,
-                prescription_analysis_text=prescription_analysis_text,
-                selected_medication_texts=selected_medication_texts
-            )
-            logger.info(f"✅ [STEP2-1] Priority 1 프롬프트 생성 완료 - 길이: {len(user_message_p1):,}자 ({len(user_message_p1)/1024:.1f}KB)")
-            logger.info(f"💊 [STEP2-1] RAG Context 획득 완료 - 길이: {len(rag_evidence_context_p1):,}자")
-
-            # 📝 [LOGGING] STEP 2-1 프롬프트 파일 저장 (사용자 요청)
-            try:
-                import os
-                from datetime import datetime
-
-                if request.session_id:
-                    log_base_dir = f"logs/planning_{request.session_id.split('_')[0]}"
-                    session_dir = os.path.join(log_base_dir, request.session_id)
-                else:
-                    log_base_dir = f"logs/planning_{datetime.now().strftime('%Y%m%d')}"
-                    timestamp = datetime.now().strftime("%H%M%S")
-                    short_uuid = request.uuid.split('-')[0]
-                    session_dir = os.path.join(log_base_dir, f"{timestamp}_{short_uuid}")
-
-                os.makedirs(session_dir, exist_ok=True)
-
-                prompt_file_path = os.path.join(session_dir, "step2_1_prompt.txt")
-                full_prompt_p1_for_log = f"{CHECKUP_DESIGN_SYSTEM_MESSAGE_STEP2}\n\n---\n\n{user_message_p1}"
-                with open(prompt_file_path, "w", encoding="utf-8") as f:
-                    f.write("=" * 80 + "\n")
-                    f.write("STEP 2-1 FULL PROMPT (실제 API에 전달되는 전체 내용)\n")
-                    f.write("=" * 80 + "\n\n")
-                    f.write("=" * 80 + "\n")
-                    f.write("SYSTEM MESSAGE\n")
-                    f.write("=" * 80 + "\n\n")
-                    f.write(CHECKUP_DESIGN_SYSTEM_MESSAGE_STEP2)
-                    f.write("\n\n")
-                    f.write("=" * 80 + "\n")
-                    f.write("USER MESSAGE\n")
-                    f.write("=" * 80 + "\n\n")
-                    f.write(user_message_p1)
-                    f.write("\n\n")
-                    f.write("=" * 80 + "\n")
-                    f.write("METADATA\n")
-                    f.write("=" * 80 + "\n")
-                    f.write(f"Model: {powerful_model}\n")
-                    f.write(f"Temperature: 0.5\n")
-                    f.write(f"Max Tokens: 2000\n")
-                    f.write(f"Session ID: {request.session_id}\n")
-                    f.write(f"Timestamp: {datetime.now().isoformat()}\n")
-
-                logger.info(f"💾 [STEP2-1] 프롬프트 txt 저장 완료: {prompt_file_path}")
-
-            except Exception as e:
-                logger.warning(f"⚠️ [STEP2-1] 프롬프트 파일 저장 실패: {str(e)}")
-
-            logger.info(f"🤖 [STEP2-1] Gemini API 호출 중... (모델: {powerful_model})")
-
-            # 검진설계 전용 키 (JERRY_PLANNING)
-            planning_key_p1 = settings.google_gemini_planning_api_key or None
-            gemini_request_p1 = GeminiRequest(
-                prompt=user_message_p1,
-                model=powerful_model,
-                temperature=0.5,
-                max_tokens=5000,
-                response_format={"type": "json_object"},
-                system_instruction=CHECKUP_DESIGN_SYSTEM_MESSAGE_STEP2,
-                api_key=planning_key_p1,
-            )
-
-            max_retries = 2
-            step2_1_result = None
-            gemini_response_p1 = None
-
-            for retry_count in range(max_retries):
-                try:
-                    if retry_count > 0:
-                        logger.warning(f"🔄 [STEP2-1] 재시도 {retry_count}/{max_retries-1}")
-
-                    gemini_response_p1 = await llm_router.call_api(
-                        gemini_request_p1,
-                        endpoint="checkup_design",
-                        save_log=True,
-                        patient_uuid=request.uuid,
-                        session_id=request.session_id if hasattr(request, 'session_id') and request.session_id else None,
-                        step_number="2-1",
-                        step_name="Priority 1 - 일반검진 주의 항목"
-                    )
-                    elapsed_p1 = time.time() - start_time_p1
-                    logger.info(f"✅ [STEP2-1] Gemini 응답 완료 - {elapsed_p1:.1f}초 (시도 {retry_count+1}/{max_retries})")
-
-                    if not gemini_response_p1.success:
-                        logger.error(f"❌ [STEP2-1] Gemini 호출 실패: {gemini_response_p1.error}")
-                        if retry_count == max_retries - 1:
-                            raise ValueError(f"STEP 2-1 실패: {gemini_response_p1.error}")
-                        continue
-
-                    step2_1_result = parse_json_with_recovery(
-                        gemini_response_p1.content,
-                        step_name="STEP2-1",
-                        session_id=request.session_id if hasattr(request, 'session_id') else None
-                    )
-                    logger.info(f"✅ [STEP2-1] JSON 파싱 성공 - 키: {list(step2_1_result.keys())}")
-                    break
-
-                except ValueError as ve:
-                    if "응답 불완전" in str(ve) or "응답이 너무 짧음" in str(ve):
-                        logger.warning(f"⚠️ [STEP2-1] 응답 불완전 감지: {str(ve)}")
-                        if retry_count == max_retries - 1:
-                            logger.error(f"❌ [STEP2-1] 재시도 {max_retries}회 모두 실패")
-                            raise
-                        continue
-                    else:
-                        raise
-
-            if step2_1_result is None:
-                raise ValueError(f"STEP 2-1 실패: {max_retries}회 재시도 후에도 성공하지 못함")
-        
-            # 📝 [LOGGING] STEP 2-1 응답 txt 파일 저장 (성공 시)
-            try:
-                response_txt_file = os.path.join(session_dir, "step2_1_result.txt")
-                with open(response_txt_file, "w", encoding="utf-8") as f:
-                    f.write("=" * 80 + "\n")
-                    f.write("STEP 2-1 RESPONSE (원본)\n")
-                    f.write("=" * 80 + "\n\n")
-                    f.write(gemini_response_p1.content)
-                    f.write("\n\n")
-                    f.write("=" * 80 + "\n")
-                    f.write("STEP 2-1 RESPONSE (파싱된 JSON)\n")
-                    f.write("=" * 80 + "\n\n")
-                    f.write(json.dumps(step2_1_result, ensure_ascii=False, indent=2))
-                    f.write("\n\n")
-                    f.write("=" * 80 + "\n")
-                    f.write("METADATA\n")
-                    f.write("=" * 80 + "\n")
-                    f.write(f"Response Length: {len(gemini_response_p1.content) if gemini_response_p1.content else 0}\n")
-                    f.write(f"Timestamp: {datetime.now().isoformat()}\n")
-
-                logger.info(f"💾 [STEP2-1] 응답 txt 저장 완료: {response_txt_file}")
-            except Exception as e:
-                logger.warning(f"⚠️ [STEP2-1] 응답 txt 저장 실패: {str(e)}")
+        # STEP 1 의 기본 검진 결과 (v2: STEP 2-1 대신 그대로 사용, v3: Upselling Anchor)
+        step1_priority1 = {
+            "summary": step1_result_dict.get("summary", {}),
+            "priority_1": step1_result_dict.get("priority_1",
+                          step1_result_dict.get("basic_checkup_guide", {}))
+        }
+        step1_rag_context = step1_result_dict.get("_rag_evidence_context", "")
 
-        # ====================================================================
-        # STEP 2-2: Priority 2,3 + Strategies (업셀링)
-        # ====================================================================
-        start_time_p2 = time.time()
-        
-        # RAG 엔진 획득
-        rag_engine = await rag_service.init_rag_engine()
-        
         # Step 2-2 호출을 위한 요청 객체 구성 (step2_upselling.py 호환)
         from types import SimpleNamespace
         upselling_request = SimpleNamespace(
@@ -1730,132 +1790,91 @@ async def create_checkup_design_step2(
         step1_for_step2_2 = {k: v for k, v in step1_result_dict.items()
                              if k in _step2_2_keep}
 
-        logger.info(f"📋 [STEP2-2] Upselling 프롬프트 생성 시작...")
-        user_message_p2, evidences_p2, rag_context_p2 = await create_checkup_design_prompt_step2_upselling(
-            request=upselling_request,
-            step1_result=step1_for_step2_2,
-            step2_1_summary=json.dumps(step2_1_result, ensure_ascii=False, indent=2), # JSON 문자열로 변환하여 전달
-            rag_service_instance=rag_engine,
-            prev_rag_context=rag_evidence_context_p1
-        )
-        logger.info(f"✅ [STEP2-2] Upselling 프롬프트 생성 완료 - 길이: {len(user_message_p2):,}자 ({len(user_message_p2)/1024:.1f}KB)")
-        
-        # 세일즈 작문(Upselling)은 GPT-4o가 더 우수하므로 여기서는 OpenAI 사용
-        openai_model = getattr(settings, 'openai_model', 'gpt-4o')
-        
-        # 📝 [LOGGING] STEP 2-2 프롬프트 파일 저장 (추가)
-        try:
-            # 앞서 생성된 session_dir 사용
-            prompt_file_path_p2 = os.path.join(session_dir, "step2_2_prompt.txt")
-            with open(prompt_file_path_p2, "w", encoding="utf-8") as f:
-                f.write("=" * 80 + "\n")
-                f.write("STEP 2-2 FULL PROMPT (실제 API에 전달되는 전체 내용)\n")
-                f.write("=" * 80 + "\n\n")
-                f.write("=" * 80 + "\n")
-                f.write("SYSTEM MESSAGE\n")
-                f.write("=" * 80 + "\n\n")
-                f.write(CHECKUP_DESIGN_SYSTEM_MESSAGE_STEP2)
-                f.write("\n\n")
-                f.write("=" * 80 + "\n")
-                f.write("USER MESSAGE\n")
-                f.write("=" * 80 + "\n\n")
-                f.write(user_message_p2)
-                f.write("\n\n")
-                f.write("=" * 80 + "\n")
-                f.write("METADATA\n")
-                f.write("=" * 80 + "\n")
-                f.write(f"Model: {openai_model}\n")
-                f.write(f"Temperature: 0.5\n")
-                f.write(f"Max Tokens: 3000\n")
-                f.write(f"Session ID: {request.session_id if hasattr(request, 'session_id') and request.session_id else 'N/A'}\n")
-                f.write(f"Timestamp: {datetime.now().isoformat()}\n")
-            logger.info(f"💾 [STEP2-2] 프롬프트 txt 저장 완료: {prompt_file_path_p2}")
-        except Exception as e:
-            logger.warning(f"⚠️ [STEP2-2] 프롬프트 txt 저장 실패: {str(e)}")
-        logger.info(f"🤖 [STEP2-2] GPT API 호출 중... (모델: {openai_model})")
-        
-        gemini_request_p2 = GeminiRequest(
-            prompt=user_message_p2,
-            model=settings.google_gemini_model,
-            temperature=0.5,
-            max_tokens=5000,  # Upselling (multi-year + strategies 대응)
-            response_format={"type": "json_object"},
-            system_instruction=CHECKUP_DESIGN_SYSTEM_MESSAGE_STEP2,
-        )
+        branches: Dict[str, Any] = {
+            "upselling": (
+                lambda: _run_step2_upselling(
+                    request, session_dir, upselling_request, step1_for_step2_2,
+                    step1_priority1, step1_rag_context,
+                ),
+                settings.checkup_design_step2_2_timeout_sec,
+            ),
+        }
+        if pipeline_version != 'v2':
+            # v3: 기존 3-STEP 경로 (하위 호환) — step2_1에는 UI 전용 + 중복 필드 제거
+            step1_for_step2_1 = {k: v for k, v in step1_result_dict.items()
+                                 if k not in ('loading_messages', 'basic_checkup_guide')}
+            branches["priority1"] = (
+                lambda: _run_step2_priority1(request, session_dir, powerful_model, dict(
+                    step1_result=step1_for_step2_1,
+                    patient_name=patient_name,
+                    patient_age=patient_age,
+                    patient_gender=patient_gender,
+                    health_data=health_data,
+                    prescription_data=prescription_data,
+                    selected_concerns=selected_concerns,
+                    survey_responses=survey_responses_clean,
+                    hospital_national_checkup=hospital_national_checkup,
+                    prescription_analysis_text=prescription_analysis_text,
+                    selected_medication_texts=selected_medication_texts,
+                )),
+                settings.checkup_design_step2_1_timeout_sec,
+            )
 
-        gpt_response_p2 = await llm_router.call_api(
-            gemini_request_p2,
-            endpoint="checkup_design",
-            save_log=True,
-            patient_uuid=request.uuid,
-            session_id=request.session_id if hasattr(request, 'session_id') and request.session_id else None,
-            step_number="2-2",
-            step_name="Priority 2, 3 - Upselling 전략",
-        )
-        elapsed_p2 = time.time() - start_time_p2
-        logger.info(f"✅ [STEP2-2] GPT 응답 완료 - {elapsed_p2:.1f}초")
-        
-        if not gpt_response_p2.success:
-            logger.error(f"❌ [STEP2-2] GPT 호출 실패: {gpt_response_p2.error}")
+        # 이전 시도에서 끝난 분기는 재사용
+        branch_results: Dict[str, Any] = {}
+        if design_request_id:
+            for name, payload in (await welno_data_service.get_checkup_design_step2_partials(design_request_id)).items():
+                if name in branches and isinstance(payload, dict) and payload.get("result"):
+                    logger.info(f"♻️ [STEP2] {name} 분기 이전 결과 재사용 - ID: {design_request_id}")
+                    branches.pop(name)
+                    branch_results[name] = {**payload, "elapsed": 0}
+
+        async def _save_partial(name: str, result: Dict[str, Any]) -> None:
+            if design_request_id and len(branches) > 1:
+                payload = {k: v for k, v in result.items() if k != "elapsed"}
+                await welno_data_service.save_checkup_design_step2_partial(design_request_id, name, payload)
+
+        start_time_step2 = time.time()
+        branch_results.update(await _run_step2_branches(branches, on_done=_save_partial))
+        elapsed_step2 = time.time() - start_time_step2
+
+        # STEP 2-1 결과 (v2: STEP 1 priority_1 직접 사용)
+        if pipeline_version == 'v2':
+            step2_1_result = step1_priority1
+            evidences_p1 = step1_result_dict.get("_structured_evidences", [])
+            elapsed_p1 = 0
+            logger.info(f"✅ [STEP2-1] SKIPPED (v2) — step1의 priority_1 직접 사용")
+        else:
+            p1 = branch_results["priority1"]
+            if isinstance(p1, Exception):
+                # Upselling 결과는 _partial 에 남아 있으므로 재시도 시 Priority 1 만 다시 호출
+                logger.error(f"❌ [STEP2-1] 실패: {str(p1)}")
+                raise p1 if isinstance(p1, ValueError) else ValueError(f"STEP 2-1 실패: {str(p1)}")
+            step2_1_result = p1["result"]
+            evidences_p1 = p1["evidences"]
+            elapsed_p1 = p1["elapsed"]
+
+        p2 = branch_results["upselling"]
+        if isinstance(p2, Exception):
+            logger.error(f"❌ [STEP2-2] 실패: {str(p2)}")
             # STEP 2-1 결과라도 반환 (부분 성공)
             logger.warning(f"⚠️ [STEP2-2] 부분 성공 - Priority 1만 반환")
             ai_response = step2_1_result
             structured_evidences = evidences_p1
+            elapsed_p2 = 0
         else:
-            # JSON 파싱 (복구 로직 포함)
-            try:
-                step2_2_result = parse_json_with_recovery(
-                    gpt_response_p2.content,
-                    step_name="STEP2-2",
-                    session_id=request.session_id if hasattr(request, 'session_id') else None
-                )
-                logger.info(f"✅ [STEP2-2] JSON 파싱 성공 - 키: {list(step2_2_result.keys())}")
-                
-                # 📝 [LOGGING] STEP 2-2 결과 JSON 파일 저장 제거 (txt만 사용)
-                
-                # 📝 [LOGGING] STEP 2-2 응답 txt 파일 저장
-                try:
-                    response_txt_file_p2 = os.path.join(session_dir, "step2_2_result.txt")
-                    with open(response_txt_file_p2, "w", encoding="utf-8") as f:
-                        f.write("=" * 80 + "\n")
-                        f.write("STEP 2-2 RESPONSE (원본)\n")
-                        f.write("=" * 80 + "\n\n")
-                        f.write(gpt_response_p2.content)
-                        f.write("\n\n")
-                        f.write("=" * 80 + "\n")
-                        f.write("STEP 2-2 RESPONSE (파싱된 JSON)\n")
-                        f.write("=" * 80 + "\n\n")
-                        f.write(json.dumps(step2_2_result, ensure_ascii=False, indent=2))
-                        f.write("\n\n")
-                        f.write("=" * 80 + "\n")
-                        f.write("METADATA\n")
-                        f.write("=" * 80 + "\n")
-                        f.write(f"Response Length: {len(gpt_response_p2.content) if gpt_response_p2.content else 0}\n")
-                        f.write(f"Timestamp: {datetime.now().isoformat()}\n")
-                    
-                    logger.info(f"💾 [STEP2-2] 응답 txt 저장 완료: {response_txt_file_p2}")
-                except Exception as e:
-                    logger.warning(f"⚠️ [STEP2-2] 응답 txt 저장 실패: {str(e)}")
-                
-                # 결과 병합
-                logger.info(f"🔗 [STEP2] 결과 병합 중...")
-                ai_response = {
-                    **step2_1_result,  # summary, priority_1
-                    **step2_2_result   # priority_2, priority_3, strategies, doctor_comment
-                }
-                structured_evidences = evidences_p1 + evidences_p2
-                logger.info(f"✅ [STEP2] 결과 병합 완료")
-                
-            except Exception as e:
-                logger.error(f"❌ [STEP2-2] JSON 파싱 실패: {str(e)}")
-                # STEP 2-1 결과라도 반환
-                logger.warning(f"⚠️ [STEP2-2] 부분 성공 - Priority 1만 반환")
-                ai_response = step2_1_result
-                structured_evidences = evidences_p1
+            # 결과 병합
+            logger.info(f"🔗 [STEP2] 결과 병합 중...")
+            ai_response = {
+                **step2_1_result,  # summary, priority_1
+                **p2["result"]     # priority_2, priority_3, strategies, doctor_comment
+            }
+            structured_evidences = evidences_p1 + p2["evidences"]
+            elapsed_p2 = p2["elapsed"]
+            logger.info(f"✅ [STEP2] 결과 병합 완료")
         
         # 전체 소요 시간 로그
-        total_elapsed = elapsed_p1 + elapsed_p2
-        logger.info(f"⏱️ [STEP2] 총 소요 시간: {total_elapsed:.1f}초 (P1: {elapsed_p1:.1f}초, P2: {elapsed_p2:.1f}초)")
+        logger.info(f"⏱️ [STEP2] 총 소요 시간: {elapsed_step2:.1f}초 (병렬 — P1: {elapsed_p1:.1f}초, P2: {elapsed_p2:.1f}초)")
         logger.info(f"📊 [STEP2] 최종 응답 키: {list(ai_response.keys()) if ai_response else 'None'}")
         
         # ====================================================================
@@ -1881,7 +1900,6 @@ async def create_checkup_design_step2(
         logger.info(f"✅ [STEP2-설계] 병합 완료 - 최종 결과 키: {list(merged_result.keys())}")
         
         # ✅ STEP2 완료 시 상태 업데이트 (STEP1에서 받은 design_request_id 사용)
-        design_request_id = step1_result_dict.get('design_request_id')
         try:
             if design_request_id:
                 # 기존 요청 업데이트
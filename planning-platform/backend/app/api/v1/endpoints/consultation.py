@@ -12,6 +12,7 @@ from fastapi import APIRouter, HTTPException, Query, Path
 from pydantic import BaseModel
 
 from ....core.database import db_manager
+from ....services.chat_tagging_service import refresh_revisit_candidate
 
 
 def _parse_json(val):
@@ -281,6 +282,8 @@ async def consultation_request(req: ConsultationRequestBody):
                 (session_id, req.consultation_type),
             )
 
+        await refresh_revisit_candidate(session_id)
+
         # 검진설계 요청도 consultation_requested 상태로 갱신
         await db_manager.execute_update(
             """UPDATE welno.welno_checkup_design_requests
@@ -846,6 +849,7 @@ async def consultation_status(req: ConsultationStatusBody):
                WHERE session_id = %s""",
             (req.status, session["session_id"]),
         )
+        await refresh_revisit_candidate(session["session_id"])
 
         print(
             f"[consultation] status changed uuid={req.uuid} "
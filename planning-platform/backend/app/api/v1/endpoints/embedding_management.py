@@ -10,17 +10,20 @@
 """
 
 import os
+import importlib.util
 import json
 import logging
+import threading
+import time
 import traceback
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
-from fastapi import APIRouter, HTTPException, UploadFile, File, BackgroundTasks, Body
+from fastapi import APIRouter, HTTPException, UploadFile, File, BackgroundTasks, Body, Depends
 from pydantic import BaseModel, Field
 
-from ....core.database import db_manager
+from ....core.database import db_manager, db_workload
 from ....utils.health_metrics import PATIENT_SELECT_COLUMNS, extract_metrics_json
 from ....utils.json_parsers import format_interest_tags, format_tag_list
 from ....utils.survey_queries import survey_union_count_today_simple, survey_union_by_hospital_today
@@ -37,8 +40,14 @@ UPLOADS_SUBDIR = "uploads"
 EMBEDDING_MODEL = "text-embedding-ada-002"
 EMBEDDING_DIMENSION = 1536
 
-# 재구축 진행 상태 추적 (메모리 딕셔너리)
+# 청크 임베딩 영구 캐시 (병원 공통, FAISS 루트 하위)
+EMBEDDING_CACHE_FILE = "_embedding_cache.sqlite3"
+
+# 재구축 진행 상태 추적 (메모리 딕셔너리 + 병원 디렉토리의 rebuild_status.json)
 _rebuild_status: Dict[str, Dict[str, Any]] = {}
+REBUILD_STATUS_FILE = "rebuild_status.json"
+# 진행 메시지 디스크 기록 최소 간격 (초)
+_REBUILD_STATUS_FLUSH_SEC = 1.0
 
 
 def _hospital_base_path(hospital_id: str) -> Path:
@@ -396,7 +405,7 @@ async def get_hospital_chats(hospital_id: str, partner_id: str):
         raise HTTPException(status_code=500, detail=f"대화 목록 조회 실패: {str(e)}")
 
 
-@router.get("/chats/all")
+@router.get("/chats/all", dependencies=[Depends(db_workload("analytics"))])
 async def get_all_chats(partner_id: Optional[str] = None, limit: int = 200):
     """전체 병원 통합 대화 세션 목록 조회 (태그 포함)"""
     try:
@@ -439,150 +448,125 @@ async def get_all_chats(partner_id: Optional[str] = None, limit: int = 200):
         raise HTTPException(status_code=500, detail=f"통합 대화 목록 조회 실패: {str(e)}")
 
 
-@router.get("/chats/export")
-async def export_chats_excel(partner_id: Optional[str] = None, limit: int = 500):
-    """대화 세션 목록을 엑셀(XLSX)로 내보내기"""
-    from fastapi.responses import StreamingResponse
-    import io
+CHAT_EXPORT_HEADERS = [
+    "세션ID", "파트너", "병원", "환자명", "성별", "연락처", "검진일",
+    "메시지수", "관심사 태그", "위험 태그", "위험도", "감정",
+    "대화깊이", "참여도점수", "행동의향", "식단·영양 관심",
+    "핵심 우려사항", "후속조치 필요", "상담사 권고사항",
+    "요약", "키워드 태그", "데이터품질",
+    "생성일", "검진 데이터(JSON)", "대화 내역(JSON)"
+]
 
-    try:
-        import openpyxl
-        from openpyxl.styles import Font, PatternFill, Alignment
-    except ImportError:
+
+def _chat_export_row(r: Dict[str, Any]) -> List[Any]:
+    """상담 세션 1건 → CHAT_EXPORT_HEADERS 순서의 값 목록"""
+    interest = format_interest_tags(r.get("interest_tags"))
+    risk = ", ".join(r.get("risk_tags") or []) if r.get("risk_tags") else ""
+
+    # 검진 데이터 JSON (공통 유틸 사용)
+    metrics_json = extract_metrics_json(r.get("initial_data"))
+
+    # 대화 내역 JSON
+    conversation = r.get("conversation") or []
+    if isinstance(conversation, str):
+        try:
+            conversation = json.loads(conversation)
+        except:
+            conversation = []
+    conv_json = json.dumps(conversation, ensure_ascii=False) if conversation else ""
+    # Excel 셀 최대 32767자 제한
+    if len(conv_json) > 32000:
+        conv_json = conv_json[:32000] + "...(truncated)"
+
+    return [
+        r.get("session_id", ""),
+        r.get("partner_id", ""),
+        r.get("hospital_name", ""),
+        r.get("user_name", ""),
+        r.get("user_gender", ""),
+        r.get("user_phone", ""),
+        r.get("checkup_date", ""),
+        r.get("message_count", 0),
+        interest,
+        risk,
+        r.get("risk_level", ""),
+        r.get("sentiment", ""),
+        r.get("conversation_depth", ""),
+        r.get("engagement_score") or 0,
+        r.get("action_intent", ""),
+        format_tag_list(r.get("nutrition_tags")),
+        format_tag_list(r.get("key_concerns")),
+        "Y" if r.get("follow_up_needed") else "N",
+        format_tag_list(r.get("counselor_recommendations")),
+        r.get("conversation_summary", ""),
+        format_tag_list(r.get("keyword_tags")),
+        r.get("data_quality_score") or 0,
+        str(r.get("created_at", "")),
+        metrics_json,
+        conv_json,
+    ]
+
+
+@router.get("/chats/export", dependencies=[Depends(db_workload("export"))])
+async def export_chats_excel(
+    partner_id: Optional[str] = None,
+    limit: int = 500,
+    format: str = "xlsx",
+    gzip: bool = False,
+    cursor: Optional[str] = None,
+):
+    """대화 세션 목록 내보내기 (서버 사이드 커서 스트리밍).
+
+    format: xlsx(write-only 워크북, "내보내기 정보" 시트에 재개 토큰) / csv / ndjson(재개 토큰 포함)
+    cursor: 이전 응답의 재개 토큰 — limit 단위로 이어 받기
+    limit: 0 이하이면 전체
+    """
+    from ....services.streaming_export import (
+        ExportSection, xlsx_stream, csv_stream, ndjson_stream, export_response,
+    )
+
+    if format not in ("xlsx", "csv", "ndjson"):
+        raise HTTPException(status_code=400, detail="format 은 xlsx / csv / ndjson 중 하나여야 합니다.")
+    # xlsx 는 스트림 시작 후 import 하므로 미설치면 여기서 먼저 500
+    if format == "xlsx" and importlib.util.find_spec("openpyxl") is None:
         raise HTTPException(status_code=500, detail="openpyxl 라이브러리가 설치되지 않았습니다.")
 
-    try:
-        # 1. 세션 목록 조회 (태그 포함)
-        if partner_id:
-            query = f"""
-                SELECT
-                    l.session_id, l.partner_id, l.hospital_id, l.user_uuid,
-                    l.message_count, l.created_at, l.updated_at,
-                    l.conversation, l.initial_data,
-                    {PATIENT_SELECT_COLUMNS},
-                    COALESCE(h.hospital_name, '') as hospital_name,
-                    t.interest_tags, t.risk_tags, t.sentiment,
-                    t.conversation_summary, t.data_quality_score,
-                    t.risk_level, t.key_concerns, t.follow_up_needed,
-                    t.counselor_recommendations, t.keyword_tags,
-                    t.conversation_depth, t.engagement_score, t.action_intent, t.nutrition_tags
-                FROM welno.tb_partner_rag_chat_log l
-                LEFT JOIN welno.tb_hospital_rag_config h ON l.hospital_id = h.hospital_id AND l.partner_id = h.partner_id
-                LEFT JOIN welno.tb_chat_session_tags t ON l.session_id = t.session_id AND l.partner_id = t.partner_id
-                WHERE l.partner_id = %s
-                ORDER BY l.created_at DESC LIMIT %s
-            """
-            rows = await db_manager.execute_query(query, (partner_id, limit))
-        else:
-            query = f"""
-                SELECT
-                    l.session_id, l.partner_id, l.hospital_id, l.user_uuid,
-                    l.message_count, l.created_at, l.updated_at,
-                    l.conversation, l.initial_data,
-                    {PATIENT_SELECT_COLUMNS},
-                    COALESCE(h.hospital_name, '') as hospital_name,
-                    t.interest_tags, t.risk_tags, t.sentiment,
-                    t.conversation_summary, t.data_quality_score,
-                    t.risk_level, t.key_concerns, t.follow_up_needed,
-                    t.counselor_recommendations, t.keyword_tags,
-                    t.conversation_depth, t.engagement_score, t.action_intent, t.nutrition_tags
-                FROM welno.tb_partner_rag_chat_log l
-                LEFT JOIN welno.tb_hospital_rag_config h ON l.hospital_id = h.hospital_id AND l.partner_id = h.partner_id
-                LEFT JOIN welno.tb_chat_session_tags t ON l.session_id = t.session_id AND l.partner_id = t.partner_id
-                ORDER BY l.created_at DESC LIMIT %s
-            """
-            rows = await db_manager.execute_query(query, (limit,))
-
-        # 2. 워크북 생성 (단일 시트)
-        wb = openpyxl.Workbook()
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-        wrap_align = Alignment(wrap_text=True, vertical="top")
-
-        ws = wb.active
-        ws.title = "상담 데이터"
-        headers = [
-            "세션ID", "파트너", "병원", "환자명", "성별", "연락처", "검진일",
-            "메시지수", "관심사 태그", "위험 태그", "위험도", "감정",
-            "대화깊이", "참여도점수", "행동의향", "식단·영양 관심",
-            "핵심 우려사항", "후속조치 필요", "상담사 권고사항",
-            "요약", "키워드 태그", "데이터품질",
-            "생성일", "검진 데이터(JSON)", "대화 내역(JSON)"
-        ]
-        for col, h in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=h)
-            cell.font = header_font
-            cell.fill = header_fill
-
-        for row_idx, r in enumerate(rows, 2):
-            interest = format_interest_tags(r.get("interest_tags"))
-            risk = ", ".join(r.get("risk_tags") or []) if r.get("risk_tags") else ""
-            concerns_str = format_tag_list(r.get("key_concerns"))
-            recs_str = format_tag_list(r.get("counselor_recommendations"))
-            kw_str = format_tag_list(r.get("keyword_tags"))
-            nutrition_str = format_tag_list(r.get("nutrition_tags"))
-
-            # 검진 데이터 JSON (공통 유틸 사용)
-            metrics_json = extract_metrics_json(r.get("initial_data"))
-
-            # 대화 내역 JSON
-            conversation = r.get("conversation") or []
-            if isinstance(conversation, str):
-                try:
-                    conversation = json.loads(conversation)
-                except:
-                    conversation = []
-            conv_json = json.dumps(conversation, ensure_ascii=False) if conversation else ""
-            # Excel 셀 최대 32767자 제한
-            if len(conv_json) > 32000:
-                conv_json = conv_json[:32000] + "...(truncated)"
-
-            col = 1
-            ws.cell(row=row_idx, column=col, value=r.get("session_id", "")); col += 1
-            ws.cell(row=row_idx, column=col, value=r.get("partner_id", "")); col += 1
-            ws.cell(row=row_idx, column=col, value=r.get("hospital_name", "")); col += 1
-            ws.cell(row=row_idx, column=col, value=r.get("user_name", "")); col += 1
-            ws.cell(row=row_idx, column=col, value=r.get("user_gender", "")); col += 1
-            ws.cell(row=row_idx, column=col, value=r.get("user_phone", "")); col += 1
-            ws.cell(row=row_idx, column=col, value=r.get("checkup_date", "")); col += 1
-            ws.cell(row=row_idx, column=col, value=r.get("message_count", 0)); col += 1
-            ws.cell(row=row_idx, column=col, value=interest); col += 1
-            ws.cell(row=row_idx, column=col, value=risk); col += 1
-            ws.cell(row=row_idx, column=col, value=r.get("risk_level", "")); col += 1
-            ws.cell(row=row_idx, column=col, value=r.get("sentiment", "")); col += 1
-            ws.cell(row=row_idx, column=col, value=r.get("conversation_depth", "")); col += 1
-            ws.cell(row=row_idx, column=col, value=r.get("engagement_score") or 0); col += 1
-            ws.cell(row=row_idx, column=col, value=r.get("action_intent", "")); col += 1
-            ws.cell(row=row_idx, column=col, value=nutrition_str); col += 1
-            ws.cell(row=row_idx, column=col, value=concerns_str); col += 1
-            ws.cell(row=row_idx, column=col, value="Y" if r.get("follow_up_needed") else "N"); col += 1
-            ws.cell(row=row_idx, column=col, value=recs_str); col += 1
-            ws.cell(row=row_idx, column=col, value=r.get("conversation_summary", "")); col += 1
-            ws.cell(row=row_idx, column=col, value=kw_str); col += 1
-            ws.cell(row=row_idx, column=col, value=r.get("data_quality_score") or 0); col += 1
-            ws.cell(row=row_idx, column=col, value=str(r.get("created_at", ""))); col += 1
-            cell_metrics = ws.cell(row=row_idx, column=col, value=metrics_json); col += 1
-            cell_metrics.alignment = wrap_align
-            cell_conv = ws.cell(row=row_idx, column=col, value=conv_json)
-            cell_conv.alignment = wrap_align
-
-        # 3. 버퍼에 저장 후 반환
-        buffer = io.BytesIO()
-        wb.save(buffer)
-        buffer.seek(0)
-
-        filename = f"welno_chats_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-        return StreamingResponse(
-            buffer,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": f'attachment; filename="{filename}"'}
-        )
+    section = ExportSection(
+        "chats",
+        f"""
+            SELECT
+                l.session_id, l.partner_id, l.hospital_id, l.user_uuid,
+                l.message_count, l.created_at, l.updated_at,
+                l.conversation, l.initial_data,
+                {PATIENT_SELECT_COLUMNS},
+                COALESCE(h.hospital_name, '') as hospital_name,
+                t.interest_tags, t.risk_tags, t.sentiment,
+                t.conversation_summary, t.data_quality_score,
+                t.risk_level, t.key_concerns, t.follow_up_needed,
+                t.counselor_recommendations, t.keyword_tags,
+                t.conversation_depth, t.engagement_score, t.action_intent, t.nutrition_tags
+            FROM welno.tb_partner_rag_chat_log l
+            LEFT JOIN welno.tb_hospital_rag_config h ON l.hospital_id = h.hospital_id AND l.partner_id = h.partner_id
+            LEFT JOIN welno.tb_chat_session_tags t ON l.session_id = t.session_id AND l.partner_id = t.partner_id
+            WHERE {"l.partner_id = %s" if partner_id else "TRUE"}
+        """,
+        (partner_id,) if partner_id else (),
+        order_keys=("l.created_at", "l.session_id"),
+        row_keys=("created_at", "session_id"),
+        limit=limit if limit > 0 else None,
+    )
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"엑셀 내보내기 실패: {e}")
-        raise HTTPException(status_code=500, detail=f"엑셀 내보내기 실패: {str(e)}")
+    filename = f"welno_chats_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{format}"
+    if format == "xlsx":
+        chunks = xlsx_stream(section, "상담 데이터", CHAT_EXPORT_HEADERS, _chat_export_row, cursor)
+    elif format == "csv":
+        chunks = csv_stream(section, cursor, headers=CHAT_EXPORT_HEADERS, row_fn=_chat_export_row)
+    else:
+        chunks = ndjson_stream(
+            [section], {"exported_at": datetime.now().isoformat(), "partner_id": partner_id}, cursor,
+            row_fn=lambda r: dict(zip(CHAT_EXPORT_HEADERS, _chat_export_row(r))),
+        )
+    return export_response(chunks, format, filename, gzip)
 
 
 @router.get("/chats/{session_id}")
@@ -634,7 +618,10 @@ class RetagRequest(BaseModel):
 
 @router.post("/retag-sessions")
 async def retag_sessions(body: RetagRequest = Body(...)):
-    """기존 세션 일괄 재태깅 (LLM 기반). force=true면 이미 LLM 태깅된 것도 재처리."""
+    """기존 세션 일괄 재태깅 (LLM 기반). force=true면 이미 LLM 태깅된 것도 재처리.
+
+    대상 세션을 태깅 큐에 적재하고 바로 반환한다. 진행률은 GET /tagging-queue/status.
+    """
     try:
         from ....services.chat_tagging_service import retag_all_sessions
         result = await retag_all_sessions(
@@ -645,6 +632,15 @@ async def retag_sessions(body: RetagRequest = Body(...)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"재태깅 실패: {str(e)}")
 
+@router.get("/tagging-queue/status")
+async def tagging_queue_status(failure_limit: int = 10):
+    """태깅 큐 현황 — 상태별 건수, 최근 처리량/ETA, quota 기반 속도 상한, 워커 상태, 최근 실패"""
+    try:
+        from ....services.tagging_queue import get_queue_status
+        return {"success": True, **await get_queue_status(failure_limit=failure_limit)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"태깅 큐 조회 실패: {str(e)}")
+
 @router.post("/chats/{session_id}/retag")
 async def retag_single_session(session_id: str):
     """단일 세션 재태깅 (LLM 기반)"""
@@ -845,8 +841,13 @@ async def upload_hospital_document(
 
 
 @router.delete("/hospitals/{hospital_id}/documents/{filename}")
-async def delete_hospital_document(hospital_id: str, filename: str) -> Dict[str, Any]:
-    """병원별 업로드 문서 비활성화 (소프트 삭제). 파일과 DB 레코드는 보존."""
+async def delete_hospital_document(
+    hospital_id: str,
+    filename: str,
+    background_tasks: BackgroundTasks,
+    partner_id: str = "welno",
+) -> Dict[str, Any]:
+    """병원별 업로드 문서 비활성화 (소프트 삭제). 파일과 DB 레코드는 보존, 인덱스에서는 증분 제거."""
     try:
         await db_manager.execute_update(
             """UPDATE welno.tb_rag_documents
@@ -857,6 +858,7 @@ async def delete_hospital_document(hospital_id: str, filename: str) -> Dict[str,
     except Exception as db_err:
         logger.warning(f"문서 비활성화 실패: {db_err}")
         raise HTTPException(status_code=500, detail=f"비활성화 실패: {str(db_err)}")
+    background_tasks.add_task(_run_rebuild_for_hospital, hospital_id, partner_id)
     return {
         "success": True,
         "hospital_id": hospital_id,
@@ -1107,19 +1109,145 @@ async def upload_hospital_icon(
 
 # ─── 임베딩 재구축 API ────────────────────────────────────────────
 
-def _run_rebuild_for_hospital(hospital_id: str, partner_id: str = "welno") -> None:
-    """병원별 FAISS 인덱스 재구축 (백그라운드).
+def _get_inactive_filenames(hospital_id: str) -> set:
+    """인덱싱 제외 대상 (비활성 병원/공통 문서 stored_filename)"""
+    inactive_files = set()
+    try:
+        with db_manager.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "SELECT stored_filename FROM welno.tb_rag_documents "
+                    "WHERE is_active = false AND (hospital_id = %s OR doc_type = 'common')",
+                    (hospital_id,),
+                )
+                for row in cur.fetchall():
+                    inactive_files.add(row[0])
+        if inactive_files:
+            logger.info(f"[rebuild:{hospital_id}] 비활성 문서 {len(inactive_files)}개 제외")
+    except Exception as _db_err:
+        logger.warning(f"[rebuild:{hospital_id}] 비활성 문서 조회 실패: {_db_err}")
+    return inactive_files
+
+
+def _persist_rebuild_status(hospital_id: str) -> None:
+    """현재 재구축 상태를 디스크에 원자적으로 기록 (프로세스 재시작 후에도 조회 가능)"""
+    status = _rebuild_status.get(hospital_id)
+    if status is None:
+        return
+    path = _hospital_base_path(hospital_id) / REBUILD_STATUS_FILE
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(_public_status(status), ensure_ascii=False, default=str), encoding="utf-8")
+        os.replace(tmp, path)
+    except Exception as e:
+        logger.warning(f"[rebuild:{hospital_id}] 상태 파일 기록 실패: {e}")
+
+
+def _update_rebuild_status(hospital_id: str, **fields: Any) -> None:
+    """상태 갱신 후 디스크 기록. 진행 메시지만 바뀌는 경우는 _REBUILD_STATUS_FLUSH_SEC 간격으로 제한"""
+    status = _rebuild_status.setdefault(hospital_id, {})
+    status.update(fields)
+    now = time.monotonic()
+    if set(fields) == {"progress"} and now - status.get("_persisted_at", 0.0) < _REBUILD_STATUS_FLUSH_SEC:
+        return
+    status["_persisted_at"] = now
+    _persist_rebuild_status(hospital_id)
+
+
+def _load_rebuild_status(hospital_id: str) -> Optional[Dict[str, Any]]:
+    path = _hospital_base_path(hospital_id) / REBUILD_STATUS_FILE
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _public_status(status: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v for k, v in status.items() if not k.startswith("_")}
+
+
+def _pid_alive(pid: Any) -> bool:
+    try:
+        os.kill(int(pid), 0)
+    except (TypeError, ValueError, ProcessLookupError):
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _is_interrupted(status: Dict[str, Any]) -> bool:
+    """디스크에는 running인데 기록한 프로세스가 없으면 재시작 등으로 중단된 작업.
+    (메모리에 없는 작업을 기록한 pid가 자기 자신이면 — 컨테이너 재시작으로 pid 재사용 — 역시 중단)"""
+    if status.get("status") != "running":
+        return False
+    pid = status.get("pid")
+    return str(pid) == str(os.getpid()) or not _pid_alive(pid)
 
-    uploads 폴더의 PDF/텍스트를 파싱 → OpenAI 임베딩 → FAISS 인덱스 저장.
+
+def resume_interrupted_rebuilds() -> List[str]:
+    """중단된 재구축을 같은 모드(full/incremental)로 다시 실행 (서버 시작 시 호출).
+
+    체크포인트는 임베딩 캐시 — 중단 전에 임베딩된 청크는 캐시에서 읽으므로 이후 분량만 임베딩한다.
+    워커 여러 개가 동시에 시작해도 상태 파일을 rename 으로 선점한 한 곳만 재개한다.
+    """
+    root = Path(LOCAL_FAISS_BY_HOSPITAL)
+    if not root.exists():
+        return []
+    resumed = []
+    for path in sorted(root.glob(f"*/{REBUILD_STATUS_FILE}")):
+        hospital_id = path.parent.name
+        if hospital_id.startswith("_") or hospital_id in _rebuild_status:
+            continue
+        status = _load_rebuild_status(hospital_id)
+        if not status or not _is_interrupted(status):
+            continue
+        claim = path.with_name(f"{REBUILD_STATUS_FILE}.resume-{os.getpid()}")
+        try:
+            os.rename(path, claim)
+        except OSError:
+            continue  # 다른 워커가 먼저 선점
+        try:
+            claimed = json.loads(claim.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            claimed = status
+        if not _is_interrupted(claimed):
+            # 읽은 뒤 다른 워커가 이미 재개해 새 상태를 쓴 경우 → 되돌리고 건너뜀
+            os.rename(claim, path)
+            continue
+        claim.unlink(missing_ok=True)
+        partner_id = claimed.get("partner_id") or "welno"
+        force = claimed.get("mode") == "full"
+        logger.info(f"[rebuild:{hospital_id}] 중단된 재구축 재개 (mode={claimed.get('mode')}, partner={partner_id})")
+        threading.Thread(
+            target=_run_rebuild_for_hospital,
+            args=(hospital_id, partner_id, force),
+            name=f"rebuild-resume-{hospital_id}",
+            daemon=True,
+        ).start()
+        resumed.append(hospital_id)
+    return resumed
+
+
+def _run_rebuild_for_hospital(hospital_id: str, partner_id: str = "welno", force: bool = False) -> None:
+    """병원별 FAISS 인덱스 동기화 (백그라운드).
+
+    문서별 sha256 해시로 변경분만 파싱/임베딩하여 IndexIDMap2에 add/remove 한다.
+    force=True면 인덱스를 새로 구성하되, 임베딩 캐시 덕분에 내용이 같은 청크는 재임베딩하지 않는다.
     rag_service.py와 동일한 EMBEDDING_MODEL, EMBEDDING_DIMENSION 사용.
     """
-    global _rebuild_status
-    _rebuild_status[hospital_id] = {
-        "status": "running",
-        "started_at": datetime.now().isoformat(),
-        "progress": "초기화 중...",
-        "error": None,
-    }
+    _rebuild_status[hospital_id] = {}
+    _update_rebuild_status(
+        hospital_id,
+        status="running",
+        started_at=datetime.now().isoformat(),
+        progress="초기화 중...",
+        mode="full" if force else "incremental",
+        partner_id=partner_id,
+        pid=os.getpid(),
+        error=None,
+    )
 
     base = _hospital_base_path(hospital_id)
     uploads = base / UPLOADS_SUBDIR
@@ -1131,41 +1259,37 @@ def _run_rebuild_for_hospital(hospital_id: str, partner_id: str = "welno") -> No
     has_common_docs = common_uploads.exists() and any(common_uploads.iterdir())
     
     if not has_hospital_docs and not has_common_docs:
-        _rebuild_status[hospital_id].update({
-            "status": "failed",
-            "error": "업로드된 문서가 없습니다.",
-            "finished_at": datetime.now().isoformat(),
-        })
+        _update_rebuild_status(
+            hospital_id,
+            status="failed",
+            error="업로드된 문서가 없습니다.",
+            finished_at=datetime.now().isoformat(),
+        )
         return
 
     try:
-        import faiss
-        import numpy as np
-        import uuid as uuid_mod
         from openai import OpenAI
-        from pypdf import PdfReader
+        from ....services.rag_index import HospitalIndexSync, EmbeddingCache
 
-        _rebuild_status[hospital_id]["progress"] = "문서 파싱 중..."
+        from ....core.config import settings as app_settings
+        openai_api_key = os.environ.get("OPENAI_API_KEY") or app_settings.openai_api_key
+        if not openai_api_key or openai_api_key == "dev-openai-key":
+            _update_rebuild_status(
+                hospital_id,
+                status="failed",
+                error="OPENAI_API_KEY가 설정되지 않았습니다.",
+                finished_at=datetime.now().isoformat(),
+            )
+            return
 
-        # 2. 공통 + 병원 uploads 내 파일 → dict 변환
-        documents: list = []
-        supported_exts = {".pdf", ".txt", ".md", ".csv"}
+        client = OpenAI(api_key=openai_api_key)
 
-        # 비활성 문서 목록 (인덱싱 제외)
-        inactive_files = set()
-        try:
-            import psycopg2 as _pg
-            _conn = _pg.connect(host="10.0.1.10", port=5432, dbname="p9_mkt_biz", user="peernine", password="autumn3334!")
-            _cur = _conn.cursor()
-            _cur.execute("SELECT stored_filename FROM welno.tb_rag_documents WHERE is_active = false AND (hospital_id = %s OR doc_type = 'common')", (hospital_id,))
-            for row in _cur.fetchall():
-                inactive_files.add(row[0])
-            _cur.close()
-            _conn.close()
-            if inactive_files:
-                logger.info(f"[rebuild:{hospital_id}] 비활성 문서 {len(inactive_files)}개 제외")
-        except Exception as _db_err:
-            logger.warning(f"[rebuild:{hospital_id}] 비활성 문서 조회 실패: {_db_err}")
+        def _embed(texts: List[str]) -> List[List[float]]:
+            resp = client.embeddings.create(input=texts, model=EMBEDDING_MODEL)
+            return [item.embedding for item in resp.data]
+
+        def _progress(message: str) -> None:
+            _update_rebuild_status(hospital_id, progress=message)
 
         # 공통/병원 문서 순회 목록 (공통 먼저)
         doc_sources = []
@@ -1174,141 +1298,52 @@ def _run_rebuild_for_hospital(hospital_id: str, partner_id: str = "welno") -> No
         if has_hospital_docs:
             doc_sources.append(("hospital", uploads))
 
-        for source_type, source_dir in doc_sources:
-            for filepath in sorted(source_dir.iterdir()):
-                if not filepath.is_file() or filepath.name.startswith("."):
-                    continue
-                if filepath.name in inactive_files:
-                    logger.info(f"[rebuild:{hospital_id}] 건너뜀 (비활성): {filepath.name}")
-                    continue
-                ext = filepath.suffix.lower()
-                if ext not in supported_exts:
-                    logger.info(f"[rebuild:{hospital_id}] 건너뜀 (미지원): {filepath.name}")
-                    continue
-                try:
-                    if ext == ".pdf":
-                        reader = PdfReader(str(filepath))
-                        for page_num, page in enumerate(reader.pages, 1):
-                            text = page.extract_text() or ""
-                            text = text.strip()
-                            if text:
-                                documents.append({
-                                    "text": text,
-                                    "metadata": {
-                                        "file_name": filepath.name,
-                                        "page_label": str(page_num),
-                                        "hospital_id": hospital_id,
-                                        "source_type": source_type,
-                                    },
-                                })
-                    else:
-                        text = filepath.read_text(encoding="utf-8", errors="ignore").strip()
-                        if text:
-                            documents.append({
-                                "text": text,
-                                "metadata": {
-                                    "file_name": filepath.name,
-                                    "page_label": "1",
-                                    "hospital_id": hospital_id,
-                                    "source_type": source_type,
-                                },
-                            })
-                except Exception as parse_err:
-                    logger.warning(f"[rebuild:{hospital_id}] 파싱 실패 {filepath.name}: {parse_err}")
-
-        if not documents:
-            # 활성 문서 0개 -> 기존 FAISS 인덱스 삭제
-            for old_file in ["faiss.index", "default__vector_store.json", "docstore.json",
-                             "index_store.json", "graph_store.json", "image__vector_store.json"]:
-                old_path = base / old_file
-                if old_path.exists():
-                    old_path.unlink()
-                    logger.info(f"[rebuild:{hospital_id}] 기존 인덱스 삭제: {old_file}")
-            _rebuild_status[hospital_id].update({
-                "status": "completed",
-                "progress": "활성 문서 없음 - 인덱스 초기화 완료",
-                "finished_at": datetime.now().isoformat(),
-                "document_count": 0,
-                "vector_count": 0,
-            })
-            logger.info(f"[rebuild:{hospital_id}] 활성 문서 없음 - FAISS 인덱스 초기화")
-            return
-
-        _rebuild_status[hospital_id]["progress"] = f"{len(documents)}개 문서 청크 임베딩 중..."
-
-        # 3. OpenAI 임베딩
-        from ....core.config import settings as app_settings
-        openai_api_key = os.environ.get("OPENAI_API_KEY") or app_settings.openai_api_key
-        if not openai_api_key or openai_api_key == "dev-openai-key":
-            _rebuild_status[hospital_id].update({
-                "status": "failed",
-                "error": "OPENAI_API_KEY가 설정되지 않았습니다.",
-                "finished_at": datetime.now().isoformat(),
-            })
-            return
-
-        client = OpenAI(api_key=openai_api_key)
-
-        # 배치 임베딩 (최대 2048개씩)
-        all_embeddings = []
-        batch_size = 2048
-        for i in range(0, len(documents), batch_size):
-            batch_texts = [d["text"] for d in documents[i:i + batch_size]]
-            resp = client.embeddings.create(input=batch_texts, model=EMBEDDING_MODEL)
-            all_embeddings.extend([item.embedding for item in resp.data])
-
-        # 4. FAISS 인덱스 빌드
-        _rebuild_status[hospital_id]["progress"] = "FAISS 인덱스 생성 중..."
-        vectors = np.array(all_embeddings, dtype=np.float32)
-        faiss_index = faiss.IndexFlatL2(EMBEDDING_DIMENSION)
-        faiss_index.add(vectors)
-
-        # 5. llama-index 호환 형식으로 저장
-        _rebuild_status[hospital_id]["progress"] = "인덱스 저장 중..."
-
-        nodes_dict = {}
-        docstore_data = {}
-        for idx, doc in enumerate(documents):
-            node_id = str(uuid_mod.uuid4())
-            nodes_dict[str(idx)] = node_id
-            docstore_data[node_id] = {
-                "__data__": {"text": doc["text"], "metadata": doc["metadata"]},
-                "__type__": "1",
-            }
-
-        faiss.write_index(faiss_index, str(base / "faiss.index"))
-
-        index_id = str(uuid_mod.uuid4())
-        index_store = {
-            "index_store/data": {
-                index_id: {
-                    "__type__": "vector_store",
-                    "__data__": json.dumps({"nodes_dict": nodes_dict}),
-                }
-            }
-        }
-        (base / "index_store.json").write_text(json.dumps(index_store, ensure_ascii=False))
+        syncer = HospitalIndexSync(
+            base_dir=base,
+            hospital_id=hospital_id,
+            embed_fn=_embed,
+            cache=EmbeddingCache(Path(LOCAL_FAISS_BY_HOSPITAL) / EMBEDDING_CACHE_FILE, EMBEDDING_MODEL),
+            dimension=EMBEDDING_DIMENSION,
+        )
+        result = syncer.sync(
+            doc_sources,
+            inactive=_get_inactive_filenames(hospital_id),
+            force=force,
+            progress=_progress,
+        )
 
-        docstore = {"docstore/data": docstore_data}
-        (base / "docstore.json").write_text(json.dumps(docstore, ensure_ascii=False))
+        # 검색 측 캐시된 FAISSVectorSearch 인스턴스 폐기 (다음 검색에서 새 인덱스 로드)
+        if result["changed"]:
+            try:
+                from ....services.checkup_design.rag_service import invalidate_hospital_vector_cache
+                invalidate_hospital_vector_cache(hospital_id)
+            except Exception as cache_err:
+                logger.warning(f"[rebuild:{hospital_id}] 검색 캐시 무효화 실패: {cache_err}")
 
-        _rebuild_status[hospital_id].update({
-            "status": "completed",
-            "progress": f"완료: {len(documents)}개 청크, 벡터 {faiss_index.ntotal}개",
-            "finished_at": datetime.now().isoformat(),
-            "document_count": len(documents),
-            "vector_count": faiss_index.ntotal,
-        })
-        logger.info(f"[rebuild:{hospital_id}] 완료 - 문서 {len(documents)}개, 벡터 {faiss_index.ntotal}개")
+        if result["vector_count"] == 0:
+            progress = "활성 문서 없음 - 인덱스 초기화 완료"
+        else:
+            progress = (
+                f"완료: {result['document_count']}개 청크, 벡터 {result['vector_count']}개 "
+                f"(신규 임베딩 {result['embedded_chunks']}건)"
+            )
+        _update_rebuild_status(
+            hospital_id,
+            status="completed",
+            progress=progress,
+            finished_at=datetime.now().isoformat(),
+            **result,
+        )
 
     except Exception as e:
         logger.error(f"[rebuild:{hospital_id}] 재구축 실패: {e}")
         logger.error(traceback.format_exc())
-        _rebuild_status[hospital_id].update({
-            "status": "failed",
-            "error": str(e),
-            "finished_at": datetime.now().isoformat(),
-        })
+        _update_rebuild_status(
+            hospital_id,
+            status="failed",
+            error=str(e),
+            finished_at=datetime.now().isoformat(),
+        )
 
 
 @router.post("/hospitals/{hospital_id}/rebuild")
@@ -1316,8 +1351,13 @@ async def trigger_rebuild(
     hospital_id: str,
     background_tasks: BackgroundTasks,
     partner_id: str = "welno",
+    force: bool = False,
 ) -> Dict[str, Any]:
-    """병원별 임베딩 인덱스 재구축 트리거 (비동기)."""
+    """병원별 임베딩 인덱스 재구축 트리거 (비동기).
+
+    force=False(기본): 문서 해시 기반 증분 동기화
+    force=True: 인덱스를 새로 구성 (변경 없는 청크는 임베딩 캐시 재사용)
+    """
     # 이미 실행 중이면 중복 방지
     current = _rebuild_status.get(hospital_id)
     if current and current.get("status") == "running":
@@ -1325,9 +1365,9 @@ async def trigger_rebuild(
             "success": False,
             "message": "이미 재구축이 진행 중입니다.",
             "hospital_id": hospital_id,
-            "status": current,
+            "status": _public_status(current),
         }
-    background_tasks.add_task(_run_rebuild_for_hospital, hospital_id, partner_id)
+    background_tasks.add_task(_run_rebuild_for_hospital, hospital_id, partner_id, force)
     return {
         "success": True,
         "message": "재구축이 백그라운드에서 시작되었습니다.",
@@ -1337,11 +1377,21 @@ async def trigger_rebuild(
 
 @router.get("/hospitals/{hospital_id}/rebuild/status")
 async def get_rebuild_status(hospital_id: str) -> Dict[str, Any]:
-    """재구축 진행 상태 조회"""
+    """재구축 진행 상태 조회.
+
+    메모리에 없으면 디스크 기록을 사용한다. 디스크에는 running인데 기록한 프로세스가 없으면
+    재시작 등으로 중단된 것이므로 interrupted로 보고한다 (다음 서버 시작 시 resume_interrupted_rebuilds 가
+    같은 모드로 재개, 임베딩 캐시로 이어서 처리).
+    """
     status = _rebuild_status.get(hospital_id)
+    if status:
+        return {"hospital_id": hospital_id, **_public_status(status)}
+    status = _load_rebuild_status(hospital_id)
     if not status:
         return {"hospital_id": hospital_id, "status": "idle", "message": "재구축 이력 없음"}
-    return {"hospital_id": hospital_id, **status}
+    if _is_interrupted(status):
+        status["status"] = "interrupted"
+    return {"hospital_id": hospital_id, **_public_status(status)}
 
 
 # ─── 병원 RAG 설정 CRUD ──────────────────────────────────────────
@@ -2,7 +2,7 @@
 헬스체크 및 시스템 상태 API 엔드포인트
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 from pydantic import BaseModel
 from datetime import datetime
 import os
@@ -41,6 +41,16 @@ async def health_ping():
     return {"status": "ok", "timestamp": datetime.now().isoformat()}
 
 
+@router.get("/ready", response_model=dict)
+async def health_ready(response: Response):
+    """준비 상태 (워밍업 완료 전 503) — 로드밸런서/PM2 재시작 후 트래픽 투입 게이트용"""
+    from ....core.warmup import warmup
+
+    if not warmup.ready:
+        response.status_code = 503
+    return {"ready": warmup.ready, "timestamp": datetime.now().isoformat(), "warmup": warmup.snapshot()}
+
+
 @router.get("/status", response_model=HealthResponse)
 async def health_status():
     """시스템 헬스체크"""
@@ -6,7 +6,6 @@ from fastapi import APIRouter, HTTPException, BackgroundTasks
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
 import json
-from openai import AsyncOpenAI
 import os
 from datetime import datetime, timedelta
 import logging
@@ -85,6 +84,8 @@ def get_openai_client():
     if client is None:
         api_key = settings.openai_api_key
         if api_key and not api_key.startswith("sk-proj-your-") and api_key != "dev-openai-key":
+            from openai import AsyncOpenAI
+
             client = AsyncOpenAI(api_key=api_key)
         else:
             # API 키가 없으면 None으로 유지 (목 데이터 사용)
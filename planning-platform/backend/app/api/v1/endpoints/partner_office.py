@@ -10,14 +10,15 @@ from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List, Literal
 
 from fastapi import APIRouter, HTTPException, Depends, Query, Body
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel, Field
 from jose import JWTError, jwt
 
 from ....core.config import settings
-from ....core.database import db_manager
+from ....core.database import db_manager, db_workload
 from ....utils.query_builders import build_filter
-from ....utils.survey_queries import survey_union_daily, survey_union_count_today, survey_union_by_respondent, survey_union_detail_for_user
+from ....utils.survey_queries import survey_union_daily, survey_union_count_today, survey_union_detail_for_user
 from ....utils.partner_config import get_partner_config_by_api_key, get_partner_type
 
 # ─── mediArc 신규 엔진 (백오피스 전용) ───────────────────────────────
@@ -30,10 +31,12 @@ try:
         build_engine_stats,
         to_engine_patient,
     )
+    from ....services.report_engine import nutrition_jobs as _nutrition_jobs_mod
     ENGINE_AVAILABLE = True
 except ImportError:
     ENGINE_AVAILABLE = False
     EngineFacade = None  # type: ignore
+    _nutrition_jobs_mod = None  # type: ignore
     compare_single = None  # type: ignore
     verify_batch = None  # type: ignore
     build_engine_stats = None  # type: ignore
@@ -76,7 +79,17 @@ class OverviewRequest(BaseModel):
     date_to: Optional[str] = None
 
 class PatientListRequest(BaseModel):
+    """환자 목록 — 요약 테이블 키셋 페이지네이션 (next_cursor 를 cursor 로 넘겨 다음 페이지)"""
     hospital_id: Optional[str] = None
+    limit: int = Field(100, ge=1, le=500)
+    cursor: Optional[str] = None
+    sort: Literal["last_activity", "chat_count", "survey_count", "journey_count", "patient_name"] = "last_activity"
+    order: Literal["asc", "desc"] = "desc"
+    search: Optional[str] = None
+    hospital_name: Optional[str] = None
+    date_from: Optional[str] = None  # YYYY-MM-DD (last_activity 기준)
+    date_to: Optional[str] = None
+    activity: Literal["all", "chat", "survey", "journey"] = "all"
 
 
 # ── B1: B2B 산업군 차원 — 신규 list/distribution endpoint (기존 변경 X) ──
@@ -102,6 +115,10 @@ class ExportJsonRequest(BaseModel):
     hospital_id: Optional[str] = None
     date_from: Optional[str] = None
     date_to: Optional[str] = None
+    format: Literal["json", "ndjson", "csv"] = "json"
+    section: Optional[str] = None  # csv 전용: chat_logs / tagging / survey_legacy / survey_dynamic
+    cursor: Optional[str] = None  # ndjson/csv 재개 토큰 (ndjson 의 {"cursor": ...} 값)
+    gzip: bool = False
 
 class AnalyticsRequest(BaseModel):
     hospital_id: Optional[str] = None
@@ -121,6 +138,7 @@ class RevisitCandidatesRequest(BaseModel):
     days: int = 30
     limit: int = 50
     filter_type: str = "all"  # 'all' | 'ai_recommended' | 'user_requested'
+    include_details: bool = False  # True: 상세 필드(추천 메시지/요약 등)까지 포함 — 엑셀 내보내기용
 
 
 class ConsultationRequest(BaseModel):
@@ -305,7 +323,7 @@ async def dashboard_overview(
     }
 
 
-@router.post("/dashboard/stats")
+@router.post("/dashboard/stats", dependencies=[Depends(db_workload("analytics"))])
 async def dashboard_stats(
     req: DashboardStatsRequest,
     user: dict = Depends(get_current_user),
@@ -391,7 +409,7 @@ async def dashboard_stats(
     }
 
 
-@router.get("/journey/stats")
+@router.get("/journey/stats", dependencies=[Depends(db_workload("analytics"))])
 async def journey_stats(
     hospital_id: Optional[str] = None,
     date_from: Optional[str] = None,
@@ -497,240 +515,38 @@ def _empty_journey(warning: str = "") -> dict:
     }
 
 
-@router.post("/patients")
+@router.post("/patients", dependencies=[Depends(db_workload("analytics"))])
 async def patient_list(
     req: PatientListRequest,
     user: dict = Depends(get_current_user),
 ):
-    """환자 통합 목록 — chat(user_uuid) + survey(respondent_uuid) merge by web_app_key"""
-
-    # ── 1) 상담 건수 by user_uuid ──
-    chat_where = ""
-    chat_params: tuple = ()
-    if req.hospital_id:
-        chat_where = "WHERE c.hospital_id = %s"
-        chat_params = (req.hospital_id,)
-
-    chat_rows = await db_manager.execute_query(f"""
-        SELECT c.user_uuid AS web_app_key,
-               COUNT(*) AS chat_count,
-               MAX(c.created_at) AS last_chat,
-               MAX(h.hospital_name) AS hospital_name
-        FROM welno.tb_partner_rag_chat_log c
-        LEFT JOIN welno.tb_hospital_rag_config h
-          ON h.hospital_id = c.hospital_id AND h.is_active = true
-        {chat_where}
-        GROUP BY c.user_uuid
-    """, chat_params)
-
-    # ── 1-2) 수검자명 by user_uuid (최신 레코드 기준) ──
-    name_rows = await db_manager.execute_query("""
-        SELECT DISTINCT ON (user_uuid)
-            user_uuid AS web_app_key,
-            COALESCE(
-                initial_data->'patient_info'->>'name',
-                client_info->>'patient_name',
-                ''
-            ) AS patient_name
-        FROM welno.tb_partner_rag_chat_log
-        WHERE user_uuid IS NOT NULL
-          AND (initial_data IS NOT NULL OR client_info IS NOT NULL)
-        ORDER BY user_uuid, created_at DESC
-    """)
-    name_map = {r["web_app_key"]: r["patient_name"] for r in name_rows if r["patient_name"]}
-
-    # ── 2) 서베이 건수 by respondent_uuid (두 테이블 UNION) ──
-    _by_resp_sql, _by_resp_params = survey_union_by_respondent(req.hospital_id)
-    survey_rows = await db_manager.execute_query(_by_resp_sql, _by_resp_params)
-
-    # ── 3) ES: webAppKey별 여정(이벤트) 건수 ──
-    import httpx
-
-    journey_map: Dict[str, int] = {}
-    es_name_map: Dict[str, str] = {}   # 마스킹 안 된 풀네임만
-    try:
-        es_url = settings.elasticsearch_url.rstrip("/")
-        es_query = {"term": {"header.project.name": "med2-frontend-hana"}}
-        if req.hospital_id:
-            es_query = {
-                "bool": {
-                    "must": [
-                        {"term": {"header.project.name": "med2-frontend-hana"}},
-                        {"term": {"data.user.hospital.id.keyword": req.hospital_id}},
-                    ]
-                }
-            }
-        es_body = {
-            "size": 0,
-            "query": es_query,
-            "aggs": {
-                "by_user": {
-                    "terms": {
-                        "field": "data.user.webAppKey.keyword",
-                        "size": 10000,
-                    },
-                    "aggs": {
-                        "latest": {
-                            "top_hits": {
-                                "size": 20,
-                                "_source": ["data.user.name"],
-                                "sort": [{"header.@timestamp": "desc"}],
-                            }
-                        }
-                    },
-                }
-            },
-        }
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            resp = await client.post(
-                f"{es_url}/medilinx-logs-data/_search", json=es_body
-            )
-            resp.raise_for_status()
-            buckets = resp.json().get("aggregations", {}).get("by_user", {}).get("buckets", [])
-            for b in buckets:
-                journey_map[b["key"]] = b["doc_count"]
-                hits = b.get("latest", {}).get("hits", {}).get("hits", [])
-                for hit in hits:
-                    name = hit.get("_source", {}).get("data", {}).get("user", {}).get("name", "")
-                    if name and "*" not in name:
-                        es_name_map[b["key"]] = name
-                        break
-                    elif name and b["key"] not in es_name_map:
-                        es_name_map[b["key"]] = name  # 마스킹 이름이라도 폴백
-    except Exception as e:
-        logger.warning(f"ES journey count fetch failed: {e}")
+    """
+    환자 통합 목록 — welno.tb_partner_patient_summary (chat/서베이 INSERT 트리거가 유지) 페이지 조회.
+    필터·정렬·페이지네이션은 SQL, 여정 건수/ES 이름은 페이지 행만 es_service 로 보충.
+    total / hospital_options 는 첫 페이지에서만 반환.
+    """
+    from ....services.patient_summary import list_patients
 
-    # ── 3-2) ES: DOWNLOAD_ONLY 정책 대상 webAppKey 감지 ──
-    download_only_keys: set = set()
     try:
-        dl_body = {
-            "size": 0,
-            "query": {
-                "bool": {
-                    "must": [
-                        {"term": {"header.project.name": "med2-frontend-hana"}},
-                        {"match_phrase": {"data.message": "DOWNLOAD_ONLY"}},
-                    ]
-                }
-            },
-            "aggs": {
-                "by_user": {
-                    "terms": {"field": "data.user.webAppKey.keyword", "size": 10000}
-                }
-            },
-        }
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.post(f"{es_url}/medilinx-logs-data/_search", json=dl_body)
-            resp.raise_for_status()
-            buckets = resp.json().get("aggregations", {}).get("by_user", {}).get("buckets", [])
-            download_only_keys = {b["key"] for b in buckets}
-    except Exception as e:
-        logger.warning(f"ES download_only fetch failed: {e}")
-
-    # ── 4) Python merge by web_app_key ──
-    # survey respondent_name 맵
-    survey_name_map = {r["web_app_key"]: r["respondent_name"] for r in survey_rows if r.get("respondent_name")}
-
-    # 이름 우선순위: chat_log → survey respondent_name → ES(풀네임만, 마스킹 제외)
-    def _resolve_name(key: str) -> str:
-        return name_map.get(key, "") or survey_name_map.get(key, "") or es_name_map.get(key, "")
-
-    merged: Dict[str, dict] = {}
-    for row in chat_rows:
-        key = row["web_app_key"]
-        if not key:
-            continue
-        merged[key] = {
-            "web_app_key": key,
-            "patient_name": _resolve_name(key),
-            "chat_count": row["chat_count"],
-            "survey_count": 0,
-            "journey_count": 0,
-            "last_activity": str(row["last_chat"]) if row["last_chat"] else None,
-            "hospital_name": row["hospital_name"] or "",
-            "download_only": key in download_only_keys,
-        }
-
-    for row in survey_rows:
-        key = row["web_app_key"]
-        if not key:
-            continue
-        if key in merged:
-            merged[key]["survey_count"] = row["survey_count"]
-            sr = str(row["last_survey"]) if row["last_survey"] else None
-            if sr and (not merged[key]["last_activity"] or sr > merged[key]["last_activity"]):
-                merged[key]["last_activity"] = sr
-            if not merged[key]["patient_name"]:
-                merged[key]["patient_name"] = _resolve_name(key)
-            # 서베이 쪽 병원명이 있고 기존이 비어있으면 보완
-            if not merged[key]["hospital_name"] and row.get("hospital_name"):
-                merged[key]["hospital_name"] = row["hospital_name"]
-        else:
-            merged[key] = {
-                "web_app_key": key,
-                "patient_name": _resolve_name(key),
-                "chat_count": 0,
-                "survey_count": row["survey_count"],
-                "journey_count": 0,
-                "last_activity": str(row["last_survey"]) if row["last_survey"] else None,
-                "hospital_name": row.get("hospital_name") or "",
-                "download_only": key in download_only_keys,
-            }
-
-    # ES 여정 데이터 merge — DB에 있는 유저만 여정 건수 매핑
-    for key, count in journey_map.items():
-        if key and key in merged:
-            merged[key]["journey_count"] = count
-
-    # ── 5) 이름 없는 환자 → ES 개별 조회로 이름 보충 ──
-    no_name_keys = [k for k, v in merged.items() if not v.get("patient_name")]
-    if no_name_keys:
-        try:
-            es_url = settings.elasticsearch_url.rstrip("/")
-            # 최대 50명씩 msearch
-            for batch_start in range(0, len(no_name_keys), 50):
-                batch = no_name_keys[batch_start:batch_start + 50]
-                msearch_body = ""
-                for wak in batch:
-                    msearch_body += json.dumps({}) + "\n"
-                    msearch_body += json.dumps({
-                        "size": 10,
-                        "query": {"bool": {"must": [
-                            {"term": {"header.project.name": "med2-frontend-hana"}},
-                            {"term": {"data.user.webAppKey.keyword": wak}},
-                        ]}},
-                        "_source": ["data.user.name"],
-                        "sort": [{"header.@timestamp": "desc"}],
-                    }) + "\n"
-                async with httpx.AsyncClient(timeout=15.0) as client:
-                    resp = await client.post(
-                        f"{es_url}/medilinx-logs-data/_msearch",
-                        content=msearch_body,
-                        headers={"Content-Type": "application/x-ndjson"},
-                    )
-                    resp.raise_for_status()
-                    responses = resp.json().get("responses", [])
-                    for idx, r in enumerate(responses):
-                        wak = batch[idx]
-                        for hit in r.get("hits", {}).get("hits", []):
-                            name = hit.get("_source", {}).get("data", {}).get("user", {}).get("name", "")
-                            if name and "*" not in name:
-                                merged[wak]["patient_name"] = name
-                                break
-                            elif name and not merged[wak].get("patient_name"):
-                                merged[wak]["patient_name"] = name  # 마스킹 이름이라도 폴백
-        except Exception as e:
-            logger.warning(f"ES name supplement failed: {e}")
-
-    patients = sorted(merged.values(), key=lambda x: x["last_activity"] or "", reverse=True)
-
-    return {"patients": patients, "total": len(patients)}
+        return await list_patients(
+            hospital_id=req.hospital_id,
+            search=req.search,
+            hospital_name=req.hospital_name,
+            date_from=req.date_from,
+            date_to=req.date_to,
+            activity=req.activity,
+            sort=req.sort,
+            order=req.order,
+            cursor=req.cursor,
+            limit=req.limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.post("/patients/{web_app_key}/detail")
 async def patient_detail(web_app_key: str, user: dict = Depends(get_current_user)):
     """환자 상세 — 상담, 서베이, 여정, 검진데이터 통합 조회"""
-    import httpx
 
     # ── 1) 상담 세션 목록 (chat_log + tags JOIN) ──
     chats = await db_manager.execute_query("""
@@ -847,7 +663,8 @@ async def patient_detail(web_app_key: str, user: dict = Depends(get_current_user
     journey_events = []
     es_name = ""
     try:
-        es_url = settings.elasticsearch_url.rstrip("/")
+        from ....services.es_service import DATA_INDEX, es_service
+
         es_body = {
             "size": 50,
             "query": {
@@ -860,32 +677,30 @@ async def patient_detail(web_app_key: str, user: dict = Depends(get_current_user
             },
             "sort": [{"header.@timestamp": {"order": "desc"}}],
         }
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            resp = await client.post(f"{es_url}/medilinx-logs-data/_search", json=es_body)
-            resp.raise_for_status()
-            hits = resp.json().get("hits", {}).get("hits", [])
-            for hit in hits:
-                src = hit.get("_source", {})
-                data = src.get("data", {})
-                ci = data.get("clientInfo", {})
-                ctx = data.get("context", "unknown").replace("UserAction-", "")
-                ts = src.get("header", {}).get("@timestamp", "")
-                journey_events.append({
-                    "timestamp": str(ts)[:19].replace("T", " ") if ts else "",
-                    "action": ctx,
-                    "message": data.get("message", ""),
-                    "page_title": data.get("pageTitle", data.get("page", {}).get("title", "")),
-                    "device": ci.get("device", ""),
-                    "os": ci.get("os", ""),
-                    "browser": ci.get("browser", ""),
-                })
-                # ES에서 이름 추출 (풀네임 우선, 마스킹 이름도 폴백)
-                if not es_name or "*" in es_name:
-                    _n = data.get("user", {}).get("name", "")
-                    if _n and "*" not in _n:
-                        es_name = _n
-                    elif _n and not es_name:
-                        es_name = _n
+        es_resp = await es_service.search(DATA_INDEX, es_body)
+        hits = es_resp.get("hits", {}).get("hits", [])
+        for hit in hits:
+            src = hit.get("_source", {})
+            data = src.get("data", {})
+            ci = data.get("clientInfo", {})
+            ctx = data.get("context", "unknown").replace("UserAction-", "")
+            ts = src.get("header", {}).get("@timestamp", "")
+            journey_events.append({
+                "timestamp": str(ts)[:19].replace("T", " ") if ts else "",
+                "action": ctx,
+                "message": data.get("message", ""),
+                "page_title": data.get("pageTitle", data.get("page", {}).get("title", "")),
+                "device": ci.get("device", ""),
+                "os": ci.get("os", ""),
+                "browser": ci.get("browser", ""),
+            })
+            # ES에서 이름 추출 (풀네임 우선, 마스킹 이름도 폴백)
+            if not es_name or "*" in es_name:
+                _n = data.get("user", {}).get("name", "")
+                if _n and "*" not in _n:
+                    es_name = _n
+                elif _n and not es_name:
+                    es_name = _n
     except Exception as e:
         logger.warning(f"ES journey detail fetch failed for {web_app_key}: {e}")
 
@@ -903,85 +718,91 @@ async def patient_detail(web_app_key: str, user: dict = Depends(get_current_user
     }
 
 
-@router.post("/export/json")
+@router.post("/export/json", dependencies=[Depends(db_workload("export"))])
 async def export_all_json(
     req: ExportJsonRequest,
     user: dict = Depends(get_current_user),
 ):
-    """전체 데이터 JSON 내보내기 — 상담 로그 + 설문 응답(legacy+dynamic) + 태깅 + 환자 목록"""
+    """전체 데이터 내보내기 — 상담 로그 + 설문 응답(legacy+dynamic) + 태깅
+
+    서버 사이드 커서로 행을 읽는 즉시 스트리밍하므로 기간과 무관하게 메모리 사용이 일정하다.
+    format=json: 기존과 같은 단일 JSON 문서 / ndjson: 한 줄 한 행 + 재개 토큰 / csv: section 하나
+    """
+    from ....services.streaming_export import (
+        ExportSection, json_document_stream, ndjson_stream, csv_stream, export_response,
+    )
+
     hospital_id = req.hospital_id
     date_to = req.date_to or datetime.utcnow().strftime("%Y-%m-%d")
     date_from = req.date_from or (datetime.utcnow() - timedelta(days=90)).strftime("%Y-%m-%d")
 
     h_where = "AND t.hospital_id = %s" if hospital_id else ""
-    h_param = (hospital_id,) if hospital_id else ()
-
-    # ── 1) 상담 로그 ──
-    chat_logs = await db_manager.execute_query(f"""
-        SELECT t.id, t.user_uuid, t.hospital_id, t.partner_id,
-               t.user_message, t.assistant_message, t.created_at
-        FROM welno.tb_partner_rag_chat_log t
-        WHERE t.created_at >= %s::date AND t.created_at < (%s::date + interval '1 day')
-        {h_where}
-        ORDER BY t.created_at DESC
-    """, (date_from, date_to) + h_param)
-    for r in chat_logs:
-        if r.get("created_at"):
-            r["created_at"] = str(r["created_at"])
-
-    # ── 2) 태깅 데이터 ──
-    h_where_tag = "AND t.hospital_id = %s" if hospital_id else ""
-    tagging_data = await db_manager.execute_query(f"""
-        SELECT t.id, t.user_uuid, t.hospital_id, t.partner_id,
-               t.risk_level, t.sentiment, t.action_intent,
-               t.interest_tags, t.nutrition_tags,
-               t.engagement_score, t.created_at
-        FROM welno.tb_chat_session_tags t
-        WHERE t.created_at >= %s::date AND t.created_at < (%s::date + interval '1 day')
-        {h_where_tag}
-        ORDER BY t.created_at DESC
-    """, (date_from, date_to) + h_param)
-    for r in tagging_data:
-        if r.get("created_at"):
-            r["created_at"] = str(r["created_at"])
-
-    # ── 3) 설문 응답 — legacy (고정 필드) ──
     h_where_s = "AND hospital_id = %s" if hospital_id else ""
-    survey_legacy = await db_manager.execute_query(f"""
-        SELECT id, partner_id, hospital_id,
-               reservation_process, facility_cleanliness, staff_kindness,
-               waiting_time, overall_satisfaction,
-               free_comment, respondent_uuid, created_at
-        FROM welno.tb_hospital_survey_responses
-        WHERE created_at >= %s::date AND created_at < (%s::date + interval '1 day')
-        {h_where_s}
-        ORDER BY created_at DESC
-    """, (date_from, date_to) + h_param)
-    for r in survey_legacy:
-        if r.get("created_at"):
-            r["created_at"] = str(r["created_at"])
+    params = (date_from, date_to) + ((hospital_id,) if hospital_id else ())
+
+    sections = [
+        # ── 1) 상담 로그 ──
+        ExportSection("chat_logs", f"""
+            SELECT t.id, t.user_uuid, t.hospital_id, t.partner_id,
+                   t.user_message, t.assistant_message, t.created_at
+            FROM welno.tb_partner_rag_chat_log t
+            WHERE t.created_at >= %s::date AND t.created_at < (%s::date + interval '1 day')
+            {h_where}
+        """, params, order_keys=("t.created_at", "t.id")),
+        # ── 2) 태깅 데이터 ──
+        ExportSection("tagging", f"""
+            SELECT t.id, t.user_uuid, t.hospital_id, t.partner_id,
+                   t.risk_level, t.sentiment, t.action_intent,
+                   t.interest_tags, t.nutrition_tags,
+                   t.engagement_score, t.created_at
+            FROM welno.tb_chat_session_tags t
+            WHERE t.created_at >= %s::date AND t.created_at < (%s::date + interval '1 day')
+            {h_where}
+        """, params, order_keys=("t.created_at", "t.id")),
+        # ── 3) 설문 응답 — legacy (고정 필드) ──
+        ExportSection("survey_legacy", f"""
+            SELECT id, partner_id, hospital_id,
+                   reservation_process, facility_cleanliness, staff_kindness,
+                   waiting_time, overall_satisfaction,
+                   free_comment, respondent_uuid, created_at
+            FROM welno.tb_hospital_survey_responses
+            WHERE created_at >= %s::date AND created_at < (%s::date + interval '1 day')
+            {h_where_s}
+        """, params),
+        # ── 4) 설문 응답 — dynamic (동적 템플릿) ──
+        ExportSection("survey_dynamic", f"""
+            SELECT id, template_id, partner_id, hospital_id,
+                   answers, free_comment, respondent_uuid, created_at
+            FROM welno.tb_survey_responses_dynamic
+            WHERE created_at >= %s::date AND created_at < (%s::date + interval '1 day')
+            {h_where_s}
+        """, params),
+    ]
+    filters = {"hospital_id": hospital_id, "date_from": date_from, "date_to": date_to}
+    stamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+
+    if req.format == "csv":
+        section = next((s for s in sections if s.name == req.section), None)
+        if not section:
+            raise HTTPException(status_code=400, detail=f"csv 는 section 지정 필요: {[s.name for s in sections]}")
+        return export_response(
+            csv_stream(section, req.cursor), "csv", f"welno_{section.name}_{stamp}.csv", req.gzip,
+        )
+    if req.format == "ndjson":
+        return export_response(
+            ndjson_stream(sections, {"exported_at": datetime.utcnow().isoformat(), "filters": filters}, req.cursor),
+            "ndjson", f"welno_export_{stamp}.ndjson", req.gzip,
+        )
 
-    # ── 4) 설문 응답 — dynamic (동적 템플릿) ──
-    survey_dynamic = await db_manager.execute_query(f"""
-        SELECT id, template_id, partner_id, hospital_id,
-               answers, free_comment, respondent_uuid, created_at
-        FROM welno.tb_survey_responses_dynamic
-        WHERE created_at >= %s::date AND created_at < (%s::date + interval '1 day')
-        {h_where_s}
-        ORDER BY created_at DESC
-    """, (date_from, date_to) + h_param)
-    for r in survey_dynamic:
+    def _legacy_row(r: Dict[str, Any]) -> Dict[str, Any]:
         if r.get("created_at"):
             r["created_at"] = str(r["created_at"])
+        return r
 
-    return {
-        "exported_at": datetime.utcnow().isoformat(),
-        "filters": {"hospital_id": hospital_id, "date_from": date_from, "date_to": date_to},
-        "chat_logs": {"count": len(chat_logs), "data": chat_logs},
-        "tagging": {"count": len(tagging_data), "data": tagging_data},
-        "survey_legacy": {"count": len(survey_legacy), "data": survey_legacy},
-        "survey_dynamic": {"count": len(survey_dynamic), "data": survey_dynamic},
-    }
+    head = {"exported_at": datetime.utcnow().isoformat(), "filters": filters}
+    return export_response(
+        json_document_stream(sections, head, row_fn=_legacy_row), "json", f"welno_export_{stamp}.json", req.gzip,
+    )
 
 
 # ─── Analytics (Cross-Analysis) ──────────────────────────
@@ -1309,28 +1130,26 @@ async def analytics(
 
 @router.post("/revisit-candidates")
 async def revisit_candidates(req: RevisitCandidatesRequest):
-    """재방문 후보 목록 — follow_up_needed=true인 세션 + 추천 메시지 (embed 모드 호환: 인증 불필요)"""
-    import json as _json
-
+    """
+    재방문 후보 목록 — welno.tb_revisit_candidate_index 범위 스캔 (embed 모드 호환: 인증 불필요)
+    인덱스는 태그 저장/상담 상태 변경/대화 로그 추가 시 갱신 (chat_tagging_service.refresh_revisit_candidate),
+    main 주기 작업이 전체 재적재로 보정.
+    무거운 상세 필드는 /revisit-candidates/{session_id}/detail 에서 지연 조회 — include_details=true 면 한 번에.
+    """
     conditions: list = []
     params: list = []
 
     if req.filter_type == "user_requested":
-        conditions.append("t.consultation_requested = true")
+        conditions.append("i.consultation_requested = true")
     elif req.filter_type == "ai_recommended":
-        conditions.append("t.follow_up_needed = true")
-        conditions.append("(t.consultation_requested IS NULL OR t.consultation_requested = false)")
-    else:
-        conditions.append("(t.follow_up_needed = true OR t.consultation_requested = true)")
-
-    # seed 테스트 데이터 제외 (session_id가 'seed_'로 시작하는 것)
-    conditions.append("c.session_id NOT LIKE 'seed_%%'")
+        conditions.append("i.follow_up_needed = true")
+        conditions.append("i.consultation_requested = false")
 
     if req.hospital_id:
-        conditions.append("c.hospital_id = %s")
+        conditions.append("i.hospital_id = %s")
         params.append(req.hospital_id)
 
-    conditions.append("c.created_at >= NOW() - interval '%s days'")
+    conditions.append("i.last_chat_at >= NOW() - interval '%s days'")
     params.append(req.days)
 
     where = " AND ".join(conditions)
@@ -1339,114 +1158,39 @@ async def revisit_candidates(req: RevisitCandidatesRequest):
     summary_row = await db_manager.execute_one(
         f"""SELECT
                 COUNT(*) AS total,
-                COUNT(*) FILTER (WHERE t.risk_level = 'high') AS high_risk_count,
-                COALESCE(ROUND(AVG(t.engagement_score)::numeric, 1), 0) AS avg_engagement
-            FROM welno.tb_chat_session_tags t
-            JOIN welno.tb_partner_rag_chat_log c ON c.session_id = t.session_id
+                COUNT(*) FILTER (WHERE i.risk_level = 'high') AS high_risk_count,
+                COALESCE(ROUND(AVG(i.engagement_score)::numeric, 1), 0) AS avg_engagement
+            FROM welno.tb_revisit_candidate_index i
             WHERE {where}""",
         params,
     )
 
-    # 후보 목록 (병원: hospital_prospect_score 정렬, 그 외: engagement_score)
+    # 후보 목록 (sort_score = 병원: hospital_prospect_score, 그 외: engagement_score)
     rows = await db_manager.execute_query(
-        f"""SELECT
-                t.session_id,
-                c.client_info,
-                c.initial_data,
-                t.interest_tags,
-                t.risk_level,
-                t.action_intent,
-                t.follow_up_needed,
-                t.suggested_revisit_messages,
-                t.conversation_summary,
-                t.counselor_recommendations,
-                t.engagement_score,
-                t.buying_signal,
-                t.key_concerns,
-                t.medical_tags,
-                t.lifestyle_tags,
-                t.medical_urgency,
-                t.anxiety_level,
-                t.prospect_type,
-                t.hospital_prospect_score,
-                t.conversation_intent,
-                t.classification_confidence,
-                t.consultation_requested,
-                t.consultation_type,
-                t.consultation_status,
-                t.consultation_consent_at,
-                c.created_at AS last_chat_date,
-                EXTRACT(DAY FROM NOW() - c.created_at)::int AS days_since_chat,
-                COALESCE(pc.config->>'partner_type', 'healthcare') AS partner_type
-            FROM welno.tb_chat_session_tags t
-            JOIN welno.tb_partner_rag_chat_log c ON c.session_id = t.session_id
-            LEFT JOIN welno.tb_partner_config pc
-                ON pc.partner_id = c.partner_id AND pc.is_active = true
+        f"""SELECT i.*,
+                EXTRACT(DAY FROM NOW() - i.last_chat_at)::int AS days_since_chat
+            FROM welno.tb_revisit_candidate_index i
             WHERE {where}
-            ORDER BY
-                CASE WHEN COALESCE(pc.config->>'partner_type', 'healthcare') = 'hospital'
-                     THEN t.hospital_prospect_score ELSE t.engagement_score END
-                DESC NULLS LAST
+            ORDER BY i.sort_score DESC NULLS LAST
             LIMIT %s""",
         params + [req.limit],
     )
 
+    details = await _load_revisit_details([r["session_id"] for r in rows]) if req.include_details and rows else {}
+
+    _action_map = {
+        "needs_visit": "위험수치 확인, 진료 예약 권유",
+        "borderline_worried": "경계수치 상담 권유",
+        "chronic_management": "정기 관리 프로그램 안내",
+        "lifestyle_improvable": "생활습관 개선 정보 제공",
+        "low_engagement": "재참여 유도 메시지 발송",
+        "uncertain": "수동 검토 후 분류 결정",
+    }
+
     candidates = []
     for r in (rows or []):
-        ci = r.get("client_info") or {}
-        if isinstance(ci, str):
-            try:
-                ci = _json.loads(ci)
-            except Exception:
-                ci = {}
-        # initial_data에서 전화번호/검진일 추출
-        _id = r.get("initial_data") or {}
-        if isinstance(_id, str):
-            try:
-                _id = _json.loads(_id)
-            except Exception:
-                _id = {}
-        _pi = _id.get("patient_info") or {} if isinstance(_id, dict) else {}
-        _hm = _id.get("health_metrics") or {} if isinstance(_id, dict) else {}
-        user_phone = _pi.get("contact") or ci.get("patient_contact", "")
-        checkup_date = _hm.get("checkup_date", "")
-        it = r.get("interest_tags") or []
-        if isinstance(it, str):
-            try:
-                it = _json.loads(it)
-            except Exception:
-                it = []
-        cr = r.get("counselor_recommendations") or []
-        if isinstance(cr, str):
-            try:
-                cr = _json.loads(cr)
-            except Exception:
-                cr = []
-        kc = r.get("key_concerns") or []
-        if isinstance(kc, str):
-            try:
-                kc = _json.loads(kc)
-            except Exception:
-                kc = []
-        msgs = r.get("suggested_revisit_messages") or {}
-        if isinstance(msgs, str):
-            try:
-                msgs = _json.loads(msgs)
-            except Exception:
-                msgs = {}
-        # 병원 전용 JSONB 파싱
-        mt = r.get("medical_tags") or []
-        if isinstance(mt, str):
-            try:
-                mt = _json.loads(mt)
-            except Exception:
-                mt = []
-        lt = r.get("lifestyle_tags") or []
-        if isinstance(lt, str):
-            try:
-                lt = _json.loads(lt)
-            except Exception:
-                lt = []
+        it = _parse_jsonb(r.get("interest_tags"), [])
+        mt = _parse_jsonb(r.get("medical_tags"), [])
         # 통합 필드 계산
         _interest_topics = set()
         for tag in it:
@@ -1461,46 +1205,32 @@ async def revisit_candidates(req: RevisitCandidatesRequest):
         eng = r.get("engagement_score") or 0
         eng_level = "high" if eng >= 60 else "medium" if eng >= 25 else "low"
 
-        pt = r.get("prospect_type", "low_engagement")
-        _action_map = {
-            "needs_visit": "위험수치 확인, 진료 예약 권유",
-            "borderline_worried": "경계수치 상담 권유",
-            "chronic_management": "정기 관리 프로그램 안내",
-            "lifestyle_improvable": "생활습관 개선 정보 제공",
-            "low_engagement": "재참여 유도 메시지 발송",
-            "uncertain": "수동 검토 후 분류 결정",
-        }
+        pt = r.get("prospect_type")
 
         conf = r.get("classification_confidence")
         conf_label = "low" if conf and conf < 0.7 else "high"
 
-        candidates.append({
+        candidate = {
             "session_id": r["session_id"],
-            "patient_name": ci.get("patient_name") or ci.get("name", ""),
-            "hospital_name": ci.get("hospital_name", ""),
-            "user_phone": user_phone,
-            "checkup_date": checkup_date,
-            "health_metrics": _hm if _hm else None,
+            "patient_name": r.get("patient_name") or "",
+            "hospital_name": r.get("hospital_name") or "",
+            "user_phone": r.get("user_phone") or "",
+            "checkup_date": r.get("checkup_date") or "",
             "interest_tags": it,
             "risk_level": r.get("risk_level"),
             "action_intent": r.get("action_intent"),
             "follow_up_needed": r.get("follow_up_needed"),
-            "message_variants": msgs,
-            "conversation_summary": r.get("conversation_summary"),
-            "counselor_recommendations": cr,
-            "key_concerns": kc,
             "engagement_score": eng,
             "buying_signal": r.get("buying_signal"),
             "days_since_chat": r.get("days_since_chat", 0),
-            "last_chat_date": str(r["last_chat_date"])[:10] if r.get("last_chat_date") else None,
+            "last_chat_date": str(r["last_chat_at"])[:10] if r.get("last_chat_at") else None,
             # 병원 전용 필드
             "medical_tags": mt,
-            "lifestyle_tags": lt,
             "medical_urgency": r.get("medical_urgency"),
             "anxiety_level": r.get("anxiety_level"),
             "prospect_type": pt,
             "hospital_prospect_score": r.get("hospital_prospect_score"),
-            "partner_type": r.get("partner_type", "healthcare"),
+            "partner_type": r.get("partner_type") or "healthcare",
             # Phase H 통합 필드
             "conversation_intent": r.get("conversation_intent", "health_question"),
             "health_concerns": health_concerns,
@@ -1512,7 +1242,10 @@ async def revisit_candidates(req: RevisitCandidatesRequest):
             "consultation_type": r.get("consultation_type"),
             "consultation_status": r.get("consultation_status"),
             "consultation_consent_at": str(r["consultation_consent_at"])[:19] if r.get("consultation_consent_at") else None,
-        })
+        }
+        if r["session_id"] in details:
+            candidate.update(details[r["session_id"]])
+        candidates.append(candidate)
 
     return {
         "total": summary_row["total"] if summary_row else 0,
@@ -1522,6 +1255,58 @@ async def revisit_candidates(req: RevisitCandidatesRequest):
     }
 
 
+def _parse_jsonb(value, default):
+    """JSONB 컬럼 값 — 문자열로 저장된 경우까지 파싱"""
+    if value is None:
+        return default
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except Exception:
+            return default
+    return value
+
+
+async def _load_revisit_details(session_ids: List[str]) -> Dict[str, dict]:
+    """재방문 후보 상세(추천 메시지/요약/상담사 추천/우려사항/생활습관 태그/검진 수치) — session_id 별"""
+    rows = await db_manager.execute_query(
+        """SELECT DISTINCT ON (t.session_id)
+                t.session_id,
+                t.suggested_revisit_messages,
+                t.conversation_summary,
+                t.counselor_recommendations,
+                t.key_concerns,
+                t.lifestyle_tags,
+                c.initial_data->'health_metrics' AS health_metrics
+            FROM welno.tb_chat_session_tags t
+            JOIN welno.tb_partner_rag_chat_log c ON c.session_id = t.session_id
+            WHERE t.session_id = ANY(%s)
+            ORDER BY t.session_id, c.created_at DESC""",
+        (list(session_ids),),
+    )
+    details = {}
+    for r in rows:
+        hm = _parse_jsonb(r.get("health_metrics"), {})
+        details[r["session_id"]] = {
+            "message_variants": _parse_jsonb(r.get("suggested_revisit_messages"), {}) or {},
+            "conversation_summary": r.get("conversation_summary"),
+            "counselor_recommendations": _parse_jsonb(r.get("counselor_recommendations"), []) or [],
+            "key_concerns": _parse_jsonb(r.get("key_concerns"), []) or [],
+            "lifestyle_tags": _parse_jsonb(r.get("lifestyle_tags"), []) or [],
+            "health_metrics": hm if isinstance(hm, dict) and hm else None,
+        }
+    return details
+
+
+@router.post("/revisit-candidates/{session_id}/detail")
+async def revisit_candidate_detail(session_id: str):
+    """재방문 후보 상세 필드 지연 조회 (embed 모드 호환: 인증 불필요)"""
+    details = await _load_revisit_details([session_id])
+    if session_id not in details:
+        raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다")
+    return {"session_id": session_id, **details[session_id]}
+
+
 @router.post("/revisit-candidates/{session_id}/messages")
 async def revisit_chat_messages(session_id: str):
     """재방문 후보의 채팅 메시지 + 세션 분석 데이터 (embed 모드 호환: 인증 불필요)"""
@@ -1767,6 +1552,8 @@ async def consultation_request(req: ConsultationRequest):
            WHERE session_id = %s""",
         (req.consultation_type, req.session_id),
     )
+    from ....services.chat_tagging_service import refresh_revisit_candidate
+    await refresh_revisit_candidate(req.session_id)
 
     return {"status": "ok", "session_id": req.session_id, "consultation_type": req.consultation_type}
 
@@ -1785,6 +1572,8 @@ async def consultation_status(req: ConsultationStatusRequest):
     )
     if not result:
         raise HTTPException(status_code=404, detail="상담 요청을 찾을 수 없습니다")
+    from ....services.chat_tagging_service import refresh_revisit_candidate
+    await refresh_revisit_candidate(req.session_id)
 
     return {"status": "ok", "session_id": req.session_id, "new_status": req.status}
 
@@ -1799,7 +1588,7 @@ class PersonaSummaryRequest(BaseModel):
     date_to: Optional[str] = None
 
 
-@router.post("/persona-analytics/summary")
+@router.post("/persona-analytics/summary", dependencies=[Depends(db_workload("analytics"))])
 async def persona_analytics_summary(req: PersonaSummaryRequest):
     """페르소나 분포 + 위험도 집계"""
     where = ["status = 'step2_completed'", "design_result IS NOT NULL"]
@@ -1852,7 +1641,7 @@ class PersonaPatientsRequest(BaseModel):
     limit: int = 20
 
 
-@router.post("/persona-analytics/patients")
+@router.post("/persona-analytics/patients", dependencies=[Depends(db_workload("analytics"))])
 async def persona_analytics_patients(req: PersonaPatientsRequest):
     """페르소나별 환자 목록 (필터, 페이징)"""
     where = ["d.status = 'step2_completed'", "d.design_result IS NOT NULL"]
@@ -1902,7 +1691,7 @@ async def persona_analytics_patients(req: PersonaPatientsRequest):
     return {"success": True, "total": total, "page": req.page, "patients": rows}
 
 
-@router.get("/persona-analytics/patient/{request_id}")
+@router.get("/persona-analytics/patient/{request_id}", dependencies=[Depends(db_workload("analytics"))])
 async def persona_analytics_patient_detail(request_id: int):
     """개별 검진설계 결과 상세"""
     rows = await db_manager.execute_query(
@@ -2502,6 +2291,8 @@ from ....services.campaigns import (
     get_kakao_templates,
     get_template_variables,
     send_campaign_messages,
+    start_campaign_dispatch,
+    get_dispatch_status,
     send_test_message,
     get_alimtalk_history,
     get_alimtalk_status,
@@ -2536,11 +2327,22 @@ async def alimtalk_template_variables(template_code: str):
 
 class AlimtalkSendRequest(BaseModel):
     recipients: list  # [{phone, hospital_id?, variables?, message: {template_code, content, attachment?}}]
+    background: bool = False  # True면 즉시 job_id 반환, 진행률은 /alimtalk/dispatch/{job_id}
 
 
 @router.post("/alimtalk/campaigns/{campaign_id}/send")
 async def alimtalk_campaign_send(campaign_id: str, req: AlimtalkSendRequest):
-    """캠페인 알림톡 발송 (MZSENDTRAN INSERT)"""
+    """캠페인 알림톡 발송 (MZSENDTRAN 일괄 INSERT)"""
+    if req.background:
+        async def _log_order(data: Dict[str, Any]) -> None:
+            if data.get('success_count', 0) > 0:
+                await save_order_log(db_manager, campaign_id, data['success_count'])
+
+        job_id = start_campaign_dispatch(
+            db_manager, campaign_id, req.recipients, on_complete=_log_order,
+        )
+        return {"success": True, "job_id": job_id, "total": len(req.recipients)}
+
     ok, data = await send_campaign_messages(
         db_manager, campaign_id, req.recipients,
     )
@@ -2561,6 +2363,15 @@ class AlimtalkTestRequest(BaseModel):
     attachment: Optional[str] = None
 
 
+@router.get("/alimtalk/dispatch/{job_id}")
+async def alimtalk_dispatch_status(job_id: str):
+    """백그라운드 캠페인 발송 진행 상태 (stage: prefetch → patients → links → send)"""
+    status = get_dispatch_status(job_id)
+    if not status:
+        raise HTTPException(status_code=404, detail="발송 작업 없음")
+    return {"success": True, **status}
+
+
 @router.post("/alimtalk/test-send")
 async def alimtalk_test_send(req: AlimtalkTestRequest):
     """테스트 알림톡 발송"""
@@ -3125,9 +2936,10 @@ async def _fetch_report_for_ai(uuid: str, hospital_id: str) -> dict:
     health_data = detail.get("health_data") or {}
     engine_patient = to_engine_patient(health_data, age=age, sex=sex)
     try:
-        result = EngineFacade().run(
+        result = await EngineFacade().arun(
             name=detail.get("name") or "익명",
             patient=engine_patient,
+            with_nutrition=False,
         )
     except Exception as exc:
         logger.exception("AI summary: 엔진 실행 실패 uuid=%s: %s", uuid, exc)
@@ -3302,6 +3114,55 @@ class SimulateResponse(BaseModel):
     engine_version: str
 
 
+class GridRange(BaseModel):
+    """그리드 축 범위 — start 부터 stop 까지 (stop 포함) step 간격."""
+    start: float
+    stop: float
+    step: float = Field(..., gt=0)
+
+    class Config:
+        extra = "forbid"
+
+    def values(self) -> List[float]:
+        if self.stop < self.start:
+            return []
+        n = int((self.stop - self.start) / self.step + 1e-9) + 1
+        return [round(self.start + i * self.step, 2) for i in range(n)]
+
+
+class SimulateGridRequest(BaseModel):
+    """simulate 축별 범위/후보 — 데카르트 곱 전체를 한 번에 계산. bmi_target 과 weight_delta_kg 는 택1."""
+    bmi_target: Optional[GridRange] = None
+    weight_delta_kg: Optional[GridRange] = None
+    smoking_target: List[Optional[Literal["current", "quit"]]] = Field(default_factory=lambda: [None])
+    drinking_target: List[Optional[Literal["none"]]] = Field(default_factory=lambda: [None])
+    time_horizon_months: List[Literal[0, 6, 12, 60]] = Field(default_factory=lambda: [0])
+    exercise_target: Optional[Literal["none", "light", "moderate", "active"]] = None
+    diet_target: Optional[Literal["high_sodium", "moderate", "low_sodium"]] = None
+    force: bool = False
+
+    class Config:
+        extra = "forbid"
+
+
+class SimulateGridResponse(BaseModel):
+    uuid: str
+    hospital_id: str
+    input_digest: str
+    order: List[str]
+    shape: List[int]
+    axes: Dict[str, list]
+    diseases: List[str]
+    orig_ratios: Dict[str, float]
+    ratios: Dict[str, List[float]]
+    improved_sbp: List[List[float]]
+    improved_dbp: List[List[float]]
+    improved_fbg: List[float]
+    cached: bool
+    generated_at: str
+    engine_version: str
+
+
 def _patient_signature(patient: dict) -> str:
     """시뮬레이션 영향 필드만 추출해 sha256 지문 생성."""
     sig_fields = (
@@ -3314,8 +3175,8 @@ def _patient_signature(patient: dict) -> str:
     return hashlib.sha256(raw.encode()).hexdigest()[:16]
 
 
-def _compute_simulate_digest(body: SimulateRequest, patient: dict) -> str:
-    """request body + patient 지문 → sha256 digest (prefix 16자)."""
+def _compute_simulate_digest(body: BaseModel, patient: dict) -> str:
+    """request body (SimulateRequest / SimulateGridRequest) + patient 지문 → sha256 digest (prefix 16자)."""
     payload = {
         "body": body.dict(exclude={"force"}, exclude_none=True),
         "patient_sig": _patient_signature(patient),
@@ -3352,7 +3213,7 @@ async def _sim_get_cached(uuid: str, hospital_id: str, digest: str) -> Optional[
 async def _sim_upsert(uuid: str, hospital_id: str, digest: str, input_dict: dict, result: dict) -> None:
     """welno_mediarc_simulations UPSERT (실패해도 응답 반환 — fail-open)."""
     try:
-        await db_manager.execute_query(
+        await db_manager.execute_update(
             """
             INSERT INTO welno.welno_mediarc_simulations
                 (patient_uuid, hospital_id, input_digest, input_json, result_json, engine_version, generated_at, updated_at)
@@ -3407,7 +3268,7 @@ async def _report_get_cached(uuid: str, hospital_id: str) -> Optional[dict]:
 async def _report_upsert(uuid: str, hospital_id: str, digest: str, result: dict) -> None:
     """welno_mediarc_report_cache UPSERT (fail-open)."""
     try:
-        await db_manager.execute_query(
+        await db_manager.execute_update(
             """
             INSERT INTO welno.welno_mediarc_report_cache
                 (patient_uuid, hospital_id, input_digest, result_json, engine_version, generated_at, updated_at)
@@ -3424,6 +3285,87 @@ async def _report_upsert(uuid: str, hospital_id: str, digest: str, result: dict)
         logger.warning("report_cache: UPSERT 실패 uuid=%s: %s", uuid, exc)
 
 
+# 2단계 전달: 백그라운드 nutrition 완료 시 같은 input_digest 캐시 행에만 반영
+_REPORT_NUTRITION_SQL = """
+    UPDATE welno.welno_mediarc_report_cache
+    SET result_json = result_json
+            || jsonb_build_object('nutrition', %s::jsonb, 'nutrition_status', 'ready'),
+        updated_at = NOW()
+    WHERE patient_uuid = %s AND hospital_id = %s AND input_digest = %s
+"""
+
+_REPORT_NUTRITION_STATE_SQL = """
+    SELECT result_json->'nutrition' AS nutrition,
+           result_json->>'nutrition_status' AS nutrition_status,
+           result_json->'diseases' AS diseases
+    FROM welno.welno_mediarc_report_cache
+    WHERE patient_uuid = %s AND hospital_id = %s AND input_digest = %s
+    LIMIT 1
+"""
+
+# 롱폴링/SSE 대기 상한 (초)
+NUTRITION_WAIT_MAX_SEC = 25
+
+
+def _start_report_nutrition(
+    uuid: str, hospital_id: str, digest: str, name: str, engine_patient: dict, diseases: dict,
+):
+    """nutrition 백그라운드 작업 시작 (같은 uuid+digest 진행 중이면 그 작업 재사용)."""
+
+    async def _save(nutrition):
+        await db_manager.execute_update(
+            _REPORT_NUTRITION_SQL,
+            (json.dumps(nutrition, ensure_ascii=False), uuid, hospital_id, digest),
+        )
+
+    return _nutrition_jobs_mod.nutrition_jobs.start(
+        (uuid, digest),
+        lambda: EngineFacade().anutrition(name, engine_patient, diseases),
+        on_done=_save,
+    )
+
+
+async def _report_nutrition_state(uuid: str, digest: str, wait: float = 0) -> dict:
+    """{status, nutrition, input_digest} — 진행 중 작업 → 캐시 행 순으로 확인.
+
+    이 프로세스에 작업이 없는데(PM2 재시작·리로드, 다른 워커) 캐시 행이 아직 pending 이면
+    캐시 행의 질환 블록으로 작업을 다시 시작한다.
+    status: ready / pending / failed / missing (missing = 캐시 행 없음 또는 검진 데이터 변경 → 리포트 재조회 필요)
+    """
+    jobs = _nutrition_jobs_mod.nutrition_jobs
+    wait = min(max(wait, 0), NUTRITION_WAIT_MAX_SEC)
+    status, nutrition = await jobs.wait((uuid, digest), wait)
+    if status != _nutrition_jobs_mod.MISSING:
+        return {"status": status, "nutrition": nutrition, "input_digest": digest}
+
+    try:
+        detail = await mediarc_patient_detail(uuid)
+        hospital_id = detail.get('hospital_id') or ''
+        row = await db_manager.execute_one(_REPORT_NUTRITION_STATE_SQL, (uuid, hospital_id, digest))
+    except HTTPException:
+        detail, row = None, None
+    except Exception as exc:
+        logger.warning("report_cache: nutrition 상태 조회 실패 uuid=%s: %s", uuid, exc)
+        detail, row = None, None
+
+    if row and row.get("nutrition_status") != _nutrition_jobs_mod.PENDING:
+        status, nutrition = _nutrition_jobs_mod.READY, row.get("nutrition")
+    elif row:
+        health_data = detail.get('health_data') or {}
+        if _compute_report_digest(health_data) == digest:
+            engine_patient = to_engine_patient(
+                health_data,
+                age=_calc_age(detail.get('birth_date') or ''),
+                sex=_normalize_sex(detail.get('gender') or ''),
+            )
+            logger.info("report_cache: nutrition 작업 재시작 (프로세스에 작업 없음) uuid=%s", uuid)
+            _start_report_nutrition(
+                uuid, hospital_id, digest, detail.get('name') or '익명', engine_patient, row.get("diseases") or {},
+            )
+            status, nutrition = await jobs.wait((uuid, digest), wait)
+    return {"status": status, "nutrition": nutrition, "input_digest": digest}
+
+
 def _build_ratio_table(engine_patient: dict, disease_results: dict) -> dict:
     """FE 클라이언트 경량 계산용 ratio_table 빌드.
 
@@ -3493,9 +3435,10 @@ async def _fetch_engine_patient_and_disease_results(uuid: str, hospital_id: str)
     health_data = detail.get("health_data") or {}
     engine_patient = to_engine_patient(health_data, age=age, sex=sex)
     try:
-        raw = EngineFacade().run(
+        raw = await EngineFacade().arun(
             name=detail.get("name") or "익명",
             patient=engine_patient,
+            with_nutrition=False,
         )
     except Exception as exc:
         logger.exception("simulate: 엔진 실행 실패 uuid=%s: %s", uuid, exc)
@@ -3574,15 +3517,101 @@ async def post_simulate(
     return SimulateResponse(**payload)
 
 
+@router.post("/mediarc-report/{uuid}/simulate/grid", response_model=SimulateGridResponse)
+async def post_simulate_grid(
+    uuid: str,
+    body: SimulateGridRequest,
+    hospital_id: str = Query(default=""),
+):
+    """마일스톤 시뮬레이션 그리드 — 슬라이더 위치마다 simulate 를 부르는 대신 1회 호출.
+
+    bmi_target(또는 weight_delta_kg) 범위 × smoking_target × drinking_target × time_horizon_months
+    전체 칸을 compute_milestone_grid 로 한 번에 계산한다. ratios[질환] 은 shape 순서
+    (bmi, smoking, drinking, time) row-major 평탄 배열 — FE 가 BMI 축으로 보간해 즉시 표시.
+    각 칸 값은 같은 조합의 /simulate ratios 와 같다. 결과는 simulate 와 같은 캐시 테이블에 저장.
+    """
+    logger.info(
+        "simulate_grid: 요청 수신 uuid=%s hospital_id=%s grid=%s",
+        uuid, hospital_id, body.dict(exclude={"force"}, exclude_none=True),
+    )
+    _engine_guard()
+    if body.bmi_target is not None and body.weight_delta_kg is not None:
+        raise HTTPException(status_code=400, detail="bmi_target 과 weight_delta_kg 범위는 함께 쓸 수 없습니다")
+    bmi_targets = body.bmi_target.values() if body.bmi_target else None
+    weight_deltas = body.weight_delta_kg.values() if body.weight_delta_kg else None
+    if bmi_targets is not None and not all(15.0 <= b <= 45.0 for b in bmi_targets):
+        raise HTTPException(status_code=400, detail="bmi_target 범위는 15.0~45.0 이어야 합니다")
+    if weight_deltas is not None and not all(0.0 <= d <= 100.0 for d in weight_deltas):
+        raise HTTPException(status_code=400, detail="weight_delta_kg 범위는 0~100 이어야 합니다")
+
+    patient, disease_results = await _fetch_engine_patient_and_disease_results(uuid, hospital_id)
+
+    digest = _compute_simulate_digest(body, patient)
+
+    if not body.force:
+        cached = await _sim_get_cached(uuid, hospital_id, digest)
+        if cached:
+            return SimulateGridResponse(
+                **cached,
+                uuid=uuid,
+                hospital_id=hospital_id,
+                input_digest=digest,
+                cached=True,
+                engine_version="v1",
+            )
+
+    try:
+        from ....services.report_engine.engine import compute_milestone_grid
+        grid = compute_milestone_grid(
+            patient,
+            disease_results,
+            bmi_targets=bmi_targets,
+            weight_deltas=weight_deltas,
+            smoking_targets=body.smoking_target,
+            drinking_targets=body.drinking_target,
+            time_horizons=body.time_horizon_months,
+            exercise_target=body.exercise_target,
+            diet_target=body.diet_target,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except Exception as exc:
+        logger.exception("simulate_grid 실패 uuid=%s", uuid)
+        raise HTTPException(status_code=500, detail=f"시뮬레이션 그리드 실패: {exc}")
+
+    payload = {**grid, "generated_at": datetime.utcnow().isoformat()}
+    await _sim_upsert(uuid, hospital_id, digest, body.dict(), payload)
+
+    return SimulateGridResponse(
+        **payload,
+        uuid=uuid,
+        hospital_id=hospital_id,
+        input_digest=digest,
+        cached=False,
+        engine_version="v1",
+    )
+
+
 @router.get("/mediarc-report/{uuid}")
-async def mediarc_report_alias(uuid: str):
-    """FE 호환 alias — 엔진 실행 + ReportData 스키마 반환 (DB 캐싱 적용)"""
+async def mediarc_report_alias(
+    uuid: str,
+    progressive: bool = Query(False, description="엔진 블록 먼저 반환, nutrition 은 /nutrition 폴링·SSE 로"),
+):
+    """FE 호환 alias — 엔진 실행 + ReportData 스키마 반환 (DB 캐싱 적용)
+
+    progressive=1: nutrition=None, nutrition_status="pending" 으로 즉시 반환하고
+    nutrition 은 백그라운드 생성 → GET /mediarc-report/{uuid}/nutrition?digest=input_digest
+    (또는 /nutrition/stream SSE) 로 받는다. 끝나면 캐시 행에도 반영.
+    """
     _engine_guard()
     detail = await mediarc_patient_detail(uuid)  # 기존 함수 재사용 (404 포함)
 
     health_data = detail.get('health_data') or {}
     digest = _compute_report_digest(health_data)
     hospital_id = detail.get('hospital_id') or ''
+    name = detail.get('name') or '익명'
+    age = _calc_age(detail.get('birth_date') or '')
+    sex = _normalize_sex(detail.get('gender') or '')
 
     # 캐시 체크
     cached = await _report_get_cached(uuid, hospital_id)
@@ -3591,17 +3620,26 @@ async def mediarc_report_alias(uuid: str):
         resp['cached'] = True
         gen_at = cached['generated_at']
         resp['generated_at'] = gen_at.isoformat() if hasattr(gen_at, 'isoformat') else str(gen_at or '')
+        resp['input_digest'] = digest
+        if resp.get('nutrition_status') == _nutrition_jobs_mod.PENDING:
+            # 엔진 블록만 캐시된 상태 — 작업이 없으면(재시작 등) 다시 시작
+            engine_patient = to_engine_patient(health_data, age=age, sex=sex)
+            task = _start_report_nutrition(
+                uuid, hospital_id, digest, name, engine_patient, resp.get('diseases', {}),
+            )
+            if not progressive:
+                resp['nutrition'] = await task
+                resp['nutrition_status'] = _nutrition_jobs_mod.READY
         return resp
 
     # 캐시 miss 또는 데이터 변경 → 엔진 실행
-    age = _calc_age(detail.get('birth_date') or '')
-    sex = _normalize_sex(detail.get('gender') or '')
     engine_patient = to_engine_patient(health_data, age=age, sex=sex)
 
     try:
-        result = EngineFacade().run(
-            name=detail.get('name') or '익명',
+        result = await EngineFacade().arun(
+            name=name,
             patient=engine_patient,
+            with_nutrition=not progressive,
         )
     except Exception as exc:
         logger.exception("엔진 실행 실패 uuid=%s: %s", uuid, exc)
@@ -3622,7 +3660,7 @@ async def mediarc_report_alias(uuid: str):
     ratio_table = _build_ratio_table(engine_patient, disease_results_for_rt)
 
     response = {
-        "name": detail.get('name') or '익명',
+        "name": name,
         "age": age,
         "sex": sex,
         "group": result.get('group'),
@@ -3630,6 +3668,8 @@ async def mediarc_report_alias(uuid: str):
         "rank": result.get('rank'),
         "diseases": result.get('diseases', {}),
         "nutrition": result.get('nutrition', {}),
+        "nutrition_status": _nutrition_jobs_mod.PENDING if progressive else _nutrition_jobs_mod.READY,
+        "input_digest": digest,
         "gauges": result.get('gauges', {}),
         # Phase 0: facade 의 improved/disease_ages pass-through
         "improved": result.get('improved', {}),
@@ -3658,4 +3698,46 @@ async def mediarc_report_alias(uuid: str):
     except Exception as exc:
         logger.warning("report_cache: 저장 실패(응답은 반환) uuid=%s: %s", uuid, exc)
 
+    if progressive:
+        # 캐시 행 저장 후 시작 — 완료 시 같은 digest 행의 nutrition 갱신
+        _start_report_nutrition(
+            uuid, hospital_id, digest, name, engine_patient, response['diseases'],
+        )
+
     return response
+
+
+@router.get("/mediarc-report/{uuid}/nutrition")
+async def mediarc_report_nutrition(
+    uuid: str,
+    digest: str = Query(..., description="리포트 응답의 input_digest"),
+    wait: float = Query(0, ge=0, le=NUTRITION_WAIT_MAX_SEC, description="완료까지 최대 대기 초 (롱폴링)"),
+):
+    """progressive 리포트의 nutrition 폴링 — {status, nutrition, input_digest}"""
+    _engine_guard()
+    return await _report_nutrition_state(uuid, digest, wait)
+
+
+@router.get("/mediarc-report/{uuid}/nutrition/stream")
+async def mediarc_report_nutrition_stream(
+    uuid: str,
+    digest: str = Query(..., description="리포트 응답의 input_digest"),
+):
+    """progressive 리포트의 nutrition SSE — 완료 시 event: nutrition 1회 후 종료 (대기 중 keepalive)"""
+    _engine_guard()
+
+    async def _events():
+        # 추천은 최대 30초(RECOMMEND_TIMEOUT_SEC) 후 룰 폴백으로 끝나므로 3회 대기면 충분
+        for _ in range(3):
+            state = await _report_nutrition_state(uuid, digest, NUTRITION_WAIT_MAX_SEC)
+            if state["status"] != _nutrition_jobs_mod.PENDING:
+                yield f"event: nutrition\ndata: {json.dumps(state, ensure_ascii=False)}\n\n"
+                return
+            yield ": keepalive\n\n"
+        yield f"event: nutrition\ndata: {json.dumps({'status': _nutrition_jobs_mod.FAILED, 'nutrition': None, 'input_digest': digest})}\n\n"
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "Connection": "keep-alive"},
+    )
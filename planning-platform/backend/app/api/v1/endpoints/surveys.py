@@ -106,7 +106,7 @@ async def submit_survey(request: Dict[str, Any]) -> Dict[str, Any]:
         try:
             import redis
             from ....core.config import settings
-            redis_url = settings.REDIS_URL if hasattr(settings, 'REDIS_URL') else "redis://10.0.1.10:6379/0"
+            redis_url = settings.redis_url
             redis_client = redis.from_url(redis_url, decode_responses=True)
             redis_client.setex(
                 survey_key,
@@ -123,7 +123,7 @@ async def submit_survey(request: Dict[str, Any]) -> Dict[str, Any]:
             try:
                 import redis
                 from ....core.config import settings
-                redis_url = settings.REDIS_URL if hasattr(settings, 'REDIS_URL') else "redis://10.0.1.10:6379/0"
+                redis_url = settings.redis_url
                 redis_client = redis.from_url(redis_url, decode_responses=True)
                 
                 meta_key = f"welno:rag_chat:metadata:{uuid}:{hospital_id}:{session_id}"
@@ -167,7 +167,7 @@ async def submit_survey(request: Dict[str, Any]) -> Dict[str, Any]:
         try:
             import redis
             from ....core.config import settings
-            redis_url = settings.REDIS_URL if hasattr(settings, 'REDIS_URL') else "redis://10.0.1.10:6379/0"
+            redis_url = settings.redis_url
             redis_client = redis.from_url(redis_url, decode_responses=True)
             redis_client.setex(
                 persona_key,
@@ -1,11 +1,16 @@
 """
 WebSocket을 통한 실시간 인증 상태 알림
+
+notify_* 알림은 fanout(services/ws_fanout.SessionFanout) 으로 보낸다 — 로컬 우선:
+이 워커에 세션 소켓이 있으면 바로 전달하고 발행은 생략, 없을 때만 Redis 채널로 발행해
+소켓을 가진 워커가 전달한다 (sticky 세션 없이 다중 워커 가능).
 """
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from typing import Dict, List
 import json
 import asyncio
 from ....data.redis_session_manager import redis_session_manager as session_manager
+from ....services.ws_fanout import SessionFanout, build_broker
 
 router = APIRouter()
 
@@ -40,6 +45,10 @@ class ConnectionManager:
         return len(self.active_connections)
 
 manager = ConnectionManager()
+# 워커 간 알림 팬아웃 — 리스너는 main.startup_event 에서 시작
+# notify_* 반환값 = fanout.publish 반환값 = 이 워커 소켓 전달 여부
+# (False 면 다른 워커로 발행만 됨 — 그쪽 소켓 전달 여부는 알 수 없음)
+fanout = SessionFanout(build_broker(), manager.send_personal_message)
 
 @router.websocket("/ws/{session_id}")
 async def websocket_endpoint(websocket: WebSocket, session_id: str):
@@ -130,11 +139,11 @@ async def notify_auth_completed(session_id: str, auth_data: dict = None):
         "next_step": "collect_health_data"
     }
     
-    success = await manager.send_personal_message(message, session_id)
+    success = await fanout.publish(session_id, message)
     if success:
         print(f"✅ [WebSocket] 세션 {session_id} 인증 완료 알림 전송됨")
     else:
-        print(f"⚠️ [WebSocket] 세션 {session_id} 연결 없음 - 알림 전송 실패")
+        print(f"⚠️ [WebSocket] 세션 {session_id} 이 워커에 연결 없음 - 다른 워커로 알림 전달 요청")
     
     return success
 
@@ -149,7 +158,7 @@ async def notify_data_collection_progress(session_id: str, progress_type: str, m
         "message": message
     }
     
-    return await manager.send_personal_message(notification, session_id)
+    return await fanout.publish(session_id, notification)
 
 async def notify_error(session_id: str, error_message: str):
     """
@@ -161,7 +170,7 @@ async def notify_error(session_id: str, error_message: str):
         "message": error_message
     }
     
-    return await manager.send_personal_message(notification, session_id)
+    return await fanout.publish(session_id, notification)
 
 async def notify_timeout(session_id: str, timeout_message: str):
     """
@@ -175,7 +184,7 @@ async def notify_timeout(session_id: str, timeout_message: str):
         "retry_available": True
     }
     
-    return await manager.send_personal_message(notification, session_id)
+    return await fanout.publish(session_id, notification)
 
 async def notify_streaming_status(session_id: str, status: str, message: str, data: dict = None):
     """실시간 스트리밍 상태 알림"""
@@ -190,7 +199,7 @@ async def notify_streaming_status(session_id: str, status: str, message: str, da
         "data": data
     }
     
-    success = await manager.send_personal_message(notification, session_id)
+    success = await fanout.publish(session_id, notification)
     if success:
         print(f"📡 [스트리밍] 세션 {session_id} 상태 알림: {status} - {message}")
     return success
@@ -207,7 +216,7 @@ async def notify_session_extended(session_id: str, extend_seconds: int):
         "timestamp": datetime.now().isoformat()
     }
     
-    success = await manager.send_personal_message(notification, session_id)
+    success = await fanout.publish(session_id, notification)
     if success:
         print(f"⏰ [세션연장] 세션 {session_id} 연장 알림: {extend_seconds}초")
     return success
@@ -259,11 +268,11 @@ async def notify_mediarc_completed(session_id: str, report_data: dict):
         }
     }
     
-    success = await manager.send_personal_message(message, session_id)
+    success = await fanout.publish(session_id, message)
     if success:
         print(f"✅ [WebSocket] 세션 {session_id} Mediarc 완료 알림 전송됨")
     else:
-        print(f"⚠️ [WebSocket] 세션 {session_id} 연결 없음 - Mediarc 알림 전송 실패")
+        print(f"⚠️ [WebSocket] 세션 {session_id} 이 워커에 연결 없음 - 다른 워커로 Mediarc 알림 전달 요청")
     
     return success
 
@@ -318,5 +327,6 @@ async def websocket_status():
     """
     return {
         "active_connections": manager.get_connection_count(),
-        "connected_sessions": list(manager.active_connections.keys())
+        "connected_sessions": list(manager.active_connections.keys()),
+        "fanout": fanout.stats(),
     }
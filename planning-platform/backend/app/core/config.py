@@ -111,7 +111,24 @@ class Settings(BaseSettings):
     DB_NAME: str = Field(default="health_check_db", env="DB_NAME")
     DB_USER: str = Field(default="admin", env="DB_USER")
     DB_PASSWORD: str = Field(default="dev_password", env="DB_PASSWORD")
-    
+    DB_APPLICATION_NAME: str = Field(default="welno-api", env="DB_APPLICATION_NAME")  # pg_stat_activity 식별용 접두어
+
+    # 읽기 전용 분석 레플리카 (DB_REPLICA_HOST 빈값이면 분석 쿼리도 primary 사용)
+    DB_REPLICA_HOST: str = Field(default="", env="DB_REPLICA_HOST")
+    DB_REPLICA_PORT: int = Field(default=5432, env="DB_REPLICA_PORT")
+    DB_REPLICA_NAME: str = Field(default="", env="DB_REPLICA_NAME")  # 빈값이면 DB_NAME
+    DB_REPLICA_USER: str = Field(default="", env="DB_REPLICA_USER")  # 빈값이면 DB_USER
+    DB_REPLICA_PASSWORD: str = Field(default="", env="DB_REPLICA_PASSWORD")  # 빈값이면 DB_PASSWORD
+    DB_REPLICA_CONNECT_TIMEOUT: int = Field(default=3, env="DB_REPLICA_CONNECT_TIMEOUT")  # 초
+    DB_REPLICA_RETRY_SECONDS: int = Field(default=30, env="DB_REPLICA_RETRY_SECONDS")  # 연결 실패 후 primary 폴백 유지 시간
+
+    # 워크로드별 statement_timeout(ms) / work_mem — 0 또는 빈값이면 서버 기본값
+    DB_DEFAULT_STATEMENT_TIMEOUT_MS: int = Field(default=0, env="DB_DEFAULT_STATEMENT_TIMEOUT_MS")
+    DB_ANALYTICS_STATEMENT_TIMEOUT_MS: int = Field(default=30000, env="DB_ANALYTICS_STATEMENT_TIMEOUT_MS")
+    DB_ANALYTICS_WORK_MEM: str = Field(default="64MB", env="DB_ANALYTICS_WORK_MEM")
+    DB_EXPORT_STATEMENT_TIMEOUT_MS: int = Field(default=120000, env="DB_EXPORT_STATEMENT_TIMEOUT_MS")
+    DB_EXPORT_WORK_MEM: str = Field(default="128MB", env="DB_EXPORT_WORK_MEM")
+
     # OpenAI 설정
     openai_api_key: str = Field(default="dev-openai-key", env="OPENAI_API_KEY")
     openai_fast_model: str = Field(default="gpt-4o-mini", env="OPENAI_FAST_MODEL")  # STEP 1용 빠른 모델
@@ -135,6 +152,10 @@ class Settings(BaseSettings):
     MEDIARC_API_URL: str = Field(default="https://partner.kindhabit.com/api/external/mediarc/report/", env="MEDIARC_API_URL")
     MEDIARC_API_KEY: str = Field(default="welno_5a9bb40b5108ecd8ef864658d5a2d5ab", env="MEDIARC_API_KEY")
     
+    # 캠페인 리포트 PDF 디스크 캐시 (빈값이면 DATA_DIR/report_cache)
+    campaign_report_cache_dir: str = Field(default="", env="CAMPAIGN_REPORT_CACHE_DIR")
+    campaign_report_cache_max_bytes: int = Field(default=512 * 1024 * 1024, env="CAMPAIGN_REPORT_CACHE_MAX_BYTES")  # 512MB
+
     # WELNO 기본 설정 (동적 조회로 대체 예정)
     welno_default_hospital_id: str = Field(default="PEERNINE", env="WELNO_DEFAULT_HOSPITAL_ID")  # 레거시 호환용, 실제로는 dynamic_config_service 사용
 
@@ -143,6 +164,10 @@ class Settings(BaseSettings):
 
     # Elasticsearch 직접 접근 (유입 퍼널 분석)
     elasticsearch_url: str = Field(default="http://localhost:9200", env="ELASTICSEARCH_URL")
+    # 병원 행동 집계(medilinx-logs-business) ES — 태깅 컨텍스트용 (services/es_service.py)
+    es_business_url: str = Field(default="http://10.0.0.10:9200", env="ES_BUSINESS_URL")
+    es_timeout_sec: float = Field(default=10.0, env="ES_TIMEOUT_SEC")
+    es_max_connections: int = Field(default=20, env="ES_MAX_CONNECTIONS")
 
     # Slack 설정
     slack_webhook_url: Optional[str] = Field(None, env="SLACK_WEBHOOK_URL")
@@ -154,9 +179,27 @@ class Settings(BaseSettings):
 
     # Phase 3: 검진설계 파이프라인 버전 (v2=2-step, v3=3-step legacy)
     checkup_design_pipeline_version: str = Field(default="v2", env="CHECKUP_PIPELINE_VERSION")
+    # STEP 2 분기별 타임아웃 (2-1 Priority 1 / 2-2 Upselling 은 동시 실행)
+    checkup_design_step2_1_timeout_sec: float = Field(default=90.0, env="CHECKUP_STEP2_1_TIMEOUT_SEC")
+    checkup_design_step2_2_timeout_sec: float = Field(default=120.0, env="CHECKUP_STEP2_2_TIMEOUT_SEC")
+    # 환자 컨텍스트(환자/병원/건강/처방 조회 묶음) 요청 간 캐시 — 0 이면 요청 안에서만 공유
+    checkup_patient_context_ttl_sec: float = Field(default=60.0, env="CHECKUP_PATIENT_CONTEXT_TTL_SEC")
 
     # Redis
     redis_url: str = Field(default="redis://10.0.1.10:6379/0", env="REDIS_URL")
+    # 틸코 인증 WebSocket 알림 워커 간 팬아웃 (services/ws_fanout.py) — False 면 프로세스 안에서만 전달
+    ws_fanout_enabled: bool = Field(default=True, env="WELNO_WS_FANOUT_ENABLED")
+    ws_fanout_channel: str = Field(default="welno:ws:tilko", env="WELNO_WS_FANOUT_CHANNEL")
+    # 요청별 지연 분해 (core/tracing.py) — Server-Timing 헤더 + 샘플링된 JSON 로그
+    tracing_enabled: bool = Field(default=True, env="WELNO_TRACING_ENABLED")
+    tracing_log_sample_rate: float = Field(default=0.01, env="WELNO_TRACING_LOG_SAMPLE_RATE")
+    tracing_slow_ms: int = Field(default=3000, env="WELNO_TRACING_SLOW_MS")  # 이 이상은 샘플링 무관 항상 로그
+    # RAG 채팅 시맨틱 답변 캐시 (services/semantic_answer_cache.py) — opt-in, 첫 메시지의 일반 질문만
+    rag_semantic_cache_enabled: bool = Field(default=False, env="WELNO_RAG_SEMANTIC_CACHE_ENABLED")
+    # 질문 임베딩 코사인 유사도 하한 (ada-002 는 무관한 문장도 0.7~0.8 → 사실상 같은 질문만 통과하도록 높게)
+    rag_semantic_cache_threshold: float = Field(default=0.97, env="WELNO_RAG_SEMANTIC_CACHE_THRESHOLD")
+    rag_semantic_cache_ttl_sec: int = Field(default=86400, env="WELNO_RAG_SEMANTIC_CACHE_TTL_SEC")
+    rag_semantic_cache_max_entries: int = Field(default=500, env="WELNO_RAG_SEMANTIC_CACHE_MAX_ENTRIES")  # 범위(scope)당
 
     # LLM Quota (엔드포인트별 일별/시간별 호출 상한)
     llm_quota_chat_tagging_daily: int = Field(default=2000, env="WELNO_LLM_QUOTA_CHAT_TAGGING_DAILY")
@@ -164,6 +207,21 @@ class Settings(BaseSettings):
     llm_quota_checkup_design_daily: int = Field(default=1000, env="WELNO_LLM_QUOTA_CHECKUP_DESIGN_DAILY")
     llm_quota_hourly_multiplier: float = Field(default=0.15, env="WELNO_LLM_QUOTA_HOURLY_MULTIPLIER")
 
+    # 태깅 작업 큐 (services/tagging_queue.py) — retag 백로그를 chat_tagging quota 안에서 병렬 처리
+    tagging_queue_enabled: bool = Field(default=True, env="WELNO_TAGGING_QUEUE_ENABLED")
+    tagging_queue_workers: int = Field(default=4, env="WELNO_TAGGING_QUEUE_WORKERS")
+    # chat_tagging 시간당 상한 중 큐가 쓸 비율 (나머지는 실시간 대화 태깅 몫)
+    tagging_queue_quota_share: float = Field(default=0.5, env="WELNO_TAGGING_QUEUE_QUOTA_SHARE")
+    # 세션 1건당 LLM 호출 수 (분석 + 재방문 메시지)
+    tagging_queue_calls_per_session: int = Field(default=2, env="WELNO_TAGGING_QUEUE_CALLS_PER_SESSION")
+    tagging_queue_max_attempts: int = Field(default=5, env="WELNO_TAGGING_QUEUE_MAX_ATTEMPTS")
+    tagging_queue_backoff_base_sec: int = Field(default=60, env="WELNO_TAGGING_QUEUE_BACKOFF_BASE_SEC")
+    tagging_queue_stale_sec: int = Field(default=900, env="WELNO_TAGGING_QUEUE_STALE_SEC")
+    # 배치 LLM 태깅 — 짧은 세션을 요청 1건에 최대 N개 묶음 (1 이면 세션별 단건 호출)
+    chat_tagging_batch_size: int = Field(default=4, env="WELNO_CHAT_TAGGING_BATCH_SIZE")
+    # 재방문 후보 인덱스 주기적 전체 재적재 (파트너 유형 변경·누락된 건별 갱신 보정) — 0 이면 끔
+    revisit_index_rebuild_interval_sec: int = Field(default=86400, env="WELNO_REVISIT_INDEX_REBUILD_INTERVAL_SEC")
+
     # LLM 비용 cap (USD/일) — 4월 100만원 사고 재발 방지
     # 5/3~5/4 정상 트래픽 = $0.009/일. cap $5 = 정상 555배. cap $20 = 4월 사고 직전 차단.
     llm_cost_cap_warn_usd: float = Field(default=5.0, env="WELNO_LLM_COST_CAP_WARN_USD")
@@ -1,17 +1,104 @@
 """
 데이터베이스 연결 및 설정 모듈
+
+워크로드 라우팅:
+  default   — 환자 채팅/인증 등 일반 트래픽 (primary)
+  analytics — 백오피스 대시보드/통계 (레플리카 우선, 짧은 statement_timeout)
+  export    — 대량 내보내기 (레플리카 우선, 긴 statement_timeout, 큰 work_mem)
+
+라우트에 dependencies=[Depends(db_workload("analytics"))]로 선언하면 해당 요청 안의
+db_manager 읽기 쿼리가 선언된 워크로드 설정으로 연결된다. 레플리카 미설정/장애 시 primary로 폴백.
+쓰기(execute_update, 커밋하는 execute_one — INSERT/UPDATE RETURNING)는 선언과 무관하게
+항상 primary default 설정을 사용한다 (분석/내보내기 연결은 read-only 세션이거나 레플리카).
 """
 
 import psycopg2
 import psycopg2.extras
 import logging
+import time
+import threading
+from contextvars import ContextVar
+from dataclasses import dataclass
 from typing import Optional, Dict, Any, List
 from contextlib import contextmanager
 import os
 from ..core.config import settings
+from .tracing import span
 
 logger = logging.getLogger(__name__)
 
+
+@dataclass(frozen=True)
+class DBWorkload:
+    """워크로드별 연결 설정"""
+    name: str
+    use_replica: bool = False
+    statement_timeout_ms: int = 0
+    work_mem: str = ""
+    read_only: bool = False
+
+    def session_options(self) -> str:
+        """libpq options 문자열 (연결 시 1회 적용 — 추가 왕복 없음)"""
+        opts = []
+        if self.statement_timeout_ms > 0:
+            opts.append(f"-c statement_timeout={int(self.statement_timeout_ms)}")
+        if self.work_mem:
+            opts.append(f"-c work_mem={self.work_mem}")
+        if self.read_only:
+            opts.append("-c default_transaction_read_only=on")
+        return " ".join(opts)
+
+
+WORKLOADS: Dict[str, DBWorkload] = {
+    "default": DBWorkload("default", statement_timeout_ms=settings.DB_DEFAULT_STATEMENT_TIMEOUT_MS),
+    "analytics": DBWorkload(
+        "analytics", use_replica=True, read_only=True,
+        statement_timeout_ms=settings.DB_ANALYTICS_STATEMENT_TIMEOUT_MS,
+        work_mem=settings.DB_ANALYTICS_WORK_MEM,
+    ),
+    "export": DBWorkload(
+        "export", use_replica=True, read_only=True,
+        statement_timeout_ms=settings.DB_EXPORT_STATEMENT_TIMEOUT_MS,
+        work_mem=settings.DB_EXPORT_WORK_MEM,
+    ),
+}
+
+# 현재 요청(태스크)의 워크로드 이름
+_current_workload: ContextVar[str] = ContextVar("db_workload", default="default")
+
+
+@contextmanager
+def use_workload(name: str):
+    """블록 안의 db_manager 호출을 지정 워크로드로 라우팅"""
+    if name not in WORKLOADS:
+        raise ValueError(f"알 수 없는 DB 워크로드: {name}")
+    token = _current_workload.set(name)
+    try:
+        yield
+    finally:
+        _current_workload.reset(token)
+
+
+def db_workload(name: str):
+    """FastAPI 라우트 의존성: dependencies=[Depends(db_workload("analytics"))]
+
+    async 제너레이터 의존성은 엔드포인트와 같은 태스크에서 실행되므로
+    여기서 설정한 컨텍스트 변수가 엔드포인트 본문에 그대로 보인다.
+    """
+    if name not in WORKLOADS:
+        raise ValueError(f"알 수 없는 DB 워크로드: {name}")
+
+    async def _dependency():
+        with use_workload(name):
+            yield
+
+    return _dependency
+
+
+def current_workload() -> DBWorkload:
+    return WORKLOADS[_current_workload.get()]
+
+
 class DatabaseManager:
     """데이터베이스 연결 및 쿼리 관리자"""
     
@@ -23,22 +110,61 @@ class DatabaseManager:
             'user': settings.DB_USER,
             'password': settings.DB_PASSWORD
         }
-    
+        self.replica_params: Optional[Dict[str, Any]] = None
+        if settings.DB_REPLICA_HOST:
+            self.replica_params = {
+                'host': settings.DB_REPLICA_HOST,
+                'port': settings.DB_REPLICA_PORT,
+                'database': settings.DB_REPLICA_NAME or settings.DB_NAME,
+                'user': settings.DB_REPLICA_USER or settings.DB_USER,
+                'password': settings.DB_REPLICA_PASSWORD or settings.DB_PASSWORD,
+                'connect_timeout': settings.DB_REPLICA_CONNECT_TIMEOUT,
+            }
+        # 레플리카 연결 실패 시각 (DB_REPLICA_RETRY_SECONDS 동안 primary 사용)
+        self._replica_down_until = 0.0
+        self._replica_lock = threading.Lock()
+
+    def _connect(self, workload: DBWorkload):
+        """워크로드 설정으로 연결. 레플리카 대상이면 레플리카 우선, 실패 시 primary"""
+        extra: Dict[str, Any] = {'application_name': f"{settings.DB_APPLICATION_NAME}:{workload.name}"}
+        options = workload.session_options()
+        if options:
+            extra['options'] = options
+
+        if workload.use_replica and self.replica_params and time.monotonic() >= self._replica_down_until:
+            try:
+                return psycopg2.connect(**self.replica_params, **extra)
+            except psycopg2.OperationalError as e:
+                with self._replica_lock:
+                    self._replica_down_until = time.monotonic() + settings.DB_REPLICA_RETRY_SECONDS
+                logger.warning(
+                    f"레플리카 연결 실패 → {settings.DB_REPLICA_RETRY_SECONDS}초간 primary 사용 "
+                    f"({workload.name}): {e}"
+                )
+        return psycopg2.connect(**self.connection_params, **extra)
+
     @contextmanager
-    def get_connection(self):
-        """데이터베이스 연결 컨텍스트 매니저"""
+    def get_connection(self, workload: Optional[str] = None):
+        """데이터베이스 연결 컨텍스트 매니저
+
+        Args:
+            workload: 워크로드 이름. 생략 시 현재 요청에 선언된 워크로드 (없으면 default)
+        """
         conn = None
-        try:
-            conn = psycopg2.connect(**self.connection_params)
-            yield conn
-        except Exception as e:
-            if conn:
-                conn.rollback()
-            logger.error(f"Database error: {e}")
-            raise
-        finally:
-            if conn:
-                conn.close()
+        target = WORKLOADS[workload] if workload else current_workload()
+        # 연결 수립 ~ 반납까지를 요청 트레이스의 db 구간으로 집계 (core/tracing)
+        with span("db", target.name):
+            try:
+                conn = self._connect(target)
+                yield conn
+            except Exception as e:
+                if conn:
+                    conn.rollback()
+                logger.error(f"Database error: {e}")
+                raise
+            finally:
+                if conn:
+                    conn.close()
     
     @contextmanager
     def get_cursor(self, conn):
@@ -62,8 +188,8 @@ class DatabaseManager:
                 return [dict(row) for row in cursor.fetchall()]
     
     async def execute_one(self, query: str, params: Optional[tuple] = None) -> Optional[Dict[str, Any]]:
-        """단일 결과 쿼리 실행 (INSERT RETURNING 포함)"""
-        with self.get_connection() as conn:
+        """단일 결과 쿼리 실행 (INSERT RETURNING 포함 — 커밋하므로 항상 primary)"""
+        with self.get_connection("default") as conn:
             with self.get_cursor(conn) as cursor:
                 cursor.execute(query, params or ())
                 row = cursor.fetchone()
@@ -72,8 +198,8 @@ class DatabaseManager:
                 return dict(row) if row else None
     
     async def execute_update(self, query: str, params: Optional[tuple] = None) -> int:
-        """INSERT/UPDATE/DELETE 쿼리 실행"""
-        with self.get_connection() as conn:
+        """INSERT/UPDATE/DELETE 쿼리 실행 (항상 primary)"""
+        with self.get_connection("default") as conn:
             with self.get_cursor(conn) as cursor:
                 cursor.execute(query, params or ())
                 conn.commit()
@@ -0,0 +1,268 @@
+"""
+요청별 지연 분해 (contextvar 기반 span 기록기, 외부 수집기 없음)
+
+HTTP 미들웨어가 요청마다 RequestTrace 를 contextvar 에 걸고, 그 안에서 실행되는 구간을
+span(category) / @traced(category) 로 잰다. asyncio 태스크·asyncio.to_thread 는 컨텍스트를 복사하므로
+gather 로 나뉜 호출이나 스레드에서 돈 DB 쿼리도 같은 요청에 합산된다.
+  - 카테고리별 집계는 자기 시간(self time, 자식 span 제외) — 순차 실행이면 합계 + app(나머지) ≈ 전체 시간,
+    gather 로 동시에 돈 구간은 각각 합산되므로 합계가 total 을 넘을 수 있다 (app 은 0 하한)
+  - 응답 헤더: Server-Timing: db;dur=12.3;desc="3x", llm;dur=..., app;dur=..., total;dur=...
+    헤더는 본문보다 먼저 나가므로 헤더 전송 전까지의 구간만 담는다 — StreamingResponse/SSE(RAG 채팅,
+    LLM stream_api, /nutrition/stream)처럼 본문 생성 중에 도는 임베딩·FAISS·LLM 구간은 헤더에 없다
+  - 로그: 본문 전송이 끝난 뒤 기록 (스트리밍 구간 포함, headers_ms = 헤더 시점 경과)
+    tracing_log_sample_rate 비율 + tracing_slow_ms 이상 요청은 항상 JSON 한 줄 ([trace])
+계측 지점: DatabaseManager.get_connection(db), FAISSVectorSearch.search(faiss)/_embed(embedding),
+LLMRouter.call_api/stream_api(llm), redis-py 명령 실행(redis — instrument_redis()).
+활성 트레이스가 없으면 (백그라운드 태스크 등) span 은 contextvar 조회 1회 외 아무 일도 하지 않는다.
+"""
+
+import functools
+import inspect
+import json
+import logging
+import random
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 요청당 개별 span 기록 상한 (넘으면 집계만 계속)
+MAX_SPANS = 64
+
+
+class RequestTrace:
+    """요청 하나의 span 집계."""
+
+    def __init__(self, method: str = "", path: str = "") -> None:
+        self.method = method
+        self.path = path
+        self.t0 = time.perf_counter()
+        self.totals: Dict[str, List[float]] = {}  # category → [횟수, self ms]
+        self.spans: List[Dict[str, Any]] = []
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def add(self, category: str, name: Optional[str], start: float, dur_ms: float,
+            self_ms: float, error: Optional[str] = None) -> None:
+        with self._lock:
+            total = self.totals.setdefault(category, [0, 0.0])
+            total[0] += 1
+            total[1] += self_ms
+            if len(self.spans) >= MAX_SPANS:
+                self.dropped += 1
+                return
+            item = {"cat": category, "name": name, "at_ms": round((start - self.t0) * 1000, 1),
+                    "ms": round(dur_ms, 1)}
+            if error:
+                item["error"] = error
+            self.spans.append(item)
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.t0) * 1000
+
+    def breakdown(self, total_ms: float) -> Dict[str, float]:
+        """카테고리별 self ms + app(계측 안 된 나머지) + total."""
+        with self._lock:
+            out = {cat: round(ms, 1) for cat, (_n, ms) in sorted(self.totals.items())}
+        out["app"] = round(max(total_ms - sum(out.values()), 0.0), 1)
+        out["total"] = round(total_ms, 1)
+        return out
+
+    def server_timing(self, total_ms: float) -> str:
+        parts = []
+        for cat, ms in self.breakdown(total_ms).items():
+            count = self.totals.get(cat, [0])[0]
+            parts.append(f'{cat};dur={ms};desc="{int(count)}x"' if count else f"{cat};dur={ms}")
+        return ", ".join(parts)
+
+    def to_log(self, status: int, total_ms: float, headers_ms: Optional[float] = None) -> Dict[str, Any]:
+        with self._lock:
+            counts = {cat: int(n) for cat, (n, _ms) in self.totals.items()}
+            spans = list(self.spans)
+        return {
+            "method": self.method,
+            "path": self.path,
+            "status": status,
+            "headers_ms": round(headers_ms if headers_ms is not None else total_ms, 1),
+            "ms": self.breakdown(total_ms),
+            "counts": counts,
+            "spans": spans,
+            "dropped_spans": self.dropped,
+        }
+
+
+_trace: ContextVar[Optional[RequestTrace]] = ContextVar("request_trace", default=None)
+_parent: ContextVar[Optional["span"]] = ContextVar("trace_parent_span", default=None)
+
+
+def current_trace() -> Optional[RequestTrace]:
+    return _trace.get()
+
+
+class span:
+    """구간 계측 — `with span("db"):` / `async with span("llm", "gemini"):`. 트레이스 없으면 no-op."""
+
+    __slots__ = ("category", "name", "trace", "parent", "child_ms", "t0", "_token")
+
+    def __init__(self, category: str, name: Optional[str] = None) -> None:
+        self.category = category
+        self.name = name
+        self.trace: Optional[RequestTrace] = None
+
+    def __enter__(self) -> "span":
+        self.trace = _trace.get()
+        if self.trace is None:
+            return self
+        self.parent = _parent.get()
+        self.child_ms = 0.0
+        self._token = _parent.set(self)
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if self.trace is None:
+            return False
+        dur_ms = (time.perf_counter() - self.t0) * 1000
+        try:
+            _parent.reset(self._token)
+        except ValueError:
+            _parent.set(self.parent)  # 다른 컨텍스트에서 종료된 경우
+        if self.parent is not None:
+            self.parent.child_ms += dur_ms
+        # gather 로 동시에 돈 자식 합이 부모보다 길 수 있음 → 0 하한
+        self.trace.add(self.category, self.name, self.t0, dur_ms, max(dur_ms - self.child_ms, 0.0),
+                       exc_type.__name__ if exc_type else None)
+        return False
+
+    async def __aenter__(self) -> "span":
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        return self.__exit__(exc_type, exc, tb)
+
+
+def traced(category: str, name: Optional[str] = None) -> Callable:
+    """함수 계측 데코레이터 (동기/코루틴/비동기 제너레이터).
+
+    비동기 제너레이터(스트리밍)는 소비 완료까지의 시간을 잰다 — yield 사이 소비자 시간 포함,
+    자식 span 차감 없음.
+    """
+    def decorator(fn: Callable) -> Callable:
+        label = name or fn.__qualname__
+
+        if inspect.isasyncgenfunction(fn):
+            @functools.wraps(fn)
+            async def agen_wrapper(*args, **kwargs):
+                trace = _trace.get()
+                gen = fn(*args, **kwargs)
+                t0 = time.perf_counter()
+                error = None
+                try:
+                    async for item in gen:
+                        yield item
+                except GeneratorExit:
+                    raise
+                except BaseException as e:
+                    error = type(e).__name__
+                    raise
+                finally:
+                    await gen.aclose()
+                    if trace is not None:
+                        dur_ms = (time.perf_counter() - t0) * 1000
+                        trace.add(category, label, t0, dur_ms, dur_ms, error)
+            return agen_wrapper
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(category, label):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def sync_wrapper(*args, **kwargs):
+            with span(category, label):
+                return fn(*args, **kwargs)
+        return sync_wrapper
+
+    return decorator
+
+
+def _log_trace(trace: RequestTrace, status: int, headers_ms: float) -> None:
+    from .config import settings
+
+    total_ms = trace.elapsed_ms()
+    if total_ms >= settings.tracing_slow_ms or random.random() < settings.tracing_log_sample_rate:
+        logger.info("[trace] %s", json.dumps(trace.to_log(status, total_ms, headers_ms), ensure_ascii=False))
+
+
+async def _finish_after_body(body_iterator, trace: RequestTrace, status: int, headers_ms: float):
+    """본문을 그대로 흘려보내고 전송이 끝나면(중단 포함) span 요약 로그."""
+    try:
+        async for chunk in body_iterator:
+            yield chunk
+    finally:
+        _log_trace(trace, status, headers_ms)
+
+
+async def trace_http_request(request, call_next):
+    """main.py HTTP 미들웨어 본체 — 트레이스 시작, Server-Timing 헤더, 샘플링 로그.
+
+    Server-Timing 은 헤더 전송 전까지의 구간만 담는다 (스트리밍 본문 생성 구간은 로그에만).
+    """
+    trace = RequestTrace(request.method, request.url.path)
+    token = _trace.set(trace)
+    try:
+        response = await call_next(request)
+    finally:
+        _trace.reset(token)
+    headers_ms = trace.elapsed_ms()
+    response.headers["Server-Timing"] = trace.server_timing(headers_ms)
+    body_iterator = getattr(response, "body_iterator", None)
+    if body_iterator is None:
+        _log_trace(trace, response.status_code, headers_ms)
+    else:
+        # call_next 응답은 본문을 아직 안 보낸 상태 — 스트리밍 중 기록되는 span 까지 로그에 담는다
+        response.body_iterator = _finish_after_body(body_iterator, trace, response.status_code, headers_ms)
+    return response
+
+
+_redis_instrumented = False
+
+
+def _redis_command_wrapper(orig: Callable) -> Callable:
+    if inspect.iscoroutinefunction(orig):
+        @functools.wraps(orig)
+        async def async_execute_command(self, *args, **options):
+            with span("redis", str(args[0]) if args else None):
+                return await orig(self, *args, **options)
+        return async_execute_command
+
+    @functools.wraps(orig)
+    def execute_command(self, *args, **options):
+        with span("redis", str(args[0]) if args else None):
+            return orig(self, *args, **options)
+    return execute_command
+
+
+def instrument_redis() -> bool:
+    """redis-py 동기/비동기 클라이언트의 명령·파이프라인 실행을 span("redis") 로 감싼다 (프로세스당 1회).
+
+    클라이언트 생성 위치가 여러 곳이라 클래스 메서드를 감싼다 — 이미 만든 클라이언트에도 적용된다.
+    """
+    global _redis_instrumented
+    if _redis_instrumented:
+        return True
+    try:
+        import redis.asyncio.client as async_client
+        import redis.client as sync_client
+    except ImportError:
+        return False
+    for cls in (sync_client.Redis, async_client.Redis):
+        cls.execute_command = _redis_command_wrapper(cls.execute_command)
+    for cls in (sync_client.Pipeline, async_client.Pipeline):
+        cls.execute = traced("redis", "pipeline")(cls.execute)
+    _redis_instrumented = True
+    return True
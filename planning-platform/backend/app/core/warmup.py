@@ -0,0 +1,114 @@
+"""
+부팅 후 워밍업 단계 (무거운 의존성 선로딩 + 준비 상태)
+
+app.main import 는 가볍게 유지하고 (google-genai / openai / faiss / sklearn 은 첫 사용 시 지연 import),
+서버가 뜬 직후 백그라운드에서 아래 단계를 순서대로 미리 올린다.
+  - sdk_genai / sdk_openai / sdk_faiss: SDK import (스레드에서 — 이벤트 루프는 계속 요청 처리)
+  - rag_engine: FAISS 벡터 DB 메모리 로드 (init_rag_engine)
+  - bioage_model: bioage_model.pkl 로드 (sklearn import 포함)
+단계별 상태·소요(ms)를 기록하고, /api/v1/health/ready 가 완료 전까지 503 을 돌려
+로드밸런서/PM2 헬스체크가 워밍업 완료를 기다릴 수 있게 한다.
+단계 실패는 기록만 하고 다음 단계로 진행 — 해당 기능은 첫 요청에서 다시 지연 로드를 시도한다.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+Step = Tuple[str, Callable[[], Awaitable[Optional[str]]]]
+
+
+def _import(module: str) -> Callable[[], Awaitable[Optional[str]]]:
+    async def _step() -> Optional[str]:
+        import importlib
+        await asyncio.to_thread(importlib.import_module, module)
+        return None
+    return _step
+
+
+async def _rag_engine() -> Optional[str]:
+    from ..services.checkup_design.rag_service import init_rag_engine
+
+    # init_rag_engine 은 내부가 동기 로드라 별도 스레드의 루프에서 실행 (메인 루프 블로킹 방지)
+    vs = await asyncio.to_thread(asyncio.run, init_rag_engine(use_local_vector_db=True))
+    return None if vs is not None else "not_loaded"
+
+
+async def _bioage_model() -> Optional[str]:
+    from ..services.report_engine.engine import _load_bioage_assets
+
+    model, _features = await asyncio.to_thread(_load_bioage_assets)
+    return None if model is not None else "missing"
+
+
+DEFAULT_STEPS: List[Step] = [
+    ("sdk_genai", _import("google.genai")),
+    ("sdk_openai", _import("openai")),
+    ("sdk_faiss", _import("faiss")),
+    ("rag_engine", _rag_engine),
+    ("bioage_model", _bioage_model),
+]
+
+
+class Warmup:
+    """워밍업 단계 실행기. status: pending → running → ready."""
+
+    def __init__(self, steps: Optional[List[Step]] = None) -> None:
+        self.steps = list(DEFAULT_STEPS if steps is None else steps)
+        self.status = "pending"
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self.started_at: Optional[str] = None
+        self.total_ms: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.status == "ready"
+
+    async def run(self) -> None:
+        self.status = "running"
+        self.started_at = datetime.now().isoformat()
+        self.results = {name: {"status": "pending"} for name, _ in self.steps}
+        t0 = time.perf_counter()
+        for name, step in self.steps:
+            self.results[name] = {"status": "running"}
+            s0 = time.perf_counter()
+            try:
+                detail = await step()
+                result = {"status": "ok" if detail is None else "skipped"}
+                if detail is not None:
+                    result["detail"] = detail
+            except Exception as e:
+                logger.warning("[워밍업] %s 실패: %s", name, e)
+                result = {"status": "failed", "detail": str(e)[:200]}
+            result["ms"] = int((time.perf_counter() - s0) * 1000)
+            self.results[name] = result
+        self.total_ms = int((time.perf_counter() - t0) * 1000)
+        self.status = "ready"
+
+    def start(self) -> asyncio.Task:
+        """백그라운드 태스크로 실행 (이미 실행 중/완료면 그 태스크 반환)."""
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "started_at": self.started_at,
+            "total_ms": self.total_ms,
+            "steps": dict(self.results),
+        }
+
+
+warmup = Warmup()
@@ -13,7 +13,7 @@ class ChatSessionManager:
 
     def __init__(self, redis_url: str = None):
         if redis_url is None:
-            redis_url = settings.REDIS_URL if hasattr(settings, 'REDIS_URL') else "redis://10.0.1.10:6379/0"
+            redis_url = settings.redis_url
 
         try:
             self.redis_client = redis.from_url(
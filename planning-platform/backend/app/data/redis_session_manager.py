@@ -15,12 +15,12 @@ class RedisSessionManager:
     
     def __init__(self, redis_url: str = None):
         if redis_url is None:
-            redis_url = settings.REDIS_URL if hasattr(settings, 'REDIS_URL') else "redis://10.0.1.10:6379/0"
+            redis_url = settings.redis_url
         
         try:
-            print(f"🔄 Redis 연결 시도: redis://10.0.1.10:6379/0")
+            print(f"🔄 Redis 연결 시도: {redis_url}")
             self.redis_client = redis.from_url(
-                "redis://10.0.1.10:6379/0",
+                redis_url,
                 decode_responses=True,
                 socket_timeout=3,
                 socket_connect_timeout=3,
@@ -28,7 +28,7 @@ class RedisSessionManager:
             )
             # 연결 테스트
             self.redis_client.ping()
-            print(f"✅ Redis 연결 성공: redis://10.0.1.10:6379/0")
+            print(f"✅ Redis 연결 성공: {redis_url}")
         except Exception as e:
             print(f"❌ Redis 연결 실패: {e}")
             print("⚠️  파일 기반 세션 관리 사용")
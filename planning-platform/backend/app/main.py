@@ -116,6 +116,17 @@ async def add_cache_control_for_widget(request: Request, call_next):
         response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
     return response
 
+# 요청별 지연 분해 (DB/Redis/FAISS/임베딩/LLM) — Server-Timing 헤더 + 샘플링 JSON 로그 (core/tracing)
+# 마지막에 등록 = 가장 바깥 미들웨어 → 다른 미들웨어 시간까지 total 에 포함
+if settings.tracing_enabled:
+    from .core.tracing import instrument_redis, trace_http_request
+
+    instrument_redis()
+
+    @app.middleware("http")
+    async def trace_request_timing(request: Request, call_next):
+        return await trace_http_request(request, call_next)
+
 # API 라우터 등록 (기본 경로)
 app.include_router(health.router, prefix="/api/v1/health", tags=["health"])
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["auth"])
@@ -273,6 +284,23 @@ async def startup_event():
     except Exception as e:
         print(f"⚠️ [LLMRouter] 시작 실패: {e}")
     
+    # 틸코 인증 WebSocket 알림 워커 간 팬아웃 구독
+    try:
+        from .api.v1.endpoints.websocket_auth import fanout
+        await fanout.start()
+        print(f"✅ [WS팬아웃] 구독 시작 ({type(fanout.broker).__name__}, {fanout.worker_id})")
+    except Exception as e:
+        print(f"⚠️ [WS팬아웃] 구독 시작 실패: {e}")
+
+    # 재시작으로 중단된 병원 인덱스 재구축 재개 (임베딩 캐시로 이어서 처리)
+    try:
+        from .api.v1.endpoints.embedding_management import resume_interrupted_rebuilds
+        resumed = resume_interrupted_rebuilds()
+        if resumed:
+            print(f"✅ [인덱스재구축] 중단된 작업 재개: {', '.join(resumed)}")
+    except Exception as e:
+        print(f"⚠️ [인덱스재구축] 중단 작업 재개 실패: {e}")
+
     # 세션 자동 정리 시작 (30분 간격)
     await session_manager.start_auto_cleanup(30)
     
@@ -289,17 +317,19 @@ async def startup_event():
     except Exception as e:
         print(f"⚠️ [파일처리] 스케줄러 시작 실패: {e}")
     
-    # RAG 엔진 사전 초기화 (벡터 DB를 메모리에 미리 로드)
+    # 워밍업 (SDK import + RAG 벡터 DB + bioage 모델) — 백그라운드, 완료 전까지 /health/ready 503
     try:
-        import time
-        from .services.checkup_design.rag_service import init_rag_engine
-        print("📚 [RAG 엔진] 벡터 DB 사전 로드 시작...")
-        start_rag = time.time()
-        await init_rag_engine(use_local_vector_db=True)
-        elapsed = time.time() - start_rag
-        print(f"✅ [RAG 엔진] 벡터 DB 메모리 로드 완료 ({elapsed:.2f}초)")
+        from .core.warmup import warmup
+
+        def _warmup_done(task):
+            if not task.cancelled():
+                print(f"✅ [워밍업] 완료 ({warmup.total_ms}ms): "
+                      + ", ".join(f"{k}={v['status']}/{v['ms']}ms" for k, v in warmup.results.items()))
+
+        warmup.start().add_done_callback(_warmup_done)
+        print("📚 [워밍업] 백그라운드 시작 (RAG 벡터 DB 사전 로드 포함)")
     except Exception as e:
-        print(f"⚠️ [RAG 엔진] 사전 로드 실패: {e}")
+        print(f"⚠️ [워밍업] 시작 실패: {e}")
     
     # 서버 모니터링 + Slack 알림 시작
     try:
@@ -315,28 +345,61 @@ async def startup_event():
     except Exception as e:
         print(f"⚠️ [모니터링] 시작 실패: {e}")
 
-    # 미태깅 세션 자동 복구 스케줄러 (1시간 간격, 서버 안정화 후 시작)
+    # 태깅 작업 큐 워커 (chat_tagging quota 기반 토큰 버킷으로 병렬 처리)
+    if settings.tagging_queue_enabled:
+        try:
+            from .services.tagging_queue import tagging_queue
+            await tagging_queue.start()
+            limits = tagging_queue.rate_limit()
+            print(f"✅ [태깅큐] 워커 {settings.tagging_queue_workers}개 시작 "
+                  f"({limits['sessions_per_hour']:.0f} 세션/시간 상한)")
+        except Exception as e:
+            print(f"⚠️ [태깅큐] 워커 시작 실패: {e}")
+
+    # 미태깅 세션 자동 복구 스케줄러 (1시간 간격, 서버 안정화 후 시작) — 큐에 적재만 함
     try:
         import asyncio
 
         async def _tagging_recovery_loop():
-            """미태깅 세션을 주기적으로 찾아 태깅합니다."""
+            """미태깅 세션을 주기적으로 찾아 태깅 큐에 적재합니다."""
             await asyncio.sleep(300)  # 서버 시작 후 5분 대기 (warmup 완료 보장)
             while True:
                 try:
                     from .services.chat_tagging_service import retag_all_sessions
-                    result = await retag_all_sessions(force=False)
-                    if result["total"] > 0:
-                        print(f"🏷 [태깅복구] 미태깅 세션 처리: {result}")
+                    result = await retag_all_sessions(force=False, source="recovery")
+                    if result["enqueued"] > 0:
+                        print(f"🏷 [태깅복구] 미태깅 세션 큐 적재: {result}")
                 except Exception as e:
                     print(f"⚠️ [태깅복구] 실행 실패: {e}")
-                await asyncio.sleep(3600)  # 1시간 대기 (Gemini quota 보호)
+                await asyncio.sleep(3600)
 
-        asyncio.create_task(_tagging_recovery_loop())
-        print("✅ [태깅복구] 미태깅 세션 자동 복구 스케줄러 시작 (1시간 간격, 5분 후 첫 실행)")
+        if settings.tagging_queue_enabled:
+            asyncio.create_task(_tagging_recovery_loop())
+            print("✅ [태깅복구] 미태깅 세션 자동 복구 스케줄러 시작 (1시간 간격, 5분 후 첫 실행)")
     except Exception as e:
         print(f"⚠️ [태깅복구] 스케줄러 시작 실패: {e}")
 
+    # 재방문 후보 인덱스 주기적 전체 재적재 (건별 갱신이 없는 파트너 유형 변경 등 보정)
+    try:
+        import asyncio
+
+        async def _revisit_index_rebuild_loop():
+            """welno.tb_revisit_candidate_index 를 주기적으로 원본에서 다시 적재합니다."""
+            while True:
+                await asyncio.sleep(settings.revisit_index_rebuild_interval_sec)
+                try:
+                    from .services.chat_tagging_service import rebuild_revisit_candidate_index
+                    count = await rebuild_revisit_candidate_index()
+                    print(f"🔁 [재방문인덱스] 전체 재적재 완료: 후보 {count}건")
+                except Exception as e:
+                    print(f"⚠️ [재방문인덱스] 재적재 실패: {e}")
+
+        if settings.revisit_index_rebuild_interval_sec > 0:
+            asyncio.create_task(_revisit_index_rebuild_loop())
+            print(f"✅ [재방문인덱스] 주기적 재적재 시작 ({settings.revisit_index_rebuild_interval_sec}초 간격)")
+    except Exception as e:
+        print(f"⚠️ [재방문인덱스] 스케줄러 시작 실패: {e}")
+
     # M4: DAILY_COST_SUMMARY 매일 09:00 KST 발송 스케줄러
     try:
         import asyncio
@@ -378,12 +441,38 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     """앱 종료 시 이벤트"""
+    try:
+        from .core.warmup import warmup
+        await warmup.stop()
+    except Exception as e:
+        print(f"⚠️ [워밍업] 종료 실패: {e}")
     try:
         from .services.llm_router import llm_router
         await llm_router.stop()
         print("✅ [LLMRouter] 종료 완료")
     except Exception as e:
         print(f"⚠️ [LLMRouter] 종료 실패: {e}")
+    try:
+        from .services.tagging_queue import tagging_queue
+        await tagging_queue.stop()
+    except Exception as e:
+        print(f"⚠️ [태깅큐] 종료 실패: {e}")
+    try:
+        from .api.v1.endpoints.websocket_auth import fanout
+        await fanout.stop()
+    except Exception as e:
+        print(f"⚠️ [WS팬아웃] 종료 실패: {e}")
+    try:
+        from .services.llm_usage_logger import llm_usage_logger
+        await llm_usage_logger.stop()
+        print(f"✅ [LLM사용량] 버퍼 flush 완료 {llm_usage_logger.stats()}")
+    except Exception as e:
+        print(f"⚠️ [LLM사용량] 버퍼 flush 실패: {e}")
+    try:
+        from .services.es_service import es_service
+        await es_service.close()
+    except Exception as e:
+        print(f"⚠️ [ES] 클라이언트 종료 실패: {e}")
 
 
 def custom_openapi():
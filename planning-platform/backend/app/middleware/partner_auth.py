@@ -19,7 +19,7 @@ security = HTTPBearer(auto_error=False)
 
 # Redis 클라이언트 (Rate Limiting용)
 try:
-    redis_url = settings.REDIS_URL if hasattr(settings, 'REDIS_URL') else "redis://10.0.1.10:6379/0"
+    redis_url = settings.redis_url
     redis_client = redis.from_url(
         redis_url,
         decode_responses=True,
@@ -4,6 +4,10 @@ from .alimtalk_service import (
     get_template_variables,
     send_campaign_messages,
 )
+from .bulk_dispatch import (
+    start_campaign_dispatch,
+    get_dispatch_status,
+)
 from .sending_service import (
     save_order_log,
     send_test_message,
@@ -0,0 +1,480 @@
+"""
+알림톡 대량 발송 엔진 — 캠페인 수신자 전체를 집합 단위로 처리
+
+수신자별로 병원 매핑/alimtalk_vars/환자 조회·생성(각 수 회 왕복) + MZSENDTRAN 단건 INSERT 하던
+방식을 다음 단계로 대체한다.
+  1. prefetch — 병원명→hospital_id, alimtalk_vars 를 수신자 집합 단위 쿼리 몇 번으로 조회
+  2. prepare  — 본문은 템플릿당 1회 분해(compile_content) 후 치환,
+                기존 환자 일괄 조회 + 신규 환자/link_data execute_values 일괄 INSERT,
+                병원 전화번호 일괄 조회 후 attachment 치환
+  3. send     — MZSENDTRAN executemany, chunk_size 단위 트랜잭션
+2~3 단계는 동기 DB 드라이버를 쓰므로 asyncio.to_thread 로 이벤트 루프 밖에서 실행한다.
+대량 캠페인은 start_campaign_dispatch 로 백그라운드 작업을 띄우고 get_dispatch_status 로 진행률을 조회한다.
+"""
+import asyncio
+import json
+import logging
+import uuid as uuid_lib
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from ...utils.wiset_agent import (
+    generate_sn, format_req_dtm, normalize_phone_number,
+    build_mzsend_insert_params, SENDER_KEY_XOG,
+)
+from .alimtalk_service import (
+    _connect_mysql, _resolve_hospital_id,
+    compile_content, render_content, needs_wello_uuid, recipient_name, resolve_title,
+    parse_patient_fields, pick_patient_uuid, build_link_payload, wello_urls,
+    attachment_needs_tel, render_attachment,
+)
+
+logger = logging.getLogger(__name__)
+
+# MZSENDTRAN 트랜잭션당 행 수
+DEFAULT_CHUNK_SIZE = 1000
+# Postgres ANY(%s)/unnest 배열 1회 크기
+LOOKUP_BATCH = 5000
+# 기존 환자 조회 시 phone+name 당 후보 수 (단건 조회의 LIMIT 5 와 동일)
+PATIENT_CANDIDATES = 5
+# link_data lookup_key 충돌 시 재발급 횟수
+LINK_KEY_RETRIES = 3
+
+ProgressFn = Callable[[str, int, int], None]
+
+
+@dataclass
+class _Item:
+    """수신자 1명의 발송 준비 상태"""
+    raw_phone: str
+    phone: str
+    recipient: Dict
+    variables: Dict
+    template_code: str
+    content: str
+    attachment: str
+    subject: str
+    hospital_id: str = ''
+    hosp_vars: Dict[str, str] = field(default_factory=dict)
+    wello_uuid: Optional[str] = None
+    params: Optional[Dict[str, Any]] = None
+    sn: Optional[str] = None
+    error: Optional[str] = None
+
+
+def _batched(seq: List, size: int) -> Iterable[List]:
+    for i in range(0, len(seq), size):
+        yield seq[i:i + size]
+
+
+class AlimtalkBulkDispatcher:
+    """캠페인 수신자 목록 → MZSENDTRAN 일괄 적재"""
+
+    def __init__(
+        self,
+        db_manager,
+        campaign: Dict,
+        template_map: Dict[str, Dict],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        progress: Optional[ProgressFn] = None,
+    ):
+        self.db = db_manager
+        self.campaign = campaign
+        self.template_map = template_map
+        self.chunk_size = max(1, chunk_size)
+        self.progress = progress or (lambda stage, done, total: None)
+
+    async def run(self, recipients: List[Dict]) -> Dict[str, Any]:
+        items = [self._normalize(r) for r in recipients]
+        valid = [it for it in items if not it.error]
+        self.progress('prefetch', 0, len(items))
+
+        await self._resolve_hospitals(valid)
+        await self._attach_alimtalk_vars(valid)
+        await asyncio.to_thread(self._prepare_sync, valid)
+        await asyncio.to_thread(self._send_sync, [it for it in valid if it.params])
+
+        results = []
+        for it in items:
+            if it.error:
+                results.append({'phone': it.phone or it.raw_phone, 'success': False, 'error': it.error})
+            else:
+                results.append({'phone': it.phone, 'success': True, 'sn': it.sn})
+        success_count = sum(1 for r in results if r['success'])
+        return {
+            'total': len(items),
+            'success_count': success_count,
+            'fail_count': len(items) - success_count,
+            'results': results,
+        }
+
+    # ── 1. 정규화 / prefetch ─────────────────────────────
+
+    def _normalize(self, recipient: Dict) -> _Item:
+        message = recipient.get('message', {})
+        variables = recipient.get('variables', {}) or {}
+        item = _Item(
+            raw_phone=recipient.get('phone', ''),
+            phone=normalize_phone_number(recipient.get('phone', '')),
+            recipient=recipient,
+            variables=variables,
+            template_code=message.get('template_code', ''),
+            content=message.get('content', ''),
+            attachment=message.get('attachment', ''),
+            subject=message.get('subject', ''),
+        )
+        if not item.phone or len(item.phone) < 10:
+            item.phone = ''
+            item.error = '유효하지 않은 전화번호'
+            return item
+        # hospital_id — 다중 fallback (병원명 매핑은 _resolve_hospitals 에서 일괄)
+        # 매칭 실패 시 빈 문자열 ('*' fallback 폐기 — 카카오 거부 원인)
+        item.hospital_id = (
+            self.campaign.get('client_id')
+            or recipient.get('hospital_id')
+            or variables.get('hospital_id')
+            or ''
+        )
+        return item
+
+    async def _resolve_hospitals(self, items: List[_Item]) -> None:
+        """병원명 → hospital_id. 정확 매칭은 일괄 쿼리, 나머지만 단건 부분 매칭"""
+        names = sorted({
+            it.variables.get('병원명', '') for it in items
+            if not it.hospital_id and it.variables.get('병원명')
+        })
+        if not names:
+            return
+        resolved: Dict[str, str] = {}
+        # tb_hospital_rag_config (해시 ID) 우선, 다음 welno_hospitals
+        for table in ('welno.tb_hospital_rag_config', 'welno.welno_hospitals'):
+            pending = [n for n in names if n not in resolved]
+            if not pending:
+                break
+            try:
+                rows = await self.db.execute_query(
+                    f"""SELECT hospital_name, hospital_id FROM {table}
+                        WHERE hospital_name = ANY(%s) AND is_active = true""",
+                    (pending,),
+                )
+                for row in rows:
+                    resolved.setdefault(row['hospital_name'], row['hospital_id'])
+            except Exception as e:
+                logger.warning(f"hospital_id 일괄 매핑 실패 ({table}): {e}")
+        for name in names:
+            if name not in resolved:
+                resolved[name] = await _resolve_hospital_id(self.db, name) or ''
+        for it in items:
+            if not it.hospital_id:
+                it.hospital_id = resolved.get(it.variables.get('병원명', ''), '')
+
+    async def _attach_alimtalk_vars(self, items: List[_Item]) -> None:
+        """병원별 alimtalk_vars[template_code] 일괄 조회"""
+        hospital_ids = sorted({it.hospital_id for it in items if it.hospital_id and it.template_code})
+        all_vars: Dict[str, Any] = {}
+        if hospital_ids:
+            try:
+                rows = await self.db.execute_query(
+                    """SELECT hospital_id, alimtalk_vars FROM welno.tb_hospital_rag_config
+                       WHERE hospital_id = ANY(%s) AND is_active = true""",
+                    (hospital_ids,),
+                )
+                for row in rows:
+                    all_vars.setdefault(row['hospital_id'], row.get('alimtalk_vars'))
+            except Exception as e:
+                logger.warning(f"alimtalk_vars 일괄 조회 실패: {e}")
+
+        cache: Dict[Tuple[str, str], Dict[str, str]] = {}
+        for it in items:
+            key = (it.hospital_id, it.template_code)
+            if key not in cache:
+                hv = all_vars.get(it.hospital_id)
+                tpl_vars = hv.get(it.template_code) if isinstance(hv, dict) else None
+                cache[key] = (
+                    {k: ('' if v is None else str(v)) for k, v in tpl_vars.items()}
+                    if isinstance(tpl_vars, dict) else {}
+                )
+            it.hosp_vars = cache[key]
+
+    # ── 2. prepare (스레드) ──────────────────────────────
+
+    def _prepare_sync(self, items: List[_Item]) -> None:
+        for it in items:
+            if it.content:
+                it.content = render_content(
+                    compile_content(it.content), it.variables, it.recipient, it.hosp_vars,
+                )
+        self.progress('patients', 0, len(items))
+        self._resolve_patients(items)
+
+        linked = [it for it in items if it.wello_uuid]
+        self.progress('links', 0, len(linked))
+        link_keys = self._insert_link_data(linked)
+
+        tel_hospitals = {it.hospital_id for it in items if it.attachment and attachment_needs_tel(it.attachment)}
+        phones = self._load_hospital_phones(tel_hospitals)
+
+        req_dtm = format_req_dtm()
+        for it in items:
+            tmpl_info = self.template_map.get(it.template_code, {})
+            # msg_type 결정 (button → AI, 그 외 → AT)
+            msg_type = 'AI' if tmpl_info.get('message_type', '') == 'button' else 'AT'
+            attachment = it.attachment
+            if attachment:
+                url_full = url_no_proto = None
+                if it.wello_uuid:
+                    url_full, url_no_proto = wello_urls(it.wello_uuid, it.hospital_id, link_keys.get(id(it)))
+                attachment = render_attachment(
+                    attachment, it.wello_uuid, it.hospital_id, it.hosp_vars,
+                    url_full, url_no_proto, phones.get(it.hospital_id),
+                )
+            it.sn = generate_sn()
+            it.params = build_mzsend_insert_params(
+                sn=it.sn, sender_key=tmpl_info.get('sender_key') or SENDER_KEY_XOG,
+                phone_num=it.phone, tmpl_cd=it.template_code, snd_msg=it.content,
+                req_dtm=req_dtm,
+                attachment=attachment if attachment else None,
+                subject=it.subject if it.subject else None,
+                title=resolve_title(msg_type, tmpl_info, it.hosp_vars), msg_type=msg_type,
+            )
+
+    def _resolve_patients(self, items: List[_Item]) -> None:
+        """welno 링크가 필요한 수신자의 welno_patients uuid — 기존 일괄 조회, 신규 일괄 INSERT"""
+        import psycopg2.extras
+
+        wanted: Dict[Tuple[str, str], List[_Item]] = {}
+        for it in items:
+            if it.hospital_id and needs_wello_uuid(it.content, it.attachment, it.hosp_vars):
+                name = recipient_name(it.variables, it.recipient) or '고객'
+                wanted.setdefault((it.phone, name), []).append(it)
+        if not wanted:
+            return
+
+        keys = list(wanted)
+        try:
+            with self.db.get_connection("default") as conn:
+                with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+                    found: Dict[Tuple[str, str], List[Dict]] = {}
+                    for batch in _batched(keys, LOOKUP_BATCH):
+                        # 기존 환자 조회 — phone+name 우선 (birth 불일치해도 기존 UUID 재사용)
+                        cur.execute(
+                            """SELECT p.phone_number, p.name, p.uuid::text AS uuid,
+                                      p.birth_date::text AS birth_date
+                               FROM welno.welno_patients p
+                               JOIN unnest(%s::text[], %s::text[]) AS k(phone, name)
+                                 ON p.phone_number = k.phone AND p.name = k.name
+                               ORDER BY p.last_auth_at DESC NULLS LAST, p.created_at DESC""",
+                            ([k[0] for k in batch], [k[1] for k in batch]),
+                        )
+                        for row in cur.fetchall():
+                            bucket = found.setdefault((row['phone_number'], row['name']), [])
+                            if len(bucket) < PATIENT_CANDIDATES:
+                                bucket.append(row)
+
+                    new_rows = []
+                    for key, group in wanted.items():
+                        for it in group:
+                            birth_date, _ = parse_patient_fields(it.variables)
+                            it.wello_uuid = pick_patient_uuid(found.get(key, []), birth_date)
+                        if group[0].wello_uuid:
+                            continue
+                        # 신규 — 같은 phone+name 수신자는 하나의 환자로
+                        first = group[0]
+                        birth_date, gender = parse_patient_fields(first.variables)
+                        new_uuid = str(uuid_lib.uuid4())
+                        new_rows.append((new_uuid, first.hospital_id, key[1], key[0], birth_date, gender))
+                        for it in group:
+                            it.wello_uuid = new_uuid
+
+                    if new_rows:
+                        psycopg2.extras.execute_values(
+                            cur,
+                            """INSERT INTO welno.welno_patients
+                               (uuid, hospital_id, name, phone_number, birth_date,
+                                gender, created_at, updated_at)
+                               VALUES %s""",
+                            new_rows,
+                            template="(%s, %s, %s, %s, %s, %s, NOW(), NOW())",
+                            page_size=1000,
+                        )
+                conn.commit()
+            logger.info(f"welno_patient 일괄 처리: 대상 {len(keys)}명, 신규 {len(new_rows)}명")
+        except Exception as e:
+            # 환자 생성 실패 시 링크 없이 발송 (단건 경로와 동일)
+            logger.error(f"welno_patient 일괄 조회/생성 실패: {e}")
+            for group in wanted.values():
+                for it in group:
+                    it.wello_uuid = None
+
+    def _insert_link_data(self, items: List[_Item]) -> Dict[int, str]:
+        """welno_link_data 일괄 INSERT → {id(item): lookup_key}. 실패 항목은 평문 URL fallback"""
+        import psycopg2.extras
+
+        if not items:
+            return {}
+        keys: Dict[int, str] = {}
+        pending = list(items)
+        try:
+            with self.db.get_connection("default") as conn:
+                with conn.cursor() as cur:
+                    for _ in range(LINK_KEY_RETRIES):
+                        if not pending:
+                            break
+                        issued: Dict[str, _Item] = {}
+                        for it in pending:
+                            key = str(uuid_lib.uuid4())[:8]  # 8자리 short key
+                            while key in issued:
+                                key = str(uuid_lib.uuid4())[:8]
+                            issued[key] = it
+                        rows = [
+                            (key, it.wello_uuid, it.hospital_id,
+                             json.dumps(build_link_payload(it.wello_uuid, it.hospital_id, it.variables),
+                                        ensure_ascii=False))
+                            for key, it in issued.items()
+                        ]
+                        inserted = psycopg2.extras.execute_values(
+                            cur,
+                            """INSERT INTO welno.welno_link_data
+                               (lookup_key, wello_uuid, hospital_id, data)
+                               VALUES %s ON CONFLICT DO NOTHING RETURNING lookup_key""",
+                            rows, page_size=1000, fetch=True,
+                        )
+                        conn.commit()
+                        for (key,) in inserted:
+                            keys[id(issued[key])] = key
+                        # 기존 키와 충돌해 건너뛴 항목만 새 키로 재시도
+                        pending = [it for key, it in issued.items() if id(it) not in keys]
+            if pending:
+                logger.warning(f"link_data 키 충돌 {len(pending)}건, 평문 fallback")
+        except Exception as e:
+            logger.error(f"link_data 일괄 저장 실패: {e}, 평문 fallback")
+        return keys
+
+    def _load_hospital_phones(self, hospital_ids: Set[str]) -> Dict[str, str]:
+        ids = sorted(h for h in hospital_ids if h)
+        if not ids:
+            return {}
+        try:
+            with self.db.get_connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        """SELECT hospital_id, phone FROM welno.welno_hospitals
+                           WHERE hospital_id = ANY(%s) AND is_active = true""",
+                        (ids,),
+                    )
+                    phones: Dict[str, str] = {}
+                    for hospital_id, phone in cur.fetchall():
+                        if phone:
+                            phones.setdefault(hospital_id, phone)
+                    return phones
+        except Exception as e:
+            logger.warning(f"병원 전화번호 일괄 조회 실패: {e}")
+            return {}
+
+    # ── 3. send (스레드) ─────────────────────────────────
+
+    def _send_sync(self, items: List[_Item]) -> None:
+        """MZSENDTRAN 청크 단위 executemany + commit. 실패 청크는 롤백 후 해당 수신자만 실패 처리"""
+        if not items:
+            return
+        mysql_conn = _connect_mysql()
+        if not mysql_conn:
+            raise RuntimeError('MySQL 연결 실패')
+        done = 0
+        try:
+            cursor = mysql_conn.cursor()
+            for chunk in _batched(items, self.chunk_size):
+                # 선택 컬럼(ATTACHMENT/SUBJECT/TITLE) 조합별로 같은 INSERT 문
+                groups: Dict[Tuple[str, ...], List[_Item]] = {}
+                for it in chunk:
+                    groups.setdefault(tuple(it.params.keys()), []).append(it)
+                try:
+                    for cols, group in groups.items():
+                        cursor.executemany(
+                            f"INSERT INTO MZSENDTRAN ({', '.join(cols)}) "
+                            f"VALUES ({', '.join(['%s'] * len(cols))})",
+                            [[it.params[c] for c in cols] for it in group],
+                        )
+                    mysql_conn.commit()
+                except Exception as e:
+                    mysql_conn.rollback()
+                    logger.error(f"MZSENDTRAN 청크 INSERT 실패 ({len(chunk)}건): {e}")
+                    for it in chunk:
+                        it.error = str(e)
+                done += len(chunk)
+                self.progress('send', done, len(items))
+            cursor.close()
+        finally:
+            mysql_conn.close()
+
+
+# ── 백그라운드 작업 ──────────────────────────────────
+
+# 작업 상태 (메모리) — 완료 작업은 최근 MAX_FINISHED_JOBS 개만 유지
+_dispatch_jobs: Dict[str, Dict[str, Any]] = {}
+_job_tasks: Set[asyncio.Task] = set()
+MAX_FINISHED_JOBS = 100
+
+
+def _prune_jobs() -> None:
+    finished = [k for k, v in _dispatch_jobs.items() if v['status'] in ('completed', 'failed')]
+    for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+        _dispatch_jobs.pop(job_id, None)
+
+
+def start_campaign_dispatch(
+    db_manager,
+    campaign_id: str,
+    recipients: List[Dict],
+    on_complete: Optional[Callable[[Dict], Awaitable[Any]]] = None,
+) -> str:
+    """send_campaign_messages 를 백그라운드 태스크로 실행하고 job_id 반환"""
+    from .alimtalk_service import send_campaign_messages
+
+    _prune_jobs()
+    job_id = uuid_lib.uuid4().hex[:12]
+    status: Dict[str, Any] = {
+        'job_id': job_id,
+        'campaign_id': campaign_id,
+        'status': 'queued',
+        'stage': None,
+        'done': 0,
+        'total': len(recipients),
+        'started_at': datetime.now().isoformat(),
+        'error': None,
+    }
+    _dispatch_jobs[job_id] = status
+
+    def _progress(stage: str, done: int, total: int) -> None:
+        status.update(stage=stage, done=done, total=total)
+
+    async def _run() -> None:
+        status['status'] = 'running'
+        try:
+            ok, data = await send_campaign_messages(db_manager, campaign_id, recipients, progress=_progress)
+            if not ok:
+                status.update(status='failed', error=data)
+                return
+            status.update(
+                status='completed',
+                success_count=data['success_count'],
+                fail_count=data['fail_count'],
+                failures=[r for r in data['results'] if not r['success']][:500],
+            )
+            if on_complete:
+                await on_complete(data)
+        except Exception as e:
+            logger.error(f"캠페인 발송 작업 실패 ({job_id}): {e}")
+            status.update(status='failed', error=str(e))
+        finally:
+            status['finished_at'] = datetime.now().isoformat()
+
+    task = asyncio.create_task(_run())
+    _job_tasks.add(task)
+    task.add_done_callback(_job_tasks.discard)
+    return job_id
+
+
+def get_dispatch_status(job_id: str) -> Optional[Dict[str, Any]]:
+    return _dispatch_jobs.get(job_id)
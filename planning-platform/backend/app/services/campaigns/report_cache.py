@@ -0,0 +1,300 @@
+"""
+캠페인 리포트 PDF 로컬 디스크 캐시
+
+/disease-prediction/report/download 프록시가 presigned URL을 매번 다시 받지 않도록
+oid 단위로 PDF를 디스크에 보관한다 (알림톡 링크 재오픈 대응).
+
+- 항목에 원본 report_url 지문(sha1)을 함께 기록 → 리포트 재생성으로 URL이 바뀌면 miss 후 교체
+
+- 업스트림 응답은 청크 단위로 클라이언트에 흘려보내면서 임시 파일에 동시 기록(tee)
+- 전송이 끝까지 완료된 경우에만 원자적으로 rename 하여 캐시에 반영 (부분 파일 노출 없음)
+- 총 용량 상한을 넘으면 가장 오래 사용되지 않은 파일부터 삭제 (mtime 기반 LRU)
+- 프로세스 종료 등으로 남은 .part 임시 파일은 유예 시간(_PART_GRACE_SEC)이 지나면 정리
+- 캐시 히트는 FileResponse로 서빙 → Range/ETag 처리는 아래 헬퍼 사용
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_CHUNK_SIZE = 64 * 1024
+# 이보다 오래 갱신되지 않은 .part 는 진행 중인 전송이 아님 (전송 중에는 청크마다 mtime 갱신)
+_PART_GRACE_SEC = 3600
+
+
+@dataclass
+class CachedReport:
+    """캐시에 저장된 리포트 메타 정보"""
+    path: Path
+    size: int
+    etag: str
+    content_type: str
+    mtime: float
+
+
+class ReportCacheWriter:
+    """업스트림 스트림을 임시 파일에 기록하고 완료 시 캐시에 커밋"""
+
+    def __init__(self, cache: "ReportFileCache", oid: str, source: Optional[str] = None):
+        self._cache = cache
+        self._oid = oid
+        self._source = source
+        fd, tmp_path = tempfile.mkstemp(dir=str(cache.cache_dir), suffix=".part")
+        self._fh = os.fdopen(fd, "wb")
+        self._tmp_path = Path(tmp_path)
+        self._hasher = hashlib.sha256()
+        self._size = 0
+        self._closed = False
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def write(self, chunk: bytes) -> None:
+        if self._closed:
+            return
+        self._fh.write(chunk)
+        self._hasher.update(chunk)
+        self._size += len(chunk)
+        # 단일 파일이 캐시 전체 용량보다 크면 보관 의미가 없음 → 기록 중단
+        if self._size > self._cache.max_bytes:
+            self.abort()
+
+    def commit(self, content_type: str, upstream_etag: Optional[str] = None) -> Optional[CachedReport]:
+        """전송 완료 후 호출 — 임시 파일을 캐시 경로로 원자적 이동"""
+        if self._closed:
+            return None
+        self._fh.close()
+        self._closed = True
+        etag = upstream_etag or f'"{self._hasher.hexdigest()[:32]}"'
+        try:
+            return self._cache._commit(self._oid, self._tmp_path, self._size, etag, content_type, self._source)
+        except Exception as e:
+            logger.warning(f"⚠️ [리포트캐시] 커밋 실패 (oid={self._oid}): {e}")
+            self._unlink_tmp()
+            return None
+
+    def abort(self) -> None:
+        """중단된 전송 — 임시 파일 폐기"""
+        if self._closed:
+            return
+        try:
+            self._fh.close()
+        finally:
+            self._closed = True
+            self._unlink_tmp()
+
+    def _unlink_tmp(self) -> None:
+        try:
+            self._tmp_path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class ReportFileCache:
+    """oid 키 기반 용량 제한 디스크 캐시"""
+
+    def __init__(self, cache_dir: Path, max_bytes: int):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self._sweep_parts_locked()
+
+    @staticmethod
+    def _key(oid: str) -> str:
+        # oid는 외부 입력이므로 파일명으로 직접 쓰지 않고 해시 사용
+        return hashlib.sha256(oid.encode("utf-8")).hexdigest()[:40]
+
+    def _pdf_path(self, oid: str) -> Path:
+        return self.cache_dir / f"{self._key(oid)}.pdf"
+
+    def _meta_path(self, oid: str) -> Path:
+        return self.cache_dir / f"{self._key(oid)}.json"
+
+    @staticmethod
+    def _source_digest(source: Optional[str]) -> Optional[str]:
+        return hashlib.sha1(source.encode("utf-8")).hexdigest() if source else None
+
+    def lookup(self, oid: str, source: Optional[str] = None) -> Optional[CachedReport]:
+        """
+        캐시 조회 — 히트 시 mtime 갱신(LRU)
+
+        source(report_url)를 주면 저장 당시 URL과 다를 때 오래된 항목으로 보고 제거 후 miss
+        """
+        pdf_path = self._pdf_path(oid)
+        meta_path = self._meta_path(oid)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            stat = pdf_path.stat()
+        except (FileNotFoundError, ValueError):
+            return None
+        if stat.st_size != meta.get("size"):
+            # 크기 불일치 = 손상된 항목 → 제거
+            self.invalidate(oid)
+            return None
+        if source is not None and meta.get("source") != self._source_digest(source):
+            # 리포트 재생성으로 report_url 변경 → 이전 PDF 폐기
+            logger.info(f"♻️ [리포트캐시] 원본 URL 변경으로 무효화: oid={oid}")
+            self.invalidate(oid)
+            return None
+        now = time.time()
+        try:
+            os.utime(pdf_path, (now, now))
+        except OSError:
+            pass
+        return CachedReport(
+            path=pdf_path,
+            size=stat.st_size,
+            etag=meta.get("etag", ""),
+            content_type=meta.get("content_type", "application/pdf"),
+            mtime=stat.st_mtime,
+        )
+
+    def open_writer(self, oid: str, source: Optional[str] = None) -> ReportCacheWriter:
+        return ReportCacheWriter(self, oid, source)
+
+    def invalidate(self, oid: str) -> None:
+        for p in (self._pdf_path(oid), self._meta_path(oid)):
+            try:
+                p.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _commit(self, oid: str, tmp_path: Path, size: int, etag: str, content_type: str,
+                source: Optional[str] = None) -> CachedReport:
+        pdf_path = self._pdf_path(oid)
+        meta_path = self._meta_path(oid)
+        meta = {"oid": oid, "size": size, "etag": etag, "content_type": content_type,
+                "source": self._source_digest(source)}
+        with self._lock:
+            os.replace(tmp_path, pdf_path)
+            meta_tmp = meta_path.with_suffix(".json.tmp")
+            meta_tmp.write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+            os.replace(meta_tmp, meta_path)
+            self._evict_locked(keep=pdf_path)
+        stat = pdf_path.stat()
+        logger.info(f"💾 [리포트캐시] 저장: oid={oid}, {size} bytes")
+        return CachedReport(pdf_path, size, etag, content_type, stat.st_mtime)
+
+    def _sweep_parts_locked(self) -> None:
+        """유예 시간이 지난 .part(중단된 전송의 잔여 임시 파일) 삭제"""
+        cutoff = time.time() - _PART_GRACE_SEC
+        for p in self.cache_dir.glob("*.part"):
+            try:
+                if p.stat().st_mtime < cutoff:
+                    p.unlink()
+                    logger.info(f"🧹 [리포트캐시] 오래된 임시 파일 제거: {p.name}")
+            except FileNotFoundError:
+                continue
+
+    def _evict_locked(self, keep: Optional[Path] = None) -> None:
+        self._sweep_parts_locked()
+        entries = []
+        total = 0
+        for p in self.cache_dir.glob("*.pdf"):
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+            total += st.st_size
+        if total <= self.max_bytes:
+            return
+        entries.sort(key=lambda e: e[0])
+        for _, size, p in entries:
+            if total <= self.max_bytes:
+                break
+            if keep is not None and p == keep:
+                continue
+            for victim in (p, p.with_suffix(".json")):
+                try:
+                    victim.unlink()
+                except FileNotFoundError:
+                    pass
+            total -= size
+            logger.info(f"🧹 [리포트캐시] 용량 초과로 제거: {p.name}")
+
+
+def parse_range_header(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    단일 구간 Range 헤더 파싱 → (start, end) 포함 구간
+
+    Returns:
+        None: Range 없음/다중 구간 등 미지원 → 전체 응답
+        (-1, -1): 만족 불가 구간 → 416
+    """
+    if not range_header or not range_header.startswith("bytes="):
+        return None
+    spec = range_header[len("bytes="):].strip()
+    if "," in spec or "-" not in spec:
+        return None
+    start_s, end_s = spec.split("-", 1)
+    try:
+        if start_s == "":
+            # suffix range: 마지막 N 바이트
+            length = int(end_s)
+            if length <= 0:
+                return (-1, -1)
+            start = max(size - length, 0)
+            end = size - 1
+        else:
+            start = int(start_s)
+            end = int(end_s) if end_s else size - 1
+    except ValueError:
+        return None
+    if start >= size or start > end:
+        return (-1, -1)
+    return (start, min(end, size - 1))
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더가 현재 ETag와 일치하는지 (weak 비교)"""
+    if not if_none_match or not etag:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    normalized = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == normalized:
+            return True
+    return False
+
+
+def iter_file_range(path: Path, start: int, end: int, chunk_size: int = _CHUNK_SIZE) -> Iterator[bytes]:
+    """파일의 [start, end] 구간을 청크 단위로 읽기"""
+    remaining = end - start + 1
+    with open(path, "rb") as fh:
+        fh.seek(start)
+        while remaining > 0:
+            chunk = fh.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+_report_cache: Optional[ReportFileCache] = None
+
+
+def get_report_cache() -> ReportFileCache:
+    """프로세스 전역 리포트 캐시 (설정값 기반 지연 생성)"""
+    global _report_cache
+    if _report_cache is None:
+        from ...core.config import settings, DATA_DIR
+        cache_dir = Path(settings.campaign_report_cache_dir or (DATA_DIR / "report_cache"))
+        _report_cache = ReportFileCache(cache_dir, settings.campaign_report_cache_max_bytes)
+    return _report_cache
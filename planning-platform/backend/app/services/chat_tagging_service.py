@@ -8,11 +8,12 @@ LLM(Gemini Flash Lite)을 사용하여 요약/감정/관심사를 분석하며,
 import logging
 import json
 import asyncio
-from typing import Dict, Any, Optional, List
+from typing import Awaitable, Callable, Dict, Any, Optional, List
 from datetime import datetime
 
 from ..core.database import db_manager
 from ..core.config import settings
+from ..utils.keyword_matcher import KeywordMatcher, ScanResult
 
 logger = logging.getLogger(__name__)
 
@@ -91,6 +92,16 @@ ACTION_INTENT_CONSIDERING = ["고민", "생각", "고려", "해볼까", "할까"
 BUYING_SIGNAL_HIGH = ["가격", "얼마", "어디서 사", "구매", "주문", "추천해", "제품", "살 수 있"]
 BUYING_SIGNAL_MID = ["영양제", "보충제", "밀크씨슬", "오메가", "프로바이오틱", "비교"]
 
+# 규칙 태깅용 다중 키워드 매처 — 위 키워드 사전 전체를 import 시 한 번 컴파일
+_TAG_MATCHER = KeywordMatcher({
+    "interest": INTEREST_KEYWORDS,
+    "intent": INTENT_KEYWORDS,
+    "sentiment": SENTIMENT_KEYWORDS,
+    "nutrition": NUTRITION_KEYWORDS,
+    "action": {"active": ACTION_INTENT_ACTIVE, "considering": ACTION_INTENT_CONSIDERING},
+    "buying": {"high": BUYING_SIGNAL_HIGH, "mid": BUYING_SIGNAL_MID},
+})
+
 # 의학적 관심사 → 상품 카테고리 매핑
 COMMERCIAL_MAPPING = {
     "간기능": {"category": "간건강", "product_hint": "밀크씨슬"},
@@ -286,16 +297,22 @@ def generate_fallback_suggestions(
 
 # ─── 규칙 기반 함수 (폴백용으로 유지) ──────────────────────────────
 
-def extract_interest_tags(messages: List[Dict[str, str]]) -> List[str]:
+def scan(messages: List[Dict[str, str]]) -> ScanResult:
+    """사용자 메시지 전체를 한 번 훑어 모든 키워드 사전(family)의 매칭 결과 반환.
+
+    family: interest / intent / sentiment / nutrition / action / buying.
+    규칙 기반 함수들은 scanned 인자로 이 결과를 공유할 수 있다.
+    """
+    user_texts = [m.get("content") or "" for m in messages if m.get("role") == "user"]
+    return _TAG_MATCHER.scan(user_texts)
+
+
+def extract_interest_tags(
+    messages: List[Dict[str, str]], scanned: Optional[ScanResult] = None,
+) -> List[str]:
     """사용자 메시지에서 관심사 태그 추출"""
-    user_text = " ".join(
-        m.get("content", "") for m in messages if m.get("role") == "user"
-    )
-    tags = []
-    for tag, keywords in INTEREST_KEYWORDS.items():
-        if any(kw in user_text for kw in keywords):
-            tags.append(tag)
-    return tags
+    scanned = scanned or scan(messages)
+    return list(scanned.tags("interest"))
 
 
 def extract_risk_tags(health_metrics: Dict[str, Any]) -> List[str]:
@@ -331,18 +348,20 @@ def calculate_risk_level(risk_tags: List[str]) -> str:
     return "low"
 
 
-def calculate_engagement(messages: List[Dict[str, str]]) -> tuple:
+def calculate_engagement(
+    messages: List[Dict[str, str]], scanned: Optional[ScanResult] = None,
+) -> tuple:
     """(conversation_depth, engagement_score) 반환"""
-    user_msgs = [m["content"] for m in messages if m.get("role") == "user"]
+    scanned = scanned or scan(messages)
+    user_msgs = scanned.texts
     if not user_msgs:
         return ("shallow", 0)
 
-    # 주제별 언급 횟수 카운트
+    # 주제별 언급 횟수 카운트 (주제가 나온 메시지 수)
     topic_counts = {}
-    for msg in user_msgs:
-        for tag, keywords in INTEREST_KEYWORDS.items():
-            if any(kw in msg for kw in keywords):
-                topic_counts[tag] = topic_counts.get(tag, 0) + 1
+    for i in range(len(user_msgs)):
+        for tag in scanned.segment_tags(i, "interest"):
+            topic_counts[tag] = topic_counts.get(tag, 0) + 1
 
     # engagement_score 개선: 질문 구체성 + 메시지 길이 반영
     repeat_topics = sum(1 for c in topic_counts.values() if c >= 2)
@@ -377,45 +396,42 @@ def calculate_engagement(messages: List[Dict[str, str]]) -> tuple:
     return (depth, score)
 
 
-def extract_nutrition_tags(messages: List[Dict[str, str]]) -> List[str]:
+def extract_nutrition_tags(
+    messages: List[Dict[str, str]], scanned: Optional[ScanResult] = None,
+) -> List[str]:
     """식단·영양제 관심 키워드 추출"""
-    user_text = " ".join(m.get("content", "") for m in messages if m.get("role") == "user")
-    tags = []
-    for tag, keywords in NUTRITION_KEYWORDS.items():
-        if any(kw in user_text for kw in keywords):
-            tags.append(tag)
-    return tags
+    scanned = scanned or scan(messages)
+    return list(scanned.tags("nutrition"))
 
 
-def detect_action_intent(messages: List[Dict[str, str]]) -> str:
+def detect_action_intent(
+    messages: List[Dict[str, str]], scanned: Optional[ScanResult] = None,
+) -> str:
     """행동 의향 판별"""
-    user_text = " ".join(m.get("content", "") for m in messages if m.get("role") == "user")
-    if any(kw in user_text for kw in ACTION_INTENT_ACTIVE):
+    hits = (scanned or scan(messages)).tags("action")
+    if "active" in hits:
         return "active"
-    elif any(kw in user_text for kw in ACTION_INTENT_CONSIDERING):
+    elif "considering" in hits:
         return "considering"
     return "passive"
 
 
-def extract_keyword_tags(messages: List[Dict[str, str]]) -> List[str]:
+def extract_keyword_tags(
+    messages: List[Dict[str, str]], scanned: Optional[ScanResult] = None,
+) -> List[str]:
     """수검자(환자) 메시지에서 핵심 키워드 태그 추출 (AI 응답은 제외)"""
-    user_text = " ".join(
-        m.get("content", "") for m in messages if m.get("role") == "user"
-    )
-    matched = set()
-    for keywords in INTEREST_KEYWORDS.values():
-        for kw in keywords:
-            if kw in user_text:
-                matched.add(kw)
-    return list(matched)[:20]  # 최대 20개
+    scanned = scanned or scan(messages)
+    return list(scanned.keywords("interest"))[:20]  # 최대 20개
 
 
-def extract_buying_signal(messages: List[Dict[str, str]]) -> str:
+def extract_buying_signal(
+    messages: List[Dict[str, str]], scanned: Optional[ScanResult] = None,
+) -> str:
     """구매 신호 규칙 기반 판별"""
-    user_text = " ".join(m.get("content", "") for m in messages if m.get("role") == "user")
-    if any(kw in user_text for kw in BUYING_SIGNAL_HIGH):
+    hits = (scanned or scan(messages)).tags("buying")
+    if "high" in hits:
         return "high"
-    if any(kw in user_text for kw in BUYING_SIGNAL_MID):
+    if "mid" in hits:
         return "mid"
     return "low"
 
@@ -439,39 +455,36 @@ def extract_commercial_tags(interest_tags: List[Dict[str, str]]) -> List[Dict[st
     return tags
 
 
-def detect_sentiment(messages: List[Dict[str, str]]) -> str:
+def detect_sentiment(
+    messages: List[Dict[str, str]], scanned: Optional[ScanResult] = None,
+) -> str:
     """사용자 마지막 메시지 기반 감정 판별"""
-    user_messages = [m for m in messages if m.get("role") == "user"]
-    if not user_messages:
+    scanned = scanned or scan(messages)
+    if not scanned.texts:
         return "neutral"
-    last_msg = user_messages[-1].get("content", "")
 
-    for sentiment, keywords in SENTIMENT_KEYWORDS.items():
-        if any(kw in last_msg for kw in keywords):
-            return sentiment
-    return "neutral"
+    tags = scanned.segment_tags(len(scanned.texts) - 1, "sentiment")
+    return tags[0] if tags else "neutral"
 
 
-def classify_conversation_intent(messages: List[Dict[str, str]]) -> str:
+def classify_conversation_intent(
+    messages: List[Dict[str, str]], scanned: Optional[ScanResult] = None,
+) -> str:
     """대화 의도 1차 분류: health_question / ux_issue / greeting / off_topic.
     비건강 대화를 LLM 태깅 전에 걸러서 비용 절감 + 잘못된 태깅 방지."""
-    user_msgs = [m.get("content", "") for m in messages if m.get("role") == "user"]
+    scanned = scanned or scan(messages)
+    user_msgs = scanned.texts
     if not user_msgs:
         return "off_topic"
 
-    all_text = " ".join(user_msgs)
-
     # 1턴 + 짧은 메시지 → 인사 체크
     if len(user_msgs) == 1 and len(user_msgs[0]) < 15:
-        if any(kw in all_text for kw in INTENT_KEYWORDS["greeting"]):
+        if scanned.distinct("intent", "greeting"):
             return "greeting"
 
     # UX/기능 질문 체크
-    ux_hits = sum(1 for kw in INTENT_KEYWORDS["ux_issue"] if kw in all_text)
-    health_hits = sum(
-        1 for tags in INTEREST_KEYWORDS.values()
-        for kw in tags if kw in all_text
-    )
+    ux_hits = scanned.distinct("intent", "ux_issue")
+    health_hits = scanned.distinct("interest")
 
     if ux_hits >= 1 and health_hits == 0:
         return "ux_issue"
@@ -508,6 +521,236 @@ async def generate_conversation_summary(messages: List[Dict[str, str]]) -> str:
 
 # ─── LLM 기반 분석 (Gemini Flash Lite) ─────────────────────────────
 
+def _build_session_sections(
+    messages: List[Dict[str, str]],
+    health_metrics: Optional[Dict[str, Any]] = None,
+    patient_info: Optional[Dict[str, Any]] = None,
+    medical_history: Optional[list] = None,
+    survey_data: Optional[Dict[str, Any]] = None,
+    es_behavior: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """대화 + 멀티채널 컨텍스트를 prompt 섹션으로 변환 (단건/배치 태깅 공통).
+
+    Returns:
+        {conversation_text, total_user_turns, context_section, conv_pattern}
+    """
+    # 대화를 순서대로 번호 매겨서 포맷 (흐름 파악 + 화자 구분)
+    conv_lines = []
+    user_turn = 0
+    for i, m in enumerate(messages):
+        content = m.get("content", "").strip()
+        if not content:
+            continue
+        if m.get("role") == "user":
+            user_turn += 1
+            conv_lines.append(f"[환자 질문 #{user_turn}] {content}")
+        else:
+            conv_lines.append(f"[상담사 답변 #{user_turn}] {content}")
+
+    conversation_text = "\n".join(conv_lines)
+    if len(conversation_text) > 2500:
+        conversation_text = conversation_text[:2500] + "\n...(이하 생략)"
+
+    # ── 멀티채널 컨텍스트 구성 (v3) ──
+    health_context = _format_health_data_for_prompt(
+        health_metrics or {}, patient_info, medical_history)
+
+    survey_context = ""
+    if survey_data:
+        survey_context = _format_survey_for_prompt(survey_data)
+
+    es_context = ""
+    if es_behavior:
+        es_lines = ["[이 병원 수검자 행동 요약] (최근 30일)"]
+        for label, count in es_behavior.items():
+            if count:
+                es_lines.append(f"{label}: {count}")
+        if len(es_lines) > 1:
+            es_context = "\n".join(es_lines)
+
+    conv_pattern = _format_conversation_pattern(messages)
+
+    # 컨텍스트 블록 조립 (데이터 있는 섹션만 포함 — graceful degradation)
+    context_blocks = [b for b in [health_context, survey_context, es_context] if b]
+    context_section = "\n\n".join(context_blocks) if context_blocks else "[검진 데이터 없음]"
+
+    return {
+        "conversation_text": conversation_text,
+        "total_user_turns": user_turn,
+        "context_section": context_section,
+        "conv_pattern": conv_pattern,
+    }
+
+
+def _parse_llm_json(raw_text: str) -> Any:
+    """LLM 응답 JSON 파싱 (```json ... ``` 감싸기 대응). 실패 시 json.JSONDecodeError."""
+    raw_text = (raw_text or "").strip()
+    if raw_text.startswith("```"):
+        raw_text = raw_text.split("\n", 1)[-1]
+        if raw_text.endswith("```"):
+            raw_text = raw_text[:-3]
+        raw_text = raw_text.strip()
+    return json.loads(raw_text)
+
+
+def _postprocess_llm_result(result: Dict[str, Any], total_user_turns: int) -> Dict[str, Any]:
+    """LLM 세션 1건 결과 검증 + 정규화 + v1 호환 매핑 (단건/배치 태깅 공통)."""
+    # ─── v2/v3 B2B CRM 태깅 — 검증 + 정규화 + v1 호환 매핑 ─────────
+    from .chat_tagging_v2_prompt import (
+        normalize_v2_tags, validate_v2_tags, build_v1_compat_fields,
+        _COMPOSITE_TO_RISK_LEVEL,
+    )
+
+    # v2/v3 출력 정규화 (누락 필드 default + clamp + intent default)
+    result = normalize_v2_tags(result)
+
+    # 검증 — 실패 시 logger.warning + 정규화된 default 사용 (응답 차단 X)
+    v2_err = validate_v2_tags(result)
+    if v2_err:
+        logger.warning("[태깅-v2] 검증 실패 (default 사용): %s", v2_err)
+
+    # v3 — composite_risk 가 LLM 출력에 있으면 risk_level override (백오피스 호환)
+    cr = result.get("composite_risk") or {}
+    cr_overall = cr.get("overall") if isinstance(cr, dict) else None
+    if cr_overall in _COMPOSITE_TO_RISK_LEVEL:
+        result["risk_level"] = _COMPOSITE_TO_RISK_LEVEL[cr_overall]
+
+    # v1 호환 필드 자동 매핑 — 백오피스 7 페이지 호환 (1개월 병행 후 DROP 예정)
+    v1_compat = build_v1_compat_fields(result, message_count=total_user_turns)
+    for k, v in v1_compat.items():
+        result.setdefault(k, v)
+
+    # 기존 v1 검증 — sentiment/risk_level 안전성 (v2 normalize 가 이미 처리)
+    valid_sentiments = {"positive", "negative", "neutral", "worried", "grateful", "curious", "confused"}
+    if result.get("sentiment") not in valid_sentiments:
+        result["sentiment"] = "neutral"
+
+    valid_risk_levels = {"low", "medium", "high"}
+    if result.get("risk_level") not in valid_risk_levels:
+        result["risk_level"] = "low"
+
+    # interest_tags 정규화 (v1 호환 — health_concerns 에서 매핑됐지만 안전성 한 번 더)
+    raw_tags = result.get("interest_tags", [])
+    if not isinstance(raw_tags, list):
+        raw_tags = []
+    normalized_tags = []
+    for tag in raw_tags[:5]:
+        if isinstance(tag, dict) and "topic" in tag:
+            intensity = tag.get("intensity", "medium")
+            if intensity not in ("high", "medium", "low"):
+                intensity = "medium"
+            normalized_tags.append({"topic": str(tag["topic"]), "intensity": intensity})
+        elif isinstance(tag, str):
+            normalized_tags.append({"topic": tag, "intensity": "medium"})
+    result["interest_tags"] = normalized_tags
+
+    if not isinstance(result.get("key_concerns"), list):
+        result["key_concerns"] = []
+    result["key_concerns"] = [str(c) for c in result["key_concerns"][:3]]
+
+    if not isinstance(result.get("follow_up_needed"), bool):
+        result["follow_up_needed"] = False
+
+    if not isinstance(result.get("summary"), str):
+        result["summary"] = ""
+
+    # counselor_recommendations
+    raw_recs = result.get("counselor_recommendations", [])
+    if not isinstance(raw_recs, list):
+        raw_recs = []
+    result["counselor_recommendations"] = [str(r) for r in raw_recs[:3]]
+
+    # conversation_depth
+    valid_depths = {"deep", "moderate", "shallow"}
+    if result.get("conversation_depth") not in valid_depths:
+        result["conversation_depth"] = "shallow"
+
+    # engagement_score
+    eng_score = result.get("engagement_score", 0)
+    result["engagement_score"] = max(0, min(100, int(eng_score) if isinstance(eng_score, (int, float)) else 0))
+
+    # action_intent
+    valid_intents = {"active", "considering", "passive"}
+    if result.get("action_intent") not in valid_intents:
+        result["action_intent"] = "passive"
+
+    # nutrition_interests
+    raw_nutrition = result.get("nutrition_interests", [])
+    result["nutrition_interests"] = [str(n) for n in raw_nutrition[:5]] if isinstance(raw_nutrition, list) else []
+
+    # commercial_tags 검증
+    raw_commercial = result.get("commercial_tags", [])
+    if not isinstance(raw_commercial, list):
+        raw_commercial = []
+    validated_commercial = []
+    for ct in raw_commercial[:10]:
+        if isinstance(ct, dict) and "category" in ct:
+            segment = ct.get("segment", "일반")
+            if segment not in ("고관여", "일반"):
+                segment = "일반"
+            validated_commercial.append({
+                "category": str(ct["category"]),
+                "product_hint": str(ct.get("product_hint", "")),
+                "segment": segment,
+            })
+    result["commercial_tags"] = validated_commercial
+
+    # buying_signal 검증
+    valid_signals = {"high", "mid", "low"}
+    if result.get("buying_signal") not in valid_signals:
+        result["buying_signal"] = "low"
+
+    # classification_confidence 검증 (0.0-1.0)
+    raw_conf = result.get("classification_confidence", 0.5)
+    try:
+        conf_val = float(raw_conf)
+    except (ValueError, TypeError):
+        conf_val = 0.5
+    result["classification_confidence"] = max(0.0, min(1.0, conf_val))
+
+    # confidence가 낮으면 prospect_type override
+    if result["classification_confidence"] < 0.4:
+        result["prospect_type"] = "uncertain"
+
+    # ── 병원 전용 필드 검증 (모든 세션에 항상 적용) ──
+    def _normalize_tag_list(raw: Any, max_items: int = 15) -> list:
+        """LLM이 반환한 태그를 순수 문자열 리스트로 정규화.
+        dict({"topic":"혈압",...})가 오면 topic만 추출, 문자열이면 그대로."""
+        if not isinstance(raw, list):
+            return []
+        normalized = []
+        for t in raw[:max_items]:
+            if isinstance(t, dict):
+                normalized.append(str(t.get("topic", t.get("name", ""))))
+            elif isinstance(t, str):
+                normalized.append(t)
+            else:
+                normalized.append(str(t))
+        return [s for s in normalized if s]
+
+    result["medical_tags"] = _normalize_tag_list(result.get("medical_tags", []), 15)
+    result["lifestyle_tags"] = _normalize_tag_list(result.get("lifestyle_tags", []), 10)
+
+    valid_urgency = {"urgent", "borderline", "normal"}
+    if result.get("medical_urgency") not in valid_urgency:
+        result["medical_urgency"] = "normal"
+
+    valid_anxiety = {"high", "medium", "low"}
+    if result.get("anxiety_level") not in valid_anxiety:
+        result["anxiety_level"] = "low"
+
+    valid_prospects = {"chronic_management", "needs_visit", "borderline_worried", "lifestyle_improvable", "low_engagement", "uncertain"}
+    if result.get("prospect_type") not in valid_prospects:
+        result["prospect_type"] = "chronic_management"
+
+    hp_score = result.get("hospital_prospect_score", 0)
+    result["hospital_prospect_score"] = max(0, min(100, int(hp_score) if isinstance(hp_score, (int, float)) else 0))
+
+    logger.info(f"[태깅-LLM] 분석 완료: sentiment={result['sentiment']}, "
+                 f"tags={len(result['interest_tags'])}, risk={result['risk_level']}")
+    return result
+
+
 async def llm_analyze_session(
     messages: List[Dict[str, str]],
     health_metrics: Optional[Dict[str, Any]] = None,
@@ -515,11 +758,17 @@ async def llm_analyze_session(
     medical_history: Optional[list] = None,
     survey_data: Optional[Dict[str, Any]] = None,
     es_behavior: Optional[Dict[str, Any]] = None,
+    session_id: Optional[str] = None,
+    partner_id: Optional[str] = None,
+    hospital_id: Optional[str] = None,
 ) -> tuple[Optional[Dict[str, Any]], str]:
     """
     Gemini Flash Lite를 사용하여 대화 세션을 분석합니다.
     v3: 검진수치 + 환자프로필 + 병력 + 설문 + ES행동 + 대화패턴 멀티채널 통합.
 
+    Args:
+        session_id/partner_id/hospital_id: llm_usage_log 추적용 (선택)
+
     Returns:
         (result, error_reason) 튜플.
         - result: {summary, sentiment, interest_tags, ...} 또는 실패 시 None
@@ -532,59 +781,15 @@ async def llm_analyze_session(
         from .llm_router import llm_router
         from .gemini_service import GeminiRequest
 
-        # 대화를 순서대로 번호 매겨서 포맷 (흐름 파악 + 화자 구분)
-        conv_lines = []
-        user_turn = 0
-        for i, m in enumerate(messages):
-            content = m.get("content", "").strip()
-            if not content:
-                continue
-            if m.get("role") == "user":
-                user_turn += 1
-                conv_lines.append(f"[환자 질문 #{user_turn}] {content}")
-            else:
-                conv_lines.append(f"[상담사 답변 #{user_turn}] {content}")
-
-        conversation_text = "\n".join(conv_lines)
-        if len(conversation_text) > 2500:
-            conversation_text = conversation_text[:2500] + "\n...(이하 생략)"
-
-        total_user_turns = user_turn
-
-        # ── 멀티채널 컨텍스트 구성 (v3) ──
-        health_context = _format_health_data_for_prompt(
-            health_metrics or {}, patient_info, medical_history)
-
-        survey_context = ""
-        if survey_data:
-            survey_context = _format_survey_for_prompt(survey_data)
-
-        es_context = ""
-        if es_behavior:
-            es_lines = ["[이 병원 수검자 행동 요약] (최근 30일)"]
-            for label, count in es_behavior.items():
-                if count:
-                    es_lines.append(f"{label}: {count}")
-            if len(es_lines) > 1:
-                es_context = "\n".join(es_lines)
-
-        conv_pattern = _format_conversation_pattern(messages)
-
-        # 컨텍스트 블록 조립 (데이터 있는 섹션만 포함 — graceful degradation)
-        context_blocks = [b for b in [health_context, survey_context, es_context] if b]
-        context_section = "\n\n".join(context_blocks) if context_blocks else "[검진 데이터 없음]"
+        sections = _build_session_sections(
+            messages, health_metrics, patient_info, medical_history, survey_data, es_behavior)
 
         # P2 v2: B2B CRM 5 산업군 태깅 — chat_tagging_v2_prompt.build_prompt_v2 사용
         # SoT: docs/spec/B2B_TAGGING_SYSTEM_v2.md
         # 출력: health_concerns / industry_scores (5 산업군) / signals / sentiment / risk_level / summary / evidence_quotes
         # v1 호환 필드 (interest_tags, prospect_type, hospital_prospect_score 등) 는 build_v1_compat_fields 알고리즘 매핑으로 채움
         from .chat_tagging_v2_prompt import build_prompt_v2
-        prompt = build_prompt_v2(
-            conversation_text=conversation_text,
-            total_user_turns=total_user_turns,
-            context_section=context_section,
-            conv_pattern=conv_pattern,
-        )
+        prompt = build_prompt_v2(**sections)
 
         # llm_router 호출 (Gemini 우선, 실패 시 OpenAI 자동 폴백)
         # response_format=json_object → Gemini는 application/json 강제, OpenAI는 동일 옵션 지원
@@ -597,6 +802,9 @@ async def llm_analyze_session(
                 response_format={"type": "json_object"},
             ),
             endpoint="chat_tagging",
+            session_id=session_id,
+            partner_id=partner_id,
+            hospital_id=hospital_id,
             save_log=False,
         )
 
@@ -604,178 +812,184 @@ async def llm_analyze_session(
             logger.warning("[태깅-LLM] llm_router 응답 실패: %s", llm_resp.error)
             return None, f"api_error:{llm_resp.error or 'no content'}"
 
-        raw_text = llm_resp.content.strip()
+        result = _parse_llm_json(llm_resp.content)
+        return _postprocess_llm_result(result, sections["total_user_turns"]), ""
 
-        # JSON 파싱 (```json ... ``` 감싸기 대응)
-        if raw_text.startswith("```"):
-            raw_text = raw_text.split("\n", 1)[-1]
-            if raw_text.endswith("```"):
-                raw_text = raw_text[:-3]
-            raw_text = raw_text.strip()
+    except json.JSONDecodeError as e:
+        logger.warning(f"[태깅-LLM] JSON 파싱 실패: {e}")
+        return None, "json_parse_error"
+    except Exception as e:
+        logger.warning(f"[태깅-LLM] Gemini 호출 실패: {e}")
+        return None, f"api_error:{e}"
 
-        result = json.loads(raw_text)
 
-        # ─── v2/v3 B2B CRM 태깅 — 검증 + 정규화 + v1 호환 매핑 ─────────
-        from .chat_tagging_v2_prompt import (
-            normalize_v2_tags, validate_v2_tags, build_v1_compat_fields,
-            _COMPOSITE_TO_RISK_LEVEL,
-        )
+# ─── 배치 LLM 태깅 (여러 세션을 한 요청으로) ────────────────────────
+# 단건 prompt 의 지시/산업군 정의/schema/규칙(약 4천 자)은 세션마다 같다.
+# 짧은 세션 여러 개를 한 요청에 묶어 공통 부분을 1회만 보내고 results.<키> 로 나눠 받는다.
+# 긴 세션(섹션 합계가 BATCH_SESSION_MAX_CHARS 초과)은 단건 호출 — 출력 품질/토큰 한도 보호.
+
+BATCH_SESSION_MAX_CHARS = 2000    # 이보다 긴 세션은 배치에 넣지 않음
+BATCH_PROMPT_MAX_CHARS = 7000     # 배치 1건에 들어가는 세션 섹션 합계 상한
+BATCH_MAX_TOKENS_PER_SESSION = 2000
+BATCH_MAX_TOKENS_CAP = 8192
+
+
+def _section_chars(sections: Dict[str, Any]) -> int:
+    return (len(sections["conversation_text"]) + len(sections["context_section"])
+            + len(sections["conv_pattern"]))
+
+
+def _pack_batches(
+    sized: List[tuple], batch_size: int, max_chars: int = BATCH_PROMPT_MAX_CHARS,
+) -> List[List[Any]]:
+    """(항목, 크기) 목록을 순서대로 batch_size 개·max_chars 이내 묶음으로 나눔."""
+    batches: List[List[Any]] = []
+    current: List[Any] = []
+    used = 0
+    for item, size in sized:
+        if current and (len(current) >= batch_size or used + size > max_chars):
+            batches.append(current)
+            current, used = [], 0
+        current.append(item)
+        used += size
+    if current:
+        batches.append(current)
+    return batches
+
+
+async def _analyze_single(item: Dict[str, Any]) -> tuple[Optional[Dict[str, Any]], str]:
+    return await llm_analyze_session(
+        item["messages"], item.get("health_metrics"),
+        patient_info=item.get("patient_info"),
+        medical_history=item.get("medical_history"),
+        survey_data=item.get("survey_data"),
+        es_behavior=item.get("es_behavior"),
+        session_id=item.get("session_id"),
+        partner_id=item.get("partner_id"),
+        hospital_id=item.get("hospital_id"),
+    )
 
-        # v2/v3 출력 정규화 (누락 필드 default + clamp + intent default)
-        result = normalize_v2_tags(result)
-
-        # 검증 — 실패 시 logger.warning + 정규화된 default 사용 (응답 차단 X)
-        v2_err = validate_v2_tags(result)
-        if v2_err:
-            logger.warning("[태깅-v2] 검증 실패 (default 사용): %s", v2_err)
-
-        # v3 — composite_risk 가 LLM 출력에 있으면 risk_level override (백오피스 호환)
-        cr = result.get("composite_risk") or {}
-        cr_overall = cr.get("overall") if isinstance(cr, dict) else None
-        if cr_overall in _COMPOSITE_TO_RISK_LEVEL:
-            result["risk_level"] = _COMPOSITE_TO_RISK_LEVEL[cr_overall]
-
-        # v1 호환 필드 자동 매핑 — 백오피스 7 페이지 호환 (1개월 병행 후 DROP 예정)
-        v1_compat = build_v1_compat_fields(result, message_count=total_user_turns)
-        for k, v in v1_compat.items():
-            result.setdefault(k, v)
-
-        # 기존 v1 검증 — sentiment/risk_level 안전성 (v2 normalize 가 이미 처리)
-        valid_sentiments = {"positive", "negative", "neutral", "worried", "grateful", "curious", "confused"}
-        if result.get("sentiment") not in valid_sentiments:
-            result["sentiment"] = "neutral"
-
-        valid_risk_levels = {"low", "medium", "high"}
-        if result.get("risk_level") not in valid_risk_levels:
-            result["risk_level"] = "low"
-
-        # interest_tags 정규화 (v1 호환 — health_concerns 에서 매핑됐지만 안전성 한 번 더)
-        raw_tags = result.get("interest_tags", [])
-        if not isinstance(raw_tags, list):
-            raw_tags = []
-        normalized_tags = []
-        for tag in raw_tags[:5]:
-            if isinstance(tag, dict) and "topic" in tag:
-                intensity = tag.get("intensity", "medium")
-                if intensity not in ("high", "medium", "low"):
-                    intensity = "medium"
-                normalized_tags.append({"topic": str(tag["topic"]), "intensity": intensity})
-            elif isinstance(tag, str):
-                normalized_tags.append({"topic": tag, "intensity": "medium"})
-        result["interest_tags"] = normalized_tags
-
-        if not isinstance(result.get("key_concerns"), list):
-            result["key_concerns"] = []
-        result["key_concerns"] = [str(c) for c in result["key_concerns"][:3]]
-
-        if not isinstance(result.get("follow_up_needed"), bool):
-            result["follow_up_needed"] = False
-
-        if not isinstance(result.get("summary"), str):
-            result["summary"] = ""
-
-        # counselor_recommendations
-        raw_recs = result.get("counselor_recommendations", [])
-        if not isinstance(raw_recs, list):
-            raw_recs = []
-        result["counselor_recommendations"] = [str(r) for r in raw_recs[:3]]
-
-        # conversation_depth
-        valid_depths = {"deep", "moderate", "shallow"}
-        if result.get("conversation_depth") not in valid_depths:
-            result["conversation_depth"] = "shallow"
-
-        # engagement_score
-        eng_score = result.get("engagement_score", 0)
-        result["engagement_score"] = max(0, min(100, int(eng_score) if isinstance(eng_score, (int, float)) else 0))
-
-        # action_intent
-        valid_intents = {"active", "considering", "passive"}
-        if result.get("action_intent") not in valid_intents:
-            result["action_intent"] = "passive"
-
-        # nutrition_interests
-        raw_nutrition = result.get("nutrition_interests", [])
-        result["nutrition_interests"] = [str(n) for n in raw_nutrition[:5]] if isinstance(raw_nutrition, list) else []
-
-        # commercial_tags 검증
-        raw_commercial = result.get("commercial_tags", [])
-        if not isinstance(raw_commercial, list):
-            raw_commercial = []
-        validated_commercial = []
-        for ct in raw_commercial[:10]:
-            if isinstance(ct, dict) and "category" in ct:
-                segment = ct.get("segment", "일반")
-                if segment not in ("고관여", "일반"):
-                    segment = "일반"
-                validated_commercial.append({
-                    "category": str(ct["category"]),
-                    "product_hint": str(ct.get("product_hint", "")),
-                    "segment": segment,
-                })
-        result["commercial_tags"] = validated_commercial
 
-        # buying_signal 검증
-        valid_signals = {"high", "mid", "low"}
-        if result.get("buying_signal") not in valid_signals:
-            result["buying_signal"] = "low"
+async def _analyze_batch(
+    group: List[Dict[str, Any]],
+) -> Dict[str, tuple[Optional[Dict[str, Any]], str]]:
+    """세션 2개 이상을 한 요청으로 분석. 요청 실패/결과 누락 세션은 단건 호출로 폴백."""
+    from .llm_router import llm_router
+    from .gemini_service import GeminiRequest
+    from .chat_tagging_v2_prompt import build_batch_prompt_v2
 
-        # classification_confidence 검증 (0.0-1.0)
-        raw_conf = result.get("classification_confidence", 0.5)
+    prompt = build_batch_prompt_v2([dict(item["sections"], key=item["key"]) for item in group])
+    session_chars = {item["key"]: _section_chars(item["sections"]) for item in group}
+    shared_chars = max(0, len(prompt) - sum(session_chars.values())) / len(group)
+
+    def _usage_split(resp: Any) -> Dict[str, Dict[str, Any]]:
+        # input: 공통 prompt 균등 + 자기 섹션 길이 / output: 자기 결과 JSON 길이
+        out_chars: Dict[str, int] = {}
         try:
-            conf_val = float(raw_conf)
+            parsed = _parse_llm_json(getattr(resp, "content", "") or "")
+            results = parsed.get("results") if isinstance(parsed, dict) else None
+            if isinstance(results, dict):
+                out_chars = {str(k): len(json.dumps(v, ensure_ascii=False)) for k, v in results.items()}
         except (ValueError, TypeError):
-            conf_val = 0.5
-        result["classification_confidence"] = max(0.0, min(1.0, conf_val))
-
-        # confidence가 낮으면 prospect_type override
-        if result["classification_confidence"] < 0.4:
-            result["prospect_type"] = "uncertain"
-
-        # ── 병원 전용 필드 검증 (모든 세션에 항상 적용) ──
-        def _normalize_tag_list(raw: Any, max_items: int = 15) -> list:
-            """LLM이 반환한 태그를 순수 문자열 리스트로 정규화.
-            dict({"topic":"혈압",...})가 오면 topic만 추출, 문자열이면 그대로."""
-            if not isinstance(raw, list):
-                return []
-            normalized = []
-            for t in raw[:max_items]:
-                if isinstance(t, dict):
-                    normalized.append(str(t.get("topic", t.get("name", ""))))
-                elif isinstance(t, str):
-                    normalized.append(t)
-                else:
-                    normalized.append(str(t))
-            return [s for s in normalized if s]
-
-        result["medical_tags"] = _normalize_tag_list(result.get("medical_tags", []), 15)
-        result["lifestyle_tags"] = _normalize_tag_list(result.get("lifestyle_tags", []), 10)
-
-        valid_urgency = {"urgent", "borderline", "normal"}
-        if result.get("medical_urgency") not in valid_urgency:
-            result["medical_urgency"] = "normal"
-
-        valid_anxiety = {"high", "medium", "low"}
-        if result.get("anxiety_level") not in valid_anxiety:
-            result["anxiety_level"] = "low"
-
-        valid_prospects = {"chronic_management", "needs_visit", "borderline_worried", "lifestyle_improvable", "low_engagement", "uncertain"}
-        if result.get("prospect_type") not in valid_prospects:
-            result["prospect_type"] = "chronic_management"
-
-        hp_score = result.get("hospital_prospect_score", 0)
-        result["hospital_prospect_score"] = max(0, min(100, int(hp_score) if isinstance(hp_score, (int, float)) else 0))
-
-        logger.info(f"[태깅-LLM] 분석 완료: sentiment={result['sentiment']}, "
-                     f"tags={len(result['interest_tags'])}, risk={result['risk_level']}")
-        return result, ""
+            pass
+        return {
+            item.get("session_id") or item["key"]: {
+                "input": shared_chars + session_chars[item["key"]],
+                "output": out_chars.get(item["key"], 0) if out_chars else 1,
+                "partner_id": item.get("partner_id"),
+                "hospital_id": item.get("hospital_id"),
+            }
+            for item in group
+        }
 
+    outcomes: Dict[str, tuple[Optional[Dict[str, Any]], str]] = {}
+    try:
+        llm_resp = await llm_router.call_api(
+            GeminiRequest(
+                prompt=prompt,
+                model=settings.google_gemini_lite_model,
+                temperature=0.5,
+                max_tokens=min(BATCH_MAX_TOKENS_PER_SESSION * len(group), BATCH_MAX_TOKENS_CAP),
+                response_format={"type": "json_object"},
+            ),
+            endpoint="chat_tagging",
+            save_log=False,
+            usage_split=_usage_split,
+        )
+        if llm_resp.success and llm_resp.content:
+            parsed = _parse_llm_json(llm_resp.content)
+            results = parsed.get("results") if isinstance(parsed, dict) else None
+            if isinstance(results, dict):
+                for item in group:
+                    raw = results.get(item["key"])
+                    if not isinstance(raw, dict):
+                        continue
+                    try:
+                        outcomes[item["key"]] = (
+                            _postprocess_llm_result(raw, item["sections"]["total_user_turns"]), "")
+                    except Exception as e:
+                        logger.warning(f"[태깅-LLM배치] 세션 결과 정규화 실패 key={item['key']}: {e}")
+        else:
+            logger.warning("[태깅-LLM배치] llm_router 응답 실패 (단건 폴백): %s", llm_resp.error)
     except json.JSONDecodeError as e:
-        logger.warning(f"[태깅-LLM] JSON 파싱 실패: {e}")
-        return None, "json_parse_error"
+        logger.warning(f"[태깅-LLM배치] JSON 파싱 실패 (단건 폴백): {e}")
     except Exception as e:
-        logger.warning(f"[태깅-LLM] Gemini 호출 실패: {e}")
-        return None, f"api_error:{e}"
+        logger.warning(f"[태깅-LLM배치] 호출 실패 (단건 폴백): {e}")
+
+    missing = [item for item in group if item["key"] not in outcomes]
+    if missing:
+        logger.info(f"[태깅-LLM배치] {len(group)}건 중 {len(missing)}건 단건 재시도")
+        singles = await asyncio.gather(*(_analyze_single(item) for item in missing))
+        for item, outcome in zip(missing, singles):
+            outcomes[item["key"]] = outcome
+    return outcomes
+
+
+async def llm_analyze_sessions_batch(
+    items: List[Dict[str, Any]],
+    batch_size: Optional[int] = None,
+) -> Dict[str, tuple[Optional[Dict[str, Any]], str]]:
+    """
+    여러 세션을 묶어 LLM 분석 — 짧은 세션은 batch_size 개씩 한 요청, 긴 세션은 단건 호출.
+
+    Args:
+        items: [{key, messages, health_metrics, patient_info, medical_history,
+                 survey_data, es_behavior, session_id?, partner_id?, hospital_id?}, ...]
+        batch_size: 요청당 최대 세션 수 (기본 settings.chat_tagging_batch_size)
+
+    Returns:
+        {key: (result, error_reason)} — 값은 llm_analyze_session 과 같은 형태
+    """
+    batch_size = max(1, batch_size or settings.chat_tagging_batch_size)
+    small: List[tuple] = []
+    singles: List[Dict[str, Any]] = []
+    for item in items:
+        item = dict(item)
+        item["sections"] = _build_session_sections(
+            item["messages"], item.get("health_metrics"), item.get("patient_info"),
+            item.get("medical_history"), item.get("survey_data"), item.get("es_behavior"))
+        size = _section_chars(item["sections"])
+        if batch_size > 1 and size <= BATCH_SESSION_MAX_CHARS:
+            small.append((item, size))
+        else:
+            singles.append(item)
+
+    groups = _pack_batches(small, batch_size)
+    for group in [g for g in groups if len(g) == 1]:
+        singles.extend(group)
+    groups = [g for g in groups if len(g) > 1]
+
+    results = await asyncio.gather(
+        *(_analyze_batch(g) for g in groups),
+        *(_analyze_single(item) for item in singles),
+    )
+    outcomes: Dict[str, tuple[Optional[Dict[str, Any]], str]] = {}
+    for group_result in results[:len(groups)]:
+        outcomes.update(group_result)
+    for item, outcome in zip(singles, results[len(groups):]):
+        outcomes[item["key"]] = outcome
+    logger.info(f"[태깅-LLM배치] 세션 {len(items)}건 → 배치 요청 {len(groups)}건 + 단건 {len(singles)}건")
+    return outcomes
 
 
 # ─── DB에서 대화 메시지 로드 ────────────────────────────────────────
@@ -865,7 +1079,7 @@ async def load_survey_data_for_session(user_uuid: str, hospital_id: str) -> Opti
     """Redis에서 설문 응답을 로드. 실패 시 None."""
     try:
         import redis
-        r = redis.from_url("redis://10.0.1.10:6379/0", decode_responses=True, socket_timeout=2)
+        r = redis.from_url(settings.redis_url, decode_responses=True, socket_timeout=2)
         survey_key = f"welno:survey:{user_uuid}:{hospital_id}"
         raw = r.get(survey_key)
         if not raw:
@@ -882,45 +1096,10 @@ async def load_es_behavior_for_hospital(
 ) -> Optional[Dict[str, Any]]:
     """ES에서 병원 레벨 행동 데이터 조회 (business 인덱스). 실패 시 None.
     NOTE: ES data.user.name은 마스킹됨(이*옥) → WELNO 원본명과 매칭 불가.
-          따라서 개인별이 아닌 병원 레벨 활동 요약으로 제공."""
-    from urllib.request import Request, urlopen
-    ES_URL = "http://10.0.0.10:9200"
-    try:
-        query = json.dumps({
-            "size": 0,
-            "query": {"bool": {"must": [
-                {"term": {"header.hospital.id": hospital_id}},
-                {"range": {"header.@timestamp": {"gte": f"now-{days}d"}}},
-            ]}},
-            "aggs": {
-                "events": {"terms": {"field": "data.context", "size": 20}},
-                "unique_users": {"cardinality": {"field": "data.user.webAppKey"}},
-            },
-        }).encode()
-        req = Request(f"{ES_URL}/medilinx-logs-business/_search",
-                      data=query, headers={"Content-Type": "application/json"})
-        with urlopen(req, timeout=5) as resp:
-            biz_data = json.loads(resp.read())
-
-        aggs = biz_data.get("aggregations", {})
-        total_users = aggs.get("unique_users", {}).get("value", 0)
-        buckets = aggs.get("events", {}).get("buckets", [])
-
-        result = {}
-        if total_users:
-            result["이 병원 활성 수검자 수"] = f"{total_users}명"
-        for b in buckets:
-            key = b.get("key", "")
-            count = b.get("doc_count", 0)
-            if "ResultOpen" in key:
-                result["결과 열람 총 횟수"] = f"{count}회"
-            elif "BannerClick" in key:
-                result["배너 클릭 총 횟수"] = f"{count}회"
-
-        return result if result else None
-    except Exception as e:
-        logger.debug(f"[태깅] ES 행동 데이터 조회 실패 (무시): {e}")
-        return None
+          따라서 개인별이 아닌 병원 레벨 활동 요약으로 제공.
+    병원별 집계는 es_service 캐시(TTL 10분, 만료 후 백그라운드 갱신)를 공유한다."""
+    from .es_service import es_service
+    return await es_service.hospital_behavior(hospital_id, days)
 
 
 def _format_survey_for_prompt(survey: Dict[str, Any]) -> str:
@@ -1166,6 +1345,31 @@ async def _save_tags_to_db(tag_data: Dict[str, Any]) -> None:
         json.dumps(evidence_quotes, ensure_ascii=False) if evidence_quotes else None,
         json.dumps(composite_risk, ensure_ascii=False) if composite_risk else None,  # v3
     ))
+    await refresh_revisit_candidate(d["session_id"])
+
+
+_REFRESH_REVISIT_SQL = "SELECT welno.refresh_revisit_candidate(%s)"
+
+
+async def refresh_revisit_candidate(session_id: str) -> None:
+    """
+    재방문 후보 인덱스(welno.tb_revisit_candidate_index) 1건 갱신.
+    태그/상담 상태가 바뀐 뒤 호출 — 후보 조건이 풀린 세션은 인덱스에서 빠진다.
+    인덱스 갱신 실패는 태그 저장을 막지 않음 (rebuild_revisit_candidate_index 로 보정).
+    """
+    try:
+        await db_manager.execute_update(_REFRESH_REVISIT_SQL, (session_id,))
+    except Exception as e:
+        logger.warning(f"[태깅] 재방문 후보 인덱스 갱신 실패 session={session_id}: {e}")
+
+
+_REBUILD_REVISIT_SQL = "SELECT welno.rebuild_revisit_candidate_index() AS count"
+
+
+async def rebuild_revisit_candidate_index() -> int:
+    """재방문 후보 인덱스 전체 재적재 (main 주기 작업). 적재된 후보 수 반환."""
+    row = await db_manager.execute_one(_REBUILD_REVISIT_SQL)
+    return int(row["count"]) if row else 0
 
 
 # ─── 메인 태깅 함수 (LLM + 규칙 기반 하이브리드) ──────────────────
@@ -1176,6 +1380,7 @@ async def tag_chat_session(
     messages: Optional[List[Dict[str, str]]] = None,
     health_metrics: Optional[Dict[str, Any]] = None,
     has_discrepancy: bool = False,
+    analyzer: Optional[Callable[..., Awaitable[tuple]]] = None,
 ) -> Optional[Dict[str, Any]]:
     """
     대화 세션에 대한 자동 태깅 수행 및 DB 저장.
@@ -1187,6 +1392,7 @@ async def tag_chat_session(
         messages: 대화 메시지 리스트 (None이면 DB에서 로드)
         health_metrics: 검진 데이터 (None이면 DB에서 로드)
         has_discrepancy: CLIENT_RAG_DISCREPANCY 발생 여부
+        analyzer: LLM 분석 함수 (기본 llm_analyze_session — 배치 태깅은 묶음 분석기 주입)
 
     Returns:
         저장된 태그 데이터 또는 None
@@ -1219,16 +1425,17 @@ async def tag_chat_session(
                 context["hospital_id"])
 
         # ── Phase H: 대화 의도 1차 분류 (LLM 호출 전 전처리) ──
-        conversation_intent = classify_conversation_intent(messages)
+        scanned = scan(messages)
+        conversation_intent = classify_conversation_intent(messages, scanned)
 
         # 규칙 기반 결과 (항상 계산 — risk_tags, data_quality는 규칙 기반 유지)
         risk_tags = extract_risk_tags(health_metrics)
-        keyword_tags = extract_keyword_tags(messages)
+        keyword_tags = extract_keyword_tags(messages, scanned)
         data_quality = calculate_data_quality_score(health_metrics)
 
         # 비건강 대화는 LLM 호출 없이 최소 태깅 (비용 절감 + 잘못된 태깅 방지)
         if conversation_intent in ("ux_issue", "greeting", "off_topic"):
-            sentiment = detect_sentiment(messages)
+            sentiment = detect_sentiment(messages, scanned)
             summary = await generate_conversation_summary(messages)
             tag_data = {
                 "session_id": session_id,
@@ -1276,12 +1483,15 @@ async def tag_chat_session(
         llm_failed = False
         llm_error = None
 
-        llm_result, llm_err = await llm_analyze_session(
+        llm_result, llm_err = await (analyzer or llm_analyze_session)(
             messages, health_metrics,
             patient_info=patient_info,
             medical_history=medical_history,
             survey_data=survey_data,
             es_behavior=es_behavior,
+            session_id=session_id,
+            partner_id=partner_id,
+            hospital_id=context.get("hospital_id"),
         )
 
         if llm_err == "api_key_missing":
@@ -1457,118 +1667,113 @@ async def tag_chat_session(
         return None
 
 
+# ─── 배치 태깅 (큐 워커용) ─────────────────────────────────────────
+
+class _BatchAnalyzer:
+    """tag_chat_session 여러 건의 LLM 분석 단계를 모아 llm_analyze_sessions_batch 1회로 처리.
+
+    각 세션은 자기 흐름(데이터 로드 → 의도 분류 → 분석 → 저장)을 그대로 타고,
+    분석 단계에서만 여기서 대기한다. 모든 세션이 분석 요청을 했거나
+    분석 없이 끝나면(비건강 대화/메시지 없음/예외) 모인 세션을 한꺼번에 분석한다.
+    """
+
+    def __init__(self, expected: int, batch_size: Optional[int] = None):
+        self._expected = expected
+        self._batch_size = batch_size
+        self._settled: set = set()
+        self._items: List[Dict[str, Any]] = []
+        self._futures: Dict[str, asyncio.Future] = {}
+        self.flushed = False
+
+    def bind(self, key: str) -> Callable[..., Awaitable[tuple]]:
+        async def _analyze(messages, health_metrics=None, **kwargs):
+            future = asyncio.get_running_loop().create_future()
+            self._items.append(dict(kwargs, key=key, messages=messages, health_metrics=health_metrics))
+            self._futures[key] = future
+            self._settle(key)
+            return await future
+        return _analyze
+
+    def leave(self, key: str) -> None:
+        """세션 흐름 종료 — 분석 요청 없이 끝난 세션은 기다리지 않는다."""
+        self._settle(key)
+
+    def _settle(self, key: str) -> None:
+        if key in self._settled:
+            return
+        self._settled.add(key)
+        if len(self._settled) >= self._expected and not self.flushed:
+            self.flushed = True
+            asyncio.ensure_future(self._flush())
+
+    async def _flush(self) -> None:
+        if not self._items:
+            return
+        try:
+            outcomes = await llm_analyze_sessions_batch(self._items, self._batch_size)
+        except Exception as e:
+            logger.warning(f"[태깅-배치] 묶음 분석 실패: {e}")
+            outcomes = {}
+        for key, future in self._futures.items():
+            if not future.done():
+                future.set_result(outcomes.get(key, (None, "api_error:batch_missing")))
+
+
+async def tag_chat_sessions_batch(
+    sessions: List[Dict[str, str]],
+    batch_size: Optional[int] = None,
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    여러 세션을 태깅 — 세션별 흐름은 tag_chat_session 과 같고 LLM 분석만 묶어서 호출.
+
+    Args:
+        sessions: [{session_id, partner_id}, ...]
+        batch_size: LLM 요청당 최대 세션 수 (기본 settings.chat_tagging_batch_size)
+
+    Returns:
+        sessions 순서대로 tag_chat_session 반환값 (저장된 태그 데이터 또는 None)
+    """
+    collector = _BatchAnalyzer(len(sessions), batch_size)
+
+    async def _run(index: int, job: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        key = str(index)
+        try:
+            return await tag_chat_session(
+                job["session_id"], job["partner_id"], analyzer=collector.bind(key))
+        finally:
+            collector.leave(key)
+
+    return list(await asyncio.gather(*(_run(i, job) for i, job in enumerate(sessions))))
+
+
 # ─── 일괄 재태깅 ───────────────────────────────────────────────────
 
 async def retag_all_sessions(
     hospital_id: Optional[str] = None,
     force: bool = False,
+    source: str = "retag",
 ) -> Dict[str, Any]:
     """
-    기존 세션을 일괄 재태깅합니다.
+    기존 세션을 재태깅 큐(tb_chat_tagging_queue)에 적재하고 바로 반환합니다.
+    실제 태깅은 tagging_queue 워커가 chat_tagging quota 안에서 병렬로 처리합니다.
 
     Args:
         hospital_id: 특정 병원만 재태깅 (None이면 전체)
         force: True면 이미 LLM 태깅된 것도 재처리
+        source: 적재 출처 (retag / recovery — recovery 는 최종 실패 세션을 되살리지 않음)
 
     Returns:
-        {total, success, failed, skipped}
+        {total, enqueued, duplicates} — duplicates 는 이미 대기/실행 중인 세션
     """
-    result = {"total": 0, "success": 0, "failed": 0, "skipped": 0}
+    from .tagging_queue import enqueue_sessions
 
     try:
-        # 재태깅 대상 세션 조회
-        if force:
-            # 모든 세션
-            if hospital_id:
-                query = """
-                    SELECT session_id, partner_id
-                    FROM welno.tb_partner_rag_chat_log
-                    WHERE hospital_id = %s
-                    ORDER BY created_at DESC
-                """
-                sessions = await db_manager.execute_query(query, (hospital_id,))
-            else:
-                query = """
-                    SELECT session_id, partner_id
-                    FROM welno.tb_partner_rag_chat_log
-                    ORDER BY created_at DESC
-                """
-                sessions = await db_manager.execute_query(query)
-        else:
-            # 태그 없거나 규칙 기반인 세션만 (LLM 3회 이상 실패한 건 제외)
-            # llm_attempted=true AND llm_failed=true인 세션은 이미 LLM 시도 후
-            # rule-based 폴백된 것이므로 재시도해도 같은 결과 → 무한 루프 방지
-            if hospital_id:
-                query = """
-                    SELECT l.session_id, l.partner_id
-                    FROM welno.tb_partner_rag_chat_log l
-                    LEFT JOIN welno.tb_chat_session_tags t
-                        ON l.session_id = t.session_id AND l.partner_id = t.partner_id
-                    WHERE l.hospital_id = %s
-                      AND (t.session_id IS NULL OR t.tagging_model IS NULL)
-                    ORDER BY l.created_at DESC
-                    LIMIT 20
-                """
-                sessions = await db_manager.execute_query(query, (hospital_id,))
-            else:
-                query = """
-                    SELECT l.session_id, l.partner_id
-                    FROM welno.tb_partner_rag_chat_log l
-                    LEFT JOIN welno.tb_chat_session_tags t
-                        ON l.session_id = t.session_id AND l.partner_id = t.partner_id
-                    WHERE t.session_id IS NULL OR t.tagging_model IS NULL
-                    ORDER BY l.created_at DESC
-                    LIMIT 20
-                """
-                sessions = await db_manager.execute_query(query)
-
-        result["total"] = len(sessions)
-        logger.info(f"[재태깅] 대상 세션 {len(sessions)}건 (hospital={hospital_id}, force={force})")
-
-        for i, session in enumerate(sessions):
-            sid = session["session_id"]
-            pid = session["partner_id"]
-
-            try:
-                tag_result = await tag_chat_session(
-                    session_id=sid,
-                    partner_id=pid,
-                )
-                if tag_result:
-                    result["success"] += 1
-                else:
-                    result["skipped"] += 1
-            except Exception as e:
-                logger.warning(f"[재태깅] 실패 {sid}: {e}")
-                result["failed"] += 1
-
-            # 속도 제한: 2건마다 1초 대기 (Gemini quota 보호)
-            if (i + 1) % 2 == 0:
-                await asyncio.sleep(1)
-
-        logger.info(f"[재태깅] 완료: {result}")
-
-        # 실패가 있으면 Slack 요약 알림
-        if result["failed"] > 0:
-            try:
-                if settings.slack_enabled and settings.slack_webhook_url:
-                    from .slack_service import get_slack_service
-                    slack = get_slack_service(settings.slack_webhook_url, settings.slack_channel_id)
-                    await slack.send_tagging_alert({
-                        "session_id": f"batch ({result['total']}건)",
-                        "partner_id": hospital_id or "전체",
-                        "error_type": "BATCH_RETAG_PARTIAL_FAILURE",
-                        "error_message": f"성공 {result['success']}건, 실패 {result['failed']}건, 스킵 {result['skipped']}건",
-                    })
-            except Exception:
-                pass
-
-        return result
-
+        result = await enqueue_sessions(hospital_id=hospital_id, force=force, source=source)
     except Exception as e:
-        logger.error(f"[재태깅] 전체 실패: {e}")
-        result["failed"] = result["total"]
-        return result
+        logger.error(f"[재태깅] 큐 적재 실패: {e}")
+        raise
+    logger.info(f"[재태깅] 큐 적재 (hospital={hospital_id}, force={force}, source={source}): {result}")
+    return {"total": result["candidates"], "enqueued": result["enqueued"], "duplicates": result["duplicates"]}
 
 
 async def get_session_tags(session_id: str, partner_id: str) -> Optional[Dict[str, Any]]:
@@ -30,14 +30,7 @@ INDUSTRY_DEFS = """
 """.strip()
 
 
-def build_prompt_v2(
-    conversation_text: str,
-    total_user_turns: int,
-    context_section: str = "",
-    conv_pattern: str = "",
-) -> str:
-    """B2B CRM v3 태깅 prompt 생성. Fix 1~6 통합 강화."""
-    return f"""건강상담 대화를 B2B CRM 관점에서 분석합니다.
+_PROMPT_HEAD = f"""건강상담 대화를 B2B CRM 관점에서 분석합니다.
 환자(수검자) 질문과 상담사(AI) 답변이 턴 번호(#)로 구분됩니다.
 
 ⚠️ 절대 원칙:
@@ -70,55 +63,48 @@ def build_prompt_v2(
 
 ⚠️ 위 7개 패턴 중 1개 이상 매칭 안 되면 default 사용 — 그 외엔 default 금지.
 
-{INDUSTRY_DEFS}
-
-{context_section}
-
-{conv_pattern}
-
-[대화] (총 {total_user_turns}턴)
-{conversation_text}
+{INDUSTRY_DEFS}"""
 
-[출력 schema — JSON only]
-{{
+# 출력 schema (세션 1건 기준) — 배치 prompt 에서는 results.<세션키> 값으로 재사용
+_OUTPUT_SCHEMA = """{
   "summary": "환자가 ~를 질문하고, 상담사가 ~를 안내함 (1-2문장)",
 
   "sentiment": "worried|curious|confused|negative|positive|grateful|neutral",
   "risk_level": "low|medium|high",
   "follow_up_needed": true|false,
 
-  "composite_risk": {{
+  "composite_risk": {
     "overall": "critical|high|medium|low",
-    "factors": {{
+    "factors": {
       "metric_severity": "high|medium|low",
       "patient_concern": "high|medium|low",
       "urgency": "urgent|normal|relaxed"
-    }},
+    },
     "reason": "검진 수치 + 환자 표현 + 시급성 결정 근거 (1문장)"
-  }},
+  },
 
   "health_concerns": [
-    {{"topic": "혈압|혈당|콜레스테롤|간|신장|비만|정신건강|갑상선|일반",
+    {"topic": "혈압|혈당|콜레스테롤|간|신장|비만|정신건강|갑상선|일반",
       "intensity": "low|medium|high",
       "intent": "concern|info_seek|action|curiosity",
-      "evidence": "환자 발화 그대로 인용"}}
+      "evidence": "환자 발화 그대로 인용"}
   ],
 
-  "industry_scores": {{
-    "hospital":    {{"score": 0-100, "stage": "none|awareness|interest|consider|decision|action", "sub_categories": ["recall","consultation",...]}},
-    "supplement":  {{"score": 0-100, "stage": "...", "sub_categories": ["혈압관리","간보호",...]}},
-    "fitness":     {{"score": 0-100, "stage": "...", "sub_categories": ["체중관리",...]}},
-    "insurance":   {{"score": 0-100, "stage": "...", "sub_categories": ["실손","암",...]}},
-    "mental_care": {{"score": 0-100, "stage": "...", "sub_categories": ["불안","우울",...]}}
-  }},
+  "industry_scores": {
+    "hospital":    {"score": 0-100, "stage": "none|awareness|interest|consider|decision|action", "sub_categories": ["recall","consultation",...]},
+    "supplement":  {"score": 0-100, "stage": "...", "sub_categories": ["혈압관리","간보호",...]},
+    "fitness":     {"score": 0-100, "stage": "...", "sub_categories": ["체중관리",...]},
+    "insurance":   {"score": 0-100, "stage": "...", "sub_categories": ["실손","암",...]},
+    "mental_care": {"score": 0-100, "stage": "...", "sub_categories": ["불안","우울",...]}
+  },
 
-  "signals": {{
+  "signals": {
     "urgency": "urgent|normal|relaxed",
     "readiness": "committed|considering|postponed",
     "timeline_days": 0-365,
     "anxiety_level": "low|medium|high",
     "buying_intent": "strong|exploring|none"
-  }},
+  },
 
   "evidence_quotes": ["환자 발화1", "환자 발화2", "환자 발화3"],
   "key_concerns": ["환자가 표현한 우려 -- 최대 3개"],
@@ -130,9 +116,9 @@ def build_prompt_v2(
   "buying_signal": "low|mid|high",
   "nutrition_interests": ["영양제 카테고리 -- 환자 직접 언급한 것만"],
   "commercial_tags": ["상품 카테고리 -- LLM 판단"]
-}}
+}"""
 
-[P1] evidence / health_concerns.evidence — 환자 발화 strict
+_PROMPT_RULES = """[P1] evidence / health_concerns.evidence — 환자 발화 strict
 - 절대 금지: "고객님의 수치는...", "정상 범위 안에 있어도...", "권해요/추천해요" — 모두 상담사 답변
 - 사용 OK: 환자가 직접 묻거나 표현한 발화 (예: "간 수치를 낮추려면?", "걱정돼요")
 - 환자 발화 부족하면 evidence_quotes 빈 배열 [] (상담사 답변 인용 금지)
@@ -194,7 +180,68 @@ CRITICAL: 검진 수치만 보고 "환자가 우려할 것" 추정 금지. **환
 - "action": 행동 의지 ("어떻게 관리?", "낮추려면?")
 - "curiosity": 단순 호기심 ("궁금해서요")
 
-JSON 외 텍스트 출력 금지. 위 P1~P6 위반 시 결과 무효.""".strip()
+JSON 외 텍스트 출력 금지. 위 P1~P6 위반 시 결과 무효."""
+
+
+def _session_block(
+    conversation_text: str,
+    total_user_turns: int,
+    context_section: str = "",
+    conv_pattern: str = "",
+) -> str:
+    return f"""{context_section}
+
+{conv_pattern}
+
+[대화] (총 {total_user_turns}턴)
+{conversation_text}"""
+
+
+def build_prompt_v2(
+    conversation_text: str,
+    total_user_turns: int,
+    context_section: str = "",
+    conv_pattern: str = "",
+) -> str:
+    """B2B CRM v3 태깅 prompt 생성. Fix 1~6 통합 강화."""
+    block = _session_block(conversation_text, total_user_turns, context_section, conv_pattern)
+    return f"""{_PROMPT_HEAD}
+
+{block}
+
+[출력 schema — JSON only]
+{_OUTPUT_SCHEMA}
+
+{_PROMPT_RULES}""".strip()
+
+
+def build_batch_prompt_v2(sessions: List[Dict[str, Any]]) -> str:
+    """여러 세션을 한 번에 태깅하는 prompt — 공통 지시/schema/규칙은 1회만 포함.
+
+    sessions: [{key, conversation_text, total_user_turns, context_section, conv_pattern}, ...]
+    출력: {"results": {"<key>": <세션 1건 schema>, ...}}
+    """
+    blocks = []
+    for s in sessions:
+        block = _session_block(
+            s["conversation_text"], s["total_user_turns"],
+            s.get("context_section", ""), s.get("conv_pattern", ""),
+        )
+        blocks.append(f"=== [세션 {s['key']}] ===\n{block.strip()}\n=== [세션 {s['key']} 끝] ===")
+    keys = ", ".join(f'"{s["key"]}"' for s in sessions)
+    return f"""{_PROMPT_HEAD}
+
+⚠️ 배치 모드: 아래 {len(sessions)}개 세션은 서로 다른 환자입니다.
+각 세션은 자기 블록의 검진 데이터/대화만 근거로 독립 분석하고, 다른 세션 내용을 섞지 마세요.
+
+{chr(10).join(blocks)}
+
+[출력 schema — JSON only]
+{{"results": {{<세션키>: 세션 1건 결과, ...}}}}  — 세션키는 {keys} 전부 포함
+세션 1건 결과 schema:
+{_OUTPUT_SCHEMA}
+
+{_PROMPT_RULES}""".strip()
 
 
 # ─── v2 → v1 호환 매핑 (백오피스 5 페이지 유지) ────────────────────
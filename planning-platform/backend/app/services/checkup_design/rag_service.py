@@ -294,6 +294,15 @@ async def search_hospital_knowledge(
     }
 
 
+def invalidate_hospital_vector_cache(hospital_id: str) -> None:
+    """병원 인덱스 갱신 후 캐시된 FAISSVectorSearch 폐기 (다음 검색 시 재로드) + 해당 병원 시맨틱 답변 캐시 삭제."""
+    if _hospital_vs_cache.pop(hospital_id, None) is not None:
+        logger.info(f"병원 FAISS 캐시 무효화: {hospital_id}")
+    if settings.rag_semantic_cache_enabled:
+        from ..semantic_answer_cache import semantic_answer_cache
+        semantic_answer_cache.invalidate(hospital_id)
+
+
 async def _search_hospital_faiss(
     hospital_id: str, query: str
 ) -> List[Dict[str, Any]]:
@@ -2,21 +2,34 @@
 FAISS 벡터 검색 모듈 — llama-index 없이 직접 FAISS + OpenAI 임베딩 사용.
 
 데이터 구조 (llama-index가 생성한 형식과 호환):
-  faiss.index       — FAISS 바이너리 인덱스 (IndexFlatL2, dim=1536)
+  faiss.index       — FAISS 바이너리 인덱스 (IndexFlatL2 또는 IndexIDMap2, dim=1536)
+                      IndexIDMap2면 검색 label이 청크 ID (rag_index.hospital_index 참조)
   index_store.json  — FAISS idx(int) → node_id(UUID) 매핑
   docstore.json     — node_id(UUID) → {text, metadata} 매핑
+  faiss.ann.index   — (선택) 검색용 ANN 사이드카 (rag_index.index_factory 참조)
 """
 import asyncio
-import faiss
 import json
-import numpy as np
 import logging
 from pathlib import Path
-from openai import OpenAI
 from typing import List, Dict, Optional
 
+from ...core.tracing import traced
+from ..rag_index.index_factory import load_search_index
+
 logger = logging.getLogger(__name__)
 
+# openai SDK 는 import 만 ~0.6s — 부팅 시점이 아니라 첫 인스턴스 생성(또는 core.warmup)에서 로드
+OpenAI = None
+
+
+def _openai_client(api_key: str):
+    global OpenAI
+    if OpenAI is None:
+        from openai import OpenAI as _OpenAI
+        OpenAI = _OpenAI
+    return OpenAI(api_key=api_key)
+
 
 class FAISSVectorSearch:
     """FAISS 인덱스 + docstore를 직접 로드하여 벡터 검색 수행."""
@@ -24,14 +37,15 @@ class FAISSVectorSearch:
     def __init__(self, faiss_dir: str, openai_api_key: str,
                  embedding_model: str = "text-embedding-ada-002"):
         self.faiss_dir = faiss_dir
-        self.client = OpenAI(api_key=openai_api_key)
+        self.client = _openai_client(openai_api_key)
         self.model = embedding_model
 
-        # 1. FAISS 인덱스 로드 (mmap 모드: RSS에 잡히지 않아 PM2 OOM 방지)
+        # 1. FAISS 인덱스 로드 — ANN 사이드카(faiss.ann.index)가 최신이면 우선 사용,
+        #    없으면 flat을 mmap 모드로 (RSS에 잡히지 않아 PM2 OOM 방지)
         index_path = f"{faiss_dir}/faiss.index"
         if not Path(index_path).exists():
             raise FileNotFoundError(f"FAISS 인덱스 없음: {index_path}")
-        self.index = faiss.read_index(index_path, faiss.IO_FLAG_MMAP)
+        self.index, self.index_kind = load_search_index(faiss_dir)
 
         # 2. FAISS idx → node_id 매핑 (index_store.json)
         with open(f"{faiss_dir}/index_store.json") as f:
@@ -55,13 +69,17 @@ class FAISSVectorSearch:
             }
 
         logger.info(
-            f"FAISS 인덱스 로드 완료: {self.index.ntotal}개 벡터, "
+            f"FAISS 인덱스 로드 완료 ({self.index_kind}): {self.index.ntotal}개 벡터, "
             f"docstore {len(self.docstore)}개 노드"
         )
 
-    def search(self, query: str, top_k: int = 10) -> List[Dict]:
-        """쿼리 임베딩 → FAISS 검색 → 문서 반환."""
-        embedding = self._embed(query)
+    @traced("faiss", "vector_search")
+    def search(self, query: str, top_k: int = 10, embedding: Optional[List[float]] = None) -> List[Dict]:
+        """쿼리 임베딩 → FAISS 검색 → 문서 반환. embedding 을 주면 임베딩 호출 생략 (embed() 결과 재사용)."""
+        import numpy as np
+
+        if embedding is None:
+            embedding = self._embed(query)
         query_vec = np.array([embedding], dtype=np.float32)
         distances, indices = self.index.search(query_vec, top_k)
 
@@ -85,6 +103,11 @@ class FAISSVectorSearch:
         """search()의 async wrapper — 이벤트 루프 블로킹 방지."""
         return await asyncio.to_thread(self.search, query, top_k)
 
+    def embed(self, text: str) -> List[float]:
+        """검색과 같은 모델의 텍스트 임베딩 (시맨틱 답변 캐시 키 등 재사용용)."""
+        return self._embed(text)
+
+    @traced("embedding", "openai_embedding")
     def _embed(self, text: str) -> List[float]:
         """OpenAI 임베딩 API 호출."""
         resp = self.client.embeddings.create(input=text, model=self.model)
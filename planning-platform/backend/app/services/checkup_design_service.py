@@ -5,7 +5,6 @@ OpenAI GPT API를 사용하여 환자의 기존 검진 결과를 바탕으로
 맞춤형 검진을 설계합니다.
 """
 
-import openai
 from typing import List, Dict, Any, Optional
 from uuid import UUID
 from datetime import datetime, timedelta
@@ -33,6 +32,8 @@ class CheckupDesignService:
         self._design_repo = checkup_design_repository
         
         # OpenAI 클라이언트 초기화
+        import openai
+
         openai.api_key = settings.openai.api_key
         self._model = settings.openai.model
         self._max_tokens = settings.openai.max_tokens
@@ -267,6 +268,8 @@ class CheckupDesignService:
     async def _call_gpt_api(self, prompt: GPTPrompt) -> str:
         """GPT API 호출"""
         try:
+            import openai
+
             response = await openai.ChatCompletion.acreate(
                 model=self._model,
                 messages=[
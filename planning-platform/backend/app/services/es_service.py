@@ -0,0 +1,267 @@
+"""
+Elasticsearch 조회 계층 — 비동기 커넥션 풀 + 집계 캐시 + msearch
+
+기존에는 호출부마다 요청 때마다 새 연결을 열었다.
+  - chat_tagging_service: 세션 태깅마다 동기 urlopen 으로 병원 30일 집계 재계산 (이벤트 루프 차단)
+  - partner_office.patient_list: 요청마다 전체 webAppKey terms 집계(size 10000 + top_hits)
+이 모듈은
+  - 기본 URL 별 httpx.AsyncClient 1개를 재사용 (keep-alive 풀)
+  - 병원 단위 집계는 TTL 캐시(utils/ttl_cache.TTLCache) — 만료 후 stale_ttl 안쪽이면 이전 값을 바로 주고 백그라운드 갱신
+    (같은 키 동시 요청은 조회 1회로 합침)
+  - webAppKey 별 여정 건수/이름은 _msearch 로 묶어서 조회 (키별 TTL 캐시)
+ES 장애 시 조회 함수는 예외를 올리지 않고 None/빈 값을 돌려준다 (호출부 graceful degradation).
+"""
+
+import json
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import httpx
+
+from ..core.config import settings
+from ..utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+DATA_INDEX = "medilinx-logs-data"
+BUSINESS_INDEX = "medilinx-logs-business"
+FRONTEND_PROJECT = "med2-frontend-hana"
+
+# 병원 행동 집계 (태깅 prompt 용) — 30일 집계라 10분 지나도 의미 있는 변화 없음
+BEHAVIOR_TTL_SEC = 600
+BEHAVIOR_STALE_SEC = 3600
+# 환자 목록 여정 건수 / DOWNLOAD_ONLY 대상
+JOURNEY_TTL_SEC = 300
+DOWNLOAD_ONLY_TTL_SEC = 300
+DOWNLOAD_ONLY_STALE_SEC = 1800
+# 환자 이름은 거의 바뀌지 않음
+NAME_TTL_SEC = 3600
+# _msearch 1회당 검색 수
+MSEARCH_CHUNK = 100
+
+
+class ESService:
+    """기본 URL 별 공유 AsyncClient + 캐시된 집계 조회. 프로세스당 1개."""
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self.behavior_cache = TTLCache()
+        self.download_only_cache = TTLCache()
+        self.journey_cache = TTLCache()
+        self.name_cache = TTLCache()
+
+    # ── 저수준 ──
+
+    def _client(self, base_url: str) -> httpx.AsyncClient:
+        client = self._clients.get(base_url)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                base_url=base_url.rstrip("/"),
+                timeout=httpx.Timeout(settings.es_timeout_sec, connect=3.0),
+                limits=httpx.Limits(
+                    max_connections=settings.es_max_connections,
+                    max_keepalive_connections=settings.es_max_connections,
+                ),
+            )
+            self._clients[base_url] = client
+        return client
+
+    async def close(self) -> None:
+        for client in list(self._clients.values()):
+            await client.aclose()
+        self._clients.clear()
+
+    async def search(
+        self, index: str, body: Dict[str, Any], base_url: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        resp = await self._client(base_url or settings.elasticsearch_url).post(f"/{index}/_search", json=body)
+        resp.raise_for_status()
+        return resp.json()
+
+    async def msearch(
+        self, index: str, bodies: List[Dict[str, Any]], base_url: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """bodies 순서대로 응답 목록 반환. 검색별 오류는 {"error": ...} 항목으로 남는다."""
+        if not bodies:
+            return []
+        lines = []
+        for body in bodies:
+            lines.append("{}")
+            lines.append(json.dumps(body, ensure_ascii=False))
+        resp = await self._client(base_url or settings.elasticsearch_url).post(
+            f"/{index}/_msearch",
+            content=("\n".join(lines) + "\n").encode("utf-8"),
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        resp.raise_for_status()
+        return resp.json().get("responses", [])
+
+    # ── 병원 행동 집계 (태깅) ──
+
+    async def hospital_behavior(self, hospital_id: str, days: int = 30) -> Optional[Dict[str, Any]]:
+        """병원 레벨 최근 N일 행동 요약 (business 인덱스). 실패/데이터 없음 시 None.
+        NOTE: ES data.user.name은 마스킹됨(이*옥) → WELNO 원본명과 매칭 불가.
+              따라서 개인별이 아닌 병원 레벨 활동 요약으로 제공."""
+        try:
+            return await self.behavior_cache.get_or_load(
+                (hospital_id, days),
+                lambda: self._load_hospital_behavior(hospital_id, days),
+                ttl=BEHAVIOR_TTL_SEC, stale_ttl=BEHAVIOR_STALE_SEC,
+            )
+        except Exception as e:
+            logger.debug(f"[ES] 병원 행동 집계 조회 실패 (무시): {e}")
+            return None
+
+    async def _load_hospital_behavior(self, hospital_id: str, days: int) -> Optional[Dict[str, Any]]:
+        biz_data = await self.search(BUSINESS_INDEX, {
+            "size": 0,
+            "query": {"bool": {"must": [
+                {"term": {"header.hospital.id": hospital_id}},
+                {"range": {"header.@timestamp": {"gte": f"now-{days}d"}}},
+            ]}},
+            "aggs": {
+                "events": {"terms": {"field": "data.context", "size": 20}},
+                "unique_users": {"cardinality": {"field": "data.user.webAppKey"}},
+            },
+        }, base_url=settings.es_business_url)
+
+        aggs = biz_data.get("aggregations", {})
+        total_users = aggs.get("unique_users", {}).get("value", 0)
+        buckets = aggs.get("events", {}).get("buckets", [])
+
+        result = {}
+        if total_users:
+            result["이 병원 활성 수검자 수"] = f"{total_users}명"
+        for b in buckets:
+            key = b.get("key", "")
+            count = b.get("doc_count", 0)
+            if "ResultOpen" in key:
+                result["결과 열람 총 횟수"] = f"{count}회"
+            elif "BannerClick" in key:
+                result["배너 클릭 총 횟수"] = f"{count}회"
+        return result or None
+
+    # ── 환자 목록 ──
+
+    async def download_only_keys(self) -> set:
+        """DOWNLOAD_ONLY 정책 대상 webAppKey 집합. 실패 시 빈 집합."""
+        try:
+            return await self.download_only_cache.get_or_load(
+                "all", self._load_download_only_keys,
+                ttl=DOWNLOAD_ONLY_TTL_SEC, stale_ttl=DOWNLOAD_ONLY_STALE_SEC,
+            )
+        except Exception as e:
+            logger.warning(f"ES download_only fetch failed: {e}")
+            return set()
+
+    async def _load_download_only_keys(self) -> set:
+        data = await self.search(DATA_INDEX, {
+            "size": 0,
+            "query": {"bool": {"must": [
+                {"term": {"header.project.name": FRONTEND_PROJECT}},
+                {"match_phrase": {"data.message": "DOWNLOAD_ONLY"}},
+            ]}},
+            "aggs": {"by_user": {"terms": {"field": "data.user.webAppKey.keyword", "size": 10000}}},
+        })
+        buckets = data.get("aggregations", {}).get("by_user", {}).get("buckets", [])
+        return {b["key"] for b in buckets}
+
+    async def journey_summary(
+        self,
+        web_app_keys: Iterable[str],
+        hospital_id: Optional[str] = None,
+        name_keys: Iterable[str] = (),
+    ) -> Tuple[Dict[str, int], Dict[str, str]]:
+        """webAppKey 별 여정(이벤트) 건수 + name_keys 의 ES 이름을 _msearch 로 조회.
+
+        건수는 hospital_id 로 한정, 이름은 병원 무관 최근 10건에서 풀네임 우선(없으면 마스킹 이름).
+        캐시에 없는 키만 조회한다. 실패한 조각은 건너뛴다 (건수 0 / 이름 없음).
+
+        Returns:
+            (journey_counts, names)
+        """
+        counts: Dict[str, int] = {}
+        names: Dict[str, str] = {}
+        count_todo: List[str] = []
+        name_todo: List[str] = []
+        for key in dict.fromkeys(k for k in web_app_keys if k):
+            fresh, value = self.journey_cache.peek((hospital_id, key), JOURNEY_TTL_SEC)
+            if fresh:
+                counts[key] = value
+            else:
+                count_todo.append(key)
+        for key in dict.fromkeys(k for k in name_keys if k):
+            fresh, value = self.name_cache.peek(key, NAME_TTL_SEC)
+            if fresh:
+                if value:
+                    names[key] = value
+            else:
+                name_todo.append(key)
+
+        searches: List[Tuple[str, str, Dict[str, Any]]] = []
+        for key in count_todo:
+            must = [
+                {"term": {"header.project.name": FRONTEND_PROJECT}},
+                {"term": {"data.user.webAppKey.keyword": key}},
+            ]
+            if hospital_id:
+                must.append({"term": {"data.user.hospital.id.keyword": hospital_id}})
+            searches.append(("count", key, {
+                "size": 0, "track_total_hits": True, "query": {"bool": {"must": must}},
+            }))
+        for key in name_todo:
+            searches.append(("name", key, {
+                "size": 10,
+                "query": {"bool": {"must": [
+                    {"term": {"header.project.name": FRONTEND_PROJECT}},
+                    {"term": {"data.user.webAppKey.keyword": key}},
+                ]}},
+                "_source": ["data.user.name"],
+                "sort": [{"header.@timestamp": "desc"}],
+            }))
+
+        for start in range(0, len(searches), MSEARCH_CHUNK):
+            chunk = searches[start:start + MSEARCH_CHUNK]
+            try:
+                responses = await self.msearch(DATA_INDEX, [body for _, _, body in chunk])
+            except Exception as e:
+                logger.warning(f"ES journey msearch failed ({len(chunk)}건): {e}")
+                continue
+            for (kind, key, _), r in zip(chunk, responses):
+                if r.get("error"):
+                    continue
+                hits = r.get("hits", {})
+                if kind == "count":
+                    total = hits.get("total", 0)
+                    count = int(total.get("value", 0) if isinstance(total, dict) else total or 0)
+                    self.journey_cache.put((hospital_id, key), count)
+                    counts[key] = count
+                else:
+                    name = _pick_name(hits.get("hits", []))
+                    self.name_cache.put(key, name)
+                    if name:
+                        names[key] = name
+        return counts, names
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "behavior": self.behavior_cache.stats(),
+            "download_only": self.download_only_cache.stats(),
+            "journey": self.journey_cache.stats(),
+            "name": self.name_cache.stats(),
+        }
+
+
+def _pick_name(hits: List[Dict[str, Any]]) -> str:
+    """최근 hit 순서로 풀네임(마스킹 '*' 없음) 우선, 없으면 첫 마스킹 이름"""
+    fallback = ""
+    for hit in hits:
+        name = hit.get("_source", {}).get("data", {}).get("user", {}).get("name", "")
+        if name and "*" not in name:
+            return name
+        if name and not fallback:
+            fallback = name
+    return fallback
+
+
+es_service = ESService()
@@ -1,18 +1,42 @@
 import logging
 import asyncio
 import time
-from typing import Optional, List, Dict, Any
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional, List, Dict, Any
 from dataclasses import dataclass
 from datetime import datetime
 
-from google import genai
-from google.genai import types
-
 from ..core.config import settings
 
+if TYPE_CHECKING:
+    from google import genai
+    from google.genai import types
+
 # 로거 설정
 logger = logging.getLogger(__name__)
 
+
+# google-genai 는 import 만 ~1s — 부팅 시점이 아니라 첫 사용(또는 core.warmup)에서 로드
+def _genai():
+    from google import genai
+    return genai
+
+
+def _types():
+    from google.genai import types
+    return types
+
+
+@lru_cache(maxsize=1)
+def _safety_settings() -> list:
+    types = _types()
+    return [
+        types.SafetySetting(category="HARM_CATEGORY_HARASSMENT", threshold="BLOCK_NONE"),
+        types.SafetySetting(category="HARM_CATEGORY_HATE_SPEECH", threshold="BLOCK_NONE"),
+        types.SafetySetting(category="HARM_CATEGORY_SEXUALLY_EXPLICIT", threshold="BLOCK_NONE"),
+        types.SafetySetting(category="HARM_CATEGORY_DANGEROUS_CONTENT", threshold="BLOCK_NONE"),
+    ]
+
 @dataclass
 class GeminiRequest:
     """Gemini API 요청 데이터 클래스"""
@@ -43,19 +67,12 @@ class GeminiService:
     MAX_CONTENT_CACHES = 10  # CachedContent 상한
     MAX_CONCURRENT_CALLS = 10  # 동시 Gemini API 호출 상한 (시연회 10명 동시 대응)
 
-    SAFETY_SETTINGS = [
-        types.SafetySetting(category="HARM_CATEGORY_HARASSMENT", threshold="BLOCK_NONE"),
-        types.SafetySetting(category="HARM_CATEGORY_HATE_SPEECH", threshold="BLOCK_NONE"),
-        types.SafetySetting(category="HARM_CATEGORY_SEXUALLY_EXPLICIT", threshold="BLOCK_NONE"),
-        types.SafetySetting(category="HARM_CATEGORY_DANGEROUS_CONTENT", threshold="BLOCK_NONE"),
-    ]
-
     HEALTH_CACHE_TTL_HEALTHY = 3600  # 정상: 1시간 (5/2 폭주 방지 — paid quota 보호)
     HEALTH_CACHE_TTL_UNHEALTHY = 300  # 비정상: 5분
 
     def __init__(self):
         self._api_key: Optional[str] = None
-        self._client: Optional[genai.Client] = None
+        self._client: Optional["genai.Client"] = None
         self._initialized: bool = False
         self._chat_sessions: Dict[str, Any] = {}  # 세션별 ChatSession 저장
         self._content_caches: Dict[str, Any] = {}  # 세션별 CachedContent 저장
@@ -69,10 +86,11 @@ class GeminiService:
         gemini-3-flash-preview 는 thinking 모델 — thinking 토큰이 max_output_tokens 에 포함됨.
         5/3~5/4 MAX_TOKENS 실패 100% 가 thinking 폭주로 답변 토큰 부족 추정 → thinking_budget 으로 사고 한도 분리.
         """
+        types = _types()
         cfg_kwargs = dict(
             temperature=request.temperature,
             max_output_tokens=request.max_tokens,
-            safety_settings=self.SAFETY_SETTINGS,
+            safety_settings=_safety_settings(),
         )
         model = request.model or ""
         if "gemini-3" in model or "thinking" in model:
@@ -90,7 +108,7 @@ class GeminiService:
         self._api_key = settings.google_gemini_api_key
 
         if self._api_key and self._api_key != "dev-gemini-key":
-            self._client = genai.Client(api_key=self._api_key)
+            self._client = _genai().Client(api_key=self._api_key)
             self._initialized = True
             logger.info("[Gemini Service] 초기화 완료")
         else:
@@ -178,7 +196,7 @@ class GeminiService:
             client = self._client
             override_active = bool(request.api_key)
             if override_active:
-                client = genai.Client(api_key=request.api_key)
+                client = _genai().Client(api_key=request.api_key)
                 logger.info("[Gemini Service] api_key override 활성 — 호출별 임시 client 사용 (cache 비활성)")
 
             # GenerateContentConfig 구성 (thinking_config 포함, _build_config 헬퍼 위임)
@@ -472,8 +490,9 @@ class GeminiService:
                 asyncio.ensure_future(self._notify_slack("Gemini 스트리밍 실패", "stream_api", err_str))
             yield "죄송합니다. 일시적인 오류가 발생했어요. 잠시 후 다시 시도해 주세요."
     
-    def _format_chat_history(self, history: List[Dict[str, Any]]) -> List[types.Content]:
+    def _format_chat_history(self, history: List[Dict[str, Any]]) -> List["types.Content"]:
         """채팅 히스토리를 Gemini Chat 형식(types.Content)으로 변환"""
+        types = _types()
         formatted = []
         for msg in history:
             role = msg.get("role", "user")
@@ -552,7 +571,7 @@ class GeminiService:
 
             cached_content = await self._client.aio.caches.create(
                 model=model_name,
-                config=types.CreateCachedContentConfig(
+                config=_types().CreateCachedContentConfig(
                     display_name=f"welno_rag_{cache_key[:16]}",
                     system_instruction=system_prompt,
                     ttl="3600s",
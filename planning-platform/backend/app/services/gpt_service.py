@@ -2,16 +2,18 @@
 공용 GPT 서비스 모듈
 기존 GPT 호출 로직을 모듈화하여 재사용성 향상
 """
-from typing import Optional, Dict, Any, List
+from typing import TYPE_CHECKING, Optional, Dict, Any, List
 from dataclasses import dataclass
 import json
 import logging
 import os
 from datetime import datetime
-from openai import AsyncOpenAI
 from ..core.config import settings
 from .session_logger import get_session_logger
 
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -38,7 +40,7 @@ class GPTService:
     """공용 GPT 서비스 클래스"""
     
     def __init__(self):
-        self._client: Optional[AsyncOpenAI] = None
+        self._client: Optional["AsyncOpenAI"] = None
         self._api_key: Optional[str] = None
         
     async def initialize(self):
@@ -46,6 +48,8 @@ class GPTService:
         self._api_key = settings.openai_api_key
         
         if self._api_key and not self._api_key.startswith("sk-proj-your-") and self._api_key != "dev-openai-key" and self._api_key != "sk-test-placeholder":
+            from openai import AsyncOpenAI
+
             self._client = AsyncOpenAI(api_key=self._api_key)
             logger.info("✅ [GPT Service] OpenAI 클라이언트 초기화 완료")
         else:
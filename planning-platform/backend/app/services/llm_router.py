@@ -17,7 +17,9 @@ import time
 import logging
 from collections import deque
 from datetime import datetime, timezone
-from typing import Optional, AsyncGenerator, Dict, Any, List, Tuple
+from typing import Optional, AsyncGenerator, Callable, Dict, Any, List, Tuple
+
+from ..core.tracing import traced
 
 logger = logging.getLogger(__name__)
 
@@ -304,6 +306,7 @@ class LLMRouter:
             if t and not t.done():
                 t.cancel()
 
+    @traced("llm", "call_api")
     async def call_api(
         self,
         request: Any,
@@ -320,11 +323,15 @@ class LLMRouter:
                       (chat_tagging / rag_chat / checkup_design / default)
             session_id/partner_id/hospital_id: usage_log 추적용 — 5/4 점검 결과 145건 100% NULL 이라
                                               session 단위 retry loop 감지 불가 → P0 추적 가능화
+            usage_split: (kwargs) 여러 세션을 묶은 요청용 — resp → {session_id: {"input", "output", ...}}
+                         가중치 콜백. 주면 usage_log 를 세션별 행으로 나눠 기록 (llm_usage_logger.log_split)
         """
         from .gemini_service import gemini_service, GeminiResponse
         from .llm_usage_logger import llm_usage_logger
         import time
 
+        usage_split: Optional[Callable[[Any], Dict[str, Dict[str, Any]]]] = kwargs.pop("usage_split", None)
+
         # Quota 체크
         daily_ceiling, hourly_ceiling = self._quota_ceilings(endpoint)
         if not self._quota.check(endpoint, daily_ceiling, hourly_ceiling):
@@ -435,6 +442,27 @@ class LLMRouter:
                         asyncio.create_task(self._notify_error_rate(ok_n, fail_n, fr, rate_th))
                 except Exception as er_exc:
                     logger.debug("[LLMRouter] error rate check skip: %s", er_exc)
+                if usage_split is not None:
+                    try:
+                        shares = usage_split(resp) or {}
+                    except Exception as split_exc:
+                        logger.debug("[LLMRouter] usage_split skip: %s", split_exc)
+                        shares = {}
+                    if shares:
+                        llm_usage_logger.log_split(
+                            model=model_name,
+                            endpoint=endpoint,
+                            shares=shares,
+                            partner_id=partner_id,
+                            hospital_id=hospital_id,
+                            input_tokens=in_t,
+                            output_tokens=out_t,
+                            cached_tokens=cached_t,
+                            latency_ms=int((time.monotonic() - t0) * 1000),
+                            success=ok,
+                            error_class=final_err_class,
+                        )
+                        return
                 llm_usage_logger.log(
                     model=model_name,
                     endpoint=endpoint,
@@ -511,6 +539,7 @@ class LLMRouter:
         )
         return GeminiResponse(success=False, error="LLM services unavailable (DOWN)", error_class="DOWN")
 
+    @traced("llm", "stream_api")
     async def stream_api(
         self,
         request: Any,
@@ -604,6 +633,14 @@ class LLMRouter:
         return {"healthy": False, "provider": None, "error": "all providers down"}
 
     # ── Internal helpers ────────────────────────────────────────────────────
+    def quota_ceilings(self, endpoint: str) -> Tuple[int, int]:
+        """(daily_ceiling, hourly_ceiling) — 배치 작업 속도 산정용 공개 API"""
+        return self._quota_ceilings(endpoint)
+
+    def has_quota(self, endpoint: str) -> bool:
+        """현재 일별/시간별 상한 안쪽인지 (call_api 가 QUOTA_BLOCKED 를 낼지 사전 확인)"""
+        return self._quota.check(endpoint, *self._quota_ceilings(endpoint))
+
     def _quota_ceilings(self, endpoint: str):
         """(daily_ceiling, hourly_ceiling) 반환"""
         cfg = self._cfg
@@ -1,28 +1,87 @@
 """
 LLMUsageLogger — LLM API 호출 비용 추적 싱글턴
 
-welno.llm_usage_log 테이블에 비동기 fire-and-forget INSERT.
-DB 접근은 기존 db_manager (psycopg2 동기) 재사용. INSERT 실패는 logger.warning만,
-LLM 응답 차단 없음.
+welno.llm_usage_log 행을 프로세스 메모리 버퍼에 쌓았다가 FLUSH_ROWS 행 또는
+FLUSH_INTERVAL_MS 마다 다중 행 INSERT(execute_values) 한 번으로 기록한다.
+호출마다 psycopg2 연결을 새로 열던 단건 INSERT 를 대체 — 채팅 부하에서도 로깅 연결은 flush 당 1개.
+
+  - log() 는 버퍼 적재만 (LLM 응답 차단 없음), flush 는 백그라운드 태스크가 이벤트 루프 밖(to_thread)에서 실행
+  - 버퍼 상한 MAX_BUFFERED_ROWS — 넘치거나 DB 장애로 flush 가 실패한 행은 버리고 dropped 로 집계 (재시도/대기 없음)
+  - 종료 시 stop() 이 남은 행을 모두 flush (main.shutdown_event)
+  - 지표: stats() — 버퍼 행 수, 기록/버림 행 수, flush 횟수
+
+여러 세션을 한 요청으로 묶은 호출(배치 태깅)은 log_split 으로 세션별 행을 나눠 기록한다.
+세션별 토큰 합은 요청 전체 토큰과 정확히 같다.
 """
 
 import asyncio
 import logging
-from typing import Optional
+from collections import deque
+from typing import Any, Deque, Dict, List, Mapping, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# 이 행 수가 쌓이면 즉시 flush, 아니면 FLUSH_INTERVAL_MS 마다
+FLUSH_ROWS = 200
+FLUSH_INTERVAL_MS = 1000
+# 버퍼 상한 — DB 장애가 길어져도 메모리가 늘지 않도록 넘치는 행은 버림
+MAX_BUFFERED_ROWS = 10000
+
+_COLUMNS = (
+    "model", "endpoint", "session_id", "partner_id", "hospital_id",
+    "input_tokens", "output_tokens", "cached_tokens",
+    "latency_ms", "success", "error_class", "ttft_ms",
+)
+
+_INSERT_SQL = f"INSERT INTO welno.llm_usage_log ({', '.join(_COLUMNS)}) VALUES %s"
+
+UsageRow = Tuple[Any, ...]
+
+
+def split_tokens(total: int, weights: List[float]) -> List[int]:
+    """total 을 weights 비율로 정수 분배 (최대 잉여 방식 — 합계 보존).
+
+    weights 가 모두 0 이면 균등 분배.
+    """
+    n = len(weights)
+    if n == 0:
+        return []
+    total = max(0, int(total))
+    clean = [max(0.0, float(w)) for w in weights]
+    weight_sum = sum(clean)
+    if weight_sum <= 0:
+        clean, weight_sum = [1.0] * n, float(n)
+    raw = [total * w / weight_sum for w in clean]
+    shares = [int(r) for r in raw]
+    remainder = total - sum(shares)
+    # 소수부 큰 순서(동률이면 앞 순서)로 1씩 추가
+    for i in sorted(range(n), key=lambda i: (shares[i] - raw[i], i))[:remainder]:
+        shares[i] += 1
+    return shares
+
 
 class LLMUsageLogger:
-    """LLM 사용량 로그 싱글턴. 비동기 fire-and-forget."""
+    """LLM 사용량 로그 싱글턴. 버퍼 적재 후 백그라운드 배치 INSERT."""
 
     _instance: Optional["LLMUsageLogger"] = None
 
     def __new__(cls) -> "LLMUsageLogger":
         if cls._instance is None:
             cls._instance = super().__new__(cls)
+            cls._instance._reset()
         return cls._instance
 
+    def _reset(self) -> None:
+        self._buffer: Deque[UsageRow] = deque()
+        self._flusher: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._overflowing = False
+        self.written = 0
+        self.dropped = 0
+        self.flushes = 0
+        self.failed_flushes = 0
+
     def log(
         self,
         model: str,
@@ -38,7 +97,7 @@ class LLMUsageLogger:
         error_class: Optional[str] = None,
         ttft_ms: Optional[int] = None,
     ) -> None:
-        """비동기 fire-and-forget INSERT. 에러 시 warning만.
+        """버퍼에 1행 적재 (fire-and-forget). 버퍼가 가득 차면 버리고 dropped 집계.
         P2-2: ttft_ms 컬럼 — 스트리밍 첫 chunk 도달 latency (P95 < 500ms SLO).
         """
         try:
@@ -46,56 +105,147 @@ class LLMUsageLogger:
         except RuntimeError:
             return  # no running loop — startup 전 호출 등은 무시
 
-        loop.create_task(
-            self._insert(
+        if len(self._buffer) >= MAX_BUFFERED_ROWS:
+            self.dropped += 1
+            if not self._overflowing:
+                self._overflowing = True
+                logger.warning("[LLMUsageLogger] 버퍼 가득 참 (%d행) — 새 행 버림", MAX_BUFFERED_ROWS)
+            return
+        self._buffer.append((
+            model, endpoint, session_id, partner_id, hospital_id,
+            input_tokens, output_tokens, cached_tokens,
+            latency_ms, success, error_class, ttft_ms,
+        ))
+        self._ensure_flusher(loop)
+        if len(self._buffer) >= FLUSH_ROWS:
+            self._wakeup.set()
+
+    def log_split(
+        self,
+        model: str,
+        endpoint: str,
+        shares: Mapping[str, Mapping[str, Any]],
+        partner_id: Optional[str] = None,
+        hospital_id: Optional[str] = None,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+        cached_tokens: int = 0,
+        latency_ms: Optional[int] = None,
+        success: bool = True,
+        error_class: Optional[str] = None,
+    ) -> None:
+        """한 요청의 토큰을 세션별로 나눠 세션 수만큼 행 기록.
+
+        shares: {session_id: {"input": 가중치, "output": 가중치, "partner_id"?, "hospital_id"?}}
+        input/cached 토큰은 input 가중치, output 토큰은 output 가중치로 분배한다.
+        latency_ms 는 요청 전체 값을 그대로 기록 (세션별로 나눌 수 없음).
+        """
+        if not shares:
+            self.log(
+                model=model, endpoint=endpoint, partner_id=partner_id, hospital_id=hospital_id,
+                input_tokens=input_tokens, output_tokens=output_tokens, cached_tokens=cached_tokens,
+                latency_ms=latency_ms, success=success, error_class=error_class,
+            )
+            return
+        session_ids = list(shares)
+        in_w = [float(shares[s].get("input", 1) or 0) for s in session_ids]
+        out_w = [float(shares[s].get("output", 1) or 0) for s in session_ids]
+        ins = split_tokens(input_tokens, in_w)
+        outs = split_tokens(output_tokens, out_w)
+        cached = split_tokens(cached_tokens, in_w)
+        for i, sid in enumerate(session_ids):
+            meta: Dict[str, Any] = dict(shares[sid])
+            self.log(
                 model=model,
                 endpoint=endpoint,
-                session_id=session_id,
-                partner_id=partner_id,
-                hospital_id=hospital_id,
-                input_tokens=input_tokens,
-                output_tokens=output_tokens,
-                cached_tokens=cached_tokens,
+                session_id=sid,
+                partner_id=meta.get("partner_id") or partner_id,
+                hospital_id=meta.get("hospital_id") or hospital_id,
+                input_tokens=ins[i],
+                output_tokens=outs[i],
+                cached_tokens=cached[i],
                 latency_ms=latency_ms,
                 success=success,
                 error_class=error_class,
-                ttft_ms=ttft_ms,
             )
-        )
 
-    async def _insert(
-        self,
-        model: str,
-        endpoint: str,
-        session_id: Optional[str],
-        partner_id: Optional[str],
-        hospital_id: Optional[str],
-        input_tokens: int,
-        output_tokens: int,
-        cached_tokens: int,
-        latency_ms: Optional[int],
-        success: bool,
-        error_class: Optional[str],
-        ttft_ms: Optional[int] = None,
-    ) -> None:
-        try:
-            from ..core.database import db_manager
-            await db_manager.execute_update(
-                """
-                INSERT INTO welno.llm_usage_log
-                  (model, endpoint, session_id, partner_id, hospital_id,
-                   input_tokens, output_tokens, cached_tokens,
-                   latency_ms, success, error_class, ttft_ms)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """,
-                (
-                    model, endpoint, session_id, partner_id, hospital_id,
-                    input_tokens, output_tokens, cached_tokens,
-                    latency_ms, success, error_class, ttft_ms,
-                ),
-            )
-        except Exception as exc:
-            logger.warning("[LLMUsageLogger] INSERT 실패 (무시): %s", exc)
+    # ------------------------------------------------------------------
+    # 배치 flush
+    # ------------------------------------------------------------------
+    def _ensure_flusher(self, loop: asyncio.AbstractEventLoop) -> None:
+        """현재 루프에 flush 태스크가 없으면 시작 (루프가 바뀐 경우 포함)."""
+        if self._flusher is not None and not self._flusher.done() and self._loop is loop:
+            return
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+        self._flusher = loop.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=FLUSH_INTERVAL_MS / 1000)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self) -> int:
+        """버퍼를 FLUSH_ROWS 단위 다중 행 INSERT 로 기록. 기록한 행 수.
+
+        실패한 묶음은 버리고 dropped 로 집계, 이번 회차는 중단 (장애 중 DB 재시도 폭주 방지).
+        """
+        written = 0
+        while self._buffer:
+            batch: List[UsageRow] = [
+                self._buffer.popleft() for _ in range(min(FLUSH_ROWS, len(self._buffer)))
+            ]
+            try:
+                await asyncio.to_thread(self._write_sync, batch)
+            except Exception as exc:
+                self.dropped += len(batch)
+                self.failed_flushes += 1
+                logger.warning(
+                    "[LLMUsageLogger] 배치 INSERT 실패 — %d행 버림 (누적 %d): %s",
+                    len(batch), self.dropped, exc,
+                )
+                break
+            written += len(batch)
+            self.written += len(batch)
+            self.flushes += 1
+        if len(self._buffer) < MAX_BUFFERED_ROWS:
+            self._overflowing = False
+        return written
+
+    @staticmethod
+    def _write_sync(rows: List[UsageRow]) -> None:
+        import psycopg2.extras
+        from ..core.database import db_manager
+
+        with db_manager.get_connection("default") as conn:
+            with conn.cursor() as cur:
+                psycopg2.extras.execute_values(cur, _INSERT_SQL, rows, page_size=len(rows))
+            conn.commit()
+
+    async def stop(self) -> None:
+        """flush 태스크 종료 후 남은 행 모두 기록 (서버 종료 시)."""
+        flusher, self._flusher = self._flusher, None
+        if flusher is not None and not flusher.done():
+            flusher.cancel()
+            await asyncio.gather(flusher, return_exceptions=True)
+        while self._buffer:
+            if not await self.flush():
+                # DB 장애 — 남은 행은 기다리지 않고 버림
+                self.dropped += len(self._buffer)
+                self._buffer.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "buffered": len(self._buffer),
+            "written": self.written,
+            "dropped": self.dropped,
+            "flushes": self.flushes,
+            "failed_flushes": self.failed_flushes,
+        }
 
 
 # 모듈 레벨 싱글턴
@@ -148,6 +148,12 @@ async def run_disease_report_pipeline(
                     WHERE oid = $3
                 """, report_url, json.dumps(response, ensure_ascii=False), oid)
                 logger.info(f"✅ [Pipeline] tb_campaign_payments 업데이트 완료: oid={oid}, report_url={report_url[:80] if report_url else None}...")
+                # 재생성된 리포트 — 다운로드 프록시의 이전 PDF 캐시 제거
+                try:
+                    from ..campaigns.report_cache import get_report_cache
+                    get_report_cache().invalidate(oid)
+                except Exception as cache_err:
+                    logger.warning(f"⚠️ [Pipeline] 리포트 캐시 무효화 실패 (oid={oid}): {cache_err}")
                 # pipeline_step도 업데이트
                 await conn.execute(
                     "UPDATE welno.tb_campaign_payments SET pipeline_step = 'REPORT_COMPLETED' WHERE oid = $1",
@@ -0,0 +1,175 @@
+"""
+검진설계 환자 컨텍스트 — 환자/병원/건강/처방 조회를 한 번에 묶어 단계 간 공유
+
+기존에는 /create, /create-step1, /create-step2 가 각각
+get_patient_by_uuid → find_hospital_id_by_uuid → get_hospital_by_id → get_patient_health_data
+→ get_patient_prescription_data 를 순차로 다시 불렀고, /create 는 STEP 1 → STEP 2 를 호출하면서
+같은 조회를 두 번 더 했다 (설계 1건당 10회 이상 중복).
+이 모듈은
+  - 다섯 조회를 동시에 실행해 PatientContext 1개로 묶는다
+    (hospital_id 가 없을 때만 자동 조회를 환자 조회와 함께 먼저 하고, 나머지는 그 다음 한 번에)
+  - 요청 안: use_patient_context 블록 안의 load_patient_context 는 묶인 컨텍스트를 그대로 반환
+  - 요청 사이: (uuid, hospital_id) 키 짧은 TTL 캐시 (같은 키 동시 요청은 조회 1회로 합침,
+    만료 항목은 저장 시 정리 + 항목 수 상한 LRU)
+  - save_health_data / save_prescription_data 저장 후 invalidate_patient_context(uuid) 로 무효화
+조회 결과(dict, "error" 포함 가능)는 가공 없이 보관한다 — 오류/폴백 판단은 호출부 기존 로직 그대로.
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from ..core.config import settings
+from ..utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# 병원 미발견 시 일반검진 폴백 병원 ID (건강/처방 조회에도 이 값을 쓴다)
+GENERIC_HOSPITAL_ID = "_GENERIC_"
+
+# 캐시에 보관하는 컨텍스트 수 상한 (건강/처방 전체 payload 라 항목이 크다)
+MAX_CACHED_CONTEXTS = 500
+# 저장 세대를 기억하는 uuid 수 상한
+MAX_TRACKED_GENERATIONS = 10000
+
+
+@dataclass
+class PatientContext:
+    """검진설계 1건에 필요한 환자 조회 결과 묶음"""
+
+    uuid: str
+    requested_hospital_id: Optional[str]
+    # 요청값 → 자동 조회값 → GENERIC_HOSPITAL_ID 순
+    resolved_hospital_id: str
+    patient_info: Dict[str, Any]
+    hospital_info: Dict[str, Any]
+    health_result: Dict[str, Any]
+    prescription_result: Dict[str, Any]
+    generation: int = 0
+    loaded_at: float = 0.0
+
+    @property
+    def health_data(self) -> List[Dict[str, Any]]:
+        if not isinstance(self.health_result, dict) or "error" in self.health_result:
+            return []
+        return self.health_result.get("health_data", [])
+
+    @property
+    def prescription_data(self) -> List[Dict[str, Any]]:
+        if not isinstance(self.prescription_result, dict) or "error" in self.prescription_result:
+            return []
+        return self.prescription_result.get("prescription_data", [])
+
+
+# 현재 요청(태스크)에 묶인 컨텍스트 — /create 가 STEP 1/2 에 넘길 때 사용
+_current_context: ContextVar[Optional[PatientContext]] = ContextVar("patient_context", default=None)
+
+_cache = TTLCache(max_entries=MAX_CACHED_CONTEXTS, max_age=settings.checkup_patient_context_ttl_sec)
+# uuid 별 저장 세대 — 조회 중 저장이 끼어들면 그 조회 결과는 다음 읽기에서 버린다.
+# 값은 전역 증가 카운터라 상한으로 밀려난 uuid(기본값 0)가 이전 세대와 겹치지 않는다.
+_generations: "OrderedDict[str, int]" = OrderedDict()
+_generation_counter = itertools.count(1)
+
+
+@contextmanager
+def use_patient_context(context: PatientContext):
+    """블록 안의 load_patient_context(같은 uuid/hospital_id) 호출이 이 컨텍스트를 재사용"""
+    token = _current_context.set(context)
+    try:
+        yield context
+    finally:
+        _current_context.reset(token)
+
+
+def invalidate_patient_context(uuid: str) -> None:
+    """건강/처방 데이터 저장 후 호출 — 해당 환자의 캐시된 컨텍스트를 모두 버린다"""
+    _generations[uuid] = next(_generation_counter)
+    _generations.move_to_end(uuid)
+    while len(_generations) > MAX_TRACKED_GENERATIONS:
+        _generations.popitem(last=False)
+    _cache.invalidate_where(lambda key: key[0] == uuid)
+
+
+def _matches(context: Optional[PatientContext], uuid: str, hospital_id: Optional[str]) -> bool:
+    return (
+        context is not None
+        and context.uuid == uuid
+        and (context.requested_hospital_id or None) == (hospital_id or None)
+        and context.generation == _generations.get(uuid, 0)
+    )
+
+
+async def _fetch(data_service, uuid: str, hospital_id: Optional[str]) -> PatientContext:
+    generation = _generations.get(uuid, 0)
+    started = time.monotonic()
+
+    if hospital_id:
+        resolved = hospital_id
+        patient_info, hospital_info, health_result, prescription_result = await asyncio.gather(
+            data_service.get_patient_by_uuid(uuid),
+            data_service.get_hospital_by_id(hospital_id),
+            data_service.get_patient_health_data(uuid, hospital_id),
+            data_service.get_patient_prescription_data(uuid, hospital_id),
+        )
+    else:
+        # 건강/처방 조회는 병원 ID 가 정해져야 하므로 자동 조회만 먼저 (환자 조회와 동시에)
+        patient_info, found_hospital_id = await asyncio.gather(
+            data_service.get_patient_by_uuid(uuid),
+            data_service.find_hospital_id_by_uuid(uuid),
+        )
+        resolved = found_hospital_id or GENERIC_HOSPITAL_ID
+        lookups = [
+            data_service.get_patient_health_data(uuid, resolved),
+            data_service.get_patient_prescription_data(uuid, resolved),
+        ]
+        if found_hospital_id:
+            lookups.append(data_service.get_hospital_by_id(found_hospital_id))
+        results = await asyncio.gather(*lookups)
+        health_result, prescription_result = results[0], results[1]
+        hospital_info = results[2] if found_hospital_id else {}
+
+    logger.info(
+        f"👤 [환자컨텍스트] 조회 완료 - uuid={uuid}, hospital_id={resolved}, "
+        f"{time.monotonic() - started:.2f}초"
+    )
+    return PatientContext(
+        uuid=uuid,
+        requested_hospital_id=hospital_id or None,
+        resolved_hospital_id=resolved,
+        patient_info=patient_info,
+        hospital_info=hospital_info,
+        health_result=health_result,
+        prescription_result=prescription_result,
+        generation=generation,
+        loaded_at=time.time(),
+    )
+
+
+async def load_patient_context(data_service, uuid: str, hospital_id: Optional[str] = None) -> PatientContext:
+    """환자 컨텍스트 조회 — 요청에 묶인 것 → TTL 캐시 → DB 순
+
+    환자 조회가 실패("error")한 결과는 캐시하지 않는다 (직후 등록된 환자를 놓치지 않도록).
+    """
+    bound = _current_context.get()
+    if _matches(bound, uuid, hospital_id):
+        return bound
+
+    ttl = settings.checkup_patient_context_ttl_sec
+    if ttl <= 0:
+        return await _fetch(data_service, uuid, hospital_id)
+
+    key = (uuid, hospital_id or "")
+    context = await _cache.get_or_load(key, lambda: _fetch(data_service, uuid, hospital_id), ttl)
+    if not _matches(context, uuid, hospital_id):
+        # 조회 도중 저장이 있었음 — 그 결과는 버리고 새로 조회
+        _cache.invalidate(key)
+        context = await _cache.get_or_load(key, lambda: _fetch(data_service, uuid, hospital_id), ttl)
+    if not isinstance(context.patient_info, dict) or "error" in context.patient_info:
+        _cache.invalidate(key)
+    return context
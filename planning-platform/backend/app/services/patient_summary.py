@@ -0,0 +1,233 @@
+"""
+파트너오피스 환자 통합 목록 — welno.tb_partner_patient_summary 조회
+
+요약 테이블은 chat_log / 서베이 INSERT 트리거가 유지한다 (migrations/add_partner_patient_summary.sql).
+목록은 (정렬값, web_app_key) 키셋 페이지네이션 — 검색/병원/기간/활동 필터와 정렬을 모두 SQL 에서 처리하고
+페이지 행만 가져온다. ES 값(여정 건수, ES 이름)은 페이지 행 중 오래된 것만 es_service 로 갱신해
+응답에 반영하고 요약 테이블에 되써 둔다.
+"""
+
+import asyncio
+import base64
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..core.database import db_manager
+from .es_service import JOURNEY_TTL_SEC, es_service
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_TABLE = "welno.tb_partner_patient_summary"
+ALL_HOSPITALS = ""  # 전체 병원 합산 행의 hospital_id
+
+# 정렬 키 → (컬럼, 커서 값 캐스트)
+SORT_COLUMNS: Dict[str, Tuple[str, str]] = {
+    "last_activity": ("s.last_activity", "timestamptz"),
+    "chat_count": ("s.chat_count", "integer"),
+    "survey_count": ("s.survey_count", "integer"),
+    "journey_count": ("s.journey_count", "integer"),
+    "patient_name": ("s.patient_name", "text"),
+}
+
+ACTIVITY_FILTERS = {
+    "chat": "s.chat_count > 0",
+    "survey": "s.survey_count > 0",
+    "journey": "s.journey_count > 0",
+}
+
+_JOURNEY_WRITEBACK_SQL = f"""
+    UPDATE {SUMMARY_TABLE} s
+    SET journey_count = v.cnt, journey_refreshed_at = NOW()
+    FROM unnest(%s::text[], %s::int[]) AS v(key, cnt)
+    WHERE s.web_app_key = v.key AND s.hospital_id = %s
+"""
+
+_ES_NAME_WRITEBACK_SQL = f"""
+    UPDATE {SUMMARY_TABLE} s
+    SET es_name = v.name
+    FROM unnest(%s::text[], %s::text[]) AS v(key, name)
+    WHERE s.web_app_key = v.key
+"""
+
+
+def encode_cursor(sort_value: Any, web_app_key: str) -> str:
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    raw = json.dumps([sort_value, web_app_key], ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, str]:
+    """잘못된 커서는 ValueError"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value, key = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception as e:
+        raise ValueError(f"invalid cursor: {e}") from e
+    if not isinstance(key, str):
+        raise ValueError("invalid cursor: key")
+    return value, key
+
+
+def _like_pattern(text: str) -> str:
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def build_patient_list_query(
+    hospital_id: Optional[str] = None,
+    search: Optional[str] = None,
+    hospital_name: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    activity: str = "all",
+    sort: str = "last_activity",
+    order: str = "desc",
+    cursor: Optional[str] = None,
+    limit: int = 100,
+) -> Tuple[str, tuple, str, tuple]:
+    """(페이지 SQL, params, 건수 SQL, params) — 페이지는 limit+1 행 (다음 페이지 존재 확인용)"""
+    if sort not in SORT_COLUMNS:
+        raise ValueError(f"unsupported sort: {sort}")
+    column, cast = SORT_COLUMNS[sort]
+    direction = "ASC" if order == "asc" else "DESC"
+
+    where = ["s.hospital_id = %s"]
+    params: List[Any] = [hospital_id or ALL_HOSPITALS]
+    if search:
+        pattern = _like_pattern(search.strip())
+        where.append("(s.patient_name ILIKE %s OR s.web_app_key ILIKE %s OR s.hospital_name ILIKE %s)")
+        params += [pattern, pattern, pattern]
+    if hospital_name:
+        where.append("s.hospital_name = %s")
+        params.append(hospital_name)
+    if date_from:
+        where.append("s.last_activity >= %s::date")
+        params.append(date_from)
+    if date_to:
+        where.append("s.last_activity < %s::date + 1")
+        params.append(date_to)
+    if activity in ACTIVITY_FILTERS:
+        where.append(ACTIVITY_FILTERS[activity])
+
+    count_sql = f"SELECT COUNT(*) AS total FROM {SUMMARY_TABLE} s WHERE {' AND '.join(where)}"
+    count_params = tuple(params)
+
+    if cursor:
+        value, key = decode_cursor(cursor)
+        op = ">" if direction == "ASC" else "<"
+        where.append(f"({column}, s.web_app_key) {op} (%s::{cast}, %s)")
+        params += [value, key]
+
+    page_sql = f"""
+        SELECT s.web_app_key, s.patient_name, s.chat_count, s.survey_count, s.journey_count,
+               s.last_activity, s.hospital_name, s.journey_refreshed_at
+        FROM {SUMMARY_TABLE} s
+        WHERE {' AND '.join(where)}
+        ORDER BY {column} {direction}, s.web_app_key {direction}
+        LIMIT %s
+    """
+    params.append(limit + 1)
+    return page_sql, tuple(params), count_sql, count_params
+
+
+async def _refresh_es_fields(rows: List[Dict[str, Any]], hospital_id: Optional[str]) -> None:
+    """오래된 행의 여정 건수/ES 이름을 조회해 rows 에 반영하고 요약 테이블에 되쓰기"""
+    now = datetime.now().astimezone()
+    stale = [
+        r for r in rows
+        if r.get("journey_refreshed_at") is None
+        or (now - r["journey_refreshed_at"]).total_seconds() > JOURNEY_TTL_SEC
+    ]
+    no_name = [r["web_app_key"] for r in rows if not r.get("patient_name")]
+    if not stale and not no_name:
+        return
+    counts, names = await es_service.journey_summary(
+        [r["web_app_key"] for r in stale], hospital_id=hospital_id or None, name_keys=no_name)
+    for r in rows:
+        if r["web_app_key"] in counts:
+            r["journey_count"] = counts[r["web_app_key"]]
+        if not r.get("patient_name") and names.get(r["web_app_key"]):
+            r["patient_name"] = names[r["web_app_key"]]
+
+    try:
+        if counts:
+            keys = list(counts)
+            await db_manager.execute_update(
+                _JOURNEY_WRITEBACK_SQL, (keys, [counts[k] for k in keys], hospital_id or ALL_HOSPITALS))
+        if names:
+            keys = list(names)
+            await db_manager.execute_update(_ES_NAME_WRITEBACK_SQL, (keys, [names[k] for k in keys]))
+    except Exception as e:
+        logger.warning(f"[환자목록] ES 값 되쓰기 실패 (무시): {e}")
+
+
+async def list_patients(
+    hospital_id: Optional[str] = None,
+    search: Optional[str] = None,
+    hospital_name: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    activity: str = "all",
+    sort: str = "last_activity",
+    order: str = "desc",
+    cursor: Optional[str] = None,
+    limit: int = 100,
+) -> Dict[str, Any]:
+    """
+    환자 목록 1페이지.
+
+    Returns:
+        {patients, next_cursor, total, hospital_options}
+        - total / hospital_options 는 첫 페이지(cursor 없음)에서만 계산, 이후 페이지는 None
+    """
+    page_sql, page_params, count_sql, count_params = build_patient_list_query(
+        hospital_id, search, hospital_name, date_from, date_to, activity, sort, order, cursor, limit)
+
+    first_page = not cursor
+    rows = [dict(r) for r in await db_manager.execute_query(page_sql, page_params)]
+    total = hospital_options = None
+    if first_page:
+        total = int(((await db_manager.execute_one(count_sql, count_params)) or {}).get("total") or 0)
+        hospital_options = [h["hospital_name"] for h in await db_manager.execute_query(
+            f"SELECT DISTINCT hospital_name FROM {SUMMARY_TABLE} "
+            "WHERE hospital_id = %s AND hospital_name IS NOT NULL AND hospital_name <> '' "
+            "ORDER BY hospital_name",
+            (hospital_id or ALL_HOSPITALS,),
+        )]
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last[SORT_COLUMNS[sort][0].split(".", 1)[1]], last["web_app_key"])
+
+    refresh, download_only = await asyncio.gather(
+        _refresh_es_fields(rows, hospital_id),
+        es_service.download_only_keys(),
+        return_exceptions=True,
+    )
+    if isinstance(refresh, Exception):
+        logger.warning(f"[환자목록] ES 여정 갱신 실패: {refresh}")
+    if isinstance(download_only, Exception):
+        download_only = set()
+
+    patients = [{
+        "web_app_key": r["web_app_key"],
+        "patient_name": r.get("patient_name") or "",
+        "chat_count": r["chat_count"],
+        "survey_count": r["survey_count"],
+        "journey_count": r.get("journey_count") or 0,
+        "last_activity": str(r["last_activity"]) if r.get("last_activity") else None,
+        "hospital_name": r.get("hospital_name") or "",
+        "download_only": r["web_app_key"] in download_only,
+    } for r in rows]
+
+    return {
+        "patients": patients,
+        "next_cursor": next_cursor,
+        "total": total,
+        "hospital_options": hospital_options,
+    }
@@ -0,0 +1,14 @@
+"""
+rag_index — 병원별/글로벌 FAISS 인덱스 구축·갱신 계층.
+
+외부 노출:
+    HospitalIndexSync   — 문서 해시 기반 증분 인덱스 동기화
+    EmbeddingCache      — 청크 텍스트 해시 → 임베딩 영구 캐시 (SQLite)
+
+faiss/numpy는 각 모듈 함수 내부에서 import (앱 부팅 시 로드 방지).
+"""
+
+from .hospital_index import (  # noqa: F401
+    HospitalIndexSync,
+    EmbeddingCache,
+)
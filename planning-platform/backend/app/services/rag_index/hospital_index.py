@@ -0,0 +1,426 @@
+"""
+병원별 FAISS 인덱스 증분 동기화.
+
+기존 방식은 문서가 하나만 바뀌어도 인덱스를 지우고 전체 페이지를 다시 임베딩했다.
+여기서는 문서 단위 sha256 해시를 manifest.json에 기록해 두고,
+바뀐 문서의 청크만 IndexIDMap2에서 remove/add 한다.
+
+저장 형식 (vector_search.FAISSVectorSearch와 호환):
+  faiss.index       — IndexIDMap2(IndexFlatL2). 검색 결과 label = 청크 ID
+  index_store.json  — str(청크 ID) → node_id
+  docstore.json     — node_id → {text, metadata}
+  manifest.json     — 문서 키 → {sha256, chunk_ids, ...}
+
+임베딩은 EmbeddingCache(텍스트 해시 키)에 영구 저장하므로
+강제 전체 재구축(force=True)도 내용이 바뀌지 않은 청크는 다시 임베딩하지 않는다.
+변경 문서의 파싱/임베딩은 ingest_pipeline.IngestPipeline이 담당한다.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import uuid as uuid_mod
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .index_factory import (
+    ANN_INDEX_FILE, ANN_META_FILE, IndexSpec, flat_signature, remove_ann_sidecar, update_ann_sidecar,
+)
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTS = {".pdf", ".txt", ".md", ".csv"}
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 1
+INDEX_FILES = [
+    "faiss.index", "default__vector_store.json", "docstore.json",
+    "index_store.json", "graph_store.json", "image__vector_store.json", MANIFEST_FILE,
+    ANN_INDEX_FILE, ANN_META_FILE,
+]
+
+# 병원별 동기화 직렬화 (업로드 직후 토글 등 연속 트리거 대비)
+_sync_locks: Dict[str, threading.Lock] = {}
+_sync_locks_guard = threading.Lock()
+
+
+def _hospital_lock(key: str) -> threading.Lock:
+    with _sync_locks_guard:
+        if key not in _sync_locks:
+            _sync_locks[key] = threading.Lock()
+        return _sync_locks[key]
+
+
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1024 * 1024), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def text_sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def chunk_id(doc_key: str, page_label: str, text_hash: str) -> int:
+    """문서·페이지·내용으로 결정되는 60bit 청크 ID (faiss int64 label 범위 내)"""
+    digest = hashlib.sha256(f"{doc_key}\x00{page_label}\x00{text_hash}".encode("utf-8")).hexdigest()
+    return int(digest[:15], 16)
+
+
+def extract_chunks(filepath: Path, hospital_id: str, source_type: str) -> List[Dict[str, Any]]:
+    """파일 → 페이지 단위 청크 목록 (PDF는 페이지별, 텍스트는 파일 전체)"""
+    ext = filepath.suffix.lower()
+    chunks: List[Dict[str, Any]] = []
+    if ext == ".pdf":
+        from pypdf import PdfReader
+        reader = PdfReader(str(filepath))
+        for page_num, page in enumerate(reader.pages, 1):
+            text = (page.extract_text() or "").strip()
+            if text:
+                chunks.append({
+                    "text": text,
+                    "metadata": {
+                        "file_name": filepath.name,
+                        "page_label": str(page_num),
+                        "hospital_id": hospital_id,
+                        "source_type": source_type,
+                    },
+                })
+    else:
+        text = filepath.read_text(encoding="utf-8", errors="ignore").strip()
+        if text:
+            chunks.append({
+                "text": text,
+                "metadata": {
+                    "file_name": filepath.name,
+                    "page_label": "1",
+                    "hospital_id": hospital_id,
+                    "source_type": source_type,
+                },
+            })
+    return chunks
+
+
+class EmbeddingCache:
+    """청크 텍스트 sha256 → 임베딩(float32 bytes) 영구 캐시.
+
+    병원 간 공통 문서도 같은 텍스트면 재사용되도록 FAISS 루트에 하나만 둔다.
+    """
+
+    def __init__(self, db_path: Path, model: str):
+        self.db_path = Path(db_path)
+        self.model = model
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS chunk_embeddings (
+                       model TEXT NOT NULL,
+                       text_hash TEXT NOT NULL,
+                       dim INTEGER NOT NULL,
+                       vector BLOB NOT NULL,
+                       PRIMARY KEY (model, text_hash)
+                   )"""
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def get_many(self, text_hashes: Iterable[str]) -> Dict[str, List[float]]:
+        import numpy as np
+
+        hashes = list(dict.fromkeys(text_hashes))
+        found: Dict[str, List[float]] = {}
+        if not hashes:
+            return found
+        with self._connect() as conn:
+            for i in range(0, len(hashes), 500):
+                part = hashes[i:i + 500]
+                placeholders = ",".join("?" * len(part))
+                rows = conn.execute(
+                    f"SELECT text_hash, vector FROM chunk_embeddings "
+                    f"WHERE model = ? AND text_hash IN ({placeholders})",
+                    [self.model, *part],
+                ).fetchall()
+                for text_hash, blob in rows:
+                    found[text_hash] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def put_many(self, items: Dict[str, Sequence[float]]) -> None:
+        import numpy as np
+
+        if not items:
+            return
+        rows = []
+        for text_hash, vec in items.items():
+            arr = np.asarray(vec, dtype=np.float32)
+            rows.append((self.model, text_hash, int(arr.shape[0]), arr.tobytes()))
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO chunk_embeddings (model, text_hash, dim, vector) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+
+
+def _write_atomic(path: Path, data: str) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(data, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+class HospitalIndexSync:
+    """병원 1곳의 FAISS 인덱스를 활성 문서 집합과 동기화"""
+
+    def __init__(
+        self,
+        base_dir: Path,
+        hospital_id: str,
+        embed_fn: Callable[[List[str]], List[List[float]]],
+        cache: EmbeddingCache,
+        dimension: int,
+        embed_batch_size: int = 2048,
+        ann_spec: Optional[IndexSpec] = None,
+        pipeline_options: Optional[Dict[str, Any]] = None,
+    ):
+        self.base = Path(base_dir)
+        self.hospital_id = hospital_id
+        self.embed_fn = embed_fn
+        self.cache = cache
+        self.dimension = dimension
+        self.embed_batch_size = embed_batch_size
+        self.ann_spec = ann_spec
+        self.pipeline_options = pipeline_options or {}
+
+    # ── 로드/저장 ────────────────────────────────────────────
+
+    def _load_manifest(self) -> Optional[Dict[str, Any]]:
+        path = self.base / MANIFEST_FILE
+        if not path.exists():
+            return None
+        try:
+            manifest = json.loads(path.read_text(encoding="utf-8"))
+        except ValueError:
+            return None
+        if manifest.get("version") != MANIFEST_VERSION or manifest.get("dimension") != self.dimension:
+            return None
+        return manifest
+
+    def _load_state(self):
+        """기존 IndexIDMap2 + docstore 로드. 레거시(IndexFlatL2) 형식이면 None."""
+        import faiss
+
+        manifest = self._load_manifest()
+        index_path = self.base / "faiss.index"
+        if manifest is None or not index_path.exists():
+            return None
+        try:
+            index = faiss.read_index(str(index_path))
+            docstore_raw = json.loads((self.base / "docstore.json").read_text(encoding="utf-8"))
+        except Exception as e:
+            logger.warning(f"[index-sync:{self.hospital_id}] 기존 인덱스 로드 실패 → 전체 재구축: {e}")
+            return None
+        if not isinstance(index, faiss.IndexIDMap2):
+            return None
+        docstore = docstore_raw.get("docstore/data", {})
+        return index, docstore, manifest
+
+    def _new_index(self):
+        import faiss
+        return faiss.IndexIDMap2(faiss.IndexFlatL2(self.dimension))
+
+    def _save(
+        self,
+        index,
+        docstore: Dict[str, Any],
+        manifest: Dict[str, Any],
+        added_ids: Sequence[int] = (),
+        removed_ids: Sequence[int] = (),
+        rebuild: bool = False,
+    ) -> None:
+        import faiss
+
+        nodes_dict = {}
+        for node_id, node in docstore.items():
+            nodes_dict[str(node["__data__"]["metadata"]["chunk_id"])] = node_id
+        index_path = self.base / "faiss.index"
+        previous_source = flat_signature(index_path) if index_path.exists() else None
+        tmp_index = self.base / "faiss.index.tmp"
+        faiss.write_index(index, str(tmp_index))
+        os.replace(tmp_index, self.base / "faiss.index")
+        index_store = {
+            "index_store/data": {
+                manifest.setdefault("index_id", str(uuid_mod.uuid4())): {
+                    "__type__": "vector_store",
+                    "__data__": json.dumps({"nodes_dict": nodes_dict}),
+                }
+            }
+        }
+        _write_atomic(self.base / "index_store.json", json.dumps(index_store, ensure_ascii=False))
+        _write_atomic(self.base / "docstore.json", json.dumps({"docstore/data": docstore}, ensure_ascii=False))
+        _write_atomic(self.base / MANIFEST_FILE, json.dumps(manifest, ensure_ascii=False, indent=1))
+        # 검색용 ANN 사이드카: 변경분만 반영, 전체 동기화·누적 변경 임계 초과 시에만 재구축
+        # (벡터 수가 임계 미만이면 생성하지 않고 기존 것 제거)
+        try:
+            update_ann_sidecar(
+                self.base, index, self.ann_spec,
+                added_ids=added_ids, removed_ids=removed_ids,
+                previous_source=previous_source, rebuild=rebuild,
+            )
+        except Exception as e:
+            logger.warning(f"[index-sync:{self.hospital_id}] ANN 사이드카 갱신 실패 → 사이드카 삭제 (flat 검색): {e}")
+            remove_ann_sidecar(self.base)
+
+    def clear(self) -> None:
+        for name in INDEX_FILES:
+            path = self.base / name
+            if path.exists():
+                path.unlink()
+                logger.info(f"[index-sync:{self.hospital_id}] 기존 인덱스 삭제: {name}")
+
+    # ── 동기화 ───────────────────────────────────────────────
+
+    def _scan(self, sources: List[Tuple[str, Path]], inactive: set) -> Dict[str, Dict[str, Any]]:
+        docs: Dict[str, Dict[str, Any]] = {}
+        for source_type, source_dir in sources:
+            if not source_dir.exists():
+                continue
+            for filepath in sorted(source_dir.iterdir()):
+                if not filepath.is_file() or filepath.name.startswith("."):
+                    continue
+                if filepath.name in inactive:
+                    logger.info(f"[index-sync:{self.hospital_id}] 건너뜀 (비활성): {filepath.name}")
+                    continue
+                if filepath.suffix.lower() not in SUPPORTED_EXTS:
+                    logger.info(f"[index-sync:{self.hospital_id}] 건너뜀 (미지원): {filepath.name}")
+                    continue
+                docs[f"{source_type}/{filepath.name}"] = {
+                    "path": filepath,
+                    "source_type": source_type,
+                    "sha256": file_sha256(filepath),
+                }
+        return docs
+
+    def sync(
+        self,
+        sources: List[Tuple[str, Path]],
+        inactive: Optional[set] = None,
+        force: bool = False,
+        progress: Optional[Callable[[str], None]] = None,
+    ) -> Dict[str, Any]:
+        """활성 문서와 인덱스 동기화.
+
+        Args:
+            sources: [(source_type, uploads 디렉토리)] — 공통 먼저
+            inactive: 인덱싱 제외할 stored_filename 집합
+            force: 기존 인덱스를 버리고 새로 구성 (임베딩은 캐시 재사용)
+            progress: 진행 메시지 콜백
+        """
+        import numpy as np
+
+        progress = progress or (lambda msg: None)
+        with _hospital_lock(str(self.base)):
+            self.base.mkdir(parents=True, exist_ok=True)
+            stats = {
+                "added_docs": 0, "removed_docs": 0, "unchanged_docs": 0,
+                "added_chunks": 0, "removed_chunks": 0,
+                "embedded_chunks": 0, "reused_embeddings": 0,
+            }
+
+            progress("문서 해시 비교 중...")
+            current = self._scan(sources, inactive or set())
+
+            state = None if force else self._load_state()
+            if state is None:
+                index, docstore = self._new_index(), {}
+                manifest = {"version": MANIFEST_VERSION, "dimension": self.dimension,
+                            "index_type": "idmap_flat_l2", "documents": {}}
+                mode = "full"
+            else:
+                index, docstore, manifest = state
+                mode = "incremental"
+            known: Dict[str, Dict[str, Any]] = manifest["documents"]
+
+            # 1. 삭제/변경된 문서의 청크 제거
+            stale_keys = [k for k, meta in known.items()
+                          if k not in current or current[k]["sha256"] != meta["sha256"]]
+            remove_ids: List[int] = []
+            for key in stale_keys:
+                ids = known.pop(key).get("chunk_ids", [])
+                remove_ids.extend(ids)
+                for cid in ids:
+                    docstore.pop(f"{cid:015x}", None)
+                if key not in current:
+                    stats["removed_docs"] += 1
+            if remove_ids:
+                index.remove_ids(np.asarray(remove_ids, dtype=np.int64))
+                stats["removed_chunks"] = len(remove_ids)
+
+            # 2. 신규/변경 문서 파싱 → 임베딩 → 추가 (스테이지 파이프라인, 이 스레드가 단일 writer)
+            pending = [k for k in current if k not in known]
+            stats["unchanged_docs"] = len(current) - len(pending)
+            added_ids: List[int] = []
+            metrics = None
+            if pending:
+                from .ingest_pipeline import IngestPipeline
+
+                def _on_document(key: str, chunks: List[Dict[str, Any]]) -> None:
+                    doc = current[key]
+                    known[key] = {
+                        "sha256": doc["sha256"],
+                        "source_type": doc["source_type"],
+                        "file_name": doc["path"].name,
+                        "chunk_ids": sorted(c["id"] for c in chunks),
+                    }
+                    stats["added_docs"] += 1
+
+                def _on_batch(chunks: List[Dict[str, Any]], vectors) -> None:
+                    index.add_with_ids(vectors, np.asarray([c["id"] for c in chunks], dtype=np.int64))
+                    added_ids.extend(c["id"] for c in chunks)
+                    for c in chunks:
+                        docstore[f"{c['id']:015x}"] = {
+                            "__data__": {"text": c["text"], "metadata": c["metadata"]},
+                            "__type__": "1",
+                        }
+                    stats["added_chunks"] += len(chunks)
+
+                pipeline = IngestPipeline(
+                    self.embed_fn, self.cache,
+                    max_batch_items=self.embed_batch_size,
+                    **self.pipeline_options,
+                )
+                metrics = pipeline.run(
+                    [(k, current[k]["path"], current[k]["source_type"]) for k in pending],
+                    self.hospital_id, _on_document, _on_batch, progress,
+                )
+                stats["embedded_chunks"] = metrics.stages["embed"].items
+                stats["reused_embeddings"] = metrics.cache_hits
+
+            if index.ntotal == 0:
+                self.clear()
+                progress("활성 문서 없음 - 인덱스 초기화 완료")
+                return {**stats, "mode": mode, "changed": True, "document_count": 0, "vector_count": 0,
+                        "metrics": metrics.to_dict() if metrics else None}
+
+            changed = mode == "full" or bool(remove_ids) or bool(pending) or bool(stale_keys)
+            if changed:
+                progress("인덱스 저장 중...")
+                self._save(index, docstore, manifest, added_ids, remove_ids, rebuild=mode == "full")
+
+            logger.info(
+                f"[index-sync:{self.hospital_id}] {mode} 완료 - 벡터 {index.ntotal}개 "
+                f"(+{stats['added_chunks']}/-{stats['removed_chunks']}, "
+                f"임베딩 {stats['embedded_chunks']}건, 캐시 재사용 {stats['reused_embeddings']}건)"
+            )
+            return {
+                **stats,
+                "mode": mode,
+                "changed": changed,
+                "document_count": len(docstore),
+                "vector_count": int(index.ntotal),
+                "metrics": metrics.to_dict() if metrics else None,
+            }
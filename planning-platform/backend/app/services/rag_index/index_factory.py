@@ -0,0 +1,408 @@
+"""
+근사 최근접(ANN) 인덱스 팩토리.
+
+글로벌/병원 인덱스는 llama-index 호환 IndexFlatL2(또는 IndexIDMap2)를 원본으로 유지하고,
+검색용으로 크기에 맞는 ANN 인덱스를 별도 파일(faiss.ann.index)로 만들어 둔다.
+원본 벡터에서 재구성하므로 label(= FAISS idx 또는 청크 ID)은 원본과 동일 → docstore 매핑 그대로 사용.
+
+인덱스 종류 (RAG_ANN_KIND, 기본 auto):
+  flat   — 전수 검색 (사이드카 생성 안 함)
+  hnsw   — HNSW 그래프. 압축: none | fp16 | sq8
+  ivfpq  — IVF + Product Quantization (학습된 코드북). 압축: pq(기본) | fp16 | sq8
+  auto   — 벡터 수 기준 선택: < RAG_ANN_FLAT_MAX → flat, < RAG_ANN_HNSW_MAX → hnsw, 이상 → ivfpq
+
+검색 파라미터: RAG_ANN_EF_SEARCH(HNSW), RAG_ANN_NPROBE(IVF)
+
+증분 동기화(update_ann_sidecar)는 매번 재구축하지 않고 학습된 사이드카에 변경분만 반영한다.
+마지막 재구축 이후 추가/삭제 벡터 수가 RAG_ANN_REBUILD_DRIFT(기본 0.2) 비율을 넘거나
+종류·팩토리가 바뀌면 그때만 다시 만든다. HNSW는 삭제를 지원하지 않아 삭제 청크는
+docstore에서만 빠지고(검색 시 건너뜀) 재구축 때 정리된다.
+"""
+
+import json
+import logging
+import math
+import os
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+ANN_INDEX_FILE = "faiss.ann.index"
+ANN_META_FILE = "faiss.ann.json"
+FLAT_INDEX_FILE = "faiss.index"
+
+
+@dataclass
+class IndexSpec:
+    """ANN 인덱스 구성"""
+    kind: str = "auto"                 # auto | flat | hnsw | ivfpq
+    compression: str = "none"          # none | fp16 | sq8 | pq
+    flat_max: int = 50_000             # auto: 이 미만이면 flat
+    hnsw_max: int = 1_000_000          # auto: 이 미만이면 hnsw, 이상이면 ivfpq
+    hnsw_m: int = 32
+    ef_construction: int = 200
+    ef_search: int = 64
+    nlist: Optional[int] = None        # None이면 4*sqrt(n)
+    pq_m: Optional[int] = None         # None이면 dim/16 (서브벡터당 16차원)
+    nprobe: int = 16
+    rebuild_drift: float = 0.2         # 재구축 이후 변경 벡터 비율이 이보다 크면 다시 구축
+
+    def resolve_kind(self, ntotal: int) -> str:
+        if self.kind != "auto":
+            return self.kind
+        if ntotal < self.flat_max:
+            return "flat"
+        if ntotal < self.hnsw_max:
+            return "hnsw"
+        return "ivfpq"
+
+    def factory_string(self, dim: int, ntotal: int) -> str:
+        """faiss.index_factory 문자열"""
+        kind = self.resolve_kind(ntotal)
+        if kind == "flat":
+            return {"fp16": "SQfp16", "sq8": "SQ8"}.get(self.compression, "Flat")
+        if kind == "hnsw":
+            storage = {"fp16": "SQfp16", "sq8": "SQ8"}.get(self.compression, "Flat")
+            return f"HNSW{self.hnsw_m},{storage}"
+        if kind == "ivfpq":
+            nlist = self.nlist_for(ntotal)
+            if self.compression in ("fp16", "sq8"):
+                return f"IVF{nlist},{'SQfp16' if self.compression == 'fp16' else 'SQ8'}"
+            return f"IVF{nlist},PQ{self.pq_m_for(dim)}x8"
+        raise ValueError(f"알 수 없는 인덱스 종류: {kind}")
+
+    def nlist_for(self, ntotal: int) -> int:
+        if self.nlist:
+            return self.nlist
+        # 클러스터당 최소 39개 학습 포인트 (faiss 권장) 확보
+        return max(1, min(int(4 * math.sqrt(max(ntotal, 1))), ntotal // 39 or 1))
+
+    def pq_m_for(self, dim: int) -> int:
+        m = self.pq_m or max(1, dim // 16)
+        while dim % m:
+            m -= 1
+        return m
+
+
+def spec_from_env() -> IndexSpec:
+    """환경변수 기반 IndexSpec"""
+    env = os.environ
+    return IndexSpec(
+        kind=env.get("RAG_ANN_KIND", "auto").lower(),
+        compression=env.get("RAG_ANN_COMPRESSION", "none").lower(),
+        flat_max=int(env.get("RAG_ANN_FLAT_MAX", "50000")),
+        hnsw_max=int(env.get("RAG_ANN_HNSW_MAX", "1000000")),
+        hnsw_m=int(env.get("RAG_ANN_HNSW_M", "32")),
+        ef_construction=int(env.get("RAG_ANN_EF_CONSTRUCTION", "200")),
+        ef_search=int(env.get("RAG_ANN_EF_SEARCH", "64")),
+        nlist=int(env["RAG_ANN_NLIST"]) if env.get("RAG_ANN_NLIST") else None,
+        pq_m=int(env["RAG_ANN_PQ_M"]) if env.get("RAG_ANN_PQ_M") else None,
+        nprobe=int(env.get("RAG_ANN_NPROBE", "16")),
+        rebuild_drift=float(env.get("RAG_ANN_REBUILD_DRIFT", "0.2")),
+    )
+
+
+def extract_vectors(index) -> Tuple[Any, Optional[Any]]:
+    """Flat / IDMap(Flat) 인덱스에서 (벡터, ID) 추출. 일반 Flat이면 ID는 None."""
+    import faiss
+
+    if isinstance(index, (faiss.IndexIDMap, faiss.IndexIDMap2)):
+        inner = faiss.downcast_index(index.index)
+        ids = faiss.vector_to_array(index.id_map).astype("int64")
+        return inner.reconstruct_n(0, inner.ntotal), ids
+    return index.reconstruct_n(0, index.ntotal), None
+
+
+def build_ann_index(vectors, spec: IndexSpec, ids=None, metric: Optional[int] = None):
+    """벡터 → ANN 인덱스 (필요 시 코드북 학습). ids가 있으면 IndexIDMap2로 감싼다."""
+    import faiss
+    import numpy as np
+
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    ntotal, dim = vectors.shape
+    factory = spec.factory_string(dim, ntotal)
+    metric = faiss.METRIC_L2 if metric is None else metric
+    index = faiss.index_factory(dim, factory, metric)
+
+    hnsw = _hnsw_of(index)
+    if hnsw is not None:
+        hnsw.efConstruction = spec.ef_construction
+
+    if not index.is_trained:
+        # 학습 샘플: 최대 nlist*256 (또는 PQ 코드북용 최소 수)
+        sample_size = min(ntotal, max(256 * spec.nlist_for(ntotal), 10_000))
+        rng = np.random.default_rng(42)
+        sample = vectors[rng.choice(ntotal, size=sample_size, replace=False)] if sample_size < ntotal else vectors
+        t0 = time.time()
+        index.train(sample)
+        logger.info(f"[ann] {factory} 학습 완료 ({sample_size}개 샘플, {time.time() - t0:.1f}s)")
+
+    if ids is not None:
+        index = faiss.IndexIDMap2(index)
+        index.add_with_ids(vectors, np.asarray(ids, dtype=np.int64))
+    else:
+        index.add(vectors)
+    apply_search_params(index, spec)
+    return index
+
+
+def _hnsw_of(index):
+    import faiss
+
+    base = faiss.downcast_index(index.index) if isinstance(index, (faiss.IndexIDMap, faiss.IndexIDMap2)) else index
+    return getattr(base, "hnsw", None)
+
+
+def apply_search_params(index, spec: IndexSpec) -> None:
+    """efSearch / nprobe 적용 (IDMap 래핑 포함)"""
+    import faiss
+
+    base = faiss.downcast_index(index.index) if isinstance(index, (faiss.IndexIDMap, faiss.IndexIDMap2)) else index
+    hnsw = getattr(base, "hnsw", None)
+    if hnsw is not None:
+        hnsw.efSearch = spec.ef_search
+    ivf = faiss.try_extract_index_ivf(base)
+    if ivf is not None:
+        ivf.nprobe = spec.nprobe
+
+
+def flat_signature(flat_path: Path) -> Dict[str, Any]:
+    """원본 인덱스 파일 서명 (사이드카 meta.source와 비교해 최신 여부 판단)"""
+    st = flat_path.stat()
+    return {"size": st.st_size, "mtime": st.st_mtime}
+
+
+def write_ann_sidecar(index_dir: Path, flat_index=None, spec: Optional[IndexSpec] = None) -> Optional[Dict[str, Any]]:
+    """원본 flat 인덱스로부터 검색용 ANN 사이드카 생성.
+
+    auto 선택 결과가 flat이면 기존 사이드카를 제거하고 None 반환.
+    """
+    import faiss
+
+    index_dir = Path(index_dir)
+    spec = spec or spec_from_env()
+    flat_path = index_dir / FLAT_INDEX_FILE
+    if flat_index is None:
+        flat_index = faiss.read_index(str(flat_path))
+
+    kind = spec.resolve_kind(flat_index.ntotal)
+    if kind == "flat" and spec.compression == "none":
+        remove_ann_sidecar(index_dir)
+        return None
+
+    t0 = time.time()
+    vectors, ids = extract_vectors(flat_index)
+    ann = build_ann_index(vectors, spec, ids=ids)
+    build_sec = time.time() - t0
+
+    tmp = index_dir / (ANN_INDEX_FILE + ".tmp")
+    faiss.write_index(ann, str(tmp))
+    os.replace(tmp, index_dir / ANN_INDEX_FILE)
+    meta = {
+        "kind": kind,
+        "factory": spec.factory_string(vectors.shape[1], flat_index.ntotal),
+        "ntotal": int(ann.ntotal),
+        "built_ntotal": int(ann.ntotal),
+        "drift": 0,
+        "dimension": int(vectors.shape[1]),
+        "spec": asdict(spec),
+        "source": flat_signature(flat_path),
+        "bytes": (index_dir / ANN_INDEX_FILE).stat().st_size,
+        "build_seconds": round(build_sec, 2),
+        "built_at": datetime.now().isoformat(),
+    }
+    _write_meta(index_dir, meta)
+    logger.info(f"[ann] {index_dir.name}: {meta['factory']} {meta['ntotal']}개 벡터, {meta['bytes']} bytes ({build_sec:.1f}s)")
+    return meta
+
+
+def update_ann_sidecar(
+    index_dir: Path,
+    flat_index,
+    spec: Optional[IndexSpec] = None,
+    added_ids: Sequence[int] = (),
+    removed_ids: Sequence[int] = (),
+    previous_source: Optional[Dict[str, Any]] = None,
+    rebuild: bool = False,
+) -> Optional[Dict[str, Any]]:
+    """증분 동기화 후 사이드카 갱신 — 변경분만 기존 학습 인덱스에 반영하고, 필요할 때만 재구축.
+
+    Args:
+        flat_index: 변경이 반영된 IndexIDMap2 원본 (이미 faiss.index로 저장된 상태)
+        added_ids / removed_ids: 이번 동기화에서 추가/삭제된 청크 ID
+        previous_source: 이번 저장 전 faiss.index 서명. 사이드카 meta.source와 다르면
+            사이드카가 이전 원본과도 어긋난 상태 → 삭제 후 재구축
+        rebuild: 강제 재구축 (전체 동기화)
+    """
+    import faiss
+    import numpy as np
+
+    index_dir = Path(index_dir)
+    spec = spec or spec_from_env()
+    ann_path = index_dir / ANN_INDEX_FILE
+    meta_path = index_dir / ANN_META_FILE
+
+    kind = spec.resolve_kind(flat_index.ntotal)
+    if kind == "flat" and spec.compression == "none":
+        remove_ann_sidecar(index_dir)
+        return None
+    if rebuild or not ann_path.exists() or not meta_path.exists():
+        return write_ann_sidecar(index_dir, flat_index, spec)
+
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    except ValueError:
+        meta = {}
+    if previous_source is None or meta.get("source") != previous_source:
+        logger.warning(f"[ann] {index_dir.name}: 사이드카가 이전 원본과 불일치 → 삭제 후 재구축")
+        remove_ann_sidecar(index_dir)
+        return write_ann_sidecar(index_dir, flat_index, spec)
+
+    built_ntotal = int(meta.get("built_ntotal", meta.get("ntotal", 0)))
+    drift = int(meta.get("drift", 0)) + len(added_ids) + len(removed_ids)
+    if (
+        meta.get("kind") != kind
+        or meta.get("factory") != spec.factory_string(flat_index.d, built_ntotal)
+        or drift > spec.rebuild_drift * max(built_ntotal, 1)
+    ):
+        return write_ann_sidecar(index_dir, flat_index, spec)
+
+    t0 = time.time()
+    ann = faiss.read_index(str(ann_path))
+    if not isinstance(ann, (faiss.IndexIDMap, faiss.IndexIDMap2)):
+        return write_ann_sidecar(index_dir, flat_index, spec)
+    added = [int(i) for i in added_ids]
+    if _hnsw_of(ann) is None:
+        if removed_ids:
+            ann.remove_ids(np.asarray(removed_ids, dtype=np.int64))
+    else:
+        # HNSW는 삭제 불가 — 남은 벡터는 docstore에 없어 검색 시 건너뜀.
+        # 청크 ID는 내용 해시라 같은 ID가 다시 추가되면 벡터도 같으므로 중복 추가하지 않는다.
+        present = set(faiss.vector_to_array(ann.id_map).tolist())
+        added = [i for i in added if i not in present]
+    if added:
+        vectors = np.vstack([flat_index.reconstruct(i) for i in added]).astype(np.float32)
+        ann.add_with_ids(vectors, np.asarray(added, dtype=np.int64))
+
+    tmp = index_dir / (ANN_INDEX_FILE + ".tmp")
+    faiss.write_index(ann, str(tmp))
+    os.replace(tmp, ann_path)
+    meta.update({
+        "ntotal": int(ann.ntotal),
+        "built_ntotal": built_ntotal,
+        "drift": drift,
+        "source": flat_signature(index_dir / FLAT_INDEX_FILE),
+        "bytes": ann_path.stat().st_size,
+        "updated_at": datetime.now().isoformat(),
+    })
+    _write_meta(index_dir, meta)
+    logger.info(
+        f"[ann] {index_dir.name}: 증분 반영 +{len(added)}/-{len(removed_ids)} "
+        f"(누적 변경 {drift}/{built_ntotal}, {time.time() - t0:.2f}s)"
+    )
+    return meta
+
+
+def _write_meta(index_dir: Path, meta: Dict[str, Any]) -> None:
+    meta_tmp = index_dir / (ANN_META_FILE + ".tmp")
+    meta_tmp.write_text(json.dumps(meta, ensure_ascii=False, indent=1), encoding="utf-8")
+    os.replace(meta_tmp, index_dir / ANN_META_FILE)
+
+
+def remove_ann_sidecar(index_dir: Path) -> None:
+    for name in (ANN_INDEX_FILE, ANN_META_FILE):
+        path = Path(index_dir) / name
+        if path.exists():
+            path.unlink()
+
+
+def load_search_index(index_dir: str):
+    """검색용 인덱스 로드 — 최신 ANN 사이드카가 있으면 사용, 없거나 오래되면 flat.
+
+    Returns:
+        (index, kind)
+    """
+    import faiss
+
+    index_dir = Path(index_dir)
+    flat_path = index_dir / FLAT_INDEX_FILE
+    ann_path = index_dir / ANN_INDEX_FILE
+    meta_path = index_dir / ANN_META_FILE
+
+    if os.environ.get("RAG_ANN_KIND", "auto").lower() != "flat" and ann_path.exists() and meta_path.exists():
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            if meta.get("source") == flat_signature(flat_path):
+                try:
+                    index = faiss.read_index(str(ann_path), faiss.IO_FLAG_MMAP)
+                except RuntimeError:
+                    index = faiss.read_index(str(ann_path))
+                spec = spec_from_env()
+                apply_search_params(index, spec)
+                return index, meta.get("kind", "ann")
+            logger.warning(f"[ann] {index_dir.name}: 사이드카가 원본 인덱스보다 오래됨 → flat 사용")
+        except Exception as e:
+            logger.warning(f"[ann] {index_dir.name}: 사이드카 로드 실패 → flat 사용: {e}")
+
+    # mmap 모드: RSS에 잡히지 않아 PM2 OOM 방지
+    return faiss.read_index(str(flat_path), faiss.IO_FLAG_MMAP), "flat"
+
+
+def index_memory_bytes(index) -> int:
+    """직렬화 크기 (메모리 사용량 근사치)"""
+    import faiss
+    return int(faiss.serialize_index(index).nbytes)
+
+
+def recall_at_k(exact_index, candidate_index, queries, k: int = 10) -> Dict[str, float]:
+    """exact(flat) 대비 candidate의 recall@k 및 쿼리 지연 측정"""
+    import numpy as np
+
+    queries = np.ascontiguousarray(queries, dtype=np.float32)
+    _, truth = exact_index.search(queries, k)
+
+    latencies = []
+    hits = 0
+    for i in range(queries.shape[0]):
+        t0 = time.perf_counter()
+        _, found = candidate_index.search(queries[i:i + 1], k)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        expected = {int(x) for x in truth[i] if x >= 0}
+        hits += len(expected & {int(x) for x in found[0] if x >= 0})
+
+    total = sum(1 for row in truth for x in row if x >= 0) or 1
+    lat = np.asarray(latencies)
+    return {
+        "recall": hits / total,
+        "latency_ms_mean": float(lat.mean()) if lat.size else 0.0,
+        "latency_ms_p95": float(np.percentile(lat, 95)) if lat.size else 0.0,
+        "queries": int(queries.shape[0]),
+        "k": k,
+    }
+
+
+def evaluate_specs(flat_index, queries, specs: Sequence[IndexSpec], k: int = 10) -> Dict[str, Dict[str, Any]]:
+    """여러 IndexSpec을 flat 기준으로 비교 (recall@k, 지연, 크기, 빌드 시간)"""
+    vectors, ids = extract_vectors(flat_index)
+    report: Dict[str, Dict[str, Any]] = {
+        "flat": {
+            **recall_at_k(flat_index, flat_index, queries, k),
+            "bytes": index_memory_bytes(flat_index),
+            "build_seconds": 0.0,
+        }
+    }
+    for spec in specs:
+        name = spec.factory_string(vectors.shape[1], vectors.shape[0])
+        t0 = time.time()
+        candidate = build_ann_index(vectors, spec, ids=ids)
+        build_sec = time.time() - t0
+        report[name] = {
+            **recall_at_k(flat_index, candidate, queries, k),
+            "bytes": index_memory_bytes(candidate),
+            "build_seconds": round(build_sec, 2),
+        }
+    return report
@@ -0,0 +1,356 @@
+"""
+문서 인제스트 파이프라인 (파싱 → 청킹 → 임베딩 → 단일 writer).
+
+  parse  — 문서 단위 텍스트 추출. 프로세스 풀(spawn)에서 병렬 실행 (pypdf는 CPU 바운드)
+  chunk  — 파싱 완료 순서대로 스트리밍 처리: 과대 페이지 분할, 해시/청크 ID 부여
+  embed  — 캐시 미스만 배치로 묶어 스레드 풀에서 동시 요청.
+           배치는 건수(max_batch_items)와 추정 토큰(max_batch_tokens)으로 자르고,
+           분당 토큰 버킷(tokens_per_minute)으로 속도 제한, 429는 백오프 후 재시도
+  write  — 호출 스레드 하나만 on_batch 콜백으로 FAISS/docstore를 갱신 (FAISS 쓰기는 thread-safe 아님)
+
+in-flight 임베딩 배치 수를 제한하므로 문서가 많아도 메모리는 배치 몇 개 분량으로 유지된다.
+단계별 처리량은 PipelineMetrics로 집계한다.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait,
+)
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from .hospital_index import EmbeddingCache, chunk_id, extract_chunks, text_sha256
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PARSE_WORKERS = int(os.environ.get("RAG_INGEST_PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+DEFAULT_EMBED_WORKERS = int(os.environ.get("RAG_INGEST_EMBED_WORKERS", "4"))
+DEFAULT_TOKENS_PER_MINUTE = int(os.environ.get("RAG_EMBED_TOKENS_PER_MINUTE", "1000000"))
+# text-embedding-ada-002 입력 한도 8191 토큰 — 한글은 글자당 ~1토큰으로 보수적으로 추정
+DEFAULT_MAX_CHUNK_CHARS = 6000
+
+
+@dataclass
+class StageMetrics:
+    items: int = 0
+    seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "items": self.items,
+            "seconds": round(self.seconds, 3),
+            "per_sec": round(self.items / self.seconds, 2) if self.seconds > 0 else None,
+        }
+
+
+@dataclass
+class PipelineMetrics:
+    """단계별 처리량 (seconds는 해당 단계 작업 시간 합계)"""
+    stages: Dict[str, StageMetrics] = field(default_factory=lambda: {
+        name: StageMetrics() for name in ("parse", "chunk", "embed", "write")
+    })
+    embed_requests: int = 0
+    embed_retries: int = 0
+    cache_hits: int = 0
+    parse_failures: int = 0
+    wall_seconds: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, stage: str, items: int, seconds: float) -> None:
+        with self._lock:
+            m = self.stages[stage]
+            m.items += items
+            m.seconds += seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "stages": {name: m.to_dict() for name, m in self.stages.items()},
+            "embed_requests": self.embed_requests,
+            "embed_retries": self.embed_retries,
+            "cache_hits": self.cache_hits,
+            "parse_failures": self.parse_failures,
+            "wall_seconds": round(self.wall_seconds, 3),
+        }
+
+
+class TokenBucket:
+    """분당 토큰 한도 버킷 (스레드 안전). 버킷 용량보다 큰 요청은 가득 찬 뒤 통과."""
+
+    def __init__(self, tokens_per_minute: int):
+        self.capacity = max(1, tokens_per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount: int) -> None:
+        amount = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                wait_sec = (amount - self.tokens) / self.rate
+            time.sleep(min(wait_sec, 5.0))
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text))
+
+
+def _is_rate_limit(exc: Exception) -> bool:
+    return "RateLimit" in type(exc).__name__ or getattr(exc, "status_code", None) == 429
+
+
+def _retry_after(exc: Exception) -> Optional[float]:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        value = headers.get("retry-after")
+        return float(value) if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+def split_oversized(chunk: Dict[str, Any], max_chars: int) -> List[Dict[str, Any]]:
+    """임베딩 입력 한도를 넘는 페이지를 문단 경계 우선으로 분할"""
+    text = chunk["text"]
+    if len(text) <= max_chars:
+        return [chunk]
+    parts: List[str] = []
+    buf = ""
+    for para in text.split("\n"):
+        while len(para) > max_chars:
+            if buf:
+                parts.append(buf)
+                buf = ""
+            parts.append(para[:max_chars])
+            para = para[max_chars:]
+        if len(buf) + len(para) + 1 > max_chars:
+            parts.append(buf)
+            buf = para
+        else:
+            buf = f"{buf}\n{para}" if buf else para
+    if buf.strip():
+        parts.append(buf)
+    page = chunk["metadata"]["page_label"]
+    return [
+        {"text": part.strip(), "metadata": {**chunk["metadata"], "page_label": f"{page}#{i}"}}
+        for i, part in enumerate(parts, 1) if part.strip()
+    ]
+
+
+def _parse_document(path: str, hospital_id: str, source_type: str) -> Tuple[List[Dict[str, Any]], float]:
+    """프로세스 풀 워커 진입점 (pickle 가능한 최상위 함수)"""
+    t0 = time.perf_counter()
+    chunks = extract_chunks(Path(path), hospital_id, source_type)
+    return chunks, time.perf_counter() - t0
+
+
+class IngestPipeline:
+    """문서 목록을 청크 임베딩으로 변환해 단일 writer 콜백에 전달"""
+
+    def __init__(
+        self,
+        embed_fn: Callable[[List[str]], List[List[float]]],
+        cache: EmbeddingCache,
+        parse_workers: int = DEFAULT_PARSE_WORKERS,
+        embed_workers: int = DEFAULT_EMBED_WORKERS,
+        max_batch_items: int = 2048,
+        max_batch_tokens: int = 250_000,
+        tokens_per_minute: int = DEFAULT_TOKENS_PER_MINUTE,
+        max_chunk_chars: int = DEFAULT_MAX_CHUNK_CHARS,
+        max_retries: int = 5,
+    ):
+        self.embed_fn = embed_fn
+        self.cache = cache
+        self.parse_workers = parse_workers
+        self.embed_workers = max(1, embed_workers)
+        self.max_batch_items = max_batch_items
+        self.max_batch_tokens = max_batch_tokens
+        self.bucket = TokenBucket(tokens_per_minute)
+        self.max_chunk_chars = max_chunk_chars
+        self.max_retries = max_retries
+        self.metrics = PipelineMetrics()
+
+    # ── parse ────────────────────────────────────────────────
+
+    def _parse_executor(self, n_docs: int) -> Executor:
+        if self.parse_workers > 1 and n_docs > 1:
+            try:
+                import multiprocessing
+                return ProcessPoolExecutor(
+                    max_workers=min(self.parse_workers, n_docs),
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            except Exception as e:
+                logger.warning(f"[ingest] 프로세스 풀 생성 실패 → 스레드 파싱: {e}")
+        return ThreadPoolExecutor(max_workers=1, thread_name_prefix="ingest-parse")
+
+    # ── embed ────────────────────────────────────────────────
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        tokens = sum(estimate_tokens(t) for t in texts)
+        attempt = 0
+        while True:
+            self.bucket.acquire(tokens)
+            t0 = time.perf_counter()
+            try:
+                vectors = self.embed_fn(texts)
+                self.metrics.record("embed", len(texts), time.perf_counter() - t0)
+                with self.metrics._lock:
+                    self.metrics.embed_requests += 1
+                return vectors
+            except Exception as e:
+                attempt += 1
+                if attempt > self.max_retries:
+                    raise
+                with self.metrics._lock:
+                    self.metrics.embed_retries += 1
+                delay = _retry_after(e) or min(2 ** attempt, 60)
+                kind = "rate limit" if _is_rate_limit(e) else type(e).__name__
+                logger.warning(f"[ingest] 임베딩 재시도 {attempt}/{self.max_retries} ({kind}, {delay:.1f}s 후)")
+                time.sleep(delay)
+
+    # ── run ──────────────────────────────────────────────────
+
+    def run(
+        self,
+        documents: Sequence[Tuple[str, Path, str]],
+        hospital_id: str,
+        on_document: Callable[[str, List[Dict[str, Any]]], None],
+        on_batch: Callable[[List[Dict[str, Any]], Any], None],
+        progress: Optional[Callable[[str], None]] = None,
+    ) -> PipelineMetrics:
+        """
+        Args:
+            documents: [(문서 키, 경로, source_type)]
+            on_document: 문서 청킹 완료 시 (키, 청크 목록) — 호출 스레드에서 실행
+            on_batch: 임베딩 완료 배치 (청크 목록, float32 행렬) — 호출 스레드에서만 실행 (단일 writer)
+        """
+        import numpy as np
+
+        progress = progress or (lambda msg: None)
+        started = time.perf_counter()
+        total_docs = len(documents)
+        done_docs = 0
+        embedded = 0
+
+        pending_chunks: Deque[Dict[str, Any]] = deque()
+        pending_tokens = 0
+        inflight: Dict[Future, List[Dict[str, Any]]] = {}
+        max_inflight = self.embed_workers * 2
+
+        def write(chunks: List[Dict[str, Any]], vectors) -> None:
+            nonlocal embedded
+            t0 = time.perf_counter()
+            on_batch(chunks, vectors)
+            self.metrics.record("write", len(chunks), time.perf_counter() - t0)
+            embedded += len(chunks)
+
+        def drain(block: bool) -> None:
+            if not inflight:
+                return
+            done, _ = wait(list(inflight), timeout=None if block else 0, return_when=FIRST_COMPLETED)
+            for fut in done:
+                chunks = inflight.pop(fut)
+                vectors = fut.result()
+                fresh = {c["text_hash"]: v for c, v in zip(chunks, vectors)}
+                self.cache.put_many(fresh)
+                write(chunks, np.asarray(vectors, dtype=np.float32))
+                progress(f"임베딩 중... (문서 {done_docs}/{total_docs}, 청크 {embedded}개 완료)")
+
+        def flush(embed_pool: ThreadPoolExecutor, force: bool) -> None:
+            nonlocal pending_tokens
+            while pending_chunks and (force or len(pending_chunks) >= self.max_batch_items
+                                      or pending_tokens >= self.max_batch_tokens):
+                batch: List[Dict[str, Any]] = []
+                tokens = 0
+                while pending_chunks and len(batch) < self.max_batch_items:
+                    t = estimate_tokens(pending_chunks[0]["text"])
+                    if batch and tokens + t > self.max_batch_tokens:
+                        break
+                    batch.append(pending_chunks.popleft())
+                    tokens += t
+                pending_tokens -= tokens
+                while len(inflight) >= max_inflight:
+                    drain(block=True)
+                inflight[embed_pool.submit(self._embed_batch, [c["text"] for c in batch])] = batch
+
+        def enqueue(chunks: List[Dict[str, Any]], embed_pool: ThreadPoolExecutor) -> None:
+            nonlocal pending_tokens
+            cached = self.cache.get_many(c["text_hash"] for c in chunks)
+            hits = [c for c in chunks if c["text_hash"] in cached]
+            if hits:
+                self.metrics.cache_hits += len(hits)
+                write(hits, np.vstack([cached[c["text_hash"]] for c in hits]).astype(np.float32))
+            for c in chunks:
+                if c["text_hash"] not in cached:
+                    pending_chunks.append(c)
+                    pending_tokens += estimate_tokens(c["text"])
+            flush(embed_pool, force=False)
+
+        def chunk_document(key: str, raw_chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            t0 = time.perf_counter()
+            out: List[Dict[str, Any]] = []
+            seen = set()
+            for raw in raw_chunks:
+                for c in split_oversized(raw, self.max_chunk_chars):
+                    c["text_hash"] = text_sha256(c["text"])
+                    cid = chunk_id(key, c["metadata"]["page_label"], c["text_hash"])
+                    if cid in seen:
+                        continue
+                    seen.add(cid)
+                    c["id"] = cid
+                    c["metadata"]["chunk_id"] = cid
+                    out.append(c)
+            self.metrics.record("chunk", len(out), time.perf_counter() - t0)
+            return out
+
+        parse_pool = self._parse_executor(total_docs)
+        embed_pool = ThreadPoolExecutor(max_workers=self.embed_workers, thread_name_prefix="ingest-embed")
+        try:
+            futures = {
+                parse_pool.submit(_parse_document, str(path), hospital_id, source_type): (key, path, source_type)
+                for key, path, source_type in documents
+            }
+            remaining = set(futures)
+            while remaining:
+                done, remaining = wait(remaining, timeout=0.2, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    key, path, _ = futures[fut]
+                    done_docs += 1
+                    try:
+                        try:
+                            raw_chunks, parse_sec = fut.result()
+                        except BrokenProcessPool:
+                            # 워커 프로세스 비정상 종료 → 해당 문서는 현재 스레드에서 파싱
+                            raw_chunks, parse_sec = _parse_document(str(path), hospital_id, futures[fut][2])
+                    except Exception as parse_err:
+                        self.metrics.parse_failures += 1
+                        logger.warning(f"[ingest:{hospital_id}] 파싱 실패 {path.name}: {parse_err}")
+                        continue
+                    self.metrics.record("parse", 1, parse_sec)
+                    chunks = chunk_document(key, raw_chunks)
+                    on_document(key, chunks)
+                    progress(f"문서 파싱 중... ({done_docs}/{total_docs}) {path.name}")
+                    enqueue(chunks, embed_pool)
+                # 파싱 대기 중에도 완료된 임베딩은 즉시 기록
+                drain(block=False)
+            flush(embed_pool, force=True)
+            while inflight:
+                drain(block=True)
+        finally:
+            parse_pool.shutdown(wait=True, cancel_futures=True)
+            embed_pool.shutdown(wait=True, cancel_futures=True)
+            self.metrics.wall_seconds = time.perf_counter() - started
+        return self.metrics
@@ -2,7 +2,7 @@
 report_engine — mediArc 자체 계산 엔진 패키지.
 
 외부 노출 (partner_office.py에서 import 가능):
-    EngineFacade           — 싱글톤 파사드 + run(name, patient) 인터페이스
+    EngineFacade           — 싱글톤 파사드 + run(name, patient) / await arun(name, patient) 인터페이스
     ENGINE_AVAILABLE       — 엔진 로드 성공 여부
     MODEL_LOADED           — pkl 모델 로드 성공 여부
     compare_single         — Twobecon vs 엔진 실시간 비교 (async)
@@ -2164,3 +2164,231 @@ def compute_milestone_scenario(patient: dict, disease_results: dict, milestone:
         "applied_attenuation": applied_atten,
         "has_improvement": has_improvement,
     }
+
+
+# ============================================================
+# 마일스톤 시뮬레이션 그리드 (슬라이더용 일괄 계산)
+# ============================================================
+# compute_milestone_scenario 를 BMI × 금연 × 금주 × 시간 축의 데카르트 곱 전체에 대해
+# numpy 배열 한 번으로 계산한다. 축별 위험인자를 배열로 만들고 RR_MATRIX / ATTENUATION_PAIRS /
+# 코호트 평균을 그대로 곱하므로 각 칸의 결과는 단건 compute_milestone_scenario 와 같다.
+
+MAX_GRID_CELLS = 4096
+
+# BMI·혈압·혈당·흡연·음주에 따라 달라지는 위험인자 (나머지는 그리드 전체에서 고정)
+_GRID_VARYING_FACTORS = (
+    "underweight", "normal_weight", "overweight", "obese", "overweight_age",
+    "htn", "htn_or_hx", "htn_midlife", "ifg", "diabetes_fbg",
+    "smoking", "ex_smoking", "drinking", "drinking_heavy", "drinking_moderate", "non_drinking",
+)
+
+
+def _grid_bmi_targets(patient: dict, bmi_targets: Optional[list], weight_deltas: Optional[list]) -> list:
+    """BMI 축 값 — weight_delta_kg 축이면 compute_milestone_scenario 와 같은 식으로 역산 (불가 시 None)."""
+    if bmi_targets is not None:
+        return [None if b is None else float(b) for b in bmi_targets]
+    if weight_deltas is None:
+        return [None]
+    h = patient.get("height") or 0
+    w = patient.get("weight") or 0
+    if h > 0 and w > 0:
+        return [round(max(w - float(d), 30.0) / (h / 100.0) ** 2, 1) for d in weight_deltas]
+    return [None] * len(weight_deltas)
+
+
+def _grid_factor_arrays(p: dict, bmi, sbp, dbp, fbg, smoking_state, drinking_state) -> dict:
+    """classify_risk_factors 의 변동 인자를 배열로 (브로드캐스트 가능한 shape)."""
+    import numpy as np
+
+    age = p["age"]
+    hx_htn = bool(p.get("hx_htn", False))
+    htn = (sbp >= 140) | (dbp >= 90)
+    return {
+        "underweight": bmi < 18.5,
+        "normal_weight": (bmi >= 18.5) & (bmi < 25),
+        "overweight": (bmi >= 25) & (bmi < 30),
+        "obese": bmi >= 30,
+        "overweight_age": (bmi >= 25) & (age >= 40),
+        "htn": htn,
+        "htn_or_hx": htn | hx_htn,
+        "htn_midlife": ((sbp >= 130) | hx_htn) & (40 <= age <= 65),
+        "ifg": (fbg >= 100) & (fbg < 126),
+        "diabetes_fbg": fbg >= 126,
+        "smoking": smoking_state == "current",
+        "ex_smoking": smoking_state == "former",
+        "drinking": np.isin(drinking_state, ("yes", "heavy", "moderate")),
+        "drinking_heavy": drinking_state == "heavy",
+        "drinking_moderate": np.isin(drinking_state, ("yes", "moderate")),
+        "non_drinking": np.isin(drinking_state, ("none", None)),
+    }
+
+
+def _grid_mets_rr(p: dict, factors: dict, bmi, sbp, dbp, fbg):
+    """_calculate_mets_rr 배열판 (classify_mets_criteria 기준 개수 + 생활습관 보정)."""
+    import numpy as np
+
+    sex = p.get("sex", "M")
+    waist = p.get("waist", 0) or 0
+    tg = p.get("tg")
+    hdl = p.get("hdl")
+    if waist == 0:
+        waist_c = (bmi > 0) & (bmi >= (25 if sex == "M" else 23))
+    else:
+        waist_c = np.full(bmi.shape, waist >= 90 if sex == "M" else waist >= 85)
+    tg_c = tg is not None and tg >= 150
+    hdl_c = hdl is not None and (hdl < 40 if sex == "M" else hdl < 50)
+    bp_c = (sbp >= 130) | (dbp >= 85) | bool(p.get("hx_htn", False))
+    fbg_c = (fbg >= 100) | bool(p.get("hx_dm", False))
+
+    count = waist_c.astype(int) + int(tg_c) + int(hdl_c) + bp_c.astype(int) + fbg_c.astype(int)
+    missing = min(int(tg is None) + int(hdl is None), 2)
+    if missing:
+        count = count + np.where(bmi >= 30, missing * 0.5, np.where(bmi >= 25, missing * 0.3, 0.0))
+
+    values, inverse = np.unique(count, return_inverse=True)
+    base = np.array([_interpolate_mets_rr(float(c)) for c in values])[inverse].reshape(count.shape)
+
+    modifier = 1.0
+    for factor_name, rr_info in RR_MATRIX.get("대사증후군", {}).items():
+        modifier = modifier * np.where(factors.get(factor_name, False), rr_info["rr"], 1.0)
+    return base * modifier
+
+
+def _grid_individual_rr(disease: str, factors: dict, shape):
+    """calculate_individual_rr 배열판 — 인자 곱 × 상관인자 감쇠 (같은 순서로 곱함)."""
+    import numpy as np
+
+    rr = np.ones(shape)
+    present: dict = {}
+    for factor_name, rr_info in RR_MATRIX.get(disease, {}).items():
+        present[factor_name] = factors.get(factor_name, False)
+        rr = rr * np.where(present[factor_name], rr_info["rr"], 1.0)
+    attenuation = np.ones(shape)
+    for (f1, f2), alpha in ATTENUATION_PAIRS.items():
+        if f1 in present and f2 in present:
+            attenuation = attenuation * np.where(present[f1] & present[f2], alpha, 1.0)
+    return rr * attenuation
+
+
+def compute_milestone_grid(
+    patient: dict,
+    disease_results: dict,
+    bmi_targets: Optional[list] = None,
+    weight_deltas: Optional[list] = None,
+    smoking_targets: Optional[list] = None,
+    drinking_targets: Optional[list] = None,
+    time_horizons: Optional[list] = None,
+    exercise_target: Optional[str] = None,
+    diet_target: Optional[str] = None,
+) -> dict:
+    """마일스톤 축 데카르트 곱 전체를 한 번에 계산 (FE 슬라이더 보간용).
+
+    축 순서: bmi(bmi_targets 또는 weight_deltas) × smoking_targets × drinking_targets × time_horizons.
+    각 축 생략 시 [None] (bmi: 현재 유지, 시간: [0]). exercise/diet 는 전체 칸 공통 값.
+    ratios[질환] 은 shape 순서 row-major 평탄 리스트 — 칸 (b, s, d, t) 값은
+    compute_milestone_scenario(..., {bmi_target, smoking_target, drinking_target, time_horizon_months}) 의 ratios 와 같다.
+    """
+    import numpy as np
+
+    if bmi_targets is not None and weight_deltas is not None:
+        raise ValueError("bmi_targets 와 weight_deltas 는 함께 쓸 수 없음")
+    targets = _grid_bmi_targets(patient, bmi_targets, weight_deltas)
+    smoking_targets = list(smoking_targets or [None])
+    drinking_targets = list(drinking_targets or [None])
+    time_horizons = [int(t or 0) for t in (time_horizons or [0])]
+    shape = (len(targets), len(smoking_targets), len(drinking_targets), len(time_horizons))
+    cells = int(np.prod(shape))
+    if cells == 0 or cells > MAX_GRID_CELLS:
+        raise ValueError(f"그리드 칸 수 {cells} — 1~{MAX_GRID_CELLS} 범위여야 함")
+
+    # ── BMI 축 (B,1,1,1) ──
+    orig_bmi: float = patient.get("bmi", 22.0) or 22.0
+    cur_bmi = patient.get("bmi", 0) or 0
+    target_arr = np.array([orig_bmi if b is None else b for b in targets], dtype=float)
+    bmi = np.array([cur_bmi if b is None else b for b in targets], dtype=float).reshape(-1, 1, 1, 1)
+    bmi_delta = np.maximum(orig_bmi - target_arr, 0.0)
+
+    orig_weight: float = patient.get("weight") or 0
+    h_m = (patient.get("height") or 170) / 100.0
+    if orig_weight > 0:
+        weight_delta_pct = np.where(bmi_delta > 0, bmi_delta * (h_m ** 2) / orig_weight * 100.0, 0.0)
+    else:
+        weight_delta_pct = np.zeros_like(bmi_delta)
+
+    # ── 혈압 (B,1,D,1) · 혈당 (B,1,1,1) ──
+    ex_eff = _EXERCISE_EFFECT.get(exercise_target or "none", _EXERCISE_EFFECT["none"])
+    diet_eff = _DIET_EFFECT.get(diet_target or "high_sodium", _DIET_EFFECT["high_sodium"])
+    effective_delta = np.where(bmi_delta > 0, bmi_delta * float(ex_eff["bmi_factor"]), 0.0).reshape(-1, 1, 1, 1)
+    quit_drink = np.array([d == "none" for d in drinking_targets]).reshape(1, 1, -1, 1)
+    sbp0: float = patient.get("sbp", 120) or 120
+    dbp0: float = patient.get("dbp", 80) or 80
+    fbg0: float = patient.get("fbg", 90) or 90
+    sbp = np.maximum(
+        sbp0 - effective_delta * 1.5 - np.where(quit_drink, 4.0, 0.0)
+        - abs(float(ex_eff["sbp"])) - abs(float(diet_eff["sbp"])),
+        100.0,
+    )
+    dbp = np.maximum(
+        dbp0 - effective_delta * 0.8 - np.where(quit_drink, 3.0, 0.0)
+        - abs(float(ex_eff["dbp"])) - abs(float(diet_eff["dbp"])),
+        65.0,
+    )
+    fbg = np.maximum(fbg0 * np.where(bmi_delta >= 2.0, 0.7, 1.0), 70.0).reshape(-1, 1, 1, 1)
+
+    # ── 흡연 (1,S,1,T) · 음주 (1,1,D,1) 상태 ──
+    smoking_state = np.array([
+        [("former" if t < 60 else "never") if s == "quit" and patient.get("smoking") == "current"
+         else patient.get("smoking") for t in time_horizons]
+        for s in smoking_targets
+    ], dtype=object).reshape(1, len(smoking_targets), 1, len(time_horizons))
+    drinking_state = np.array(
+        ["none" if d == "none" else patient.get("drinking") for d in drinking_targets], dtype=object,
+    ).reshape(1, 1, -1, 1)
+
+    factors = {k: bool(v) for k, v in classify_risk_factors(patient).items() if k not in _GRID_VARYING_FACTORS}
+    factors.update(_grid_factor_arrays(patient, bmi, sbp, dbp, fbg, smoking_state, drinking_state))
+
+    # ── 시간 감쇠 α (B,S,1,T) — BMI 칸은 (감량 여부, 체중 10% 임계) 조합별로 한 번만 계산 ──
+    flag_rows: dict = {}
+    for b in range(shape[0]):
+        flag_rows.setdefault((bool(bmi_delta[b] > 0), bool(weight_delta_pct[b] >= 10.0)), []).append(b)
+
+    ratios: dict = {}
+    for disease, orig_data in disease_results.items():
+        if disease == "대사증후군":
+            rr = np.broadcast_to(_grid_mets_rr(patient, factors, bmi, sbp, dbp, fbg), shape)
+        else:
+            rr = _grid_individual_rr(disease, factors, shape)
+        cohort_mean: float = orig_data.get("cohort_mean", 0) or 0
+        base_ratio = rr / cohort_mean if cohort_mean > 0 else np.ones(shape)
+
+        alpha = np.ones((shape[0], shape[1], 1, shape[3]))
+        for rows in flag_rows.values():
+            rep = rows[0]
+            for si, s in enumerate(smoking_targets):
+                for ti, t in enumerate(time_horizons):
+                    alpha[rows, si, 0, ti] = _time_attenuation(
+                        disease, t, s, float(bmi_delta[rep]), float(weight_delta_pct[rep]),
+                    )
+        final = np.where(base_ratio >= 1.0, 1.0 + (base_ratio - 1.0) * alpha, base_ratio)
+        ratios[disease] = [round(float(v), 2) for v in final.ravel()]
+
+    axes: dict = {
+        "bmi_target": targets,
+        "smoking_target": smoking_targets,
+        "drinking_target": drinking_targets,
+        "time_horizon_months": time_horizons,
+    }
+    if weight_deltas is not None:
+        axes["weight_delta_kg"] = [float(d) for d in weight_deltas]
+    return {
+        "order": ["bmi", "smoking", "drinking", "time"],
+        "shape": list(shape),
+        "axes": axes,
+        "diseases": list(disease_results),
+        "orig_ratios": {d: r.get("ratio", 1.0) for d, r in disease_results.items()},
+        "ratios": ratios,
+        "improved_sbp": [[round(float(v), 1) for v in row] for row in sbp[:, 0, :, 0]],
+        "improved_dbp": [[round(float(v), 1) for v in row] for row in dbp[:, 0, :, 0]],
+        "improved_fbg": [round(float(v), 1) for v in fbg.ravel()],
+    }
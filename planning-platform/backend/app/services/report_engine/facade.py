@@ -3,8 +3,13 @@ facade.py — EngineFacade 싱글톤 + 편의 함수.
 
 서버 시작 시 1회 로드(lazy). pkl/json 로드 실패 시 ENGINE_AVAILABLE=False,
 MODEL_LOADED=False 로 폴백 — app crash 없이 계속 기동.
+
+async 라우트는 arun() 사용 — 결정적 엔진 계산은 워커 스레드, 영양 추천(RAG+GPT)은
+프로세스 공용 NutritionService 를 이벤트 루프에서 직접 await (루프 차단 없음).
+run()/generate_report() 는 동기 호출부(배치·스크립트) 용으로 유지.
 """
 
+import asyncio
 import json
 import logging
 from pathlib import Path
@@ -76,9 +81,9 @@ class EngineFacade:
             logger.warning("report_engine: warmup pkl 로드 실패 — %s (bioage 건너뜀)", e)
         self._warmed = True
 
-    def generate_report(self, patient_dict: dict) -> dict:
-        """engine.run_for_patient 호출 후 FE ReportData 형식 반환.
-        _name 키로 이름 전달 (내부 pop). ENGINE_AVAILABLE=False → 빈 dict."""
+    def _compute_report(self, patient_dict: dict) -> dict:
+        """결정적 계산 (run_for_patient + bioage_gb) → FE ReportData 형식, nutrition=None.
+        _name 키로 이름 전달 (내부 pop). ENGINE_AVAILABLE=False / 엔진 실패 → 빈 dict."""
         if not ENGINE_AVAILABLE or run_for_patient is None:
             return {}
 
@@ -104,51 +109,6 @@ class EngineFacade:
             bodyage_val = bioage_gb_result["bioage_gb"]
             delta_val = round(bodyage_val - age_val, 1)
 
-        # nutrition — nutrition_service (RAG + GPT) 경유, 실패 시 nutrition_rules 폴백
-        nutrition_result: Optional[dict] = None
-        try:
-            # 소문자 → 대문자 브리지 (nutrition_rules 호환)
-            # None 값 제거: .get(..., 0) 기본값으로 TypeError 방지
-            _nr_raw = {
-                "ALT":        patient_dict.get("alt"),
-                "SBP":        patient_dict.get("sbp"),
-                "DBP":        patient_dict.get("dbp"),
-                "BMI":        patient_dict.get("bmi"),
-                "creatinine": patient_dict.get("cr"),
-                "TC":         patient_dict.get("tc"),
-                "LDL":        patient_dict.get("ldl"),
-                "FBG":        patient_dict.get("fbg"),
-                "AST":        patient_dict.get("ast"),
-                "GGT":        patient_dict.get("ggt"),
-                "age":        patient_dict.get("age"),
-                "sex":        patient_dict.get("sex", "M"),
-            }
-            _nr_patient = {k: v for k, v in _nr_raw.items() if v is not None}
-            # disease_results: nutrition_rules 호환 포맷 (result = "이상"/"정상")
-            _nr_diseases = {
-                d: {"result": "이상" if v.get("rank", 100) <= 30 else "정상"}
-                for d, v in (raw.get("diseases") or {}).items()
-            }
-            # nutrition_service (4-step RAG+GPT 파이프라인) 시도
-            try:
-                from .nutrition_service import NutritionService
-                _svc = NutritionService()
-                nutrition_result = _svc.recommend_sync(
-                    patient=_nr_patient,
-                    diseases=_nr_diseases,
-                    name=name,
-                    medications=[],
-                )
-            except Exception as _svc_e:
-                logger.warning("report_engine: nutrition_service 실패, 기존 룰 폴백 — %s", _svc_e)
-                from .nutrition_rules import recommend_nutrients, caution_nutrients
-                nutrition_result = {
-                    "recommend": recommend_nutrients(_nr_patient, _nr_diseases),
-                    "caution":   caution_nutrients(_nr_patient, _nr_diseases),
-                }
-        except Exception as _ne:
-            logger.warning("report_engine: nutrition 생성 실패 — %s", _ne)
-
         return {
             "name": name,
             "age": age_val,
@@ -174,9 +134,72 @@ class EngineFacade:
                 "height": patient_dict.get("height"),
                 "weight": patient_dict.get("weight"),
             },
-            "nutrition": nutrition_result,
+            "nutrition": None,
         }
 
+    @staticmethod
+    def _nutrition_inputs(patient_dict: dict, diseases: dict) -> tuple:
+        """엔진 patient/diseases → nutrition_rules 호환 (patient, diseases)."""
+        # 소문자 → 대문자 브리지 (nutrition_rules 호환)
+        # None 값 제거: .get(..., 0) 기본값으로 TypeError 방지
+        _nr_raw = {
+            "ALT":        patient_dict.get("alt"),
+            "SBP":        patient_dict.get("sbp"),
+            "DBP":        patient_dict.get("dbp"),
+            "BMI":        patient_dict.get("bmi"),
+            "creatinine": patient_dict.get("cr"),
+            "TC":         patient_dict.get("tc"),
+            "LDL":        patient_dict.get("ldl"),
+            "FBG":        patient_dict.get("fbg"),
+            "AST":        patient_dict.get("ast"),
+            "GGT":        patient_dict.get("ggt"),
+            "age":        patient_dict.get("age"),
+            "sex":        patient_dict.get("sex", "M"),
+        }
+        _nr_patient = {k: v for k, v in _nr_raw.items() if v is not None}
+        # disease_results: nutrition_rules 호환 포맷 (result = "이상"/"정상")
+        _nr_diseases = {
+            d: {"result": "이상" if v.get("rank", 100) <= 30 else "정상"}
+            for d, v in (diseases or {}).items()
+        }
+        return _nr_patient, _nr_diseases
+
+    def generate_report(self, patient_dict: dict) -> dict:
+        """engine.run_for_patient 호출 후 FE ReportData 형식 반환 (동기).
+        _name 키로 이름 전달 (내부 pop). ENGINE_AVAILABLE=False → 빈 dict."""
+        report = self._compute_report(patient_dict)
+        if not report:
+            return report
+
+        # nutrition — nutrition_service (RAG + GPT) 경유, 실패 시 nutrition_rules 폴백
+        nutrition_result: Optional[dict] = None
+        try:
+            _nr_patient, _nr_diseases = self._nutrition_inputs(patient_dict, report["diseases"])
+            # nutrition_service (4-step RAG+GPT 파이프라인) 시도
+            # 동기 경로는 호출마다 별도 이벤트 루프에서 돌므로 AsyncOpenAI 클라이언트를 공유하지 않는
+            # 새 인스턴스 사용 (FAISS 인덱스는 모듈 공용이라 다시 로드하지 않음)
+            try:
+                from .nutrition_service import NutritionService
+                _svc = NutritionService()
+                nutrition_result = _svc.recommend_sync(
+                    patient=_nr_patient,
+                    diseases=_nr_diseases,
+                    name=report["name"],
+                    medications=[],
+                )
+            except Exception as _svc_e:
+                logger.warning("report_engine: nutrition_service 실패, 기존 룰 폴백 — %s", _svc_e)
+                from .nutrition_rules import recommend_nutrients, caution_nutrients
+                nutrition_result = {
+                    "recommend": recommend_nutrients(_nr_patient, _nr_diseases),
+                    "caution":   caution_nutrients(_nr_patient, _nr_diseases),
+                }
+        except Exception as _ne:
+            logger.warning("report_engine: nutrition 생성 실패 — %s", _ne)
+
+        report["nutrition"] = nutrition_result
+        return report
+
     def run(self, name: str, patient: dict) -> dict:
         """partner_office.py 호출 인터페이스 — generate_report의 명시적 래퍼.
 
@@ -190,6 +213,39 @@ class EngineFacade:
         merged = {"_name": name, **patient}
         return self.generate_report(merged)
 
+    async def arun(self, name: str, patient: dict, with_nutrition: bool = True) -> dict:
+        """run() 의 async 버전 — async 라우트에서 사용.
+
+        결정적 계산은 asyncio.to_thread 로 워커 스레드에서, 영양 추천은 프로세스 공용
+        NutritionService.recommend 를 직접 await (시간 초과/실패 시 룰 폴백).
+        with_nutrition=False 면 nutrition=None (엔진 수치만 필요한 호출부).
+        """
+        merged = {"_name": name, **patient}
+        report = await asyncio.to_thread(self._compute_report, merged)
+        if not report or not with_nutrition:
+            return report
+
+        report["nutrition"] = await self.anutrition(report["name"], merged, report["diseases"])
+        return report
+
+    async def anutrition(self, name: str, patient: dict, diseases: dict) -> Optional[dict]:
+        """영양 추천만 생성 — 공용 NutritionService 경유 (실패/시간 초과 시 룰 폴백, 그래도 실패면 None).
+
+        arun 내부 및 리포트 2단계 전달(엔진 블록 먼저, nutrition 나중)에서 사용.
+        """
+        try:
+            from .nutrition_service import get_nutrition_service
+            _nr_patient, _nr_diseases = self._nutrition_inputs(patient, diseases)
+            return await get_nutrition_service().recommend_with_fallback(
+                patient=_nr_patient,
+                diseases=_nr_diseases,
+                name=name,
+                medications=[],
+            )
+        except Exception as _ne:
+            logger.warning("report_engine: nutrition 생성 실패 — %s", _ne)
+            return None
+
     def compute_stats(self) -> dict:
         """RR_MATRIX + rr_ci_table.json 에서 EngineStats 집계."""
         if not ENGINE_AVAILABLE:
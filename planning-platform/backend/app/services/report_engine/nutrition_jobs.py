@@ -0,0 +1,85 @@
+"""
+nutrition_jobs.py — mediArc 리포트 2단계 전달용 영양 추천 백그라운드 작업.
+
+/mediarc-report/{uuid}?progressive=1 은 엔진 블록(질환/게이지/생체나이/순위/ratio_table)만 먼저
+반환·캐시하고, LLM 기반 nutrition 은 여기서 백그라운드로 만든다.
+  - 키: (uuid, input_digest) — 같은 키 중복 요청은 작업 1개로 합침
+  - 완료 시 on_done 콜백 (캐시 행 nutrition 갱신) 실행, 결과는 폴링/SSE 가 peek()/wait() 로 조회
+  - 프로세스 메모리 기반 — 재시작으로 사라진 작업은 다음 리포트 조회가 다시 시작한다
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 끝난 작업 결과 보관 상한 (오래된 것부터 버림)
+MAX_FINISHED_JOBS = 512
+
+PENDING = "pending"
+READY = "ready"
+FAILED = "failed"
+MISSING = "missing"
+
+
+class NutritionJobs:
+    """키별 asyncio.Task 레지스트리 (프로세스당 1개)."""
+
+    def __init__(self) -> None:
+        self._tasks: "OrderedDict[Hashable, asyncio.Task]" = OrderedDict()
+
+    def start(
+        self,
+        key: Hashable,
+        factory: Callable[[], Awaitable[Any]],
+        on_done: Optional[Callable[[Any], Awaitable[None]]] = None,
+    ) -> asyncio.Task:
+        """진행 중이거나 성공한 작업이 있으면 그대로, 없거나 실패했으면 새로 시작."""
+        task = self._tasks.get(key)
+        if task is not None and not (task.done() and (task.cancelled() or task.exception())):
+            return task
+
+        async def _run():
+            result = await factory()
+            if on_done is not None:
+                try:
+                    await on_done(result)
+                except Exception as e:
+                    logger.warning("nutrition_jobs: 완료 콜백 실패 key=%s — %s", key, e)
+            return result
+
+        task = asyncio.ensure_future(_run())
+        # 실패가 "Task exception was never retrieved" 로 남지 않도록 소비
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._tasks[key] = task
+        self._tasks.move_to_end(key)
+        self._prune()
+        return task
+
+    def peek(self, key: Hashable) -> Tuple[str, Any]:
+        """(상태, 결과) — 상태는 pending / ready / failed / missing."""
+        task = self._tasks.get(key)
+        if task is None:
+            return MISSING, None
+        if not task.done():
+            return PENDING, None
+        if task.cancelled() or task.exception() is not None:
+            return FAILED, None
+        return READY, task.result()
+
+    async def wait(self, key: Hashable, timeout: float) -> Tuple[str, Any]:
+        """최대 timeout 초 기다린 뒤 peek() — 롱폴링/SSE 용 (작업은 취소하지 않음)."""
+        task = self._tasks.get(key)
+        if task is not None and not task.done() and timeout > 0:
+            await asyncio.wait({task}, timeout=timeout)
+        return self.peek(key)
+
+    def _prune(self) -> None:
+        finished = [k for k, t in self._tasks.items() if t.done()]
+        for k in finished[: max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            self._tasks.pop(k, None)
+
+
+nutrition_jobs = NutritionJobs()
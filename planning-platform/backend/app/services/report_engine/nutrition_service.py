@@ -6,19 +6,34 @@ nutrition_service.py — 건기식 RAG 맞춤 추천 서비스 (Phase 1)
   Step 2: FAISS RAG 에비던스 조회
   Step 3: 약물 상호작용 체크 (Phase 1: medications=[] → 스킵)
   Step 4: GPT-4o-mini 스토리텔링 → 개인화 설명
+          (메모리 → 스토리 카탈로그(story_catalog) → 미스만 GPT 동시 생성, 결과는 카탈로그에 추가)
 
-facade.py (동기)에서 recommend_sync()로 호출.
+facade.arun() (async) 은 get_nutrition_service() 공용 인스턴스의 recommend_with_fallback() 을 await,
+facade.generate_report() (동기) 는 recommend_sync() 로 호출.
+FAISS 인덱스는 모듈 공용 (프로세스당 1회 로드), 검색(임베딩 API 동기 호출)은 워커 스레드에서 실행.
 """
 
 import asyncio
 import concurrent.futures
 import hashlib
 import logging
+import threading
 import time
-from typing import Optional
+from collections import OrderedDict
+from typing import NamedTuple, Optional
 
 logger = logging.getLogger(__name__)
 
+# recommend 전체 상한 (초과 시 룰 폴백) — recommend_sync 의 future.result(timeout) 와 동일
+RECOMMEND_TIMEOUT_SEC = 30
+# 카탈로그 미스 GPT 동시 생성 수 (리포트 1건 기준)
+STORY_CONCURRENCY = 6
+# 프로세스 메모리 스토리 캐시 상한 (카탈로그 앞단)
+STORY_MEMORY_MAX = 4096
+STORY_MODEL = "gpt-4o-mini"
+# 카탈로그 스토리는 이름 없이 생성 → 응답 시 "고객님" 을 환자 이름으로 치환
+CATALOG_NAME = "고객"
+
 # ---------------------------------------------------------------------------
 # GPT 시스템 프롬프트 (스펙 섹션 3-1)
 # ---------------------------------------------------------------------------
@@ -54,15 +69,137 @@ _CAUTION_TMPL = """환자 이름: {name}
 # ---------------------------------------------------------------------------
 # 캐시 키 생성 (스펙 섹션 3-5)
 # ---------------------------------------------------------------------------
-def _story_cache_key(nutrient: str, patient: dict) -> str:
+def _story_bins(patient: dict) -> tuple[int, int, int, int]:
+    """(sbp_bin, fbg_bin, bmi_bin, alt_bin) — SBP/FBG/ALT 10 단위 내림, BMI 반올림."""
     sbp_bin = (int(patient.get("SBP", 0) or 0) // 10) * 10
     fbg_bin = (int(patient.get("FBG", 0) or 0) // 10) * 10
     bmi_bin = round(float(patient.get("BMI", 0) or 0))
     alt_bin = (int(patient.get("ALT", 0) or 0) // 10) * 10
+    return sbp_bin, fbg_bin, bmi_bin, alt_bin
+
+
+def _story_cache_key(nutrient: str, patient: dict) -> str:
+    sbp_bin, fbg_bin, bmi_bin, alt_bin = _story_bins(patient)
     raw = f"nutrition_story:{nutrient}:{sbp_bin}:{fbg_bin}:{bmi_bin}:{alt_bin}"
     return hashlib.md5(raw.encode()).hexdigest()
 
 
+# ---------------------------------------------------------------------------
+# 스토리 요청 (리포트 생성 / 카탈로그 일괄 생성 공용)
+# ---------------------------------------------------------------------------
+class StoryRequest(NamedTuple):
+    cache_key: str
+    kind: str                           # recommend / caution
+    nutrient: str
+    bins: tuple[int, int, int, int]
+    prompt: str
+    fallback: str
+
+
+def build_recommend_story(cand: dict, patient: dict, evidence_summary: str) -> StoryRequest:
+    n = cand["name"]
+    prompt = _RECOMMEND_TMPL.format(
+        name=CATALOG_NAME,
+        sbp=patient.get("SBP", 0) or 0, ldl=patient.get("LDL", 0) or 0,
+        fbg=patient.get("FBG", 0) or 0, bmi=patient.get("BMI", 0) or 0,
+        alt=patient.get("ALT", 0) or 0,
+        nutrient_name=n,
+        tag=cand["tag"],
+        rule_reason=cand.get("rule_reason", ""),
+        evidence_summary=evidence_summary[:200],
+    )
+    return StoryRequest(_story_cache_key(n, patient), "recommend", n, _story_bins(patient), prompt, cand["desc"])
+
+
+def build_caution_story(c: dict, patient: dict) -> StoryRequest:
+    n = c["name"]
+    rel_vals = (
+        f"SBP={patient.get('SBP', 0) or 0}, FBG={patient.get('FBG', 0) or 0}, "
+        f"ALT={patient.get('ALT', 0) or 0}, cr={patient.get('creatinine', 0)}"
+    )
+    prompt = _CAUTION_TMPL.format(
+        name=CATALOG_NAME,
+        relevant_values=rel_vals,
+        nutrient_name=n,
+        caution_reason=c["tag"],
+        evidence_summary=c.get("desc", "")[:100],
+    )
+    return StoryRequest(
+        _story_cache_key(f"caution_{n}", patient), "caution", n, _story_bins(patient), prompt, c["desc"],
+    )
+
+
+def select_candidates(candidates: list[dict], top_n: int = 5) -> list[dict]:
+    """priority_score 순으로 카테고리 상한(_CATEGORY_LIMITS)을 지키며 상위 top_n 종 선택."""
+    from .nutrition_rules import _CATEGORY_LIMITS
+    candidates.sort(key=lambda x: x["priority_score"], reverse=True)
+    cat_count: dict[str, int] = {}
+    selected: list[dict] = []
+    for c in candidates:
+        cat = c["category"]
+        limit = _CATEGORY_LIMITS.get(cat, 1)
+        if cat_count.get(cat, 0) < limit:
+            cat_count[cat] = cat_count.get(cat, 0) + 1
+            selected.append(c)
+        if len(selected) >= top_n:
+            break
+    return selected
+
+
+def _personalize(story: str, name: str) -> str:
+    if not name or name == CATALOG_NAME:
+        return story
+    return story.replace(f"{CATALOG_NAME}님", f"{name}님")
+
+
+# 프로세스 공용 메모리 캐시 (카탈로그 조회 앞단, 오래된 것부터 버림)
+_story_memory: "OrderedDict[str, str]" = OrderedDict()
+
+
+def _remember_story(key: str, story: str) -> None:
+    _story_memory[key] = story
+    _story_memory.move_to_end(key)
+    while len(_story_memory) > STORY_MEMORY_MAX:
+        _story_memory.popitem(last=False)
+
+
+# ---------------------------------------------------------------------------
+# 공용 FAISS 인덱스 (인스턴스마다 다시 읽지 않도록 모듈 단위 1회 로드)
+# ---------------------------------------------------------------------------
+_faiss_lock = threading.Lock()
+_faiss_shared = None
+_faiss_loaded = False
+
+
+def _load_shared_faiss():
+    global _faiss_shared, _faiss_loaded
+    with _faiss_lock:
+        if _faiss_loaded:
+            return _faiss_shared
+        try:
+            from app.services.checkup_design.vector_search import FAISSVectorSearch
+            from app.core.config import settings
+            faiss_dir = "/data/vector_db/welno/faiss_db"
+            _faiss_shared = FAISSVectorSearch(
+                faiss_dir=faiss_dir,
+                openai_api_key=settings.openai_api_key,
+            )
+        except Exception as e:
+            logger.warning("nutrition_service: FAISS 초기화 실패 — %s (폴백 모드)", e)
+            _faiss_shared = None
+        _faiss_loaded = True
+        return _faiss_shared
+
+
+def _rule_fallback(patient: dict, diseases: dict, error: Exception) -> dict:
+    from .nutrition_rules import recommend_nutrients, caution_nutrients
+    return {
+        "recommend": recommend_nutrients(patient, diseases),
+        "caution": caution_nutrients(patient, diseases),
+        "meta": {"gpt_generated": False, "fallback": True, "error": str(error)},
+    }
+
+
 # ---------------------------------------------------------------------------
 # NutritionService
 # ---------------------------------------------------------------------------
@@ -72,25 +209,13 @@ class NutritionService:
     def __init__(self) -> None:
         self._faiss_vs = None   # FAISSVectorSearch (lazy init)
         self._openai = None     # openai.AsyncOpenAI (lazy init)
-        self._story_cache: dict[str, str] = {}   # 메모리 캐시 (TTL 미구현, 재시작 시 초기화)
 
     # ------------------------------------------------------------------
     # lazy FAISS 초기화
     # ------------------------------------------------------------------
     def _get_faiss(self):
-        if self._faiss_vs is not None:
-            return self._faiss_vs
-        try:
-            from app.services.checkup_design.vector_search import FAISSVectorSearch
-            from app.core.config import settings
-            faiss_dir = "/data/vector_db/welno/faiss_db"
-            self._faiss_vs = FAISSVectorSearch(
-                faiss_dir=faiss_dir,
-                openai_api_key=settings.openai_api_key,
-            )
-        except Exception as e:
-            logger.warning("nutrition_service: FAISS 초기화 실패 — %s (폴백 모드)", e)
-            self._faiss_vs = None
+        if self._faiss_vs is None:
+            self._faiss_vs = _load_shared_faiss()
         return self._faiss_vs
 
     # ------------------------------------------------------------------
@@ -113,11 +238,12 @@ class NutritionService:
     # ------------------------------------------------------------------
     async def _fetch_rag_evidence(self, nutrient_name: str, rag_query: str) -> dict:
         """FAISS에서 에비던스 조회. 실패 시 빈 dict 반환."""
-        vs = self._get_faiss()
+        # 최초 인덱스 로드·임베딩 API 호출 모두 동기 → 워커 스레드
+        vs = self._faiss_vs or await asyncio.to_thread(self._get_faiss)
         if vs is None:
             return {}
         try:
-            results = vs.search(rag_query, top_k=3)
+            results = await asyncio.to_thread(vs.search, rag_query, 3)
             if not results:
                 return {}
             top = results[0]
@@ -148,23 +274,16 @@ class NutritionService:
             return {}
 
     # ------------------------------------------------------------------
-    # Step 4: GPT 스토리텔링 (단건)
+    # Step 4: GPT 스토리텔링
     # ------------------------------------------------------------------
-    async def _gpt_story(
-        self,
-        prompt_text: str,
-        fallback: str,
-        cache_key: str,
-    ) -> str:
-        """GPT-4o-mini로 설명 생성. 캐시 히트 또는 실패 시 fallback 반환."""
-        if cache_key in self._story_cache:
-            return self._story_cache[cache_key]
+    async def _gpt_story(self, prompt_text: str) -> Optional[str]:
+        """GPT-4o-mini로 설명 생성 (단건). 클라이언트 없음/실패 시 None."""
         client = self._get_openai()
         if client is None:
-            return fallback
+            return None
         try:
             resp = await client.chat.completions.create(
-                model="gpt-4o-mini",
+                model=STORY_MODEL,
                 messages=[
                     {"role": "system", "content": _SYSTEM_PROMPT},
                     {"role": "user", "content": prompt_text},
@@ -172,12 +291,64 @@ class NutritionService:
                 temperature=0.3,
                 max_tokens=150,
             )
-            text = resp.choices[0].message.content.strip()
-            self._story_cache[cache_key] = text
-            return text
+            return resp.choices[0].message.content.strip()
         except Exception as e:
             logger.warning("nutrition_service: GPT 실패 — %s (폴백)", e)
-            return fallback
+            return None
+
+    async def resolve_stories(
+        self,
+        requests: list[StoryRequest],
+        concurrency: int = STORY_CONCURRENCY,
+    ) -> tuple[list[str], dict]:
+        """요청 순서대로 스토리 반환 (이름 치환 전) + 통계.
+
+        메모리 → 카탈로그 1회 조회 → 남은 키만 GPT 를 세마포어 안에서 동시 생성.
+        생성 성공분은 메모리·카탈로그에 추가, 실패분은 fallback (캐시하지 않음).
+        """
+        from . import story_catalog
+
+        stories: dict[str, str] = {}
+        for r in requests:
+            if r.cache_key in _story_memory:
+                stories[r.cache_key] = _story_memory[r.cache_key]
+        memory_hits = len(stories)
+
+        missing = [r for r in dict((r.cache_key, r) for r in requests).values() if r.cache_key not in stories]
+        catalog_hits = 0
+        if missing:
+            found = await story_catalog.get_stories(r.cache_key for r in missing)
+            for key, story in found.items():
+                stories[key] = story
+                _remember_story(key, story)
+            catalog_hits = len(found)
+            missing = [r for r in missing if r.cache_key not in stories]
+
+        generated: list[StoryRequest] = []
+        if missing:
+            sem = asyncio.Semaphore(max(1, concurrency))
+
+            async def _one(r: StoryRequest) -> Optional[str]:
+                async with sem:
+                    return await self._gpt_story(r.prompt)
+
+            texts = await asyncio.gather(*[_one(r) for r in missing])
+            rows = []
+            for r, text in zip(missing, texts):
+                if text:
+                    stories[r.cache_key] = text
+                    _remember_story(r.cache_key, text)
+                    rows.append((r.cache_key, r.kind, r.nutrient, r.bins, text, STORY_MODEL))
+                    generated.append(r)
+            await story_catalog.put_stories(rows)
+
+        stats = {
+            "memory_hits": memory_hits,
+            "catalog_hits": catalog_hits,
+            "generated": len(generated),
+            "fallbacks": sum(1 for r in requests if r.cache_key not in stories),
+        }
+        return [stories.get(r.cache_key, r.fallback) for r in requests], stats
 
     # ------------------------------------------------------------------
     # 핵심 recommend (async)
@@ -237,49 +408,32 @@ class NutritionService:
         # medications=[] → 경고 없음. Phase 2에서 FAISS "약물명+영양소+상호작용" 검색 구현.
 
         # 카테고리 상한 적용하여 상위 5종 선택
-        from .nutrition_rules import _CATEGORY_LIMITS
-        candidates.sort(key=lambda x: x["priority_score"], reverse=True)
-        cat_count: dict[str, int] = {}
-        selected_cands: list[dict] = []
-        for c in candidates:
-            cat = c["category"]
-            limit = _CATEGORY_LIMITS.get(cat, 1)
-            if cat_count.get(cat, 0) < limit:
-                cat_count[cat] = cat_count.get(cat, 0) + 1
-                selected_cands.append(c)
-            if len(selected_cands) >= 5:
-                break
-
-        # Step 4: GPT 스토리텔링 (추천 5종 배치)
-        sbp = patient.get("SBP", 0) or 0
-        ldl = patient.get("LDL", 0) or 0
-        fbg = patient.get("FBG", 0) or 0
-        bmi = patient.get("BMI", 0) or 0
-        alt = patient.get("ALT", 0) or 0
-        display_name = name or "고객"
+        selected_cands = select_candidates(candidates)
+
+        # Step 4: GPT 스토리텔링 (추천 5종 + 주의 항목, 카탈로그 미스만 한 번에 동시 생성)
+        display_name = name or CATALOG_NAME
+        caution_raw = caution_nutrients(patient, diseases)
+        story_requests = [
+            build_recommend_story(
+                cand,
+                patient,
+                evidence_map.get(cand["name"], {}).get("detail", "")
+                or str(NUTRIENT_DESC.get(cand["name"], ""))[:100],
+            )
+            for cand in selected_cands
+        ] + [build_caution_story(c, patient) for c in caution_raw]
+        story_texts, story_stats = await self.resolve_stories(story_requests)
+        story_texts = [_personalize(t, display_name) for t in story_texts]
 
         recommend_list = []
         for i, cand in enumerate(selected_cands):
             n = cand["name"]
             ev = evidence_map.get(n, {})
-            ev_summary = ev.get("detail", "") or str(NUTRIENT_DESC.get(n, ""))[:100]
-
-            ck = _story_cache_key(n, patient)
-            prompt = _RECOMMEND_TMPL.format(
-                name=display_name,
-                sbp=sbp, ldl=ldl, fbg=fbg, bmi=bmi, alt=alt,
-                nutrient_name=n,
-                tag=cand["tag"],
-                rule_reason=cand.get("rule_reason", ""),
-                evidence_summary=ev_summary[:200],
-            )
-            fallback_val = cand["desc"]
-            desc = await self._gpt_story(prompt, fallback_val, ck)
 
             item: dict = {
                 "name": n,
                 "tag": cand["tag"],
-                "desc": desc,
+                "desc": story_texts[i],
                 "priority": i + 1,
             }
             # optional 필드 (하위 호환 — 없으면 FE 기존 렌더링 유지)
@@ -295,25 +449,12 @@ class NutritionService:
             recommend_list.append(item)
 
         # caution 영양소 (GPT 스토리텔링 포함)
-        caution_raw = caution_nutrients(patient, diseases)
         caution_list = []
         for j, c in enumerate(caution_raw):
-            n = c["name"]
-            rel_vals = f"SBP={sbp}, FBG={fbg}, ALT={alt}, cr={patient.get('creatinine', 0)}"
-            ck = _story_cache_key(f"caution_{n}", patient)
-            prompt = _CAUTION_TMPL.format(
-                name=display_name,
-                relevant_values=rel_vals,
-                nutrient_name=n,
-                caution_reason=c["tag"],
-                evidence_summary=c.get("desc", "")[:100],
-            )
-            fallback_val = c["desc"]
-            desc = await self._gpt_story(prompt, fallback_val, ck)
             caution_list.append({
-                "name": n,
+                "name": c["name"],
                 "tag": c["tag"],
-                "desc": desc,
+                "desc": story_texts[len(selected_cands) + j],
                 "priority": j + 1,
                 "evidence": None,
             })
@@ -329,11 +470,30 @@ class NutritionService:
                 "candidates": len(candidates),
                 "rag_hits": rag_hits,
                 "gpt_generated": gpt_generated,
-                "cached": False,
+                "cached": story_stats["generated"] == 0 and story_stats["fallbacks"] == 0,
+                "stories": story_stats,
                 "latency_ms": latency_ms,
             },
         }
 
+    async def recommend_with_fallback(
+        self,
+        patient: dict,
+        diseases: dict,
+        name: str = "",
+        medications: Optional[list[str]] = None,
+        timeout: float = RECOMMEND_TIMEOUT_SEC,
+    ) -> dict:
+        """recommend + 시간 상한. 실패/초과 시 룰 폴백 (recommend_sync 와 같은 형태)."""
+        try:
+            return await asyncio.wait_for(
+                self.recommend(patient, diseases, name, medications or []),
+                timeout=timeout,
+            )
+        except Exception as e:
+            logger.warning("nutrition_service.recommend 실패 — %r (기존 룰 폴백)", e)
+            return _rule_fallback(patient, diseases, e)
+
     # ------------------------------------------------------------------
     # sync wrapper (facade.py 호출용 — 동기 함수에서 async 실행)
     # ------------------------------------------------------------------
@@ -361,16 +521,25 @@ class NutritionService:
                         asyncio.run,
                         self.recommend(patient, diseases, name, medications),
                     )
-                    return future.result(timeout=30)
+                    return future.result(timeout=RECOMMEND_TIMEOUT_SEC)
             else:
                 return loop.run_until_complete(
                     self.recommend(patient, diseases, name, medications)
                 )
         except Exception as e:
             logger.warning("nutrition_service.recommend_sync 실패 — %s (기존 룰 폴백)", e)
-            from .nutrition_rules import recommend_nutrients, caution_nutrients
-            return {
-                "recommend": recommend_nutrients(patient, diseases),
-                "caution": caution_nutrients(patient, diseases),
-                "meta": {"gpt_generated": False, "fallback": True, "error": str(e)},
-            }
+            return _rule_fallback(patient, diseases, e)
+
+
+# ---------------------------------------------------------------------------
+# 프로세스 공용 인스턴스 (async 경로 — 같은 이벤트 루프에서만 사용)
+# ---------------------------------------------------------------------------
+_shared_service: Optional[NutritionService] = None
+
+
+def get_nutrition_service() -> NutritionService:
+    """facade.arun 용 공용 NutritionService (GPT 스토리 캐시·OpenAI 클라이언트 공유)."""
+    global _shared_service
+    if _shared_service is None:
+        _shared_service = NutritionService()
+    return _shared_service
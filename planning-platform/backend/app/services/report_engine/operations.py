@@ -69,7 +69,7 @@ async def compare_single(
     """Twobecon 저장 결과 vs 엔진 실시간 계산 비교.
 
     welno_mediarc_reports에서 환자의 최신 분석 결과를 SELECT(읽기만)한 뒤
-    engine.run()으로 실시간 재계산하여 질환별 rate를 비교한다.
+    engine.arun()으로 실시간 재계산하여 질환별 rate를 비교한다 (영양 추천은 비교 대상 아님 → 생략).
 
     Args:
         uuid:       patient_uuid (welno.welno_mediarc_reports 기준)
@@ -172,7 +172,7 @@ async def compare_single(
     }
 
     try:
-        mediarc_result = engine.run(name=name, patient=patient_dict)
+        mediarc_result = await engine.arun(name=name, patient=patient_dict, with_nutrition=False)
     except Exception as e:
         logger.warning("compare_single: engine.run 실패 uuid=%s — %s", uuid, e)
         mediarc_result = {}
@@ -0,0 +1,64 @@
+"""
+story_catalog.py — 건기식 GPT 스토리 영구 카탈로그 (welno.tb_nutrition_story_catalog).
+
+키: nutrition_service._story_cache_key — 영양소(주의 항목은 "caution_" 접두) × SBP/FBG/BMI/ALT 구간.
+스토리는 환자 이름 없이("고객님") 생성·보관하고, 응답 시 nutrition_service 가 이름으로 치환한다.
+
+조회/저장 모두 fail-open — DB 장애 시 빈 결과/무시, 호출부는 GPT 생성·폴백으로 진행.
+채우기: scripts/database/generate_nutrition_story_catalog.py (도달 가능한 구간 조합 일괄 생성)
+"""
+
+import logging
+from typing import Dict, Iterable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+_SELECT_SQL = """
+    SELECT cache_key, story
+    FROM welno.tb_nutrition_story_catalog
+    WHERE cache_key = ANY(%s)
+"""
+
+_INSERT_SQL = """
+    INSERT INTO welno.tb_nutrition_story_catalog
+        (cache_key, kind, nutrient, sbp_bin, fbg_bin, bmi_bin, alt_bin, story, model)
+    SELECT * FROM UNNEST(
+        %s::varchar[], %s::varchar[], %s::varchar[],
+        %s::smallint[], %s::smallint[], %s::smallint[], %s::smallint[],
+        %s::text[], %s::varchar[]
+    )
+    ON CONFLICT (cache_key) DO NOTHING
+"""
+
+# (cache_key, kind, nutrient, (sbp_bin, fbg_bin, bmi_bin, alt_bin), story, model)
+CatalogRow = Tuple[str, str, str, Tuple[int, int, int, int], str, str]
+
+
+async def get_stories(keys: Iterable[str]) -> Dict[str, str]:
+    """{cache_key: story} — 없는 키는 빠짐. 실패 시 빈 dict."""
+    keys = list(dict.fromkeys(keys))
+    if not keys:
+        return {}
+    try:
+        from app.core.database import db_manager
+        rows = await db_manager.execute_query(_SELECT_SQL, (keys,))
+        return {r["cache_key"]: r["story"] for r in rows or []}
+    except Exception as e:
+        logger.warning("story_catalog: 조회 실패 — %s", e)
+        return {}
+
+
+async def put_stories(rows: List[CatalogRow]) -> int:
+    """카탈로그에 추가 (이미 있는 키는 유지). 추가된 행 수, 실패 시 0."""
+    if not rows:
+        return 0
+    try:
+        from app.core.database import db_manager
+        columns = list(zip(*[
+            (key, kind, nutrient, bins[0], bins[1], bins[2], bins[3], story, model)
+            for key, kind, nutrient, bins, story, model in rows
+        ]))
+        return await db_manager.execute_update(_INSERT_SQL, tuple(list(c) for c in columns))
+    except Exception as e:
+        logger.warning("story_catalog: 저장 실패 — %s", e)
+        return 0
@@ -0,0 +1,290 @@
+"""
+RAG 채팅 시맨틱 답변 캐시 (opt-in: rag_semantic_cache_enabled)
+
+같은 병원·비슷한 환자 맥락에서 거의 같은 질문("공복혈당 높으면 어떻게 해요?")이 반복되면
+RAG 검색 + Gemini 생성을 다시 하지 않고 저장된 답변을 스트림으로 재생한다 (질문 임베딩 1회 비용).
+  - 범위(scope): hospital_id + partner_id + 환자 맥락 지문(context_fingerprint — 데이터 유무·stale·이상 항목 종류 등
+    거친 특징) + 병원 LLM 설정. 범위 안에서 질문 임베딩 코사인 유사도 ≥ rag_semantic_cache_threshold 인 최상위 1건
+  - 세대(generation): 글로벌/병원 FAISS 인덱스 파일 (mtime, 크기) — 인덱스 재빌드 시 키 공간이 바뀌어
+    이전 답변은 TTL 로 소멸. 병원 인덱스 동기화(invalidate_hospital_vector_cache)는 해당 병원 항목을 즉시 삭제
+  - 개인화된 답변(환자 이름이나 환자 데이터의 수치 인용)은 저장하지 않는다 — 다른 환자에게 재생되면 안 되므로
+Redis 키 (워커 간 공유):
+  welno:rag_semcache:{hospital}:{gen}:{scope}:vecs    hash entry_id → float16 정규화 벡터
+  welno:rag_semcache:{hospital}:{gen}:{scope}:ver     범위 변경 카운터 (워커별 로컬 행렬 재로딩 판단)
+  welno:rag_semcache:{hospital}:{gen}:{scope}:a:{id}  답변 JSON (TTL)
+Redis 장애 시 항상 miss 로 동작 — 채팅 흐름은 막지 않는다.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "welno:rag_semcache"
+# 재생 청크 크기 (글자) — 프론트 스트리밍 렌더링이 생성 응답과 같게 보이도록
+REPLAY_CHUNK_CHARS = 40
+# 이보다 짧은 답변은 저장 안 함 (폴백/오류 문구 방지)
+MIN_ANSWER_CHARS = 80
+# 워커별로 들고 있는 범위 행렬 수 상한
+MAX_LOCAL_SCOPES = 256
+
+_NUMBER_RE = re.compile(r"\d+(?:\.\d+)?")
+# 이름 미확인 시 쓰는 호칭 — 개인화 판단에서 제외
+_GENERIC_NAMES = {"", "고객", "파트너 환자"}
+
+
+@dataclass
+class CacheScope:
+    hospital_id: str
+    generation: str
+    digest: str
+
+    def key(self, suffix: str) -> str:
+        return f"{KEY_PREFIX}:{self.hospital_id}:{self.generation}:{self.digest}:{suffix}"
+
+
+@dataclass
+class CachedAnswer:
+    entry_id: str
+    similarity: float
+    question: str
+    answer: str
+    sources: List[Dict[str, Any]]
+    suggestions: List[str]
+    chat_stage: Optional[str] = None
+
+
+def context_fingerprint(
+    has_patient_data: bool,
+    is_stale_data: bool = False,
+    is_partner_session: bool = False,
+    chat_stage: str = "",
+    alert_fields: Iterable[str] = (),
+) -> str:
+    """환자 맥락의 거친 지문 — 수치 자체가 아니라 답변 방향을 바꾸는 특징만."""
+    return json.dumps({
+        "data": bool(has_patient_data),
+        "stale": bool(is_stale_data),
+        "partner": bool(is_partner_session),
+        "stage": chat_stage or "",
+        "alerts": sorted(set(alert_fields)),
+    }, sort_keys=True)
+
+
+def index_generation(hospital_id: Optional[str]) -> str:
+    """글로벌 + 병원 FAISS 인덱스 파일 상태 해시 — 재빌드되면 값이 바뀐다."""
+    from .checkup_design import rag_service
+
+    parts = []
+    paths = [os.path.join(rag_service.LOCAL_FAISS_DIR, "faiss.index")]
+    if hospital_id:
+        paths.append(os.path.join(rag_service.LOCAL_FAISS_BY_HOSPITAL, hospital_id, "faiss.index"))
+    for path in paths:
+        try:
+            st = os.stat(path)
+            parts.append(f"{st.st_mtime_ns}:{st.st_size}")
+        except OSError:
+            parts.append("-")
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()[:10]
+
+
+def is_personalized(answer: str, names: Sequence[str] = (), context_text: str = "") -> bool:
+    """답변이 환자 이름이나 환자 데이터(브리핑/문진)의 수치를 인용하면 True."""
+    if any(name and name not in _GENERIC_NAMES and name in answer for name in names):
+        return True
+    context_numbers = {n for n in _NUMBER_RE.findall(context_text or "") if len(n) >= 2}
+    return bool(context_numbers & set(_NUMBER_RE.findall(answer)))
+
+
+def replay_chunks(answer: str, size: int = REPLAY_CHUNK_CHARS) -> List[str]:
+    """저장 답변을 스트림 청크로 분할 (공백 경계 우선)."""
+    chunks, rest = [], answer
+    while len(rest) > size:
+        cut = rest.rfind(" ", 0, size)
+        cut = cut + 1 if cut > 0 else size
+        chunks.append(rest[:cut])
+        rest = rest[cut:]
+    if rest:
+        chunks.append(rest)
+    return chunks
+
+
+def _normalize(embedding: Sequence[float]):
+    import numpy as np
+
+    vec = np.asarray(embedding, dtype=np.float32)
+    norm = float(np.linalg.norm(vec))
+    return vec / norm if norm else vec
+
+
+class SemanticAnswerCache:
+    """질문 임베딩 기반 답변 캐시. client 미지정 시 settings.redis_url 로 지연 연결."""
+
+    def __init__(self, client=None) -> None:
+        self._client = client
+        # vecs 키 → (ver, entry_ids, float32 행렬)
+        self._local: "OrderedDict[str, tuple]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "skipped": 0, "errors": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return settings.rag_semantic_cache_enabled
+
+    def _redis(self):
+        if self._client is None:
+            import redis
+
+            # 벡터는 바이너리 — decode_responses=False 전용 클라이언트
+            self._client = redis.from_url(settings.redis_url, socket_timeout=1, socket_connect_timeout=1)
+        return self._client
+
+    def scope(self, partner_id: str, hospital_id: str, fingerprint: str,
+              prompt_config: Optional[Dict[str, Any]] = None) -> CacheScope:
+        """prompt_config: 답변을 바꾸는 병원 설정 (LLM 설정, 페르소나, 병원명 등)."""
+        digest = hashlib.sha1(
+            json.dumps([partner_id, fingerprint, prompt_config or {}], sort_keys=True, default=str).encode()
+        ).hexdigest()[:16]
+        return CacheScope(hospital_id or "-", index_generation(hospital_id), digest)
+
+    def _matrix(self, r, scope: CacheScope):
+        import numpy as np
+
+        vecs_key = scope.key("vecs")
+        ver = r.get(scope.key("ver"))
+        local = self._local.get(vecs_key)
+        if local is not None and local[0] == ver:
+            self._local.move_to_end(vecs_key)
+            return local[1], local[2]
+
+        raw = r.hgetall(vecs_key)
+        ids, rows = [], []
+        for entry_id, blob in raw.items():
+            if rows and len(blob) != len(rows[0]):
+                continue  # 임베딩 모델 교체 등으로 차원이 다른 잔여 항목
+            ids.append(entry_id.decode() if isinstance(entry_id, bytes) else entry_id)
+            rows.append(blob)
+        matrix = (np.frombuffer(b"".join(rows), dtype=np.float16).reshape(len(rows), -1).astype(np.float32)
+                  if rows else None)
+        self._local[vecs_key] = (ver, ids, matrix)
+        while len(self._local) > MAX_LOCAL_SCOPES:
+            self._local.popitem(last=False)
+        return ids, matrix
+
+    def _best(self, r, scope: CacheScope, vec):
+        ids, matrix = self._matrix(r, scope)
+        if matrix is None or matrix.shape[1] != vec.shape[0]:
+            return None, 0.0
+        sims = matrix @ vec
+        best = int(sims.argmax())
+        return ids[best], float(sims[best])
+
+    def lookup(self, scope: CacheScope, embedding: Sequence[float]) -> Optional[CachedAnswer]:
+        """임계값 이상 유사 질문의 저장 답변 (없으면 None)."""
+        try:
+            r = self._redis()
+            entry_id, similarity = self._best(r, scope, _normalize(embedding))
+            if entry_id is None or similarity < settings.rag_semantic_cache_threshold:
+                self.stats["misses"] += 1
+                return None
+            raw = r.get(scope.key(f"a:{entry_id}"))
+            if raw is None:
+                # 답변 TTL 만료 → 벡터도 정리
+                r.hdel(scope.key("vecs"), entry_id)
+                r.incr(scope.key("ver"))
+                self.stats["misses"] += 1
+                return None
+            data = json.loads(raw)
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning(f"⚠️ [시맨틱캐시] 조회 실패 (miss 처리): {e}")
+            return None
+        self.stats["hits"] += 1
+        return CachedAnswer(
+            entry_id=entry_id,
+            similarity=similarity,
+            question=data.get("question", ""),
+            answer=data["answer"],
+            sources=data.get("sources") or [],
+            suggestions=data.get("suggestions") or [],
+            chat_stage=data.get("chat_stage"),
+        )
+
+    def store(self, scope: CacheScope, embedding: Sequence[float], question: str, answer: str,
+              sources: List[Dict[str, Any]], suggestions: List[str], chat_stage: Optional[str] = None,
+              personal_names: Sequence[str] = (), personal_context: str = "") -> bool:
+        """답변 저장. 짧거나 개인화된 답변, 이미 같은 질문이 있으면 건너뛴다."""
+        if len(answer or "") < MIN_ANSWER_CHARS or answer.startswith("죄송합니다"):
+            self.stats["skipped"] += 1
+            return False
+        if is_personalized(answer, personal_names, personal_context):
+            self.stats["skipped"] += 1
+            return False
+        try:
+            import numpy as np
+
+            r = self._redis()
+            vec = _normalize(embedding)
+            _existing, similarity = self._best(r, scope, vec)
+            if similarity >= settings.rag_semantic_cache_threshold:
+                self.stats["skipped"] += 1  # 다른 워커가 먼저 저장
+                return False
+
+            ttl = settings.rag_semantic_cache_ttl_sec
+            vecs_key, ver_key = scope.key("vecs"), scope.key("ver")
+            entry_id = f"{time.time_ns():x}"
+            # 상한 초과분은 오래된 항목부터 (entry_id = 시각 16진수 → 정렬 = 생성 순)
+            existing = sorted(k.decode() if isinstance(k, bytes) else k for k in r.hkeys(vecs_key))
+            overflow = existing[:max(0, len(existing) - settings.rag_semantic_cache_max_entries + 1)]
+
+            pipe = r.pipeline()
+            if overflow:
+                pipe.hdel(vecs_key, *overflow)
+                pipe.delete(*[scope.key(f"a:{old}") for old in overflow])
+            pipe.setex(scope.key(f"a:{entry_id}"), ttl, json.dumps({
+                "question": question,
+                "answer": answer,
+                "sources": sources,
+                "suggestions": suggestions,
+                "chat_stage": chat_stage,
+                "created_at": int(time.time()),
+            }, ensure_ascii=False, default=str))
+            pipe.hset(vecs_key, entry_id, vec.astype(np.float16).tobytes())
+            pipe.expire(vecs_key, ttl)
+            pipe.incr(ver_key)
+            pipe.expire(ver_key, ttl)
+            pipe.execute()
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning(f"⚠️ [시맨틱캐시] 저장 실패: {e}")
+            return False
+        self.stats["stores"] += 1
+        return True
+
+    def invalidate(self, hospital_id: Optional[str] = None) -> int:
+        """병원(없으면 전체) 캐시 삭제. 삭제한 키 수 반환."""
+        prefix = f"{KEY_PREFIX}:{hospital_id}:" if hospital_id else f"{KEY_PREFIX}:"
+        for key in [k for k in self._local if k.startswith(prefix)]:
+            del self._local[key]
+        try:
+            r = self._redis()
+            keys = list(r.scan_iter(match=f"{prefix}*", count=500))
+            for i in range(0, len(keys), 500):
+                r.delete(*keys[i:i + 500])
+        except Exception as e:
+            logger.warning(f"⚠️ [시맨틱캐시] 무효화 실패 ({hospital_id or '전체'}): {e}")
+            return 0
+        if keys:
+            logger.info(f"🧹 [시맨틱캐시] 무효화: {hospital_id or '전체'} {len(keys)}개 키")
+        return len(keys)
+
+
+semantic_answer_cache = SemanticAnswerCache()
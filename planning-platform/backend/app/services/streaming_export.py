@@ -0,0 +1,344 @@
+"""
+스트리밍 내보내기 — 서버 사이드(named) 커서로 행을 배치 단위로 읽어 바로 직렬화
+
+- 메모리: 커서 itersize(배치) + 출력 버퍼만 유지 → 기간/행 수와 무관하게 일정
+- 형식: json(기존 응답 형태를 스트리밍), ndjson(재개 토큰 포함), csv, xlsx(write-only 임시 파일, 정보 시트에 재개 토큰)
+- gzip: 스트림을 즉시 압축 (Content-Encoding: gzip)
+- 재개: 각 섹션은 (정렬 키1, 정렬 키2) 내림차순 keyset 으로 읽으므로
+  ndjson 의 {"cursor": ...} 토큰(또는 xlsx 정보 시트의 cursor 값)을 다시 넘기면
+  해당 위치 다음 행부터 이어서 내보낸다.
+
+DB 드라이버가 동기(psycopg2)이므로 생성기는 동기 생성기로 두고,
+Starlette StreamingResponse 가 스레드풀에서 순회하게 한다.
+"""
+
+import base64
+import csv
+import io
+import json
+import logging
+import os
+import tempfile
+import uuid
+import zlib
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import psycopg2.extras
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+from ..core.database import db_manager
+
+logger = logging.getLogger(__name__)
+
+# named cursor 왕복당 행 수
+EXPORT_BATCH_SIZE = 2000
+# ndjson 재개 토큰 출력 간격 (행)
+CHECKPOINT_EVERY = 5000
+# 출력 버퍼 플러시 기준 (바이트)
+FLUSH_BYTES = 64 * 1024
+# xlsx 임시 파일 → 응답 청크 크기
+FILE_CHUNK = 256 * 1024
+# xlsx 재개 토큰·행 수를 적는 마지막 시트
+XLSX_INFO_SHEET = "내보내기 정보"
+
+MEDIA_TYPES = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+@dataclass
+class ExportSection:
+    """내보내기 단위 (하나의 SELECT).
+
+    base_sql 은 WHERE 절까지 포함하고 ORDER BY 는 넣지 않는다.
+    order_keys 는 SQL 정렬 컬럼, row_keys 는 결과 행에서 같은 값을 읽을 키 (토큰 생성용).
+    """
+    name: str
+    base_sql: str
+    params: Tuple = ()
+    order_keys: Tuple[str, str] = ("created_at", "id")
+    row_keys: Tuple[str, str] = ("created_at", "id")
+    limit: Optional[int] = None
+
+    def query(self, after: Optional[List[Any]]) -> Tuple[str, Tuple]:
+        k1, k2 = self.order_keys
+        sql, params = self.base_sql, tuple(self.params)
+        if after:
+            sql += f" AND ({k1}, {k2}) < (%s, %s)"
+            params += (after[0], after[1])
+        sql += f" ORDER BY {k1} DESC, {k2} DESC"
+        if self.limit:
+            sql += " LIMIT %s"
+            params += (self.limit,)
+        return sql, params
+
+
+# ── 재개 토큰 ──────────────────────────────────────────────
+
+def _plain(value: Any) -> Any:
+    """JSON/CSV 에 그대로 쓸 수 있는 값으로 변환"""
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    if isinstance(value, (dict, list)):
+        return _dumps(value)
+    return _json_default(value)
+
+
+def encode_cursor_token(section: str, row: Dict[str, Any], row_keys: Sequence[str]) -> str:
+    payload = {"s": section, "k": [_plain(row.get(k)) for k in row_keys]}
+    raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor_token(token: str) -> Tuple[str, List[Any]]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return payload["s"], list(payload["k"])
+    except Exception:
+        raise HTTPException(status_code=400, detail="잘못된 cursor 토큰입니다.")
+
+
+# ── 행 스트림 ──────────────────────────────────────────────
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (bytes, memoryview)):
+        return bytes(value).decode("utf-8", "replace")
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return str(value)
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, default=_json_default)
+
+
+def iter_section_rows(
+    section: ExportSection,
+    after: Optional[List[Any]] = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> Iterator[Dict[str, Any]]:
+    """named cursor 로 섹션 행을 batch_size 씩 가져와 하나씩 반환"""
+    sql, params = section.query(after)
+    with db_manager.get_connection("export") as conn:
+        name = f"export_{section.name}_{uuid.uuid4().hex[:8]}"
+        with conn.cursor(name=name, cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+            cur.itersize = batch_size
+            cur.execute(sql, params)
+            for row in cur:
+                yield dict(row)
+
+
+def _resume_plan(
+    sections: Sequence[ExportSection], cursor_token: Optional[str],
+) -> List[Tuple[ExportSection, Optional[List[Any]]]]:
+    """토큰이 있으면 해당 섹션의 keyset 위치부터, 이전 섹션은 건너뜀"""
+    if not cursor_token:
+        return [(s, None) for s in sections]
+    name, after = decode_cursor_token(cursor_token)
+    names = [s.name for s in sections]
+    if name not in names:
+        raise HTTPException(status_code=400, detail=f"cursor 토큰의 섹션({name})이 요청과 맞지 않습니다.")
+    idx = names.index(name)
+    return [(sections[idx], after)] + [(s, None) for s in sections[idx + 1:]]
+
+
+class _Buffer:
+    """작은 쓰기를 모아 FLUSH_BYTES 단위로 내보냄"""
+
+    def __init__(self):
+        self.parts: List[str] = []
+        self.size = 0
+
+    def write(self, text: str) -> Optional[bytes]:
+        self.parts.append(text)
+        self.size += len(text)
+        if self.size >= FLUSH_BYTES:
+            return self.drain()
+        return None
+
+    def drain(self) -> bytes:
+        data = "".join(self.parts).encode("utf-8")
+        self.parts, self.size = [], 0
+        return data
+
+
+# ── 인코더 ─────────────────────────────────────────────────
+
+def ndjson_stream(
+    sections: Sequence[ExportSection],
+    meta: Dict[str, Any],
+    cursor_token: Optional[str] = None,
+    row_fn: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+) -> Iterator[bytes]:
+    """{"meta"} → {"section","data"} 행들 + 주기적 {"cursor"} → {"done","counts"}.
+    토큰 검증은 응답 시작 전에 수행 (잘못된 토큰은 400)"""
+    return _ndjson_gen(_resume_plan(sections, cursor_token), meta, row_fn)
+
+
+def _ndjson_gen(plan, meta, row_fn) -> Iterator[bytes]:
+    buf = _Buffer()
+    counts: Dict[str, int] = {}
+    yield (_dumps({"meta": meta}) + "\n").encode("utf-8")
+    for section, after in plan:
+        count = 0
+        last = None
+        for row in iter_section_rows(section, after):
+            last = row
+            count += 1
+            out = buf.write(_dumps({"section": section.name, "data": row_fn(row) if row_fn else row}) + "\n")
+            if out:
+                yield out
+            if count % CHECKPOINT_EVERY == 0:
+                buf.write(_dumps({"cursor": encode_cursor_token(section.name, last, section.row_keys)}) + "\n")
+        if last is not None:
+            buf.write(_dumps({"cursor": encode_cursor_token(section.name, last, section.row_keys)}) + "\n")
+        counts[section.name] = count
+    buf.write(_dumps({"done": True, "counts": counts}) + "\n")
+    yield buf.drain()
+
+
+def json_document_stream(
+    sections: Sequence[ExportSection],
+    head: Dict[str, Any],
+    row_fn: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+) -> Iterator[bytes]:
+    """기존 단일 JSON 응답과 같은 형태 {..head, section: {"data": [...], "count": N}} 를 스트리밍"""
+    buf = _Buffer()
+    buf.write(_dumps(head)[:-1])
+    sep = ", " if head else ""
+    for section in sections:
+        buf.write(f'{sep}{_dumps(section.name)}: {{"data": [')
+        sep = ", "
+        count = 0
+        for row in iter_section_rows(section):
+            out = buf.write(("," if count else "") + _dumps(row_fn(row) if row_fn else row))
+            count += 1
+            if out:
+                yield out
+        buf.write(f'], "count": {count}}}')
+    buf.write("}")
+    yield buf.drain()
+
+
+def csv_stream(
+    section: ExportSection,
+    cursor_token: Optional[str] = None,
+    headers: Optional[List[str]] = None,
+    row_fn: Optional[Callable[[Dict[str, Any]], List[Any]]] = None,
+) -> Iterator[bytes]:
+    """단일 섹션 CSV (UTF-8 BOM — 엑셀 한글 호환). headers 없으면 첫 행 키 사용"""
+    (section, after), = _resume_plan([section], cursor_token)
+    return _csv_gen(section, after, headers, row_fn)
+
+
+def _csv_gen(section, after, headers, row_fn) -> Iterator[bytes]:
+    out = io.StringIO()
+    writer = csv.writer(out)
+    out.write("﻿")
+    if headers:
+        writer.writerow(headers)
+    for row in iter_section_rows(section, after):
+        if headers is None:
+            headers = list(row.keys())
+            writer.writerow(headers)
+        values = row_fn(row) if row_fn else [row.get(h) for h in headers]
+        writer.writerow([_plain(v) for v in values])
+        if out.tell() >= FLUSH_BYTES:
+            yield out.getvalue().encode("utf-8")
+            out.seek(0)
+            out.truncate()
+    yield out.getvalue().encode("utf-8")
+
+
+def xlsx_stream(
+    section: ExportSection,
+    sheet_title: str,
+    headers: List[str],
+    row_fn: Callable[[Dict[str, Any]], List[Any]],
+    cursor_token: Optional[str] = None,
+) -> Iterator[bytes]:
+    """openpyxl write-only 워크북을 임시 파일에 쓴 뒤 청크로 전송 (행 객체를 메모리에 쌓지 않음).
+
+    마지막 XLSX_INFO_SHEET 시트에 행 수와 마지막 행의 재개 토큰(cursor)을 기록 →
+    limit 로 나눠 받을 때 이 값을 cursor 로 넘기면 다음 행부터 이어진다.
+    """
+    (section, after), = _resume_plan([section], cursor_token)
+    return _xlsx_gen(section, after, sheet_title, headers, row_fn)
+
+
+def _xlsx_gen(section, after, sheet_title, headers, row_fn) -> Iterator[bytes]:
+    import openpyxl
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, PatternFill
+
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet(sheet_title)
+    header_font = Font(bold=True, color="FFFFFF")
+    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+    header_cells = []
+    for h in headers:
+        cell = WriteOnlyCell(ws, value=h)
+        cell.font = header_font
+        cell.fill = header_fill
+        header_cells.append(cell)
+    ws.append(header_cells)
+    count = 0
+    last = None
+    for row in iter_section_rows(section, after):
+        ws.append(row_fn(row))
+        last = row
+        count += 1
+
+    info = wb.create_sheet(XLSX_INFO_SHEET)
+    info.append(["rows", count])
+    info.append(["cursor", encode_cursor_token(section.name, last, section.row_keys) if last is not None else None])
+
+    fd, path = tempfile.mkstemp(prefix="welno_export_", suffix=".xlsx")
+    os.close(fd)
+    try:
+        wb.save(path)
+        with open(path, "rb") as f:
+            while True:
+                chunk = f.read(FILE_CHUNK)
+                if not chunk:
+                    break
+                yield chunk
+    finally:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def gzip_stream(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_response(
+    chunks: Iterable[bytes],
+    fmt: str,
+    filename: str,
+    gzip: bool = False,
+) -> StreamingResponse:
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    if gzip:
+        chunks = gzip_stream(chunks)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(chunks, media_type=MEDIA_TYPES[fmt], headers=headers)
@@ -0,0 +1,468 @@
+"""
+채팅 세션 태깅 작업 큐
+
+retag_all_sessions 의 순차 처리(2건마다 1초 sleep, 1회 LIMIT 20)를 대체한다.
+  - 적재: 대상 세션을 welno.tb_chat_tagging_queue 에 집합 INSERT
+          (같은 세션이 pending/running 이면 무시, done/failed 면 pending 으로 재사용)
+  - 실행: 워커 코루틴 N개가 FOR UPDATE SKIP LOCKED 로 1건씩 가져가 tag_chat_session 실행
+          (chat_tagging_batch_size > 1 이면 최대 N건씩 가져가 tag_chat_sessions_batch —
+           짧은 세션의 LLM 분석을 요청 1건으로 묶음)
+  - 속도: LLMRouter chat_tagging 시간당 상한 × quota_share 로 채우는 토큰 버킷,
+          상한 소진(has_quota=False) 시 일시정지
+  - 실패: 지수 백오프(next_run_at) 재시도, max_attempts 도달 시 failed
+  - 지표: get_queue_status() — 상태별 건수, 최근 처리량, 워커/버킷 상태
+
+큐가 DB 에 있으므로 서버 재시작 후에도 이어서 처리하고, 멈춘 running 은 stale_sec 후 회수한다.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import socket
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set
+
+from ..core.config import settings
+from ..core.database import db_manager
+
+logger = logging.getLogger(__name__)
+
+QUEUE_TABLE = "welno.tb_chat_tagging_queue"
+ENDPOINT = "chat_tagging"
+
+# 할 일이 없을 때 / quota 소진 시 대기
+POLL_INTERVAL_SEC = 10.0
+QUOTA_PAUSE_SEC = 60.0
+MAX_BACKOFF_SEC = 3600
+# 처리량 계산용 최근 완료 시각 보관 창
+THROUGHPUT_WINDOW_SEC = 300
+
+
+class AsyncTokenBucket:
+    """시간당 호출 한도 버킷 (asyncio). capacity 만큼 burst 허용, 대기자는 도착 순서대로 통과."""
+
+    def __init__(self, per_hour: float, capacity: float):
+        self.rate = max(per_hour, 1.0) / 3600.0
+        self.capacity = max(1.0, capacity)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float) -> None:
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep(min((amount - self.tokens) / self.rate, 30.0))
+
+    def refund(self, amount: float) -> None:
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+# ─── SQL ─────────────────────────────────────────────────────────
+
+def _revive_clause(revive_failed: bool) -> str:
+    # 자동 복구 적재는 최종 실패(failed)를 되살리지 않음 — 매시간 같은 실패 반복 방지
+    return "q.status IN ('done', 'failed')" if revive_failed else "q.status = 'done'"
+
+
+def _enqueue_sql(hospital_id: Optional[str], force: bool, revive_failed: bool) -> str:
+    conditions = ["l.message_count > 0"]
+    if hospital_id:
+        conditions.append("l.hospital_id = %s")
+    if not force:
+        # 태그 없거나 tagging_model 비어 있는 세션만 (기존 retag 조건과 동일)
+        conditions.append("(t.session_id IS NULL OR t.tagging_model IS NULL)")
+    return f"""
+        WITH candidates AS (
+            SELECT l.session_id, l.partner_id
+            FROM welno.tb_partner_rag_chat_log l
+            LEFT JOIN welno.tb_chat_session_tags t
+                ON l.session_id = t.session_id AND l.partner_id = t.partner_id
+            WHERE {' AND '.join(conditions)}
+        ), ins AS (
+            INSERT INTO {QUEUE_TABLE} AS q (session_id, partner_id, source)
+            SELECT session_id, partner_id, %s FROM candidates
+            ON CONFLICT (session_id, partner_id) DO UPDATE
+                SET status = 'pending', attempts = 0, next_run_at = NOW(),
+                    last_error = NULL, source = EXCLUDED.source,
+                    enqueued_at = NOW(), finished_at = NULL, duration_ms = NULL
+                WHERE {_revive_clause(revive_failed)}
+            RETURNING 1
+        )
+        SELECT (SELECT COUNT(*) FROM candidates) AS candidates,
+               (SELECT COUNT(*) FROM ins) AS enqueued
+    """
+
+
+_ENQUEUE_ONE_SQL = f"""
+    INSERT INTO {QUEUE_TABLE} AS q (session_id, partner_id, source)
+    VALUES (%s, %s, %s)
+    ON CONFLICT (session_id, partner_id) DO UPDATE
+        SET status = 'pending', attempts = 0, next_run_at = NOW(),
+            last_error = NULL, source = EXCLUDED.source,
+            enqueued_at = NOW(), finished_at = NULL, duration_ms = NULL
+        WHERE q.status IN ('done', 'failed')
+    RETURNING q.id
+"""
+
+_CLAIM_SQL = f"""
+    UPDATE {QUEUE_TABLE} q
+    SET status = 'running', attempts = q.attempts + 1, locked_at = NOW(), locked_by = %s
+    WHERE q.id = (
+        SELECT id FROM {QUEUE_TABLE}
+        WHERE status = 'pending' AND next_run_at <= NOW()
+        ORDER BY next_run_at, id
+        LIMIT 1
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING q.id, q.session_id, q.partner_id, q.attempts
+"""
+
+# 배치 모드 — 최대 N건 claim. execute_one(커밋) 1회로 받도록 json_agg 로 묶어 반환
+_CLAIM_BATCH_SQL = f"""
+    WITH claimed AS (
+        UPDATE {QUEUE_TABLE} q
+        SET status = 'running', attempts = q.attempts + 1, locked_at = NOW(), locked_by = %s
+        WHERE q.id IN (
+            SELECT id FROM {QUEUE_TABLE}
+            WHERE status = 'pending' AND next_run_at <= NOW()
+            ORDER BY next_run_at, id
+            LIMIT %s
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING q.id, q.session_id, q.partner_id, q.attempts
+    )
+    SELECT COALESCE(json_agg(claimed ORDER BY claimed.id), '[]'::json) AS jobs FROM claimed
+"""
+
+_DONE_SQL = f"""
+    UPDATE {QUEUE_TABLE}
+    SET status = 'done', finished_at = NOW(), locked_at = NULL, last_error = NULL, duration_ms = %s
+    WHERE id = %s
+"""
+
+_RETRY_SQL = f"""
+    UPDATE {QUEUE_TABLE}
+    SET status = 'pending', next_run_at = NOW() + make_interval(secs => %s),
+        locked_at = NULL, last_error = %s, duration_ms = %s
+    WHERE id = %s
+"""
+
+_FAILED_SQL = f"""
+    UPDATE {QUEUE_TABLE}
+    SET status = 'failed', finished_at = NOW(), locked_at = NULL, last_error = %s, duration_ms = %s
+    WHERE id = %s
+"""
+
+_RECLAIM_STALE_SQL = f"""
+    UPDATE {QUEUE_TABLE}
+    SET status = 'pending', locked_at = NULL, last_error = 'stale_running'
+    WHERE status = 'running' AND locked_at < NOW() - make_interval(secs => %s)
+"""
+
+_STATUS_SQL = f"""
+    SELECT
+        COUNT(*) FILTER (WHERE status = 'pending') AS pending,
+        COUNT(*) FILTER (WHERE status = 'pending' AND next_run_at > NOW()) AS backoff,
+        COUNT(*) FILTER (WHERE status = 'running') AS running,
+        COUNT(*) FILTER (WHERE status = 'done') AS done,
+        COUNT(*) FILTER (WHERE status = 'failed') AS failed,
+        EXTRACT(EPOCH FROM NOW() - MIN(enqueued_at) FILTER (WHERE status = 'pending')) AS oldest_pending_sec,
+        COUNT(*) FILTER (WHERE status = 'done' AND finished_at > NOW() - INTERVAL '5 minutes') AS done_5m,
+        COUNT(*) FILTER (WHERE status = 'done' AND finished_at > NOW() - INTERVAL '1 hour') AS done_1h,
+        AVG(duration_ms) FILTER (WHERE status = 'done' AND finished_at > NOW() - INTERVAL '1 hour') AS avg_ms_1h
+    FROM {QUEUE_TABLE}
+"""
+
+_RECENT_FAILURES_SQL = f"""
+    SELECT session_id, partner_id, attempts, last_error, finished_at
+    FROM {QUEUE_TABLE}
+    WHERE status = 'failed'
+    ORDER BY finished_at DESC
+    LIMIT %s
+"""
+
+
+def batch_call_cost(sessions: int) -> int:
+    """세션 sessions 건을 배치로 처리할 때 LLM 호출 수 — 묶음 분석 1회 + 나머지 호출(재방문 메시지 등)은 세션별"""
+    per_session = max(1, settings.tagging_queue_calls_per_session)
+    if sessions <= 1:
+        return per_session
+    return 1 + (per_session - 1) * sessions
+
+
+def backoff_seconds(attempts: int) -> int:
+    """attempts 회 실패 후 대기 시간 — base × 2^(n-1), 상한 1시간, ±20% 지터"""
+    base = settings.tagging_queue_backoff_base_sec * (2 ** max(0, attempts - 1))
+    return int(min(MAX_BACKOFF_SEC, base) * random.uniform(0.8, 1.2))
+
+
+# ─── 워커 ────────────────────────────────────────────────────────
+
+class TaggingQueueWorker:
+    """프로세스당 1개 — startup 에서 start(), shutdown 에서 stop()"""
+
+    def __init__(self):
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._tasks: Set[asyncio.Task] = set()
+        self._bucket: Optional[AsyncTokenBucket] = None
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self.started_at: Optional[float] = None
+        self.paused_reason: Optional[str] = None
+        self.counters: Dict[str, int] = {"claimed": 0, "succeeded": 0, "retried": 0, "failed": 0}
+        self._recent_done: Deque[float] = deque()
+        self._busy = 0
+        self._reclaimed_at = 0.0
+
+    @property
+    def running(self) -> bool:
+        return any(not t.done() for t in self._tasks)
+
+    def rate_limit(self) -> Dict[str, float]:
+        """LLMRouter chat_tagging 상한에서 큐 몫의 시간당 호출/세션 수 산정"""
+        from .llm_router import llm_router
+
+        daily, hourly = llm_router.quota_ceilings(ENDPOINT)
+        calls_per_hour = max(1.0, hourly * settings.tagging_queue_quota_share)
+        batch = max(1, settings.chat_tagging_batch_size)
+        per_session = batch_call_cost(batch) / batch
+        return {
+            "daily_ceiling": daily,
+            "hourly_ceiling": hourly,
+            "batch_size": batch,
+            "calls_per_hour": calls_per_hour,
+            "sessions_per_hour": calls_per_hour / per_session,
+        }
+
+    async def start(self, workers: Optional[int] = None) -> None:
+        if self.running:
+            return
+        workers = max(1, workers or settings.tagging_queue_workers)
+        per_session = max(1, settings.tagging_queue_calls_per_session)
+        burst = max(per_session, batch_call_cost(max(1, settings.chat_tagging_batch_size))) * workers
+        self._bucket = AsyncTokenBucket(self.rate_limit()["calls_per_hour"], burst)
+        self._stopping = False
+        self.started_at = time.time()
+        for i in range(workers):
+            task = asyncio.create_task(self._worker_loop(f"{self.worker_id}#{i}"))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        logger.info(f"[태깅큐] 워커 {workers}개 시작 ({self._bucket.rate * 3600:.0f} calls/h)")
+
+    async def stop(self) -> None:
+        self._stopping = True
+        self._wakeup.set()
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def notify(self) -> None:
+        """적재 직후 대기 중인 워커 깨우기"""
+        self._wakeup.set()
+
+    async def _idle(self, seconds: float) -> None:
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    async def _worker_loop(self, name: str) -> None:
+        from .llm_router import llm_router
+
+        batch = max(1, settings.chat_tagging_batch_size)
+        cost = batch_call_cost(batch)
+        while not self._stopping:
+            try:
+                if not llm_router.has_quota(ENDPOINT):
+                    self.paused_reason = "quota_exhausted"
+                    await asyncio.sleep(QUOTA_PAUSE_SEC)
+                    continue
+                self.paused_reason = None
+
+                await self._bucket.acquire(cost)
+                if batch > 1:
+                    row = await db_manager.execute_one(_CLAIM_BATCH_SQL, (name, batch))
+                    jobs = list((row or {}).get("jobs") or [])
+                else:
+                    job = await db_manager.execute_one(_CLAIM_SQL, (name,))
+                    jobs = [job] if job else []
+                if not jobs:
+                    self._bucket.refund(cost)
+                    await self._maybe_reclaim()
+                    await self._idle(POLL_INTERVAL_SEC)
+                    continue
+                # 덜 채워진 배치는 쓰지 않은 호출 몫 반환
+                self._bucket.refund(cost - batch_call_cost(len(jobs)))
+                self.counters["claimed"] += len(jobs)
+                if len(jobs) == 1:
+                    await self._run_job(jobs[0])
+                else:
+                    await self._run_batch(jobs)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # DB 장애 등 — 루프 유지, 잠시 후 재시도
+                logger.warning(f"[태깅큐] 워커 오류 {name}: {e}")
+                await asyncio.sleep(POLL_INTERVAL_SEC)
+
+    async def _maybe_reclaim(self) -> None:
+        # 다른 프로세스가 죽으며 남긴 running 도 회수 (stale_sec 의 절반 주기)
+        now = time.monotonic()
+        if now - self._reclaimed_at < settings.tagging_queue_stale_sec / 2:
+            return
+        self._reclaimed_at = now
+        count = await reclaim_stale()
+        if count:
+            logger.info(f"[태깅큐] 멈춘 running {count}건 회수")
+
+    async def _run_job(self, job: Dict[str, Any]) -> None:
+        from .chat_tagging_service import tag_chat_session
+
+        self._busy += 1
+        started = time.monotonic()
+        error = None
+        try:
+            result = await tag_chat_session(session_id=job["session_id"], partner_id=job["partner_id"])
+            if not result:
+                error = "tagging_returned_none"
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"[:500]
+        finally:
+            self._busy -= 1
+        await self._finish_job(job, error, int((time.monotonic() - started) * 1000))
+
+    async def _run_batch(self, jobs: List[Dict[str, Any]]) -> None:
+        from .chat_tagging_service import tag_chat_sessions_batch
+
+        self._busy += len(jobs)
+        started = time.monotonic()
+        try:
+            results = await tag_chat_sessions_batch(
+                [{"session_id": j["session_id"], "partner_id": j["partner_id"]} for j in jobs])
+            errors = [None if r else "tagging_returned_none" for r in results]
+        except Exception as e:
+            errors = [f"{type(e).__name__}: {e}"[:500]] * len(jobs)
+        finally:
+            self._busy -= len(jobs)
+        # 세션별 시간은 나눌 수 없어 묶음 전체 시간을 기록
+        duration_ms = int((time.monotonic() - started) * 1000)
+        for job, error in zip(jobs, errors):
+            await self._finish_job(job, error, duration_ms)
+
+    async def _finish_job(self, job: Dict[str, Any], error: Optional[str], duration_ms: int) -> None:
+        if error is None:
+            await db_manager.execute_update(_DONE_SQL, (duration_ms, job["id"]))
+            self.counters["succeeded"] += 1
+            now = time.monotonic()
+            self._recent_done.append(now)
+            while self._recent_done and now - self._recent_done[0] > THROUGHPUT_WINDOW_SEC:
+                self._recent_done.popleft()
+        elif job["attempts"] >= settings.tagging_queue_max_attempts:
+            await db_manager.execute_update(_FAILED_SQL, (error, duration_ms, job["id"]))
+            self.counters["failed"] += 1
+            logger.warning(f"[태깅큐] 최종 실패 {job['session_id']} ({job['attempts']}회): {error}")
+        else:
+            delay = backoff_seconds(job["attempts"])
+            await db_manager.execute_update(_RETRY_SQL, (delay, error, duration_ms, job["id"]))
+            self.counters["retried"] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        recent = sum(1 for t in self._recent_done if now - t <= THROUGHPUT_WINDOW_SEC)
+        return {
+            "worker_id": self.worker_id,
+            "running": self.running,
+            "workers": len(self._tasks),
+            "busy": self._busy,
+            "paused_reason": self.paused_reason,
+            "started_at": self.started_at,
+            "bucket_tokens": round(self._bucket.tokens, 2) if self._bucket else None,
+            "sessions_per_min_5m": round(recent / (THROUGHPUT_WINDOW_SEC / 60), 2),
+            **self.counters,
+        }
+
+
+tagging_queue = TaggingQueueWorker()
+
+
+# ─── 적재 / 조회 ─────────────────────────────────────────────────
+
+async def enqueue_sessions(
+    hospital_id: Optional[str] = None,
+    force: bool = False,
+    source: str = "retag",
+) -> Dict[str, int]:
+    """재태깅 대상 세션 전체를 큐에 적재. 이미 pending/running 인 세션은 duplicates 로 집계.
+
+    source="recovery"(주기 복구)는 failed 세션을 다시 살리지 않는다.
+    """
+    params: List[Any] = []
+    if hospital_id:
+        params.append(hospital_id)
+    params.append(source)
+    sql = _enqueue_sql(hospital_id, force, revive_failed=source != "recovery")
+    row = await db_manager.execute_one(sql, tuple(params)) or {}
+    candidates = int(row.get("candidates") or 0)
+    enqueued = int(row.get("enqueued") or 0)
+    if enqueued:
+        tagging_queue.notify()
+    return {"candidates": candidates, "enqueued": enqueued, "duplicates": candidates - enqueued}
+
+
+async def enqueue_session(session_id: str, partner_id: str, source: str = "manual") -> bool:
+    """단일 세션 적재. 이미 대기/실행 중이면 False."""
+    row = await db_manager.execute_one(_ENQUEUE_ONE_SQL, (session_id, partner_id, source))
+    if row:
+        tagging_queue.notify()
+    return row is not None
+
+
+async def reclaim_stale() -> int:
+    """서버 종료 등으로 running 에 멈춘 작업을 pending 으로 되돌림"""
+    return await db_manager.execute_update(_RECLAIM_STALE_SQL, (settings.tagging_queue_stale_sec,))
+
+
+async def get_queue_status(failure_limit: int = 10) -> Dict[str, Any]:
+    """백오피스용 큐 현황 — DB 집계(전체 프로세스) + 이 프로세스 워커 상태"""
+    row = await db_manager.execute_one(_STATUS_SQL) or {}
+    failures = await db_manager.execute_query(_RECENT_FAILURES_SQL, (failure_limit,))
+    done_5m = int(row.get("done_5m") or 0)
+    done_1h = int(row.get("done_1h") or 0)
+    pending = int(row.get("pending") or 0)
+    limits = tagging_queue.rate_limit()
+    per_hour = done_1h or limits["sessions_per_hour"]
+    return {
+        "queue": {
+            "pending": pending,
+            "backoff": int(row.get("backoff") or 0),
+            "running": int(row.get("running") or 0),
+            "done": int(row.get("done") or 0),
+            "failed": int(row.get("failed") or 0),
+            "oldest_pending_sec": float(row["oldest_pending_sec"]) if row.get("oldest_pending_sec") is not None else None,
+        },
+        "throughput": {
+            "done_5m": done_5m,
+            "done_1h": done_1h,
+            "per_min_5m": round(done_5m / 5, 2),
+            "avg_duration_ms_1h": round(float(row["avg_ms_1h"]), 1) if row.get("avg_ms_1h") is not None else None,
+            "eta_sec": round(pending / per_hour * 3600) if pending and per_hour else 0,
+        },
+        "rate_limit": limits,
+        "worker": tagging_queue.snapshot(),
+        "recent_failures": failures,
+    }
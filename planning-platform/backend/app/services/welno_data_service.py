@@ -738,6 +738,10 @@ class WelnoDataService:
                 """, data_source, patient_uuid, hospital_id)
             finally:
                 await update_conn.close()
+
+            # 검진설계 환자 컨텍스트 캐시 무효화 (다음 설계는 새 데이터로 조회)
+            from .patient_context import invalidate_patient_context
+            invalidate_patient_context(patient_uuid)
             
             print(f"✅ [건강검진저장] {saved_count}건 저장 완료 (출처: {data_source})")
 
@@ -841,6 +845,10 @@ class WelnoDataService:
                 """, data_source, patient_uuid, hospital_id)
             finally:
                 await update_conn.close()
+
+            # 검진설계 환자 컨텍스트 캐시 무효화 (다음 설계는 새 데이터로 조회)
+            from .patient_context import invalidate_patient_context
+            invalidate_patient_context(patient_uuid)
             
             print(f"✅ [처방전저장] {saved_count}건 저장 완료 (출처: {data_source})")
             return True
@@ -1714,6 +1722,68 @@ class WelnoDataService:
                 "error": str(e)
             }
     
+    async def save_checkup_design_step2_partial(
+        self,
+        request_id: int,
+        branch: str,
+        payload: Dict[str, Any]
+    ) -> bool:
+        """
+        STEP2 분기(priority1 / upselling) 결과를 step2_result._partial.<branch> 에 먼저 저장.
+        다른 분기가 실패/타임아웃해도 재시도 시 완료된 분기는 다시 호출하지 않는다.
+        상태·retry_count 는 건드리지 않음 (step1_completed 인 요청만 대상).
+        """
+        try:
+            conn = await asyncpg.connect(**self.db_config)
+            result = await conn.execute(
+                """
+                UPDATE welno.welno_checkup_design_requests
+                SET step2_result = jsonb_set(
+                        CASE WHEN jsonb_typeof(step2_result) = 'object' THEN step2_result ELSE '{}'::jsonb END,
+                        '{_partial}',
+                        COALESCE(
+                            CASE WHEN jsonb_typeof(step2_result->'_partial') = 'object'
+                                 THEN step2_result->'_partial' END,
+                            '{}'::jsonb
+                        ) || jsonb_build_object($2::text, $3::jsonb)
+                    ),
+                    updated_at = NOW()
+                WHERE id = $1 AND status = 'step1_completed'
+                """,
+                request_id,
+                branch,
+                json.dumps(payload, ensure_ascii=False),
+            )
+            await conn.close()
+            return result.endswith(" 1")
+        except Exception as e:
+            import logging
+            logger = logging.getLogger(__name__)
+            logger.warning(f"⚠️ [검진설계-부분저장] {branch} 저장 실패 - ID: {request_id}: {e}")
+            return False
+
+    async def get_checkup_design_step2_partials(self, request_id: int) -> Dict[str, Any]:
+        """save_checkup_design_step2_partial 로 저장된 분기 결과 ({branch: payload}, 없으면 {})"""
+        try:
+            conn = await asyncpg.connect(**self.db_config)
+            value = await conn.fetchval(
+                """
+                SELECT step2_result->'_partial'
+                FROM welno.welno_checkup_design_requests
+                WHERE id = $1 AND status = 'step1_completed'
+                """,
+                request_id,
+            )
+            await conn.close()
+            if isinstance(value, str):
+                value = json.loads(value)
+            return value if isinstance(value, dict) else {}
+        except Exception as e:
+            import logging
+            logger = logging.getLogger(__name__)
+            logger.warning(f"⚠️ [검진설계-부분조회] 실패 - ID: {request_id}: {e}")
+            return {}
+
     async def get_incomplete_checkup_design(
         self,
         uuid: str,
@@ -17,11 +17,13 @@ from .checkup_design.rag_service import search_checkup_knowledge, clean_html_con
 from .checkup_design.lifestyle_rag_service import lifestyle_rag_service, LifestyleAnalysisRequest
 from ..services.gemini_service import gemini_service, GeminiRequest
 from .llm_router import llm_router
+from .semantic_answer_cache import context_fingerprint, replay_chunks, semantic_answer_cache
 from ..services.welno_data_service import WelnoDataService
 from ..core.database import db_manager
 from .chat_tagging_service import (
     build_suggestion_instruction,
     extract_health_alerts,
+    refresh_revisit_candidate,
 )
 from ..utils.partner_constants import PARTNER_TYPE_MAP
 
@@ -93,7 +95,7 @@ class WelnoRagChatService:
         
         # Redis 클라이언트 직접 초기화
         try:
-            redis_url = settings.REDIS_URL if hasattr(settings, 'REDIS_URL') else "redis://10.0.1.10:6379/0"
+            redis_url = settings.redis_url
             self.redis_client = redis.from_url(
                 redis_url,
                 decode_responses=True,
@@ -186,6 +188,8 @@ class WelnoRagChatService:
                     partner_id,
                     session_id
                 ))
+                # 재방문 후보면 last_chat_at 갱신 (신규 세션은 태그 전이라 후보 아님)
+                await refresh_revisit_candidate(session_id)
             else:
                 # 신규 세션: warmup 인사말이 있으면 conversation 첫 행에 포함
                 conversation = []
@@ -515,13 +519,51 @@ class WelnoRagChatService:
                     logger.warning(f"⚠️ [RAG 쿼리] 맥락 보강 실패: {e}")
             
             # 타이밍 변수 초기화
-            rag_engine_time = 0.0
+            rag_engine_time = None
             rag_search_time = 0.0
             gemini_time = 0.0
+            vector_search = None
+
+            # 시맨틱 답변 캐시 (opt-in) — 첫 메시지만 (이후 메시지는 대화 히스토리에 따라 답이 달라짐)
+            cache_scope = None
+            query_embedding = None
+            cached_answer = None
+            if is_first_message and semantic_answer_cache.enabled:
+                # 질문 임베딩에 엔진이 필요 → 캐시 경로에서만 초기화를 먼저 기다린다
+                vector_search = await rag_init_task
+                rag_engine_time = time.time() - rag_engine_start
+                if vector_search:
+                    try:
+                        _hc = (trace_data.get("hospital_config") if trace_data else None) or {}
+                        _pd_cache = (trace_data.get("processed_data") if trace_data else None) or {}
+                        _pd_cache = _pd_cache if isinstance(_pd_cache, dict) else {}
+                        cache_scope = semantic_answer_cache.scope(
+                            partner_id,
+                            hospital_id,
+                            context_fingerprint(
+                                has_patient_data=bool(briefing_context or past_survey_info),
+                                is_stale_data=is_stale_data,
+                                is_partner_session=is_partner_session,
+                                chat_stage=chat_stage,
+                                alert_fields=[a["field"] for a in extract_health_alerts(_pd_cache.get("health_metrics", {}))],
+                            ),
+                            prompt_config={
+                                "llm_config": _hc.get("llm_config"),
+                                "persona_prompt": _hc.get("persona_prompt"),
+                                "hospital_name": _pd_cache.get("partner_hospital_name") or _hc.get("hospital_name"),
+                                "hospital_tel": _pd_cache.get("partner_hospital_tel"),
+                            },
+                        )
+                        # 임베딩 API·Redis 호출은 동기 → 이벤트 루프 블로킹 방지
+                        query_embedding = await asyncio.to_thread(vector_search.embed, search_query)
+                        cached_answer = await asyncio.to_thread(semantic_answer_cache.lookup, cache_scope, query_embedding)
+                    except Exception as e:
+                        logger.warning(f"⚠️ [시맨틱캐시] 조회 스킵: {e}")
+                        cache_scope = None
 
             # 병원 RAG 우선: 해당 hospital_id 전용 인덱스가 있으면 먼저 검색
             hospital_rag_sources = []
-            if hospital_id:
+            if hospital_id and cached_answer is None:
                 try:
                     hospital_rag = await search_hospital_knowledge(hospital_id, search_query)
                     if hospital_rag.get("success") and hospital_rag.get("sources"):
@@ -530,18 +572,41 @@ class WelnoRagChatService:
                 except Exception as e:
                     logger.warning(f"⚠️ [RAG 채팅] 병원 RAG 검색 스킵: {e}")
 
-            # RAG 엔진 초기화 대기 (health_data fetch와 병렬로 이미 시작됨)
-            vector_search = await rag_init_task
-            rag_engine_time = time.time() - rag_engine_start
+            # RAG 엔진 초기화 대기 (health_data fetch·병원 RAG 검색과 병렬로 이미 시작됨)
+            if rag_engine_time is None:
+                vector_search = await rag_init_task
+                rag_engine_time = time.time() - rag_engine_start
             logger.info(f"⏱️  [RAG 채팅] RAG 엔진 초기화 (병렬): {rag_engine_time:.3f}초")
 
             if trace_data:
                 trace_data["timings"]["rag_engine_init_ms"] = rag_engine_time * 1000
 
-            if vector_search:
+            if cached_answer is not None:
+                # 캐시 재생: RAG 검색·LLM 생성 없이 저장 답변을 같은 SSE 형식으로 스트리밍
+                logger.info(f"⚡ [시맨틱캐시] hit - 유사도 {cached_answer.similarity:.3f}, 저장 질문: {cached_answer.question[:50]}")
+                if trace_data:
+                    trace_data["semantic_cache"] = {"hit": True, "similarity": cached_answer.similarity,
+                                                    "entry_id": cached_answer.entry_id}
+                for piece in replay_chunks(cached_answer.answer):
+                    yield f"data: {json.dumps({'answer': piece, 'done': False}, ensure_ascii=False)}\n\n"
+                    await asyncio.sleep(0)
+                full_answer = cached_answer.answer
+                sources = cached_answer.sources
+                suggestions = cached_answer.suggestions
+                chat_stage = cached_answer.chat_stage or "normal"
+
+                await self.save_chat_log(
+                    partner_id=partner_id,
+                    hospital_id=hospital_id,
+                    user_uuid=uuid,
+                    session_id=session_id,
+                    message=full_answer,
+                    role="assistant"
+                )
+            elif vector_search:
                 # RAG 검색 실행 타이밍
                 rag_search_start = time.time()
-                nodes = vector_search.search(search_query, top_k=5)
+                nodes = vector_search.search(search_query, top_k=5, embedding=query_embedding)
                 rag_search_time = time.time() - rag_search_start
 
                 if trace_data:
@@ -1159,6 +1224,9 @@ class WelnoRagChatService:
                     except:
                         pass
 
+                # 모델이 SUGGESTIONS 블록까지 냈으면 스트림이 끝까지 온 것 (중간 실패·폴백 문구 아님) → 캐시 저장 조건
+                answer_complete = bool(suggestions)
+
                 # 모델이 SUGGESTIONS를 생략하면 1회 LLM 재시도 후 폴백
                 if not suggestions:
                     try:
@@ -1189,6 +1257,20 @@ class WelnoRagChatService:
                             _ha = extract_health_alerts(_hm.get("health_metrics", {}))
                     suggestions = generate_fallback_suggestions(message_count, _ha, "")
                     logger.info(f"💡 [서제스천] 모델 미생성 — 폴백 {len(suggestions)}건 사용")
+
+                if cache_scope is not None and query_embedding is not None and answer_complete and not had_rag_discrepancy:
+                    await asyncio.to_thread(
+                        semantic_answer_cache.store,
+                        cache_scope,
+                        query_embedding,
+                        question=message,
+                        answer=full_answer,
+                        sources=sources,
+                        suggestions=suggestions,
+                        chat_stage=chat_stage,
+                        personal_names=[patient_name],
+                        personal_context=f"{briefing_context}\n{past_survey_info}",
+                    )
             else:
                 yield f"data: {json.dumps({'answer': '죄송합니다. 엔진 초기화에 실패했습니다.', 'done': False}, ensure_ascii=False)}\n\n"
 
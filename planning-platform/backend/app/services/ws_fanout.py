@@ -0,0 +1,188 @@
+"""
+WebSocket 세션 메시지 워커 간 팬아웃 (틸코 인증 상태 알림)
+
+websocket_auth.ConnectionManager 의 소켓은 프로세스 로컬이라, 틸코 인증 흐름이 다른 워커에서
+진행되면 상태 알림이 소켓까지 가지 못한다 (PM2 인스턴스 1개 고정 이유).
+  - publish(session_id, message): 이 워커의 소켓에 바로 전달, 소켓이 없을 때만 브로커 채널에 발행
+    (세션 소켓은 한 워커에만 있음). 반환값은 로컬 전달 여부 — 발행 결과는 forward() / published 카운터
+  - 모든 워커의 리스너가 채널을 구독해 자기 소켓이 있는 세션이면 전달 (자기가 발행한 건 건너뜀)
+  - 브로커: RedisBroker (Redis pub/sub 채널) / InMemoryBroker (같은 프로세스 안 — 테스트·단일 워커)
+브로커 장애 시에는 로컬 전달만 하고 경고 로그 — 알림 실패가 인증 흐름을 막지 않는다.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 리스너 재연결 대기 (초, 실패할 때마다 2배, 상한)
+RECONNECT_BASE_SEC = 1.0
+RECONNECT_MAX_SEC = 30.0
+
+Deliver = Callable[[Dict[str, Any], str], Awaitable[bool]]
+
+
+class InMemoryBroker:
+    """프로세스 안 pub/sub — 구독자마다 큐 1개. Redis 없이 같은 프로세스의 팬아웃 인스턴스끼리 공유."""
+
+    def __init__(self) -> None:
+        self._queues: List[asyncio.Queue] = []
+
+    async def publish(self, data: str) -> None:
+        for q in list(self._queues):
+            q.put_nowait(data)
+
+    async def listen(self, on_message: Callable[[str], Awaitable[None]]) -> None:
+        q: asyncio.Queue = asyncio.Queue()
+        self._queues.append(q)
+        try:
+            while True:
+                await on_message(await q.get())
+        finally:
+            self._queues.remove(q)
+
+    async def close(self) -> None:
+        return None
+
+
+class RedisBroker:
+    """Redis pub/sub 채널 (redis.asyncio). 발행·구독 연결은 지연 생성."""
+
+    def __init__(self, url: str, channel: str) -> None:
+        self.url = url
+        self.channel = channel
+        self._client = None
+
+    def _get_client(self):
+        if self._client is None:
+            import redis.asyncio as aioredis
+            self._client = aioredis.from_url(
+                self.url, decode_responses=True, socket_connect_timeout=3, socket_timeout=3,
+            )
+        return self._client
+
+    async def publish(self, data: str) -> None:
+        await self._get_client().publish(self.channel, data)
+
+    async def listen(self, on_message: Callable[[str], Awaitable[None]]) -> None:
+        pubsub = self._get_client().pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(self.channel)
+        try:
+            while True:
+                msg = await pubsub.get_message(timeout=1.0)
+                if msg and msg.get("type") == "message":
+                    await on_message(msg["data"])
+        finally:
+            try:
+                await pubsub.unsubscribe(self.channel)
+                await pubsub.close()
+            except Exception:
+                pass
+
+    async def close(self) -> None:
+        if self._client is not None:
+            try:
+                await self._client.close()
+            except Exception:
+                pass
+            self._client = None
+
+
+class SessionFanout:
+    """세션 메시지를 로컬 소켓 + 다른 워커로 전달."""
+
+    def __init__(self, broker, deliver: Deliver) -> None:
+        self.broker = broker
+        self.deliver = deliver
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{id(self):x}"
+        self._task: Optional[asyncio.Task] = None
+        self.published = 0
+        self.received = 0
+        self.delivered_remote = 0
+        self.publish_errors = 0
+
+    async def publish(self, session_id: str, message: Dict[str, Any]) -> bool:
+        """이 워커의 소켓에 전달되면 True (발행 생략). 아니면 다른 워커용으로 발행하고 False.
+
+        False 는 "이 워커에 연결 없음" — 다른 워커가 소켓을 갖고 있으면 그쪽에서 전달된다 (수신 확인 없음).
+        """
+        if await self.deliver(message, session_id):
+            return True
+        await self.forward(session_id, message)
+        return False
+
+    async def forward(self, session_id: str, message: Dict[str, Any]) -> bool:
+        """다른 워커용으로 브로커에 발행 — 브로커가 받으면 True."""
+        try:
+            await self.broker.publish(json.dumps(
+                {"origin": self.worker_id, "session_id": session_id, "message": message},
+                ensure_ascii=False, default=str,
+            ))
+            self.published += 1
+            return True
+        except Exception as e:
+            self.publish_errors += 1
+            logger.warning("[WS팬아웃] 발행 실패 (session=%s): %s", session_id, e)
+            return False
+
+    async def _on_message(self, data: str) -> None:
+        try:
+            envelope = json.loads(data)
+        except (TypeError, ValueError):
+            return
+        if envelope.get("origin") == self.worker_id:
+            return
+        self.received += 1
+        if await self.deliver(envelope.get("message") or {}, envelope.get("session_id") or ""):
+            self.delivered_remote += 1
+
+    async def _listen_loop(self) -> None:
+        delay = RECONNECT_BASE_SEC
+        while True:
+            try:
+                await self.broker.listen(self._on_message)
+                delay = RECONNECT_BASE_SEC
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("[WS팬아웃] 구독 끊김 — %.0f초 후 재연결: %s", delay, e)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECONNECT_MAX_SEC)
+
+    async def start(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._listen_loop())
+        # 구독이 걸릴 때까지 한 번 양보 (시작 직후 발행분 유실 방지)
+        await asyncio.sleep(0)
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        await self.broker.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "worker_id": self.worker_id,
+            "broker": type(self.broker).__name__,
+            "listening": self._task is not None and not self._task.done(),
+            "published": self.published,
+            "received": self.received,
+            "delivered_remote": self.delivered_remote,
+            "publish_errors": self.publish_errors,
+        }
+
+
+def build_broker():
+    """설정에 따라 브로커 생성 — ws_fanout_enabled=False 면 프로세스 안에서만 (단일 워커)."""
+    from ..core.config import settings
+
+    if settings.ws_fanout_enabled:
+        return RedisBroker(settings.redis_url, settings.ws_fanout_channel)
+    return InMemoryBroker()
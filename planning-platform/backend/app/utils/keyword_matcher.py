@@ -0,0 +1,108 @@
+"""다중 키워드 매처.
+
+여러 키워드 사전(family → tag → keywords)을 하나의 어휘로 컴파일해 두고,
+메시지 묶음을 한 번만 훑어 모든 family 의 매칭 결과를 만든다.
+결과는 `kw in text` 를 사전마다 반복하던 방식과 같다 (부분 문자열 포함 여부).
+
+- 여러 사전에 겹치는 키워드(예: "다이어트", "영양제")는 한 번만 검사
+- 첫 글자 색인: 텍스트에 나온 글자 집합과 교집합인 키워드만 부분 문자열 검사
+- 메시지별 매칭은 전체 텍스트에서 나온 키워드만 다시 확인
+
+순수 파이썬 Aho-Corasick 은 문자마다 인터프리터 루프를 돌아
+이 정도 어휘(수백 개)에서는 C 로 구현된 `str.__contains__` 보다 느리다
+(scripts/tagging_benchmark.py 로 측정). 그래서 어휘 1회 스캔 방식을 쓴다.
+"""
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+
+class ScanResult:
+    """KeywordMatcher.scan 결과.
+
+    - texts: 입력 조각 (scan 에 넘긴 순서 그대로)
+    - counts: 이어붙인 전체 텍스트에서 키워드별 출현 횟수 (str.count 기준)
+    조각별 매칭(segment_tags)은 전체 텍스트에서 나온 키워드만 다시 확인하므로
+    구분자를 가로지르는 매칭은 전체 텍스트에만 반영된다.
+    """
+
+    __slots__ = ("_matcher", "texts", "counts")
+
+    def __init__(self, matcher: "KeywordMatcher", texts: List[str], counts: Dict[str, int]):
+        self._matcher = matcher
+        self.texts = texts
+        self.counts = counts
+
+    def __contains__(self, keyword: str) -> bool:
+        return keyword in self.counts
+
+    def tags(self, family: str) -> Dict[str, int]:
+        """family 의 tag → 출현 횟수 (사전 순서 유지, 매칭된 tag 만)."""
+        owners = self._matcher.owners[family]
+        found: Dict[str, int] = {}
+        for kw, n in self.counts.items():
+            for tag in owners.get(kw, ()):
+                found[tag] = found.get(tag, 0) + n
+        return {tag: found[tag] for tag in self._matcher.families[family] if tag in found}
+
+    def distinct(self, family: str, tag: Optional[str] = None) -> int:
+        """매칭된 서로 다른 키워드 수 (tag 미지정 시 family 전체 tag 합산)."""
+        groups = self._matcher.families[family]
+        tags = [tag] if tag is not None else list(groups)
+        return sum(1 for t in tags for kw in groups[t] if kw in self.counts)
+
+    def keywords(self, family: str) -> Set[str]:
+        """family 에서 매칭된 키워드 집합."""
+        return {
+            kw for keywords in self._matcher.families[family].values()
+            for kw in keywords if kw in self.counts
+        }
+
+    def segment_tags(self, index: int, family: str) -> List[str]:
+        """index 번째 조각에서 매칭된 family 의 tag 목록 (사전 순서 유지)."""
+        owners = self._matcher.owners[family]
+        text = self.texts[index]
+        found: Set[str] = set()
+        for kw in self.counts:
+            tags = owners.get(kw)
+            if tags and kw in text:
+                found.update(tags)
+        if not found:
+            return []
+        return [tag for tag in self._matcher.families[family] if tag in found]
+
+
+class KeywordMatcher:
+    """family → tag → keywords 사전 전체를 한 번에 컴파일한 매처."""
+
+    def __init__(self, families: Mapping[str, Mapping[str, Iterable[str]]]):
+        self.families: Dict[str, Dict[str, Tuple[str, ...]]] = {
+            family: {tag: tuple(dict.fromkeys(kws)) for tag, kws in groups.items()}
+            for family, groups in families.items()
+        }
+        # family 별 키워드 → 소속 tag 역색인
+        self.owners: Dict[str, Dict[str, Tuple[str, ...]]] = {}
+        for family, groups in self.families.items():
+            owners: Dict[str, Tuple[str, ...]] = {}
+            for tag, kws in groups.items():
+                for kw in kws:
+                    owners[kw] = owners.get(kw, ()) + (tag,)
+            self.owners[family] = owners
+        # 같은 키워드가 여러 family/tag 에 있어도 한 번만 검사
+        self.vocabulary: Tuple[str, ...] = tuple(sorted({
+            kw for groups in self.families.values()
+            for kws in groups.values() for kw in kws if kw
+        }))
+        self._by_first: Dict[str, Tuple[str, ...]] = {}
+        for kw in self.vocabulary:
+            self._by_first[kw[0]] = self._by_first.get(kw[0], ()) + (kw,)
+        self._first_chars = frozenset(self._by_first)
+
+    def scan(self, texts: Sequence[str], sep: str = " ") -> ScanResult:
+        """texts 를 sep 로 이어붙인 텍스트를 한 번 훑어 ScanResult 반환."""
+        texts = list(texts)
+        joined = sep.join(texts)
+        counts: Dict[str, int] = {}
+        for ch in self._first_chars.intersection(joined):
+            for kw in self._by_first[ch]:
+                if kw in joined:
+                    counts[kw] = joined.count(kw)
+        return ScanResult(self, texts, counts)
@@ -0,0 +1,107 @@
+"""
+프로세스 로컬 TTL 메모리 캐시 — stale-while-revalidate, 같은 키 동시 조회 합치기, 용량/수명 상한.
+
+es_service(ES 집계), patient_context(검진설계 환자 조회 묶음) 등 서비스 계층에서 공용으로 쓴다.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+
+class TTLCache:
+    """키별 (값, 조회 시각) 메모리 캐시 — stale-while-revalidate + 동시 조회 합치기
+
+    max_age: put 시 이보다 오래된 항목 정리 (stale_ttl 을 쓰면 그 이상으로)
+    max_entries: 초과 시 가장 오래 안 쓴 항목부터 버림 (LRU)
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, max_age: Optional[float] = None):
+        self._entries: "OrderedDict[Any, Tuple[Any, float]]" = OrderedDict()
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._inflight: Dict[Any, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+
+    def peek(self, key: Any, ttl: float) -> Tuple[bool, Any]:
+        """(신선 여부, 값) — ttl 안쪽이면 (True, 값), 아니면 (False, None)"""
+        entry = self._entries.get(key)
+        if entry and time.monotonic() - entry[1] < ttl:
+            self._entries.move_to_end(key)
+            return True, entry[0]
+        return False, None
+
+    def put(self, key: Any, value: Any) -> None:
+        self._entries[key] = (value, time.monotonic())
+        self._entries.move_to_end(key)
+        self._prune()
+
+    def _prune(self) -> None:
+        if self.max_age is not None:
+            cutoff = time.monotonic() - self.max_age
+            for key in [k for k, (_, at) in self._entries.items() if at < cutoff]:
+                self._entries.pop(key, None)
+        if self.max_entries is not None:
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Any = None) -> None:
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[Any], bool]) -> None:
+        for key in [k for k in self._entries if predicate(k)]:
+            self._entries.pop(key, None)
+
+    async def get_or_load(
+        self,
+        key: Any,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: float,
+        stale_ttl: Optional[float] = None,
+    ) -> Any:
+        """신선하면 캐시, stale_ttl 안쪽이면 이전 값 반환 + 백그라운드 갱신, 그 외엔 조회 후 저장.
+
+        loader 가 예외를 내면 캐시하지 않는다 — 기다리던 호출자에게는 예외를 올리고,
+        백그라운드 갱신 실패면 다음 조회 때 다시 시도한다.
+        """
+        entry = self._entries.get(key)
+        if entry:
+            age = time.monotonic() - entry[1]
+            if age < ttl:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry[0]
+            if stale_ttl is not None and age < stale_ttl:
+                self.stale_hits += 1
+                self._entries.move_to_end(key)
+                if key not in self._inflight:
+                    self._spawn(key, loader)
+                return entry[0]
+        self.misses += 1
+        if key not in self._inflight:
+            self._spawn(key, loader)
+        return await asyncio.shield(self._inflight[key])
+
+    def _spawn(self, key: Any, loader: Callable[[], Awaitable[Any]]) -> None:
+        future = asyncio.ensure_future(self._load(key, loader))
+        self._inflight[key] = future
+        # 백그라운드 갱신 실패가 "Task exception was never retrieved" 로 남지 않도록 소비
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+
+    async def _load(self, key: Any, loader: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            value = await loader()
+            self.put(key, value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits,
+                "stale_hits": self.stale_hits, "misses": self.misses}
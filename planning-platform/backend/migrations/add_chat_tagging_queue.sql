@@ -0,0 +1,35 @@
+-- 채팅 세션 태깅 작업 큐
+-- retag_all_sessions 순차 처리(2건마다 1초 sleep, LIMIT 20)를 대체하는 영속 큐.
+-- 워커는 FOR UPDATE SKIP LOCKED 로 pending 작업을 가져가므로 프로세스 여러 개가 동시에 돌아도 안전.
+-- (session_id, partner_id) 당 1행 — pending/running 중 재적재는 무시, done/failed 는 pending 으로 재사용.
+
+CREATE TABLE IF NOT EXISTS welno.tb_chat_tagging_queue (
+    id BIGSERIAL PRIMARY KEY,
+    session_id VARCHAR(255) NOT NULL,
+    partner_id VARCHAR(50) NOT NULL,
+    status VARCHAR(16) NOT NULL DEFAULT 'pending',   -- pending, running, done, failed
+    source VARCHAR(32) NOT NULL DEFAULT 'retag',     -- retag, recovery, manual
+    attempts SMALLINT NOT NULL DEFAULT 0,
+    next_run_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    locked_at TIMESTAMPTZ,
+    locked_by VARCHAR(64),
+    last_error VARCHAR(500),
+    duration_ms INTEGER,
+    enqueued_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    finished_at TIMESTAMPTZ,
+    CONSTRAINT uq_chat_tagging_queue_session UNIQUE (session_id, partner_id)
+);
+
+-- 워커 claim: pending 중 실행 시각 도래한 것만
+CREATE INDEX IF NOT EXISTS idx_chat_tagging_queue_pending
+    ON welno.tb_chat_tagging_queue (next_run_at, id) WHERE status = 'pending';
+-- 멈춘 running 회수
+CREATE INDEX IF NOT EXISTS idx_chat_tagging_queue_running
+    ON welno.tb_chat_tagging_queue (locked_at) WHERE status = 'running';
+-- 처리량 지표 (최근 N분 완료 건수)
+CREATE INDEX IF NOT EXISTS idx_chat_tagging_queue_finished
+    ON welno.tb_chat_tagging_queue (finished_at DESC) WHERE finished_at IS NOT NULL;
+
+COMMENT ON TABLE welno.tb_chat_tagging_queue IS '채팅 세션 LLM 태깅 작업 큐 (services/tagging_queue.py)';
+COMMENT ON COLUMN welno.tb_chat_tagging_queue.attempts IS '시도 횟수 — WELNO_TAGGING_QUEUE_MAX_ATTEMPTS 도달 시 failed';
+COMMENT ON COLUMN welno.tb_chat_tagging_queue.next_run_at IS '재시도 백오프 후 다음 실행 가능 시각';
@@ -0,0 +1,29 @@
+-- 건기식 GPT 스토리 카탈로그
+-- report_engine/nutrition_service 가 리포트마다 최대 11회 순차로 부르던 GPT-4o-mini 스토리텔링을
+-- 영양소 × 검진 수치 구간(SBP/FBG/ALT 10 단위, BMI 반올림) 키로 영구 보관한다.
+--
+-- 키: md5("nutrition_story:{영양소}:{sbp_bin}:{fbg_bin}:{bmi_bin}:{alt_bin}")
+--     (주의 항목은 영양소 앞에 "caution_") — nutrition_service._story_cache_key 와 동일
+-- 스토리는 환자 이름 없이 "고객님" 으로 생성, 응답 시 이름으로 치환.
+--
+-- 유지: 리포트 생성 중 카탈로그 미스는 GPT 로 동시 생성 후 추가 (ON CONFLICT DO NOTHING).
+--       일괄 채우기는 scripts/database/generate_nutrition_story_catalog.py
+--       프롬프트 변경 시 TRUNCATE 후 재생성.
+
+CREATE TABLE IF NOT EXISTS welno.tb_nutrition_story_catalog (
+    cache_key VARCHAR(32) PRIMARY KEY,
+    kind VARCHAR(10) NOT NULL,              -- recommend / caution
+    nutrient VARCHAR(100) NOT NULL,
+    sbp_bin SMALLINT NOT NULL,
+    fbg_bin SMALLINT NOT NULL,
+    bmi_bin SMALLINT NOT NULL,
+    alt_bin SMALLINT NOT NULL,
+    story TEXT NOT NULL,
+    model VARCHAR(50) NOT NULL DEFAULT 'gpt-4o-mini',
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_nutrition_story_catalog_nutrient
+    ON welno.tb_nutrition_story_catalog (kind, nutrient);
+
+COMMENT ON TABLE welno.tb_nutrition_story_catalog IS '건기식 GPT 스토리 카탈로그 (영양소 × 검진 수치 구간, report_engine.nutrition_service)';
@@ -0,0 +1,223 @@
+-- 파트너오피스 환자 통합 목록 요약 테이블
+-- partner_office.patient_list 가 요청마다 하던 chat_log GROUP BY / 이름 DISTINCT ON / 서베이 UNION /
+-- Python merge 를 대신한다. 쓰기 시점 트리거로 유지하고, 목록은 키셋 페이지네이션으로 조회.
+--
+-- 행 단위: (web_app_key, hospital_id)
+--   hospital_id = 실제 병원 ID → 병원 필터 목록 (해당 병원 상담/서베이만 집계)
+--   hospital_id = ''          → 전체 목록 (모든 병원 합산)
+-- 이름(chat_name/survey_name/es_name)은 병원 무관 — 같은 web_app_key 의 모든 행에 동기화.
+-- journey_count/es_name 은 ES 값 — 목록 조회 시 오래된 행만 es_service 로 갱신 (journey_refreshed_at).
+--
+-- 적용: 테이블/트리거 생성 후 마지막의 rebuild 호출로 기존 데이터 적재.
+--       삭제/수동 보정 후에도 SELECT welno.rebuild_partner_patient_summary(); 로 다시 맞출 수 있음.
+
+CREATE TABLE IF NOT EXISTS welno.tb_partner_patient_summary (
+    web_app_key VARCHAR(200) NOT NULL,
+    hospital_id VARCHAR(255) NOT NULL DEFAULT '',
+    hospital_name VARCHAR(255),
+    chat_name VARCHAR(100),
+    survey_name VARCHAR(100),
+    es_name VARCHAR(100),
+    chat_count INTEGER NOT NULL DEFAULT 0,
+    last_chat TIMESTAMPTZ,
+    survey_count INTEGER NOT NULL DEFAULT 0,
+    last_survey TIMESTAMPTZ,
+    journey_count INTEGER NOT NULL DEFAULT 0,
+    journey_refreshed_at TIMESTAMPTZ,
+    -- 이름 우선순위: chat_log → survey respondent_name → ES
+    patient_name VARCHAR(100) GENERATED ALWAYS AS (
+        COALESCE(NULLIF(chat_name, ''), NULLIF(survey_name, ''), NULLIF(es_name, ''), '')
+    ) STORED,
+    last_activity TIMESTAMPTZ GENERATED ALWAYS AS (GREATEST(last_chat, last_survey)) STORED,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (web_app_key, hospital_id)
+);
+
+-- 키셋 페이지네이션 정렬별 인덱스 (hospital_id 고정 → (정렬값, web_app_key))
+CREATE INDEX IF NOT EXISTS idx_patient_summary_activity
+    ON welno.tb_partner_patient_summary (hospital_id, last_activity DESC, web_app_key DESC);
+CREATE INDEX IF NOT EXISTS idx_patient_summary_chat
+    ON welno.tb_partner_patient_summary (hospital_id, chat_count DESC, web_app_key DESC);
+CREATE INDEX IF NOT EXISTS idx_patient_summary_survey
+    ON welno.tb_partner_patient_summary (hospital_id, survey_count DESC, web_app_key DESC);
+CREATE INDEX IF NOT EXISTS idx_patient_summary_journey
+    ON welno.tb_partner_patient_summary (hospital_id, journey_count DESC, web_app_key DESC);
+CREATE INDEX IF NOT EXISTS idx_patient_summary_name
+    ON welno.tb_partner_patient_summary (hospital_id, patient_name, web_app_key);
+
+COMMENT ON TABLE welno.tb_partner_patient_summary IS '파트너오피스 환자 목록 요약 (트리거 유지, services/patient_summary.py)';
+COMMENT ON COLUMN welno.tb_partner_patient_summary.hospital_id IS '빈 문자열 = 전체 병원 합산 행';
+COMMENT ON COLUMN welno.tb_partner_patient_summary.journey_refreshed_at IS 'ES 여정 건수 마지막 갱신 시각 (NULL = 미조회)';
+
+
+-- 상담/서베이 1건 반영 — 병원 행 + 전체('') 행 upsert, 이름은 같은 web_app_key 전 행에 동기화
+CREATE OR REPLACE FUNCTION welno.touch_partner_patient_summary(
+    p_key TEXT, p_hospital TEXT, p_chat INTEGER, p_survey INTEGER, p_at TIMESTAMPTZ,
+    p_chat_name TEXT, p_survey_name TEXT
+) RETURNS VOID AS $$
+DECLARE
+    v_hospital_name TEXT;
+    v_hid TEXT;
+BEGIN
+    IF p_key IS NULL OR p_key = '' THEN
+        RETURN;
+    END IF;
+    SELECT hospital_name INTO v_hospital_name
+    FROM welno.tb_hospital_rag_config
+    WHERE hospital_id = p_hospital AND is_active = true
+    LIMIT 1;
+
+    FOREACH v_hid IN ARRAY ARRAY(SELECT DISTINCT h FROM unnest(ARRAY[COALESCE(p_hospital, ''), '']) h) LOOP
+        INSERT INTO welno.tb_partner_patient_summary AS s
+            (web_app_key, hospital_id, hospital_name, chat_count, last_chat, survey_count, last_survey)
+        VALUES (
+            p_key, v_hid, v_hospital_name,
+            p_chat, CASE WHEN p_chat > 0 THEN p_at END,
+            p_survey, CASE WHEN p_survey > 0 THEN p_at END
+        )
+        ON CONFLICT (web_app_key, hospital_id) DO UPDATE SET
+            chat_count = s.chat_count + EXCLUDED.chat_count,
+            last_chat = GREATEST(s.last_chat, EXCLUDED.last_chat),
+            survey_count = s.survey_count + EXCLUDED.survey_count,
+            last_survey = GREATEST(s.last_survey, EXCLUDED.last_survey),
+            hospital_name = COALESCE(NULLIF(s.hospital_name, ''), EXCLUDED.hospital_name),
+            updated_at = NOW();
+    END LOOP;
+
+    UPDATE welno.tb_partner_patient_summary s SET
+        chat_name = COALESCE(NULLIF(p_chat_name, ''), n.chat_name),
+        survey_name = COALESCE(NULLIF(p_survey_name, ''), n.survey_name),
+        es_name = n.es_name
+    FROM (
+        SELECT MAX(chat_name) AS chat_name, MAX(survey_name) AS survey_name, MAX(es_name) AS es_name
+        FROM welno.tb_partner_patient_summary
+        WHERE web_app_key = p_key
+    ) n
+    WHERE s.web_app_key = p_key;
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION welno.trg_patient_summary_chat_log()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM welno.touch_partner_patient_summary(
+        NEW.user_uuid, NEW.hospital_id, 1, 0, NEW.created_at,
+        COALESCE(NEW.initial_data->'patient_info'->>'name', NEW.client_info->>'patient_name', ''),
+        NULL
+    );
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION welno.trg_patient_summary_survey()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM welno.touch_partner_patient_summary(
+        NEW.respondent_uuid, NEW.hospital_id, 0, 1, NEW.created_at, NULL, NEW.respondent_name
+    );
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_patient_summary_chat_log ON welno.tb_partner_rag_chat_log;
+CREATE TRIGGER trg_patient_summary_chat_log
+    AFTER INSERT ON welno.tb_partner_rag_chat_log
+    FOR EACH ROW EXECUTE FUNCTION welno.trg_patient_summary_chat_log();
+
+DROP TRIGGER IF EXISTS trg_patient_summary_survey ON welno.tb_hospital_survey_responses;
+CREATE TRIGGER trg_patient_summary_survey
+    AFTER INSERT ON welno.tb_hospital_survey_responses
+    FOR EACH ROW EXECUTE FUNCTION welno.trg_patient_summary_survey();
+
+DROP TRIGGER IF EXISTS trg_patient_summary_survey_dynamic ON welno.tb_survey_responses_dynamic;
+CREATE TRIGGER trg_patient_summary_survey_dynamic
+    AFTER INSERT ON welno.tb_survey_responses_dynamic
+    FOR EACH ROW EXECUTE FUNCTION welno.trg_patient_summary_survey();
+
+
+-- 전체 재적재 — TRUNCATE 가 진행 중인 트리거 트랜잭션 커밋을 기다린 뒤 집계하므로 중복/누락 없음.
+-- ES 값(journey_count/es_name)은 비워지고 다음 목록 조회 때 다시 채워진다.
+CREATE OR REPLACE FUNCTION welno.rebuild_partner_patient_summary()
+RETURNS BIGINT AS $$
+DECLARE
+    v_rows BIGINT;
+BEGIN
+    TRUNCATE welno.tb_partner_patient_summary;
+
+    WITH chat AS (
+        SELECT user_uuid AS web_app_key, hospital_id, COUNT(*) AS cnt, MAX(created_at) AS last_at
+        FROM welno.tb_partner_rag_chat_log
+        WHERE user_uuid IS NOT NULL AND user_uuid <> ''
+        GROUP BY user_uuid, hospital_id
+    ), survey AS (
+        SELECT respondent_uuid AS web_app_key, hospital_id, SUM(cnt) AS cnt, MAX(last_at) AS last_at
+        FROM (
+            SELECT respondent_uuid, hospital_id, COUNT(*) AS cnt, MAX(created_at) AS last_at
+            FROM welno.tb_hospital_survey_responses
+            WHERE respondent_uuid IS NOT NULL AND respondent_uuid <> ''
+            GROUP BY respondent_uuid, hospital_id
+          UNION ALL
+            SELECT respondent_uuid, hospital_id, COUNT(*), MAX(created_at)
+            FROM welno.tb_survey_responses_dynamic
+            WHERE respondent_uuid IS NOT NULL AND respondent_uuid <> ''
+            GROUP BY respondent_uuid, hospital_id
+        ) u
+        GROUP BY respondent_uuid, hospital_id
+    ), per_hospital AS (
+        SELECT COALESCE(c.web_app_key, s.web_app_key) AS web_app_key,
+               COALESCE(c.hospital_id, s.hospital_id) AS hospital_id,
+               COALESCE(c.cnt, 0) AS chat_count, c.last_at AS last_chat,
+               COALESCE(s.cnt, 0) AS survey_count, s.last_at AS last_survey
+        FROM chat c
+        FULL JOIN survey s ON s.web_app_key = c.web_app_key AND s.hospital_id = c.hospital_id
+    ), chat_names AS (
+        SELECT DISTINCT ON (user_uuid) user_uuid AS web_app_key,
+               COALESCE(initial_data->'patient_info'->>'name', client_info->>'patient_name') AS name
+        FROM welno.tb_partner_rag_chat_log
+        WHERE COALESCE(initial_data->'patient_info'->>'name', client_info->>'patient_name', '') <> ''
+        ORDER BY user_uuid, created_at DESC
+    ), survey_names AS (
+        SELECT DISTINCT ON (respondent_uuid) respondent_uuid AS web_app_key, respondent_name AS name
+        FROM (
+            SELECT respondent_uuid, respondent_name, created_at FROM welno.tb_hospital_survey_responses
+            UNION ALL
+            SELECT respondent_uuid, respondent_name, created_at FROM welno.tb_survey_responses_dynamic
+        ) u
+        WHERE respondent_name IS NOT NULL AND respondent_name <> ''
+        ORDER BY respondent_uuid, created_at DESC
+    ), summary_rows AS (
+        SELECT web_app_key, hospital_id, chat_count, last_chat, survey_count, last_survey
+        FROM per_hospital
+        WHERE hospital_id <> ''
+        UNION ALL
+        SELECT web_app_key, '', SUM(chat_count), MAX(last_chat), SUM(survey_count), MAX(last_survey)
+        FROM per_hospital
+        GROUP BY web_app_key
+    )
+    INSERT INTO welno.tb_partner_patient_summary
+        (web_app_key, hospital_id, hospital_name, chat_name, survey_name,
+         chat_count, last_chat, survey_count, last_survey)
+    SELECT r.web_app_key, r.hospital_id,
+           CASE WHEN r.hospital_id = '' THEN (
+               SELECT MAX(h2.hospital_name)
+               FROM per_hospital p2
+               JOIN welno.tb_hospital_rag_config h2 ON h2.hospital_id = p2.hospital_id AND h2.is_active = true
+               WHERE p2.web_app_key = r.web_app_key
+           ) ELSE h.hospital_name END,
+           cn.name, sn.name,
+           r.chat_count, r.last_chat, r.survey_count, r.last_survey
+    FROM summary_rows r
+    LEFT JOIN LATERAL (
+        SELECT hospital_name FROM welno.tb_hospital_rag_config
+        WHERE hospital_id = r.hospital_id AND is_active = true LIMIT 1
+    ) h ON true
+    LEFT JOIN chat_names cn ON cn.web_app_key = r.web_app_key
+    LEFT JOIN survey_names sn ON sn.web_app_key = r.web_app_key;
+
+    GET DIAGNOSTICS v_rows = ROW_COUNT;
+    RETURN v_rows;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT welno.rebuild_partner_patient_summary();
@@ -0,0 +1,153 @@
+-- 재방문 후보 인덱스 테이블
+-- partner_office.revisit_candidates 가 요청마다 하던 tb_chat_session_tags × tb_partner_rag_chat_log JOIN,
+-- client_info/initial_data 파싱, prospect/engagement 정렬을 대신한다.
+--
+-- 행 단위: 후보 세션 1건 (follow_up_needed OR consultation_requested, seed_ 세션 제외)
+--   정렬 키(sort_score)와 목록에 필요한 좁은 projection 만 보관.
+--   무거운 상세(추천 메시지/요약/상담사 추천/우려사항/생활습관 태그/검진 수치)는
+--   /revisit-candidates/{session_id}/detail 에서 원본 테이블로 지연 조회.
+--
+-- 유지: 태그 저장(_save_tags_to_db)·상담 요청/상태 변경·대화 로그 추가(save_chat_log) 후
+--       SELECT welno.refresh_revisit_candidate(session_id) (후보 조건이 풀리면 행 삭제).
+--       전체 재적재는 SELECT welno.rebuild_revisit_candidate_index(); — main 에서 주기 실행
+--       (WELNO_REVISIT_INDEX_REBUILD_INTERVAL_SEC, 파트너 유형 변경 등 건별 갱신이 없는 변경 보정)
+
+CREATE TABLE IF NOT EXISTS welno.tb_revisit_candidate_index (
+    session_id VARCHAR(255) NOT NULL,
+    partner_id VARCHAR(50) NOT NULL,
+    hospital_id VARCHAR(255) NOT NULL,
+    last_chat_at TIMESTAMPTZ NOT NULL,
+    follow_up_needed BOOLEAN NOT NULL DEFAULT false,
+    consultation_requested BOOLEAN NOT NULL DEFAULT false,
+    partner_type VARCHAR(30) NOT NULL DEFAULT 'healthcare',
+    -- 병원 파트너: hospital_prospect_score, 그 외: engagement_score
+    sort_score SMALLINT,
+    risk_level VARCHAR(20),
+    action_intent VARCHAR(30),
+    engagement_score SMALLINT,
+    buying_signal VARCHAR(20),
+    prospect_type VARCHAR(50),
+    hospital_prospect_score SMALLINT,
+    medical_urgency VARCHAR(30),
+    anxiety_level VARCHAR(30),
+    conversation_intent VARCHAR(50),
+    classification_confidence REAL,
+    consultation_type VARCHAR(30),
+    consultation_status VARCHAR(30),
+    consultation_consent_at TIMESTAMPTZ,
+    patient_name VARCHAR(100) NOT NULL DEFAULT '',
+    hospital_name VARCHAR(255) NOT NULL DEFAULT '',
+    user_phone VARCHAR(50) NOT NULL DEFAULT '',
+    checkup_date VARCHAR(30) NOT NULL DEFAULT '',
+    interest_tags JSONB NOT NULL DEFAULT '[]',
+    medical_tags JSONB NOT NULL DEFAULT '[]',
+    indexed_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (session_id, partner_id)
+);
+
+-- 목록: (병원) + 정렬 점수 범위 스캔, 기간은 last_chat_at 으로 걸러냄
+CREATE INDEX IF NOT EXISTS idx_revisit_index_hospital_score
+    ON welno.tb_revisit_candidate_index (hospital_id, sort_score DESC NULLS LAST, last_chat_at);
+CREATE INDEX IF NOT EXISTS idx_revisit_index_score
+    ON welno.tb_revisit_candidate_index (sort_score DESC NULLS LAST, last_chat_at);
+CREATE INDEX IF NOT EXISTS idx_revisit_index_requested
+    ON welno.tb_revisit_candidate_index (hospital_id, last_chat_at)
+    WHERE consultation_requested = true;
+
+COMMENT ON TABLE welno.tb_revisit_candidate_index IS '재방문 후보 인덱스 (태그 저장 시 갱신, partner_office.revisit_candidates)';
+COMMENT ON COLUMN welno.tb_revisit_candidate_index.sort_score IS 'partner_type=hospital → hospital_prospect_score, 그 외 engagement_score';
+
+
+-- 후보 projection — refresh/rebuild 공용
+CREATE OR REPLACE VIEW welno.v_revisit_candidate_source AS
+SELECT DISTINCT ON (t.session_id, t.partner_id)
+    t.session_id,
+    t.partner_id,
+    c.hospital_id,
+    COALESCE(c.updated_at, c.created_at) AS last_chat_at,
+    COALESCE(t.follow_up_needed, false) AS follow_up_needed,
+    COALESCE(t.consultation_requested, false) AS consultation_requested,
+    COALESCE(pc.config->>'partner_type', 'healthcare') AS partner_type,
+    CASE WHEN COALESCE(pc.config->>'partner_type', 'healthcare') = 'hospital'
+         THEN t.hospital_prospect_score ELSE t.engagement_score END AS sort_score,
+    t.risk_level,
+    t.action_intent,
+    t.engagement_score,
+    t.buying_signal,
+    t.prospect_type,
+    t.hospital_prospect_score,
+    t.medical_urgency,
+    t.anxiety_level,
+    t.conversation_intent,
+    t.classification_confidence,
+    t.consultation_type,
+    t.consultation_status,
+    t.consultation_consent_at,
+    COALESCE(NULLIF(c.client_info->>'patient_name', ''), c.client_info->>'name', '') AS patient_name,
+    COALESCE(c.client_info->>'hospital_name', '') AS hospital_name,
+    COALESCE(NULLIF(c.initial_data->'patient_info'->>'contact', ''), c.client_info->>'patient_contact', '') AS user_phone,
+    COALESCE(c.initial_data->'health_metrics'->>'checkup_date', '') AS checkup_date,
+    COALESCE(t.interest_tags, '[]'::jsonb) AS interest_tags,
+    COALESCE(t.medical_tags, '[]'::jsonb) AS medical_tags
+FROM welno.tb_chat_session_tags t
+JOIN welno.tb_partner_rag_chat_log c ON c.session_id = t.session_id
+LEFT JOIN welno.tb_partner_config pc
+    ON pc.partner_id = c.partner_id AND pc.is_active = true
+WHERE (t.follow_up_needed = true OR t.consultation_requested = true)
+  AND c.session_id NOT LIKE 'seed_%'
+ORDER BY t.session_id, t.partner_id, COALESCE(c.updated_at, c.created_at) DESC;
+
+
+-- 세션 1건 반영 (후보가 아니게 되면 삭제만 됨)
+CREATE OR REPLACE FUNCTION welno.refresh_revisit_candidate(p_session_id TEXT)
+RETURNS VOID AS $$
+BEGIN
+    DELETE FROM welno.tb_revisit_candidate_index WHERE session_id = p_session_id;
+    INSERT INTO welno.tb_revisit_candidate_index (
+        session_id, partner_id, hospital_id, last_chat_at, follow_up_needed, consultation_requested,
+        partner_type, sort_score, risk_level, action_intent, engagement_score, buying_signal,
+        prospect_type, hospital_prospect_score, medical_urgency, anxiety_level,
+        conversation_intent, classification_confidence,
+        consultation_type, consultation_status, consultation_consent_at,
+        patient_name, hospital_name, user_phone, checkup_date, interest_tags, medical_tags
+    )
+    SELECT session_id, partner_id, hospital_id, last_chat_at, follow_up_needed, consultation_requested,
+           partner_type, sort_score, risk_level, action_intent, engagement_score, buying_signal,
+           prospect_type, hospital_prospect_score, medical_urgency, anxiety_level,
+           conversation_intent, classification_confidence,
+           consultation_type, consultation_status, consultation_consent_at,
+           patient_name, hospital_name, user_phone, checkup_date, interest_tags, medical_tags
+    FROM welno.v_revisit_candidate_source
+    WHERE session_id = p_session_id;
+END;
+$$ LANGUAGE plpgsql;
+
+
+-- 전체 재적재 (최초 적용, 파트너 유형 변경 등 일괄 보정)
+CREATE OR REPLACE FUNCTION welno.rebuild_revisit_candidate_index()
+RETURNS INTEGER AS $$
+DECLARE
+    v_count INTEGER;
+BEGIN
+    TRUNCATE welno.tb_revisit_candidate_index;
+    INSERT INTO welno.tb_revisit_candidate_index (
+        session_id, partner_id, hospital_id, last_chat_at, follow_up_needed, consultation_requested,
+        partner_type, sort_score, risk_level, action_intent, engagement_score, buying_signal,
+        prospect_type, hospital_prospect_score, medical_urgency, anxiety_level,
+        conversation_intent, classification_confidence,
+        consultation_type, consultation_status, consultation_consent_at,
+        patient_name, hospital_name, user_phone, checkup_date, interest_tags, medical_tags
+    )
+    SELECT session_id, partner_id, hospital_id, last_chat_at, follow_up_needed, consultation_requested,
+           partner_type, sort_score, risk_level, action_intent, engagement_score, buying_signal,
+           prospect_type, hospital_prospect_score, medical_urgency, anxiety_level,
+           conversation_intent, classification_confidence,
+           consultation_type, consultation_status, consultation_consent_at,
+           patient_name, hospital_name, user_phone, checkup_date, interest_tags, medical_tags
+    FROM welno.v_revisit_candidate_source;
+    GET DIAGNOSTICS v_count = ROW_COUNT;
+    RETURN v_count;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT welno.rebuild_revisit_candidate_index();
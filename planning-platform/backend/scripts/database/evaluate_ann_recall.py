@@ -0,0 +1,144 @@
+"""
+ANN 인덱스 recall@k 평가 하네스
+
+flat(IndexFlatL2) 인덱스를 정답으로 두고 HNSW / IVF-PQ 등 후보 구성의
+recall@k, 쿼리 지연(mean/p95), 직렬화 크기, 빌드 시간을 비교한다.
+쿼리는 실제 채팅 로그(tb_partner_rag_chat_log의 user 메시지) 또는 텍스트 파일에서 읽는다.
+쿼리 임베딩은 병원 인덱스와 같은 EmbeddingCache를 사용하므로 재실행 시 API 호출이 없다.
+
+서버에서 실행:
+  cd /home/welno/workspace/PROJECT_WELNO_BEFE/planning-platform/backend
+  python3 -m scripts.database.evaluate_ann_recall --db-dir /data/vector_db/welno/faiss_db --limit 500
+  python3 -m scripts.database.evaluate_ann_recall --queries queries.txt --k 10 \\
+      --spec hnsw:none --spec hnsw:fp16 --spec ivfpq:pq --write-sidecar hnsw:fp16
+"""
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import List
+
+# 프로젝트 루트를 path에 추가
+backend_dir = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+# 환경변수 로드
+from dotenv import load_dotenv
+for env_file in [".env.local", "config.env", ".env"]:
+    env_path = backend_dir / env_file
+    if env_path.exists():
+        load_dotenv(env_path)
+        break
+
+EMBEDDING_MODEL = "text-embedding-ada-002"
+DEFAULT_DB_DIR = "/data/vector_db/welno/faiss_db"
+EMBEDDING_CACHE_PATH = Path(
+    os.environ.get("LOCAL_FAISS_BY_HOSPITAL", "/data/vector_db/welno/faiss_db_by_hospital")
+) / "_embedding_cache.sqlite3"
+
+
+def load_queries_from_logs(limit: int) -> List[str]:
+    """최근 채팅 로그의 사용자 질문 (중복 제거)"""
+    from app.core.database import db_manager
+
+    queries: List[str] = []
+    seen = set()
+    with db_manager.get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """SELECT conversation FROM welno.tb_partner_rag_chat_log
+                   WHERE conversation IS NOT NULL
+                   ORDER BY updated_at DESC LIMIT %s""",
+                (limit * 3,),
+            )
+            for (conversation,) in cur.fetchall():
+                if isinstance(conversation, str):
+                    conversation = json.loads(conversation)
+                for msg in conversation or []:
+                    text = (msg.get("content") or "").strip()
+                    if msg.get("role") == "user" and 2 <= len(text) <= 500 and text not in seen:
+                        seen.add(text)
+                        queries.append(text)
+                if len(queries) >= limit:
+                    return queries[:limit]
+    return queries
+
+
+def embed_queries(queries: List[str]):
+    import numpy as np
+    from openai import OpenAI
+    from app.services.rag_index.hospital_index import EmbeddingCache, text_sha256
+
+    cache = EmbeddingCache(EMBEDDING_CACHE_PATH, EMBEDDING_MODEL)
+    hashes = [text_sha256(q) for q in queries]
+    found = cache.get_many(hashes)
+    missing = [(h, q) for h, q in zip(hashes, queries) if h not in found]
+    if missing:
+        client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+        for i in range(0, len(missing), 512):
+            batch = missing[i:i + 512]
+            resp = client.embeddings.create(input=[q for _, q in batch], model=EMBEDDING_MODEL)
+            fresh = {h: item.embedding for (h, _), item in zip(batch, resp.data)}
+            cache.put_many(fresh)
+            found.update({h: np.asarray(v, dtype=np.float32) for h, v in fresh.items()})
+    return np.vstack([found[h] for h in hashes]).astype(np.float32)
+
+
+def parse_spec(text: str):
+    from app.services.rag_index.index_factory import spec_from_env
+
+    kind, _, compression = text.partition(":")
+    spec = spec_from_env()
+    spec.kind = kind
+    spec.compression = compression or ("pq" if kind == "ivfpq" else "none")
+    return spec
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ANN 인덱스 recall@k 평가")
+    parser.add_argument("--db-dir", default=DEFAULT_DB_DIR, help="faiss.index가 있는 디렉토리")
+    parser.add_argument("--queries", help="쿼리 텍스트 파일 (한 줄 1개). 없으면 채팅 로그 사용")
+    parser.add_argument("--limit", type=int, default=500, help="채팅 로그에서 읽을 쿼리 수")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--spec", action="append", default=[],
+                        help="kind:compression (예: hnsw:none, hnsw:fp16, ivfpq:pq). 반복 지정")
+    parser.add_argument("--write-sidecar", help="평가 후 이 구성으로 faiss.ann.index 생성")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+
+    import faiss
+    from app.services.rag_index.index_factory import evaluate_specs, write_ann_sidecar
+
+    db_dir = Path(args.db_dir)
+    flat = faiss.read_index(str(db_dir / "faiss.index"))
+    print(f"📦 flat 인덱스: {flat.ntotal}개 벡터 ({db_dir})")
+
+    if args.queries:
+        queries = [l.strip() for l in Path(args.queries).read_text(encoding="utf-8").splitlines() if l.strip()]
+    else:
+        queries = load_queries_from_logs(args.limit)
+    if not queries:
+        print("❌ 평가할 쿼리가 없습니다.")
+        return
+    print(f"🔎 쿼리 {len(queries)}개 임베딩 중...")
+    query_vecs = embed_queries(queries)
+
+    specs = [parse_spec(s) for s in (args.spec or ["hnsw:none", "hnsw:fp16", "ivfpq:pq"])]
+    report = evaluate_specs(flat, query_vecs, specs, k=args.k)
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print(f"\n{'구성':<24} {'recall@' + str(args.k):>10} {'mean(ms)':>10} {'p95(ms)':>10} {'MB':>10} {'build(s)':>10}")
+        for name, row in report.items():
+            print(f"{name:<24} {row['recall']:>10.4f} {row['latency_ms_mean']:>10.3f} "
+                  f"{row['latency_ms_p95']:>10.3f} {row['bytes'] / 1e6:>10.1f} {row['build_seconds']:>10.1f}")
+
+    if args.write_sidecar:
+        meta = write_ann_sidecar(db_dir, flat, parse_spec(args.write_sidecar))
+        print(f"\n💾 사이드카 생성: {meta['factory'] if meta else '(flat — 생성 안 함)'}")
+
+
+if __name__ == "__main__":
+    main()
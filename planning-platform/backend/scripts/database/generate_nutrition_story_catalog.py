@@ -0,0 +1,127 @@
+"""
+건기식 GPT 스토리 카탈로그 일괄 생성 (welno.tb_nutrition_story_catalog)
+
+검진 수치 구간(SBP/FBG/ALT 10 단위, BMI 1 단위) 격자를 훑으며 리포트와 같은 룰(recommend_candidates +
+카테고리 상한 상위 5종, caution_nutrients)로 실제 선택될 수 있는 (영양소 × 구간) 키를 모으고,
+카탈로그에 없는 키만 NutritionService.resolve_stories 로 동시 생성해 채운다.
+재실행 시 이미 있는 키는 건너뛰므로 중단 후 이어서 실행 가능.
+
+사전 조건: migrations/add_nutrition_story_catalog.sql 적용
+
+서버에서 실행:
+  cd /home/welno/workspace/PROJECT_WELNO_BEFE/planning-platform/backend
+  python3 -m scripts.database.generate_nutrition_story_catalog --dry-run
+  python3 -m scripts.database.generate_nutrition_story_catalog --concurrency 8 --limit 2000
+"""
+import argparse
+import asyncio
+import itertools
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+# 프로젝트 루트를 path에 추가
+backend_dir = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+# 환경변수 로드
+from dotenv import load_dotenv
+for env_file in [".env.local", "config.env", ".env"]:
+    env_path = backend_dir / env_file
+    if env_path.exists():
+        load_dotenv(env_path)
+        break
+
+# 구간 하한 범위 (start, stop, step) — 검진 수치 분포 밖 구간은 제외
+DEFAULT_SBP = (90, 200, 10)
+DEFAULT_FBG = (70, 200, 10)
+DEFAULT_BMI = (16, 41, 1)
+DEFAULT_ALT = (0, 150, 10)
+
+# 질환 판정 조합 — 없음 / 혈압·지질·심혈관 이상 / 장 이상 (후보 영양소가 달라지는 축)
+DISEASE_VARIANTS = [
+    {},
+    {"고혈압": {"result": "이상"}, "이상지질혈증": {"result": "이상"}, "심혈관질환": {"result": "이상"}},
+    {"위장관질환": {"result": "이상"}},
+]
+SEXES = ["M", "F"]
+BATCH_SIZE = 200
+
+
+def _parse_range(value: str) -> tuple:
+    start, stop, step = (int(v) for v in value.split(":"))
+    return start, stop, step
+
+
+def iter_story_requests(sbp_range, fbg_range, bmi_range, alt_range) -> Iterator:
+    """구간 격자 × 성별 × 질환 조합에서 도달 가능한 StoryRequest (중복 키 포함)."""
+    from app.services.report_engine.nutrition_rules import (
+        NUTRIENT_DESC,
+        caution_nutrients,
+        recommend_candidates,
+    )
+    from app.services.report_engine.nutrition_service import (
+        build_caution_story,
+        build_recommend_story,
+        select_candidates,
+    )
+
+    for sbp, fbg, bmi, alt in itertools.product(
+        range(*sbp_range), range(*fbg_range), range(*bmi_range), range(*alt_range),
+    ):
+        for sex, diseases in itertools.product(SEXES, DISEASE_VARIANTS):
+            patient = {"SBP": sbp, "FBG": fbg, "BMI": bmi, "ALT": alt, "creatinine": 1.0, "age": 50, "sex": sex}
+            for cand in select_candidates(recommend_candidates(patient, diseases)):
+                yield build_recommend_story(cand, patient, str(NUTRIENT_DESC.get(cand["name"], ""))[:100])
+            for c in caution_nutrients(patient, diseases):
+                yield build_caution_story(c, patient)
+
+
+async def main_async(args) -> None:
+    from app.services.report_engine import story_catalog
+    from app.services.report_engine.nutrition_service import NutritionService
+
+    started = time.time()
+    requests: Dict[str, object] = {}
+    for r in iter_story_requests(args.sbp, args.fbg, args.bmi, args.alt):
+        requests.setdefault(r.cache_key, r)
+    print(f"도달 가능한 키: {len(requests):,}개 ({time.time() - started:.1f}초)")
+
+    keys = list(requests)
+    existing = set()
+    for i in range(0, len(keys), 1000):
+        existing.update((await story_catalog.get_stories(keys[i:i + 1000])).keys())
+    todo: List = [r for k, r in requests.items() if k not in existing]
+    if args.limit:
+        todo = todo[:args.limit]
+    print(f"카탈로그 보유: {len(existing):,}개 → 생성 대상: {len(todo):,}개")
+    if args.dry_run or not todo:
+        return
+
+    svc = NutritionService()
+    totals = {"generated": 0, "fallbacks": 0}
+    for i in range(0, len(todo), BATCH_SIZE):
+        batch = todo[i:i + BATCH_SIZE]
+        _, stats = await svc.resolve_stories(batch, concurrency=args.concurrency)
+        totals["generated"] += stats["generated"]
+        totals["fallbacks"] += stats["fallbacks"]
+        print(f"  {i + len(batch):,}/{len(todo):,} — 생성 {totals['generated']:,}, 실패 {totals['fallbacks']:,}")
+
+    print(f"완료: {time.time() - started:.1f}초, 생성 {totals['generated']:,}개, 실패 {totals['fallbacks']:,}개")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="건기식 스토리 카탈로그 일괄 생성")
+    parser.add_argument("--sbp", type=_parse_range, default=DEFAULT_SBP, help="start:stop:step (기본 90:200:10)")
+    parser.add_argument("--fbg", type=_parse_range, default=DEFAULT_FBG, help="start:stop:step (기본 70:200:10)")
+    parser.add_argument("--bmi", type=_parse_range, default=DEFAULT_BMI, help="start:stop:step (기본 16:41:1)")
+    parser.add_argument("--alt", type=_parse_range, default=DEFAULT_ALT, help="start:stop:step (기본 0:150:10)")
+    parser.add_argument("--concurrency", type=int, default=8, help="GPT 동시 호출 수")
+    parser.add_argument("--limit", type=int, default=0, help="이번 실행 최대 생성 수 (0=전체)")
+    parser.add_argument("--dry-run", action="store_true", help="키 수만 계산")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
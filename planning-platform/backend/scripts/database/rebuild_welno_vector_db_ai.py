@@ -28,6 +28,10 @@ from llama_index.vector_stores.faiss import FaissVectorStore
 from pypdf import PdfReader
 import pandas as pd
 
+# ANN 인덱스 팩토리 (app.services.rag_index)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+from app.services.rag_index.index_factory import write_ann_sidecar, spec_from_env
+
 # 임베딩 상수 (rag_service와 동일)
 EMBEDDING_MODEL = "text-embedding-ada-002"
 EMBEDDING_DIMENSION = 1536
@@ -329,6 +333,17 @@ class WelnoAIVectorDBManager:
                 faiss.write_index(f_idx, str(self.db_dir / "faiss.index"))
             self.log("SAVE", f"배치 {batch_num} 저장 완료", "SAVE")
 
+        # 검색용 ANN 사이드카 (벡터 수에 따라 HNSW / IVF-PQ, 임계 미만이면 flat 유지)
+        if f_idx:
+            try:
+                meta = write_ann_sidecar(self.db_dir, f_idx, spec_from_env())
+                if meta:
+                    self.log("ANN", f"{meta['factory']} 사이드카 생성 ({meta['bytes'] / 1e6:.1f}MB)", "SAVE")
+                else:
+                    self.log("ANN", "벡터 수가 임계 미만 → flat 검색 유지", "INFO")
+            except Exception as e:
+                self.log("WARNING", f"ANN 사이드카 생성 실패 (flat 검색 유지): {e}", "WARNING")
+
         final_count = len(index.docstore.docs)
         self.log("COMPLETE", f"🎉 완료! 최종 노드: {final_count}개", "SUCCESS")
 
@@ -0,0 +1,11 @@
+"""
+오프라인 부하 테스트 (네트워크·LLM 과금 없이 CI/로컬에서 성능 회귀 확인)
+
+  - standins.py: in-memory Redis(RESP) 서버, 가짜 LLM(TTFT·토큰 지연), 가짜 임베딩, 합성 FAISS 인덱스
+  - server.py: 대역을 끼운 FastAPI 앱 기동 (로컬 PostgreSQL 전용)
+  - scenarios.py: chat / report / simulate / checkup_design / partner_office 트래픽 혼합 + 합성 환자 시드
+  - run.py: closed-loop 드라이버 — p50/p95/p99, 처리량, Server-Timing 분해, 기준선 비교
+
+실행:
+    cd backend && python3 -m scripts.load_test.run --spawn --seed-patients 50 --concurrency 20 --duration 60
+"""
@@ -0,0 +1,297 @@
+"""
+부하 테스트 드라이버 — 시나리오 혼합 트래픽을 걸고 p50/p95/p99·처리량 리포트
+
+closed-loop 가상 사용자(VU) concurrency 명이 duration 초 동안 요청 → 응답 → 다음 요청을 반복한다.
+앞 warmup 초는 집계에서 뺀다. 응답의 Server-Timing(db/redis/llm/faiss/app) 도 시나리오별로 평균 낸다.
+--baseline 리포트를 주면 p95 가 --max-regression 비율 넘게 나빠진 시나리오가 있을 때 exit 1 (CI 게이트).
+
+실행:
+    cd backend
+    # 대역 서버 자동 기동 (로컬 PostgreSQL 필요) + 합성 환자 50명 시드
+    python3 -m scripts.load_test.run --spawn --seed-patients 50 --concurrency 20 --duration 60 \\
+        --out /tmp/loadtest.json
+    # 이미 떠 있는 서버에 + 기준선 비교
+    python3 -m scripts.load_test.run --base-url http://127.0.0.1:8765 --uuids-file uuids.txt \\
+        --baseline loadtest_baseline.json --max-regression 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+backend_dir = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+import httpx
+
+from scripts.load_test.scenarios import (
+    RequestSpec,
+    ScenarioMix,
+    cleanup_patients,
+    load_uuids_file,
+    parse_mix,
+    partner_office_token,
+    seed_patients,
+)
+
+_TIMING_RE = re.compile(r"(\w+);dur=([\d.]+)")
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """최근접 순위 백분위 (값 없으면 None)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class Recorder:
+    """시나리오별 지연·상태코드·Server-Timing 집계."""
+
+    def __init__(self) -> None:
+        self.latencies: Dict[str, List[float]] = {}
+        self.ttfb: Dict[str, List[float]] = {}
+        self.statuses: Dict[str, Dict[str, int]] = {}
+        self.errors: Dict[str, int] = {}
+        self.timing: Dict[str, Dict[str, float]] = {}
+        self.started = time.perf_counter()
+        self.measure_from = self.started
+
+    def record(self, scenario: str, latency_ms: float, status: Any, ttfb_ms: Optional[float] = None,
+               server_timing: Optional[str] = None) -> None:
+        if time.perf_counter() < self.measure_from:
+            return
+        self.latencies.setdefault(scenario, []).append(latency_ms)
+        if ttfb_ms is not None:
+            self.ttfb.setdefault(scenario, []).append(ttfb_ms)
+        counts = self.statuses.setdefault(scenario, {})
+        counts[str(status)] = counts.get(str(status), 0) + 1
+        if not isinstance(status, int) or status >= 500:
+            self.errors[scenario] = self.errors.get(scenario, 0) + 1
+        if server_timing:
+            acc = self.timing.setdefault(scenario, {})
+            for cat, dur in _TIMING_RE.findall(server_timing):
+                acc[cat] = acc.get(cat, 0.0) + float(dur)
+
+    def summary(self, elapsed_sec: float) -> Dict[str, Any]:
+        scenarios = {}
+        for name, values in sorted(self.latencies.items()):
+            n = len(values)
+            item = {
+                "requests": n,
+                "throughput_rps": round(n / elapsed_sec, 2) if elapsed_sec > 0 else None,
+                "error_rate": round(self.errors.get(name, 0) / n, 4),
+                "status": self.statuses.get(name, {}),
+                "latency_ms": {f"p{p}": round(percentile(values, p), 1) for p in (50, 95, 99)},
+            }
+            item["latency_ms"]["max"] = round(max(values), 1)
+            if name in self.ttfb:
+                item["ttfb_ms"] = {f"p{p}": round(percentile(self.ttfb[name], p), 1) for p in (50, 95, 99)}
+            if name in self.timing:
+                item["server_timing_avg_ms"] = {cat: round(total / n, 1) for cat, total in
+                                                sorted(self.timing[name].items())}
+            scenarios[name] = item
+        total = sum(len(v) for v in self.latencies.values())
+        all_values = [v for values in self.latencies.values() for v in values]
+        return {
+            "elapsed_sec": round(elapsed_sec, 1),
+            "requests": total,
+            "throughput_rps": round(total / elapsed_sec, 2) if elapsed_sec > 0 else None,
+            "error_rate": round(sum(self.errors.values()) / total, 4) if total else None,
+            "latency_ms": {f"p{p}": round(percentile(all_values, p), 1) for p in (50, 95, 99)} if all_values else {},
+            "scenarios": scenarios,
+        }
+
+
+async def _send(client: httpx.AsyncClient, spec: RequestSpec, recorder: Recorder) -> None:
+    t0 = time.perf_counter()
+    try:
+        if spec.stream:
+            async with client.stream(spec.method, spec.path, json=spec.json, params=spec.params,
+                                     headers=spec.headers) as resp:
+                ttfb = None
+                async for _chunk in resp.aiter_bytes():
+                    if ttfb is None:
+                        ttfb = (time.perf_counter() - t0) * 1000
+                recorder.record(spec.scenario, (time.perf_counter() - t0) * 1000, resp.status_code, ttfb,
+                                resp.headers.get("server-timing"))
+            return
+        resp = await client.request(spec.method, spec.path, json=spec.json, params=spec.params,
+                                    headers=spec.headers)
+        recorder.record(spec.scenario, (time.perf_counter() - t0) * 1000, resp.status_code,
+                        server_timing=resp.headers.get("server-timing"))
+    except httpx.HTTPError as e:
+        recorder.record(spec.scenario, (time.perf_counter() - t0) * 1000, type(e).__name__)
+
+
+async def run_load(client: httpx.AsyncClient, mix: ScenarioMix, concurrency: int, duration_sec: float,
+                   warmup_sec: float = 0.0, seed: int = 0) -> Dict[str, Any]:
+    """closed-loop 부하 실행. client 는 base_url 이 잡힌 AsyncClient (테스트에선 ASGITransport)."""
+    recorder = Recorder()
+    recorder.measure_from = recorder.started + warmup_sec
+    deadline = recorder.started + warmup_sec + duration_sec
+
+    async def _vu(n: int) -> None:
+        rng = random.Random(seed * 1000 + n)
+        while time.perf_counter() < deadline:
+            await _send(client, mix.next(rng), recorder)
+
+    await asyncio.gather(*(_vu(i) for i in range(concurrency)))
+    report = recorder.summary(time.perf_counter() - recorder.measure_from)
+    report["config"] = {"concurrency": concurrency, "duration_sec": duration_sec, "warmup_sec": warmup_sec,
+                        "mix": mix.weights, "seed": seed}
+    return report
+
+
+def compare_to_baseline(report: Dict[str, Any], baseline: Dict[str, Any], max_regression: float) -> List[str]:
+    """baseline 대비 p95 가 (1 + max_regression) 배를 넘거나 에러율이 오른 시나리오 목록."""
+    regressions = []
+    for name, base in baseline.get("scenarios", {}).items():
+        cur = report.get("scenarios", {}).get(name)
+        if cur is None:
+            continue
+        base_p95, cur_p95 = base["latency_ms"]["p95"], cur["latency_ms"]["p95"]
+        if base_p95 and cur_p95 > base_p95 * (1 + max_regression):
+            regressions.append(f"{name}: p95 {base_p95}ms → {cur_p95}ms")
+        if cur["error_rate"] > base["error_rate"] + 0.01:
+            regressions.append(f"{name}: error_rate {base['error_rate']} → {cur['error_rate']}")
+    return regressions
+
+
+def _spawn_server(args: argparse.Namespace) -> subprocess.Popen:
+    cmd = [sys.executable, "-m", "scripts.load_test.server", "--port", str(args.port),
+           "--ttft-ms", str(args.ttft_ms), "--token-ms", str(args.token_ms), "--tokens", str(args.tokens),
+           "--faiss-docs", str(args.faiss_docs)]
+    if args.allow_remote_db:
+        cmd.append("--allow-remote-db")
+    return subprocess.Popen(cmd, cwd=backend_dir)
+
+
+async def _wait_ready(client: httpx.AsyncClient, proc: Optional[subprocess.Popen], timeout: float) -> None:
+    """/api/v1/health/ready 200 (워밍업 완료) 까지 대기."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc is not None and proc.poll() is not None:
+            raise SystemExit(f"❌ 서버 프로세스 종료 (exit {proc.returncode})")
+        try:
+            if (await client.get("/api/v1/health/ready")).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.5)
+    raise SystemExit(f"❌ {timeout}초 안에 서버 준비 안 됨")
+
+
+def _peak_rss_mb(pid: int) -> Optional[float]:
+    """리눅스 /proc 의 VmHWM (최대 RSS)."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        return None
+    return None
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    print(f"\n총 {report['requests']}건 / {report['elapsed_sec']}s → {report['throughput_rps']} rps, "
+          f"에러율 {report['error_rate']}")
+    print(f"{'시나리오':<16}{'건수':>7}{'rps':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'err':>8}")
+    for name, s in report["scenarios"].items():
+        lat = s["latency_ms"]
+        print(f"{name:<16}{s['requests']:>7}{s['throughput_rps']:>8}{lat['p50']:>9}{lat['p95']:>9}"
+              f"{lat['p99']:>9}{s['error_rate']:>8}")
+    if report.get("server_peak_rss_mb"):
+        print(f"서버 최대 RSS: {report['server_peak_rss_mb']} MB")
+
+
+async def main_async(args: argparse.Namespace) -> int:
+    proc = _spawn_server(args) if args.spawn else None
+    base_url = f"http://127.0.0.1:{args.port}" if args.spawn else args.base_url
+    seeded = False
+    try:
+        patients = []
+        if args.seed_patients:
+            patients = await seed_patients(args.seed_patients, seed=args.seed)
+            seeded = True
+        design_patients = load_uuids_file(args.uuids_file) if args.uuids_file else []
+        mix = ScenarioMix(patients or design_patients, design_patients=design_patients,
+                          weights=parse_mix(args.mix), office_token=partner_office_token())
+
+        limits = httpx.Limits(max_connections=args.concurrency * 2, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+            await _wait_ready(client, proc, args.ready_timeout)
+            print(f"✅ [부하테스트] {base_url} VU={args.concurrency} {args.duration}s (warmup {args.warmup}s) "
+                  f"mix={mix.weights}")
+            report = await run_load(client, mix, args.concurrency, args.duration, args.warmup, args.seed)
+        if proc is not None:
+            report["server_peak_rss_mb"] = _peak_rss_mb(proc.pid)
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(30)
+        if seeded and not args.keep_data:
+            await cleanup_patients()
+
+    _print_report(report)
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, ensure_ascii=False, indent=2))
+        print(f"리포트 저장: {args.out}")
+    if args.baseline:
+        regressions = compare_to_baseline(report, json.loads(Path(args.baseline).read_text()),
+                                          args.max_regression)
+        if regressions:
+            print("❌ 성능 회귀:\n  " + "\n  ".join(regressions))
+            return 1
+        print("✅ 기준선 대비 회귀 없음")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="WELNO 부하 테스트 드라이버")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--spawn", action="store_true", help="대역 서버(scripts.load_test.server) 자동 기동")
+    target.add_argument("--base-url", help="이미 떠 있는 서버 주소")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--warmup", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--mix", default=None, help="예: chat=4,report=3,simulate=2")
+    parser.add_argument("--seed-patients", type=int, default=0, help="합성 환자 N명 로컬 DB 시드 (종료 시 삭제)")
+    parser.add_argument("--keep-data", action="store_true", help="시드 데이터 유지")
+    parser.add_argument("--uuids-file", default=None, help="기존 환자 목록 (uuid,hospital_id) — 검진설계 시나리오용")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--ready-timeout", type=float, default=180.0)
+    parser.add_argument("--out", default=None, help="JSON 리포트 저장 경로")
+    parser.add_argument("--baseline", default=None, help="비교할 이전 JSON 리포트")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="허용 p95 악화 비율")
+    # --spawn 전달용 대역 설정
+    parser.add_argument("--ttft-ms", type=float, default=400.0)
+    parser.add_argument("--token-ms", type=float, default=15.0)
+    parser.add_argument("--tokens", type=int, default=120)
+    parser.add_argument("--faiss-docs", type=int, default=5000)
+    parser.add_argument("--allow-remote-db", action="store_true")
+    return parser
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    if args.seed_patients and not args.allow_remote_db:
+        from scripts.load_test.server import check_local_db
+        check_local_db()
+    sys.exit(asyncio.run(main_async(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""
+부하 테스트 트래픽 시나리오 + 합성 환자 시드
+
+시나리오 (가중치는 --mix chat=4,report=3,... 로 조정):
+  - chat: 웰노 RAG 채팅 스트리밍 (SSE) — TTFB 별도 기록
+  - report: mediArc 리포트 (progressive=true)
+  - simulate: 마일스톤 시뮬레이션 (bmi_target × time_horizon_months)
+  - checkup_design: 검진설계 생성 (welno_patients 실환자 필요 → --uuids-file)
+  - partner_office: 파트너오피스 대시보드 통계 (partner_office scope JWT 자체 발급)
+
+합성 환자는 welno.tb_partner_rag_chat_log 에 partner_id='loadtest' 로만 넣고 지운다 (리포트의 chat 소스 경로).
+"""
+
+import json
+import random
+import uuid as uuid_lib
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+LOADTEST_PARTNER_ID = "loadtest"
+LOADTEST_HOSPITAL_ID = "LOADTEST_HOSPITAL"
+
+DEFAULT_MIX: Dict[str, int] = {
+    "chat": 4,
+    "report": 3,
+    "simulate": 2,
+    "checkup_design": 1,
+    "partner_office": 1,
+}
+
+_CHAT_QUESTIONS = [
+    "혈압이 조금 높게 나왔는데 괜찮은 건가요?",
+    "공복혈당 105면 당뇨 전단계인가요?",
+    "콜레스테롤 낮추려면 뭘 먹어야 해요?",
+    "올해 추가로 받아야 할 검사가 있을까요?",
+    "간 수치가 높은데 술을 끊어야 하나요?",
+]
+
+
+@dataclass
+class RequestSpec:
+    """드라이버가 보낼 요청 하나."""
+
+    scenario: str
+    method: str
+    path: str
+    json: Optional[Dict[str, Any]] = None
+    params: Optional[Dict[str, Any]] = None
+    headers: Optional[Dict[str, str]] = None
+    stream: bool = False
+
+
+@dataclass
+class Patient:
+    uuid: str
+    hospital_id: str
+
+
+def synthetic_patient(rng: random.Random) -> Tuple[Patient, Dict[str, Any]]:
+    """합성 환자 + tb_partner_rag_chat_log.initial_data 형식 검진 수치."""
+    height = rng.uniform(155, 185)
+    weight = rng.uniform(50, 95)
+    birth = datetime(1950, 1, 1) + timedelta(days=rng.randint(0, 365 * 50))
+    initial_data = {
+        "health_metrics": {
+            "height": round(height, 1),
+            "weight": round(weight, 1),
+            "bmi": round(weight / (height / 100) ** 2, 1),
+            "systolic_bp": rng.randint(105, 160),
+            "diastolic_bp": rng.randint(65, 100),
+            "fasting_glucose": rng.randint(80, 140),
+            "total_cholesterol": rng.randint(150, 260),
+            "hdl_cholesterol": rng.randint(35, 75),
+            "ldl_cholesterol": rng.randint(70, 180),
+            "triglycerides": rng.randint(60, 300),
+            "sgot_ast": rng.randint(15, 50),
+            "sgpt_alt": rng.randint(10, 60),
+            "gamma_gtp": rng.randint(10, 90),
+            "creatinine": round(rng.uniform(0.6, 1.3), 2),
+            "hemoglobin": round(rng.uniform(11.5, 16.5), 1),
+            "waist": rng.randint(65, 100),
+            "checkup_date": (datetime.now() - timedelta(days=rng.randint(10, 300))).strftime("%Y-%m-%d"),
+        },
+        "patient_info": {
+            "name": f"부하테스트{rng.randint(1000, 9999)}",
+            "gender": rng.choice(["M", "F"]),
+            "birth_date": birth.strftime("%Y-%m-%d"),
+        },
+    }
+    patient = Patient(uuid=f"loadtest-{uuid_lib.UUID(int=rng.getrandbits(128))}", hospital_id=LOADTEST_HOSPITAL_ID)
+    return patient, initial_data
+
+
+async def seed_patients(count: int, seed: int = 0) -> List[Patient]:
+    """합성 환자 count 명을 로컬 DB 에 적재 (partner_id='loadtest')."""
+    from app.core.database import db_manager
+
+    rng = random.Random(seed)
+    patients = []
+    for _ in range(count):
+        patient, initial_data = synthetic_patient(rng)
+        await db_manager.execute_update(
+            """
+            INSERT INTO welno.tb_partner_rag_chat_log
+                (partner_id, hospital_id, user_uuid, session_id, initial_data)
+            VALUES (%s, %s, %s, %s, %s::jsonb)
+            ON CONFLICT (partner_id, session_id) DO UPDATE SET initial_data = EXCLUDED.initial_data
+            """,
+            (LOADTEST_PARTNER_ID, patient.hospital_id, patient.uuid, f"seed_{patient.uuid}",
+             json.dumps(initial_data, ensure_ascii=False)),
+        )
+        patients.append(patient)
+    return patients
+
+
+async def cleanup_patients() -> int:
+    """시드/부하로 생긴 loadtest 행 정리 (채팅 중 저장된 세션 로그 포함)."""
+    from app.core.database import db_manager
+
+    return await db_manager.execute_update(
+        """
+        DELETE FROM welno.tb_partner_rag_chat_log
+        WHERE partner_id = %s OR hospital_id = %s OR user_uuid LIKE 'loadtest-%%'
+        """,
+        (LOADTEST_PARTNER_ID, LOADTEST_HOSPITAL_ID),
+    )
+
+
+def load_uuids_file(path: str) -> List[Patient]:
+    """기존 로컬 환자 목록 (한 줄에 `uuid,hospital_id`) — 검진설계처럼 welno_patients 가 필요한 시나리오용."""
+    patients = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            uuid, _, hospital_id = line.partition(",")
+            patients.append(Patient(uuid=uuid.strip(), hospital_id=hospital_id.strip() or LOADTEST_HOSPITAL_ID))
+    return patients
+
+
+def partner_office_token(ttl_hours: int = 8) -> str:
+    """create_office_token 과 같은 형식의 super_admin JWT (로컬 secret_key 로 서명)."""
+    from jose import jwt
+
+    from app.core.config import settings
+
+    now = datetime.utcnow()
+    return jwt.encode({
+        "sub": "loadtest",
+        "user_id": 0,
+        "display_name": "loadtest",
+        "partner_id": None,
+        "permission_level": "super_admin",
+        "access_scope": None,
+        "scope": "partner_office",
+        "exp": now + timedelta(hours=ttl_hours),
+        "iat": now,
+        "type": "access",
+    }, settings.secret_key, algorithm=settings.jwt_algorithm)
+
+
+class ScenarioMix:
+    """가중치 기반 요청 생성기."""
+
+    def __init__(self, patients: List[Patient], design_patients: Optional[List[Patient]] = None,
+                 weights: Optional[Dict[str, int]] = None, office_token: Optional[str] = None,
+                 prefix: str = "/welno-api/v1") -> None:
+        if not patients:
+            raise ValueError("환자 목록이 비어 있음 (--seed-patients 또는 --uuids-file)")
+        self.patients = patients
+        self.design_patients = design_patients or []
+        self.prefix = prefix
+        self.office_token = office_token
+        weights = dict(DEFAULT_MIX if weights is None else weights)
+        if not self.design_patients:
+            weights.pop("checkup_design", None)  # 실환자 없으면 제외 (합성 uuid 는 welno_patients 에 없음)
+        if not self.office_token:
+            weights.pop("partner_office", None)
+        unknown = set(weights) - set(self._builders())
+        if unknown:
+            raise ValueError(f"알 수 없는 시나리오: {sorted(unknown)}")
+        self.weights = {k: v for k, v in weights.items() if v > 0}
+
+    def _builders(self) -> Dict[str, Callable[[random.Random], RequestSpec]]:
+        return {
+            "chat": self._chat,
+            "report": self._report,
+            "simulate": self._simulate,
+            "checkup_design": self._checkup_design,
+            "partner_office": self._partner_office,
+        }
+
+    def next(self, rng: random.Random) -> RequestSpec:
+        name = rng.choices(list(self.weights), weights=list(self.weights.values()))[0]
+        return self._builders()[name](rng)
+
+    def _chat(self, rng: random.Random) -> RequestSpec:
+        p = rng.choice(self.patients)
+        return RequestSpec(
+            "chat", "POST", f"{self.prefix}/welno-rag-chat/message",
+            json={"uuid": p.uuid, "hospital_id": p.hospital_id, "message": rng.choice(_CHAT_QUESTIONS),
+                  "session_id": f"welno_{p.uuid}_{p.hospital_id}_loadtest{rng.randint(0, 3)}"},
+            headers={"Referer": "https://welno.kindhabit.com/"},
+            stream=True,
+        )
+
+    def _report(self, rng: random.Random) -> RequestSpec:
+        p = rng.choice(self.patients)
+        return RequestSpec("report", "GET", f"{self.prefix}/partner-office/mediarc-report/{p.uuid}",
+                           params={"progressive": "true"})
+
+    def _simulate(self, rng: random.Random) -> RequestSpec:
+        p = rng.choice(self.patients)
+        return RequestSpec(
+            "simulate", "POST", f"{self.prefix}/partner-office/mediarc-report/{p.uuid}/simulate",
+            params={"hospital_id": p.hospital_id},
+            json={"bmi_target": rng.choice([21.0, 22.5, 24.0]), "time_horizon_months": rng.choice([0, 6, 12, 60])},
+        )
+
+    def _checkup_design(self, rng: random.Random) -> RequestSpec:
+        p = rng.choice(self.design_patients)
+        return RequestSpec("checkup_design", "POST", f"{self.prefix}/checkup-design/create",
+                           json={"uuid": p.uuid, "hospital_id": p.hospital_id})
+
+    def _partner_office(self, rng: random.Random) -> RequestSpec:
+        return RequestSpec("partner_office", "POST", f"{self.prefix}/partner-office/dashboard/stats",
+                           json={}, headers={"Authorization": f"Bearer {self.office_token}"})
+
+
+def parse_mix(text: Optional[str]) -> Optional[Dict[str, int]]:
+    """'chat=4,report=3' → {'chat': 4, 'report': 3}"""
+    if not text:
+        return None
+    out = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        out[name.strip()] = int(weight or 1)
+    return out
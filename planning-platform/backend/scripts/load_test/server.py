@@ -0,0 +1,109 @@
+"""
+부하 테스트용 앱 서버 — 로컬 대역을 끼운 상태로 FastAPI 앱 기동
+
+  - Redis: InMemoryRedisServer (REDIS_URL 환경변수를 앱 import 전에 설정)
+  - LLM: FakeLLM (Gemini / OpenAI 호출 대체, 과금·네트워크 없음)
+  - RAG: 합성 FAISS 인덱스 + FakeOpenAI 임베딩
+  - PostgreSQL: 로컬 DB 만 허용 (마이그레이션 적용된 상태여야 함). 원격 DB 는 --allow-remote-db 없이는 거부
+LLM 일일/시간 쿼터·비용 상한·스파이크 감지는 부하 중 차단되지 않도록 끈다.
+
+실행 (보통은 run.py --spawn 이 띄움):
+    cd backend && python3 -m scripts.load_test.server --port 8765 --ttft-ms 400 --token-ms 15
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+backend_dir = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from scripts.load_test.standins import FakeLLM, FakeOpenAI, InMemoryRedisServer, build_synthetic_faiss
+
+LOCAL_DB_HOSTS = {"localhost", "127.0.0.1", "::1", ""}
+
+
+def _is_local_host(host: str) -> bool:
+    return host in LOCAL_DB_HOSTS or host.startswith("/")  # 유닉스 소켓 디렉터리
+
+
+def check_local_db(allow_remote: bool = False) -> None:
+    """DB_HOST / DB_REPLICA_HOST 가 로컬이 아니면 중단 — 운영 DB 에 부하를 걸지 않도록."""
+    from app.core.config import settings
+
+    hosts = [settings.DB_HOST] + ([settings.DB_REPLICA_HOST] if settings.DB_REPLICA_HOST else [])
+    remote = [h for h in hosts if not _is_local_host(h)]
+    if remote and not allow_remote:
+        raise SystemExit(f"❌ 로컬 DB 가 아님: {remote} — DB_HOST=127.0.0.1 로 지정하거나 --allow-remote-db")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="부하 테스트용 앱 서버 (로컬 대역)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--ttft-ms", type=float, default=400.0, help="가짜 LLM 첫 토큰 지연")
+    parser.add_argument("--token-ms", type=float, default=15.0, help="가짜 LLM 토큰 간격")
+    parser.add_argument("--tokens", type=int, default=120, help="가짜 LLM 응답 토큰 수")
+    parser.add_argument("--embedding-ms", type=float, default=80.0, help="가짜 임베딩 API 지연")
+    parser.add_argument("--faiss-docs", type=int, default=5000, help="합성 FAISS 문서 수 (0 이면 RAG 없음)")
+    parser.add_argument("--faiss-dir", default=None, help="합성 인덱스 위치 (기본: 임시 디렉터리)")
+    parser.add_argument("--allow-remote-db", action="store_true")
+    return parser
+
+
+def prepare(args: argparse.Namespace):
+    """대역 기동 + 앱 설정 패치. (redis 대역, FakeLLM) 반환 — 앱 import 전에 호출해야 한다."""
+    redis_server = InMemoryRedisServer()
+    os.environ["REDIS_URL"] = redis_server.start()
+    # rag_service._get_openai_api_key 는 dev 키면 None → 더미 키 (FakeOpenAI 가 받음)
+    os.environ.setdefault("OPENAI_API_KEY", "sk-loadtest")
+    os.environ.setdefault("GOOGLE_GEMINI_API_KEY", "loadtest")
+
+    from app.core.config import settings
+
+    check_local_db(args.allow_remote_db)
+    settings.redis_url = os.environ["REDIS_URL"]
+    settings.llm_quota_chat_tagging_daily = 10 ** 9
+    settings.llm_quota_rag_chat_daily = 10 ** 9
+    settings.llm_quota_checkup_design_daily = 10 ** 9
+    settings.llm_quota_hourly_multiplier = 1.0
+    settings.llm_cost_cap_enabled = False
+    settings.llm_spike_enabled = False
+
+    from app.services.checkup_design import rag_service, vector_search
+
+    embedding_ms = args.embedding_ms
+    vector_search.OpenAI = lambda api_key=None: FakeOpenAI(api_key, latency_ms=embedding_ms)
+    if args.faiss_docs > 0:
+        faiss_dir = Path(args.faiss_dir or tempfile.mkdtemp(prefix="loadtest_faiss_"))
+        build_synthetic_faiss(faiss_dir, n_docs=args.faiss_docs)
+        rag_service.LOCAL_FAISS_DIR = str(faiss_dir)
+    else:
+        rag_service.LOCAL_FAISS_DIR = tempfile.mkdtemp(prefix="loadtest_nofaiss_")
+
+    llm = FakeLLM(ttft_ms=args.ttft_ms, token_ms=args.token_ms, tokens=args.tokens).install()
+    print(f"✅ [부하테스트] redis={settings.redis_url} faiss={rag_service.LOCAL_FAISS_DIR} "
+          f"llm(ttft={args.ttft_ms}ms, token={args.token_ms}ms × {args.tokens})")
+    return redis_server, llm
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    # 대역 패치는 이 프로세스 안에서만 유효 → 단일 워커로 app 객체를 직접 띄운다
+    redis_server, llm = prepare(args)
+
+    import uvicorn
+
+    from app.main import app
+
+    try:
+        uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+    finally:
+        llm.uninstall()
+        redis_server.stop()
+
+
+if __name__ == "__main__":
+    main()
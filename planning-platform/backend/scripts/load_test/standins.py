@@ -0,0 +1,606 @@
+"""
+부하 테스트용 로컬 대역 (네트워크·외부 과금 없이 앱을 띄우기 위한 것)
+
+  - InMemoryRedisServer: redis-py 가 그대로 붙는 RESP2 TCP 서버 (별도 스레드 이벤트 루프).
+    앱 곳곳의 redis.from_url(REDIS_URL) 클라이언트를 수정 없이 받는다.
+  - FakeLLM: GeminiService / GPTService 호출을 가짜 응답으로 교체 (TTFT·토큰 간격·토큰 수 설정).
+    llm_router 경유든 직접 호출이든 같은 가짜를 탄다.
+  - FakeOpenAI + build_synthetic_faiss: 임베딩 API 대역 + llama-index 호환 형식의 합성 FAISS 인덱스.
+"""
+
+import asyncio
+import fnmatch
+import json
+import random
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+
+# ─── Redis 대역 ───────────────────────────────────────────────
+
+class _RespError(Exception):
+    pass
+
+
+class _Conn:
+    def __init__(self, writer: asyncio.StreamWriter) -> None:
+        self.writer = writer
+        self.db = 0
+        self.channels: set = set()
+        self.queued: Optional[List[List[bytes]]] = None  # MULTI 중이면 리스트
+
+
+def _encode(value: Any) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, _Simple):
+        return b"+" + value.text.encode() + b"\r\n"
+    if isinstance(value, _RespError):
+        return b"-" + str(value).encode() + b"\r\n"
+    if isinstance(value, bool):
+        return b":%d\r\n" % int(value)
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, (list, tuple)):
+        return b"*%d\r\n" % len(value) + b"".join(_encode(v) for v in value)
+    if isinstance(value, str):
+        value = value.encode()
+    if isinstance(value, float):
+        value = repr(value).encode()
+    return b"$%d\r\n%s\r\n" % (len(value), value)
+
+
+class _Simple:
+    __slots__ = ("text",)
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+
+OK = _Simple("OK")
+_WRONGTYPE = "WRONGTYPE Operation against a key holding the wrong kind of value"
+
+
+class InMemoryRedisServer:
+    """RESP2 in-memory Redis 대역. 문자열·해시·리스트·셋·만료·pub/sub·MULTI/EXEC 지원.
+
+    start() 는 바인딩된 redis:// URL 을 돌려준다 (port=0 이면 빈 포트 자동 선택).
+    모르는 명령은 ERR 응답 — 앱 코드의 Redis 예외 처리 경로를 탄다.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.host = host
+        self.port = port
+        self._dbs: Dict[int, Dict[bytes, Any]] = {}
+        self._expires: Dict[int, Dict[bytes, float]] = {}
+        self._subscribers: Dict[bytes, set] = {}
+        self.commands = 0
+        self._conns: set = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    # ── 수명 ──
+    def start(self) -> str:
+        ready = threading.Event()
+
+        def _run():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            self._server = self._loop.run_until_complete(
+                asyncio.start_server(self._handle, self.host, self.port)
+            )
+            self.port = self._server.sockets[0].getsockname()[1]
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=_run, name="redis-standin", daemon=True)
+        self._thread.start()
+        ready.wait(5)
+        return self.url
+
+    @property
+    def url(self) -> str:
+        return f"redis://{self.host}:{self.port}/0"
+
+    def stop(self) -> None:
+        if self._loop is None:
+            return
+
+        async def _close():
+            self._server.close()
+            for conn in list(self._conns):
+                conn.writer.close()
+            tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        asyncio.run_coroutine_threadsafe(_close(), self._loop).result(5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(5)
+        self._loop = None
+
+    # ── 프로토콜 ──
+    async def _read_command(self, reader: asyncio.StreamReader) -> Optional[List[bytes]]:
+        line = await reader.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            return line.strip().split()  # 인라인 명령 (redis-cli 등)
+        args = []
+        for _ in range(int(line[1:])):
+            size = int((await reader.readline())[1:])
+            args.append((await reader.readexactly(size + 2))[:-2])
+        return args
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        conn = _Conn(writer)
+        self._conns.add(conn)
+        try:
+            while True:
+                args = await self._read_command(reader)
+                if args is None:
+                    break
+                if not args:
+                    continue
+                writer.write(self._dispatch(conn, args))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            self._conns.discard(conn)
+            for ch in conn.channels:
+                self._subscribers.get(ch, set()).discard(conn)
+            writer.close()
+
+    def _dispatch(self, conn: _Conn, args: List[bytes]) -> bytes:
+        self.commands += 1
+        name = args[0].decode().upper()
+        if conn.queued is not None and name not in ("EXEC", "DISCARD", "MULTI", "WATCH"):
+            conn.queued.append(args)
+            return _encode(_Simple("QUEUED"))
+        if name in ("SUBSCRIBE", "UNSUBSCRIBE"):
+            return self._pubsub(conn, name, args[1:])
+        try:
+            return _encode(self._execute(conn, name, args[1:]))
+        except _RespError as e:
+            return _encode(e)
+        except (ValueError, IndexError):
+            return _encode(_RespError(f"ERR wrong arguments for '{name.lower()}' command"))
+
+    def _pubsub(self, conn: _Conn, name: str, channels: List[bytes]) -> bytes:
+        out = b""
+        if name == "SUBSCRIBE":
+            for ch in channels:
+                conn.channels.add(ch)
+                self._subscribers.setdefault(ch, set()).add(conn)
+                out += _encode([b"subscribe", ch, len(conn.channels)])
+            return out
+        for ch in channels or list(conn.channels):
+            conn.channels.discard(ch)
+            self._subscribers.get(ch, set()).discard(conn)
+            out += _encode([b"unsubscribe", ch, len(conn.channels)])
+        return out or _encode([b"unsubscribe", None, 0])
+
+    # ── 키스페이스 ──
+    def _db(self, conn: _Conn) -> Dict[bytes, Any]:
+        return self._dbs.setdefault(conn.db, {})
+
+    def _alive(self, conn: _Conn, key: bytes) -> bool:
+        exp = self._expires.setdefault(conn.db, {})
+        deadline = exp.get(key)
+        if deadline is not None and time.monotonic() >= deadline:
+            self._db(conn).pop(key, None)
+            exp.pop(key, None)
+        return key in self._db(conn)
+
+    def _get(self, conn: _Conn, key: bytes, kind: type, create: bool = False):
+        if self._alive(conn, key):
+            value = self._db(conn)[key]
+            if not isinstance(value, kind):
+                raise _RespError(_WRONGTYPE)
+            return value
+        if create:
+            value = self._db(conn)[key] = kind()
+            return value
+        return None
+
+    def _set_expire(self, conn: _Conn, key: bytes, seconds: Optional[float]) -> None:
+        exp = self._expires.setdefault(conn.db, {})
+        if seconds is None:
+            exp.pop(key, None)
+        else:
+            exp[key] = time.monotonic() + seconds
+
+    def _delete(self, conn: _Conn, key: bytes) -> int:
+        if not self._alive(conn, key):
+            return 0
+        del self._db(conn)[key]
+        self._expires.setdefault(conn.db, {}).pop(key, None)
+        return 1
+
+    def _execute(self, conn: _Conn, name: str, a: List[bytes]) -> Any:
+        db = self._db(conn)
+        if name == "PING":
+            return a[0] if a else _Simple("PONG")
+        if name == "ECHO":
+            return a[0]
+        if name == "SELECT":
+            conn.db = int(a[0])
+            return OK
+        if name in ("CLIENT", "WATCH", "UNWATCH", "READONLY"):
+            return OK
+        if name in ("COMMAND", "CONFIG"):
+            return []
+        if name == "INFO":
+            return b"# Server\r\nredis_version:7.0.0-loadtest-standin\r\nredis_mode:standalone\r\n"
+        if name == "MULTI":
+            conn.queued = []
+            return OK
+        if name == "DISCARD":
+            conn.queued = None
+            return OK
+        if name == "EXEC":
+            queued, conn.queued = conn.queued or [], None
+            results = []
+            for args in queued:
+                try:
+                    results.append(self._execute(conn, args[0].decode().upper(), args[1:]))
+                except _RespError as e:
+                    results.append(e)
+            return results
+        if name in ("FLUSHDB", "FLUSHALL"):
+            targets = list(self._dbs) if name == "FLUSHALL" else [conn.db]
+            for n in targets:
+                self._dbs[n] = {}
+                self._expires[n] = {}
+            return OK
+        if name == "DBSIZE":
+            return sum(1 for k in list(db) if self._alive(conn, k))
+
+        # 문자열
+        if name == "GET":
+            return self._get(conn, a[0], bytes)
+        if name == "SET":
+            key, value, opts = a[0], a[1], [o.upper() for o in a[2:]]
+            exists = self._alive(conn, key)
+            if (b"NX" in opts and exists) or (b"XX" in opts and not exists):
+                return None
+            ttl = None
+            for flag, scale in ((b"EX", 1.0), (b"PX", 0.001)):
+                if flag in opts:
+                    ttl = float(a[2 + opts.index(flag) + 1]) * scale
+            keep = b"KEEPTTL" in opts and exists
+            old = db.get(key) if exists else None
+            db[key] = value
+            if not keep:
+                self._set_expire(conn, key, ttl)
+            return old if b"GET" in opts else OK
+        if name in ("SETEX", "PSETEX"):
+            db[a[0]] = a[2]
+            self._set_expire(conn, a[0], float(a[1]) * (1.0 if name == "SETEX" else 0.001))
+            return OK
+        if name == "SETNX":
+            if self._alive(conn, a[0]):
+                return 0
+            db[a[0]] = a[1]
+            return 1
+        if name == "GETDEL":
+            value = self._get(conn, a[0], bytes)
+            self._delete(conn, a[0])
+            return value
+        if name == "MGET":
+            return [db[k] if self._alive(conn, k) and isinstance(db[k], bytes) else None for k in a]
+        if name in ("INCR", "DECR", "INCRBY", "DECRBY"):
+            step = int(a[1]) if len(a) > 1 else 1
+            step = -step if name.startswith("DECR") else step
+            try:
+                value = int(self._get(conn, a[0], bytes) or b"0") + step
+            except ValueError:
+                raise _RespError("ERR value is not an integer or out of range")
+            db[a[0]] = str(value).encode()
+            return value
+        if name == "INCRBYFLOAT":
+            value = float(self._get(conn, a[0], bytes) or b"0") + float(a[1])
+            db[a[0]] = repr(value).encode()
+            return db[a[0]]
+
+        # 키 공통
+        if name in ("DEL", "UNLINK"):
+            return sum(self._delete(conn, k) for k in a)
+        if name == "EXISTS":
+            return sum(1 for k in a if self._alive(conn, k))
+        if name in ("EXPIRE", "PEXPIRE"):
+            if not self._alive(conn, a[0]):
+                return 0
+            self._set_expire(conn, a[0], float(a[1]) * (1.0 if name == "EXPIRE" else 0.001))
+            return 1
+        if name in ("TTL", "PTTL"):
+            if not self._alive(conn, a[0]):
+                return -2
+            deadline = self._expires.setdefault(conn.db, {}).get(a[0])
+            if deadline is None:
+                return -1
+            left = deadline - time.monotonic()
+            return int(round(left)) if name == "TTL" else int(left * 1000)
+        if name == "PERSIST":
+            return int(self._expires.setdefault(conn.db, {}).pop(a[0], None) is not None)
+        if name == "TYPE":
+            if not self._alive(conn, a[0]):
+                return _Simple("none")
+            kinds = {bytes: "string", dict: "hash", list: "list", set: "set"}
+            return _Simple(kinds[type(db[a[0]])])
+        if name == "KEYS":
+            pattern = a[0].decode()
+            return [k for k in list(db) if self._alive(conn, k) and fnmatch.fnmatchcase(k.decode(), pattern)]
+        if name == "SCAN":
+            opts = [o.upper() for o in a[1:]]
+            pattern = a[1 + opts.index(b"MATCH") + 1].decode() if b"MATCH" in opts else "*"
+            keys = [k for k in list(db) if self._alive(conn, k) and fnmatch.fnmatchcase(k.decode(), pattern)]
+            return [b"0", keys]
+
+        # 해시
+        if name in ("HSET", "HMSET"):
+            h = self._get(conn, a[0], dict, create=True)
+            added = 0
+            for f, v in zip(a[1::2], a[2::2]):
+                added += f not in h
+                h[f] = v
+            return OK if name == "HMSET" else added
+        if name == "HGET":
+            return (self._get(conn, a[0], dict) or {}).get(a[1])
+        if name == "HMGET":
+            h = self._get(conn, a[0], dict) or {}
+            return [h.get(f) for f in a[1:]]
+        if name == "HGETALL":
+            h = self._get(conn, a[0], dict) or {}
+            return [x for kv in h.items() for x in kv]
+        if name == "HDEL":
+            h = self._get(conn, a[0], dict) or {}
+            return sum(1 for f in a[1:] if h.pop(f, None) is not None)
+        if name == "HEXISTS":
+            return int(a[1] in (self._get(conn, a[0], dict) or {}))
+        if name == "HLEN":
+            return len(self._get(conn, a[0], dict) or {})
+        if name == "HKEYS":
+            return list(self._get(conn, a[0], dict) or {})
+        if name == "HINCRBY":
+            h = self._get(conn, a[0], dict, create=True)
+            value = int(h.get(a[1], b"0")) + int(a[2])
+            h[a[1]] = str(value).encode()
+            return value
+
+        # 리스트
+        if name in ("LPUSH", "RPUSH"):
+            lst = self._get(conn, a[0], list, create=True)
+            for v in a[1:]:
+                if name == "LPUSH":
+                    lst.insert(0, v)
+                else:
+                    lst.append(v)
+            return len(lst)
+        if name in ("LPOP", "RPOP"):
+            lst = self._get(conn, a[0], list) or []
+            return (lst.pop(0) if name == "LPOP" else lst.pop()) if lst else None
+        if name == "LLEN":
+            return len(self._get(conn, a[0], list) or [])
+        if name == "LRANGE":
+            lst = self._get(conn, a[0], list) or []
+            start, stop = int(a[1]), int(a[2])
+            stop = len(lst) if stop == -1 else (stop + 1 if stop >= 0 else len(lst) + stop + 1)
+            return lst[start if start >= 0 else max(len(lst) + start, 0):stop]
+        if name == "LTRIM":
+            lst = self._get(conn, a[0], list) or []
+            start, stop = int(a[1]), int(a[2])
+            stop = len(lst) if stop == -1 else (stop + 1 if stop >= 0 else len(lst) + stop + 1)
+            lst[:] = lst[start if start >= 0 else max(len(lst) + start, 0):stop]
+            return OK
+
+        # 셋
+        if name == "SADD":
+            s = self._get(conn, a[0], set, create=True)
+            before = len(s)
+            s.update(a[1:])
+            return len(s) - before
+        if name == "SREM":
+            s = self._get(conn, a[0], set) or set()
+            return sum(1 for m in a[1:] if m in s and not s.discard(m))
+        if name == "SMEMBERS":
+            return sorted(self._get(conn, a[0], set) or set())
+        if name == "SISMEMBER":
+            return int(a[1] in (self._get(conn, a[0], set) or set()))
+        if name == "SCARD":
+            return len(self._get(conn, a[0], set) or set())
+
+        # pub/sub (발행)
+        if name == "PUBLISH":
+            subs = list(self._subscribers.get(a[0], ()))
+            for sub in subs:
+                sub.writer.write(_encode([b"message", a[0], a[1]]))
+            return len(subs)
+
+        raise _RespError(f"ERR unknown command '{name.lower()}' (loadtest stand-in)")
+
+
+# ─── LLM 대역 ─────────────────────────────────────────────────
+
+_FAKE_SENTENCES = [
+    "검진 결과를 보면 혈압이 경계 구간이에요.",
+    "공복혈당은 정상 범위지만 추이를 지켜보는 게 좋아요.",
+    "체중을 조금만 줄여도 위험도가 눈에 띄게 내려가요.",
+    "다음 검진 때 간 기능 수치를 함께 확인해 보세요.",
+    "규칙적인 유산소 운동이 도움이 돼요.",
+]
+
+
+@dataclass
+class FakeLLM:
+    """Gemini / OpenAI 호출 대역. 지연 = ttft_ms + token_ms × tokens (스트리밍은 토큰마다 나눠 yield)."""
+
+    ttft_ms: float = 400.0
+    token_ms: float = 15.0
+    tokens: int = 120
+    calls: int = 0
+    streams: int = 0
+    _restore: List[Callable[[], None]] = field(default_factory=list, repr=False)
+
+    def text(self, n: Optional[int] = None) -> str:
+        rng = random.Random(self.calls)
+        words = " ".join(rng.choice(_FAKE_SENTENCES) for _ in range(max(1, (n or self.tokens) // 8)))
+        return words
+
+    def _json(self) -> str:
+        return json.dumps({
+            "summary": self.text(40),
+            "analysis": self.text(60),
+            "recommended_items": [], "priority_1": {"items": []}, "priority_2": {"items": []},
+            "loadtest": True,
+        }, ensure_ascii=False)
+
+    def _content(self, response_format: Optional[Dict[str, Any]]) -> str:
+        if response_format and response_format.get("type") == "json_object":
+            return self._json()
+        return self.text()
+
+    async def _wait(self) -> None:
+        await asyncio.sleep((self.ttft_ms + self.token_ms * self.tokens) / 1000)
+
+    async def _stream(self):
+        self.streams += 1
+        await asyncio.sleep(self.ttft_ms / 1000)
+        words = self.text().split(" ")
+        per_chunk = max(1, len(words) // max(1, self.tokens))
+        for i in range(0, len(words), per_chunk):
+            yield " ".join(words[i:i + per_chunk]) + " "
+            await asyncio.sleep(self.token_ms / 1000)
+
+    def _usage(self) -> Dict[str, int]:
+        return {"input_tokens": 800, "output_tokens": self.tokens, "cached_tokens": 0,
+                "total_tokens": 800 + self.tokens}
+
+    def install(self) -> "FakeLLM":
+        """GeminiService / GPTService 메서드를 가짜로 교체. uninstall() 로 원복."""
+        from app.services import gemini_service as gm
+        from app.services import gpt_service as gp
+
+        fake = self
+
+        async def g_initialize(svc):
+            svc._initialized = True
+
+        async def g_call_api(svc, request, *args, **kwargs):
+            fake.calls += 1
+            await fake._wait()
+            return gm.GeminiResponse(content=fake._content(request.response_format), success=True,
+                                     usage=fake._usage())
+
+        async def g_stream_api(svc, request, session_id=None):
+            fake.calls += 1
+            async for chunk in fake._stream():
+                yield chunk
+
+        async def g_cache(svc, *args, **kwargs):
+            return None
+
+        async def g_health(svc):
+            return {"healthy": True, "loadtest": True}
+
+        async def o_initialize(svc):
+            svc._client = object()
+
+        async def o_call_api(svc, request, *args, **kwargs):
+            fake.calls += 1
+            await fake._wait()
+            return gp.GPTResponse(content=fake._content(request.response_format), model="loadtest",
+                                  usage={"prompt_tokens": 800, "completion_tokens": fake.tokens,
+                                         "total_tokens": 800 + fake.tokens}, success=True)
+
+        async def o_stream_api(svc, request, session_id=None):
+            fake.calls += 1
+            async for chunk in fake._stream():
+                yield chunk
+
+        patches = [
+            (gm.GeminiService, "initialize", g_initialize),
+            (gm.GeminiService, "call_api", g_call_api),
+            (gm.GeminiService, "stream_api", g_stream_api),
+            (gm.GeminiService, "_get_or_create_cache", g_cache),
+            (gm.GeminiService, "check_health", g_health),
+            (gp.GPTService, "initialize", o_initialize),
+            (gp.GPTService, "call_api", o_call_api),
+            (gp.GPTService, "stream_api", o_stream_api),
+        ]
+        for cls, attr, fn in patches:
+            original = cls.__dict__[attr]
+            setattr(cls, attr, fn)
+            self._restore.append(lambda cls=cls, attr=attr, original=original: setattr(cls, attr, original))
+        return self
+
+    def uninstall(self) -> None:
+        while self._restore:
+            self._restore.pop()()
+
+
+# ─── 임베딩 / FAISS 대역 ──────────────────────────────────────
+
+def fake_embedding(text: str, dim: int) -> List[float]:
+    """텍스트 해시 시드의 정규화 난수 벡터 — 같은 텍스트는 항상 같은 벡터."""
+    import numpy as np
+
+    vec = np.random.default_rng(zlib.crc32(text.encode("utf-8"))).standard_normal(dim).astype("float32")
+    return (vec / np.linalg.norm(vec)).tolist()
+
+
+class FakeOpenAI:
+    """openai.OpenAI 중 embeddings.create 만 흉내 (vector_search.OpenAI 자리에 주입)."""
+
+    def __init__(self, api_key: Optional[str] = None, dim: int = 1536, latency_ms: float = 80.0) -> None:
+        self.dim = dim
+        self.latency_ms = latency_ms
+        self.embeddings = self
+
+    def create(self, input: str, model: str = ""):
+        time.sleep(self.latency_ms / 1000)
+        emb = fake_embedding(input if isinstance(input, str) else " ".join(input), self.dim)
+        return type("EmbeddingResponse", (), {"data": [type("Embedding", (), {"embedding": emb})()]})()
+
+
+_DOC_TOPICS = ["고혈압", "당뇨", "이상지질혈증", "비만", "지방간", "빈혈", "갑상선", "골다공증", "위암 검진", "대장암 검진"]
+_DOC_ASPECTS = ["진단 기준", "생활습관 관리", "약물 치료", "추적 검사 주기", "식이 요법", "운동 처방"]
+
+
+def build_synthetic_faiss(out_dir: Path, n_docs: int = 5000, dim: int = 1536, seed: int = 7) -> Path:
+    """FAISSVectorSearch 가 읽는 형식(faiss.index / index_store.json / docstore.json)의 합성 인덱스 생성."""
+    import faiss
+    import numpy as np
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    texts, nodes_dict, docstore = [], {}, {}
+    for i in range(n_docs):
+        topic, aspect = rng.choice(_DOC_TOPICS), rng.choice(_DOC_ASPECTS)
+        text = f"[{topic}] {aspect} 가이드 {i}: " + " ".join(rng.choice(_FAKE_SENTENCES) for _ in range(6))
+        node_id = f"loadtest-{i:06d}"
+        texts.append(text)
+        nodes_dict[str(i)] = node_id
+        docstore[node_id] = {"__data__": {
+            "text": text,
+            "metadata": {"file_name": f"loadtest_{topic}.pdf", "page_label": str(i % 40 + 1)},
+        }}
+
+    vecs = np.array([fake_embedding(t, dim) for t in texts], dtype=np.float32)
+    index = faiss.IndexFlatL2(dim)
+    index.add(vecs)
+    faiss.write_index(index, str(out_dir / "faiss.index"))
+    (out_dir / "index_store.json").write_text(json.dumps({"index_store/data": {"loadtest": {
+        "__type__": "faiss",
+        "__data__": json.dumps({"index_id": "loadtest", "nodes_dict": nodes_dict}),
+    }}}))
+    (out_dir / "docstore.json").write_text(json.dumps({"docstore/data": docstore}, ensure_ascii=False))
+    return out_dir
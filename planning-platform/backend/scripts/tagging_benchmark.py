@@ -0,0 +1,169 @@
+"""
+규칙 태깅 키워드 매칭 벤치마크
+
+내보낸 상담 로그로 기존 방식(키워드마다 `kw in text` 반복)과
+컴파일된 키워드 매처(chat_tagging_service.scan) 1회 스캔을 비교한다.
+두 방식의 태깅 결과가 세션마다 같은지도 함께 확인한다.
+
+입력 (여러 개 가능, .gz 자동 해제):
+  - /partner-office/export/json        → {"chat_logs": {"data": [{conversation, ...}]}}
+  - /partner-office/export/json?format=ndjson
+  - /embedding/chats/export?format=ndjson  → "대화 내역(JSON)" 컬럼
+
+실행:
+  cd planning-platform/backend
+  python3 -m scripts.tagging_benchmark export.ndjson.gz [--repeat 5]
+"""
+import argparse
+import gzip
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.services import chat_tagging_service as cts
+
+CONVERSATION_KEYS = ("conversation", "대화 내역(JSON)")
+
+
+def _open(path: Path):
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8-sig")
+    return open(path, encoding="utf-8-sig")
+
+
+def _records(path: Path) -> Iterator[Dict[str, Any]]:
+    """JSON 문서 / NDJSON 양쪽에서 세션 행 추출"""
+    with _open(path) as f:
+        body = f.read()
+    try:
+        doc = json.loads(body)
+    except json.JSONDecodeError:
+        doc = None  # 여러 줄 NDJSON
+    if isinstance(doc, list):
+        yield from doc
+        return
+    if isinstance(doc, dict) and "chat_logs" in doc:
+        yield from doc["chat_logs"].get("data", [])
+        return
+    for line in body.splitlines():
+        if not line.strip():
+            continue
+        obj = json.loads(line)
+        if "data" in obj and obj.get("section", "chat_logs") == "chat_logs":
+            yield obj["data"]
+
+
+def load_conversations(paths: List[Path]) -> List[List[Dict[str, str]]]:
+    conversations = []
+    for path in paths:
+        for row in _records(path):
+            raw = next((row[k] for k in CONVERSATION_KEYS if row.get(k)), None)
+            if isinstance(raw, str):
+                try:
+                    raw = json.loads(raw)
+                except json.JSONDecodeError:
+                    continue  # 엑셀 32000자 잘림 등
+            if raw:
+                conversations.append([
+                    {"role": m.get("role"), "content": m.get("content") or ""}
+                    for m in raw if isinstance(m, dict)
+                ])
+    return conversations
+
+
+# ─── 기존 방식 (키워드 × 메시지 반복) ───────────────────────────────
+
+def _user_text(messages):
+    return " ".join(m.get("content", "") for m in messages if m.get("role") == "user")
+
+
+def naive_tags(messages: List[Dict[str, str]]) -> Dict[str, Any]:
+    user_msgs = [m.get("content", "") for m in messages if m.get("role") == "user"]
+    text = _user_text(messages)
+    topic_counts: Dict[str, int] = {}
+    for msg in user_msgs:
+        for tag, kws in cts.INTEREST_KEYWORDS.items():
+            if any(kw in msg for kw in kws):
+                topic_counts[tag] = topic_counts.get(tag, 0) + 1
+    sentiment = "neutral"
+    if user_msgs:
+        sentiment = next((s for s, kws in cts.SENTIMENT_KEYWORDS.items()
+                          if any(kw in user_msgs[-1] for kw in kws)), "neutral")
+    return {
+        "interest": [t for t, kws in cts.INTEREST_KEYWORDS.items() if any(kw in text for kw in kws)],
+        "topic_counts": topic_counts,
+        "nutrition": [t for t, kws in cts.NUTRITION_KEYWORDS.items() if any(kw in text for kw in kws)],
+        "action": ("active" if any(kw in text for kw in cts.ACTION_INTENT_ACTIVE)
+                   else "considering" if any(kw in text for kw in cts.ACTION_INTENT_CONSIDERING)
+                   else "passive"),
+        "keywords": sorted({kw for kws in cts.INTEREST_KEYWORDS.values() for kw in kws if kw in text}),
+        "buying": ("high" if any(kw in text for kw in cts.BUYING_SIGNAL_HIGH)
+                   else "mid" if any(kw in text for kw in cts.BUYING_SIGNAL_MID) else "low"),
+        "sentiment": sentiment,
+        "ux_hits": sum(1 for kw in cts.INTENT_KEYWORDS["ux_issue"] if kw in text),
+        "health_hits": sum(1 for kws in cts.INTEREST_KEYWORDS.values() for kw in kws if kw in text),
+    }
+
+
+def compiled_tags(messages: List[Dict[str, str]]) -> Dict[str, Any]:
+    scanned = cts.scan(messages)
+    topic_counts: Dict[str, int] = {}
+    for i in range(len(scanned.texts)):
+        for tag in scanned.segment_tags(i, "interest"):
+            topic_counts[tag] = topic_counts.get(tag, 0) + 1
+    return {
+        "interest": cts.extract_interest_tags(messages, scanned),
+        "topic_counts": topic_counts,
+        "nutrition": cts.extract_nutrition_tags(messages, scanned),
+        "action": cts.detect_action_intent(messages, scanned),
+        "keywords": sorted(scanned.keywords("interest")),
+        "buying": cts.extract_buying_signal(messages, scanned),
+        "sentiment": cts.detect_sentiment(messages, scanned),
+        "ux_hits": scanned.distinct("intent", "ux_issue"),
+        "health_hits": scanned.distinct("interest"),
+    }
+
+
+def _timeit(fn, conversations, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for messages in conversations:
+            fn(messages)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("paths", nargs="+", type=Path)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    conversations = load_conversations(args.paths)
+    if not conversations:
+        print("대화 내역이 있는 세션이 없습니다.")
+        return 1
+
+    mismatches = [i for i, m in enumerate(conversations) if naive_tags(m) != compiled_tags(m)]
+    user_chars = sum(len(_user_text(m)) for m in conversations)
+
+    naive = _timeit(naive_tags, conversations, args.repeat)
+    compiled = _timeit(compiled_tags, conversations, args.repeat)
+    per_session = lambda sec: sec / len(conversations) * 1e6
+
+    print(f"세션 {len(conversations)}건, 사용자 발화 {user_chars:,}자")
+    print(f"  기존 (kw in text)  : {naive * 1000:8.1f} ms  ({per_session(naive):7.1f} µs/세션)")
+    print(f"  매처 1회 스캔      : {compiled * 1000:8.1f} ms  ({per_session(compiled):7.1f} µs/세션)")
+    print(f"  속도 비: x{naive / compiled:.2f}")
+    print(f"  결과 불일치: {len(mismatches)}건" + (f" (예: {mismatches[:5]})" if mismatches else ""))
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+"""
+campaigns/bulk_dispatch.py 알림톡 대량 발송 엔진 테스트.
+
+가짜 db_manager / MariaDB 연결로 실제 DB 없이
+일괄 prefetch, 환자 일괄 생성, 청크 단위 MZSENDTRAN 적재를 확인한다.
+
+실행:
+    cd backend && python -m pytest tests/test_alimtalk_bulk_dispatch.py -v
+"""
+
+import json
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, List
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import psycopg2.extras
+
+from app.services.campaigns import bulk_dispatch
+from app.services.campaigns.alimtalk_service import compile_content, render_content
+from app.services.campaigns.bulk_dispatch import AlimtalkBulkDispatcher
+
+ATTACHMENT = json.dumps({"button": [
+    {"type": "WL", "url_mobile": "https://#{sub}", "url_pc": "https://#{sub}"},
+    {"type": "TN", "tel_number": ""},
+]})
+
+
+class _FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self._rows: List[Any] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.db.pg_queries.append(sql)
+        if "FROM welno.welno_patients" in sql:
+            phones, names = params
+            self._rows = [
+                p for p in self.db.patients
+                if (p["phone_number"], p["name"]) in set(zip(phones, names))
+            ]
+        elif "FROM welno.welno_hospitals" in sql:
+            self._rows = [("H1", "02-111-2222")]
+        else:
+            self._rows = []
+
+    def fetchall(self):
+        return self._rows
+
+    def close(self):
+        pass
+
+
+class _FakeDB:
+    """db_manager 대역 — 호출된 쿼리 기록"""
+
+    def __init__(self):
+        self.pg_queries: List[str] = []
+        self.patients = [{"phone_number": "01011112222", "name": "홍길동씨",
+                          "uuid": "existing-uuid", "birth_date": None}]
+
+    async def execute_query(self, query, params=None):
+        self.pg_queries.append(query)
+        if "hospital_name = ANY" in query and "tb_hospital_rag_config" in query:
+            return [{"hospital_name": "가나병원", "hospital_id": "H1"}]
+        if "alimtalk_vars" in query:
+            return [{"hospital_id": "H1", "alimtalk_vars": {"tmpl": {"병원전화": "1588-0000"}}}]
+        return []
+
+    @contextmanager
+    def get_connection(self, workload=None):
+        conn = self
+
+        class _Conn:
+            def cursor(self, cursor_factory=None):
+                return _FakeCursor(conn)
+
+            def commit(self):
+                pass
+
+        yield _Conn()
+
+
+class _FakeMysql:
+    def __init__(self, fail_on_call=None):
+        self.batches: List[List] = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.fail_on_call = fail_on_call
+
+    def cursor(self):
+        mysql = self
+
+        class _Cur:
+            def executemany(self, sql, rows):
+                mysql.batches.append(list(rows))
+                if mysql.fail_on_call == len(mysql.batches):
+                    raise RuntimeError("duplicate SN")
+
+            def close(self):
+                pass
+
+        return _Cur()
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def fake_execute_values(monkeypatch):
+    calls = []
+
+    def _execute_values(cur, sql, rows, template=None, page_size=100, fetch=False):
+        rows = list(rows)
+        calls.append((sql, rows))
+        if fetch:
+            return [(r[0],) for r in rows]
+        return None
+
+    monkeypatch.setattr(psycopg2.extras, "execute_values", _execute_values)
+    return calls
+
+
+def _recipient(phone, name, content="#{고객명}님 #{고객명}님, #{병원전화}"):
+    return {
+        "phone": phone,
+        "variables": {"고객명_0": name, "고객명": f"{name}씨", "병원명": "가나병원"},
+        "message": {"template_code": "tmpl", "content": content, "attachment": ATTACHMENT},
+    }
+
+
+def test_render_content_positional_and_fallbacks():
+    parts = compile_content("#{고객명}/#{고객명}/#{name}/#{병원}/#{없음}")
+    out = render_content(parts, {"고객명_0": "A", "고객명": "B"}, {"name": "C"}, {"병원": "D"})
+    assert out == "A/B/C/D/#{없음}"
+    assert compile_content("#{고객명}/#{고객명}/#{name}/#{병원}/#{없음}") is parts
+
+
+@pytest.mark.asyncio
+async def test_bulk_dispatch_end_to_end(monkeypatch, fake_execute_values):
+    db = _FakeDB()
+    mysql = _FakeMysql()
+    monkeypatch.setattr(bulk_dispatch, "_connect_mysql", lambda: mysql)
+    progress = []
+
+    recipients = [
+        _recipient("010-1111-2222", "홍길동"),  # 기존 환자
+        _recipient("010-3333-4444", "김철수"),  # 신규
+        _recipient("010-3333-4444", "김철수"),  # 같은 사람 중복 → 신규 1명만
+        _recipient("123", "오류"),               # 잘못된 번호
+    ]
+    dispatcher = AlimtalkBulkDispatcher(
+        db, {"client_id": ""}, {"tmpl": {"message_type": "button", "sender_key": "SK"}},
+        chunk_size=2, progress=lambda *a: progress.append(a),
+    )
+    data = await dispatcher.run(recipients)
+
+    assert data["total"] == 4
+    assert data["success_count"] == 3
+    assert data["results"][3] == {"phone": "123", "success": False, "error": "유효하지 않은 전화번호"}
+
+    # 병원명/alimtalk_vars 는 수신자 수와 무관하게 일괄 조회
+    assert sum("hospital_name = ANY" in q for q in db.pg_queries) == 1
+    assert sum("alimtalk_vars" in q for q in db.pg_queries) == 1
+
+    patient_inserts = [rows for sql, rows in fake_execute_values if "welno_patients" in sql]
+    assert len(patient_inserts) == 1 and len(patient_inserts[0]) == 1
+    new_uuid = patient_inserts[0][0][0]
+    link_rows = [rows for sql, rows in fake_execute_values if "welno_link_data" in sql][0]
+    assert {r[1] for r in link_rows} == {"existing-uuid", new_uuid}
+
+    # 청크 2건 단위 커밋, 본문/버튼 치환
+    assert [len(b) for b in mysql.batches] == [2, 1]
+    assert mysql.commits == 2
+    row = mysql.batches[0][0]
+    assert "홍길동님 홍길동씨님, 1588-0000" in row
+    attachment = json.loads(next(v for v in row if isinstance(v, str) and v.startswith("{")))
+    assert "welno.kindhabit.com" in attachment["button"][0]["url_mobile"]
+    assert attachment["button"][1]["tel_number"] == "02-111-2222"
+    assert progress[-1] == ("send", 3, 3)
+
+
+@pytest.mark.asyncio
+async def test_failed_chunk_only_fails_its_recipients(monkeypatch, fake_execute_values):
+    mysql = _FakeMysql(fail_on_call=2)
+    monkeypatch.setattr(bulk_dispatch, "_connect_mysql", lambda: mysql)
+    recipients = [_recipient(f"010-0000-000{i}", f"사람{i}", content="안내") for i in range(5)]
+    for r in recipients:
+        r["message"]["attachment"] = ""
+
+    dispatcher = AlimtalkBulkDispatcher(_FakeDB(), {"client_id": "H1"}, {"tmpl": {}}, chunk_size=2)
+    data = await dispatcher.run(recipients)
+
+    assert mysql.rollbacks == 1
+    assert [r["success"] for r in data["results"]] == [True, True, False, False, True]
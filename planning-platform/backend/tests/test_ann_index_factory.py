@@ -0,0 +1,181 @@
+"""
+rag_index/index_factory.py ANN 인덱스 팩토리 테스트.
+
+실행:
+    cd backend && python -m pytest tests/test_ann_index_factory.py -v
+"""
+
+import importlib
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+_DEPS_AVAILABLE = (
+    importlib.util.find_spec("faiss") is not None
+    and importlib.util.find_spec("numpy") is not None
+)
+pytestmark = pytest.mark.skipif(not _DEPS_AVAILABLE, reason="faiss/numpy 미설치 — 서버 환경에서 실행 필요")
+
+DIM = 32
+
+
+@pytest.fixture
+def vectors():
+    import numpy as np
+    rng = np.random.default_rng(0)
+    return rng.random((3000, DIM), dtype=np.float32)
+
+
+def test_auto_kind_by_size():
+    from app.services.rag_index.index_factory import IndexSpec
+
+    spec = IndexSpec(flat_max=100, hnsw_max=1000)
+    assert spec.resolve_kind(50) == "flat"
+    assert spec.resolve_kind(500) == "hnsw"
+    assert spec.resolve_kind(5000) == "ivfpq"
+    assert spec.factory_string(1536, 500) == "HNSW32,Flat"
+    assert spec.factory_string(1536, 5000).endswith(",PQ96x8")
+    assert IndexSpec(kind="hnsw", compression="fp16").factory_string(1536, 10) == "HNSW32,SQfp16"
+
+
+def test_hnsw_recall_against_flat(vectors):
+    import faiss
+    from app.services.rag_index.index_factory import IndexSpec, evaluate_specs
+
+    flat = faiss.IndexFlatL2(DIM)
+    flat.add(vectors)
+    report = evaluate_specs(flat, vectors[:50], [IndexSpec(kind="hnsw", ef_search=128)], k=10)
+
+    assert report["flat"]["recall"] == 1.0
+    assert report["HNSW32,Flat"]["recall"] > 0.9
+
+
+def test_ivfpq_is_trained_and_smaller(vectors):
+    import faiss
+    from app.services.rag_index.index_factory import IndexSpec, build_ann_index, index_memory_bytes
+
+    flat = faiss.IndexFlatL2(DIM)
+    flat.add(vectors)
+    ann = build_ann_index(vectors, IndexSpec(kind="ivfpq", pq_m=8))
+
+    assert ann.is_trained
+    assert ann.ntotal == len(vectors)
+    assert index_memory_bytes(ann) < index_memory_bytes(flat)
+
+
+def test_idmap_labels_preserved(vectors):
+    import faiss
+    import numpy as np
+    from app.services.rag_index.index_factory import IndexSpec, build_ann_index, extract_vectors
+
+    ids = np.arange(len(vectors), dtype=np.int64) * 7 + 1000
+    source = faiss.IndexIDMap2(faiss.IndexFlatL2(DIM))
+    source.add_with_ids(vectors, ids)
+
+    vecs, extracted = extract_vectors(source)
+    ann = build_ann_index(vecs, IndexSpec(kind="hnsw"), ids=extracted)
+    _, labels = ann.search(vectors[5:6], 1)
+    assert int(labels[0][0]) == int(ids[5])
+
+
+def test_sidecar_written_loaded_and_staleness(tmp_path: Path, vectors):
+    import faiss
+    from app.services.rag_index.index_factory import (
+        IndexSpec, write_ann_sidecar, load_search_index, ANN_INDEX_FILE,
+    )
+
+    flat = faiss.IndexFlatL2(DIM)
+    flat.add(vectors)
+    faiss.write_index(flat, str(tmp_path / "faiss.index"))
+
+    # 임계 미만 → 사이드카 없음
+    assert write_ann_sidecar(tmp_path, flat, IndexSpec(flat_max=10_000)) is None
+    assert not (tmp_path / ANN_INDEX_FILE).exists()
+
+    meta = write_ann_sidecar(tmp_path, flat, IndexSpec(flat_max=100))
+    assert meta["kind"] == "hnsw"
+    index, kind = load_search_index(str(tmp_path))
+    assert kind == "hnsw"
+    assert index.ntotal == len(vectors)
+
+    # 원본이 다시 쓰이면 사이드카는 무시되고 flat 사용
+    flat.add(vectors[:1])
+    faiss.write_index(flat, str(tmp_path / "faiss.index"))
+    os.utime(tmp_path / "faiss.index", (1, 1))
+    index, kind = load_search_index(str(tmp_path))
+    assert kind == "flat"
+    assert index.ntotal == len(vectors) + 1
+
+
+def _idmap_flat(vectors, ids):
+    import faiss
+    import numpy as np
+
+    index = faiss.IndexIDMap2(faiss.IndexFlatL2(DIM))
+    index.add_with_ids(vectors, np.asarray(ids, dtype=np.int64))
+    return index
+
+
+def _save_flat(index, path: Path, mtime: int):
+    import faiss
+
+    faiss.write_index(index, str(path / "faiss.index"))
+    os.utime(path / "faiss.index", (mtime, mtime))
+
+
+def test_sidecar_updated_incrementally_until_drift(tmp_path: Path, vectors):
+    import numpy as np
+    from app.services.rag_index.index_factory import (
+        IndexSpec, flat_signature, load_search_index, update_ann_sidecar,
+    )
+
+    spec = IndexSpec(flat_max=100, rebuild_drift=0.2)
+    ids = np.arange(len(vectors), dtype=np.int64) + 10
+    flat = _idmap_flat(vectors[:2000], ids[:2000])
+    _save_flat(flat, tmp_path, 1)
+    built = update_ann_sidecar(tmp_path, flat, spec, rebuild=True)
+    assert built["kind"] == "hnsw" and built["drift"] == 0
+
+    # 소량 추가 → 재구축 없이 기존 HNSW에 add_with_ids
+    previous = flat_signature(tmp_path / "faiss.index")
+    flat.add_with_ids(vectors[2000:2100], ids[2000:2100])
+    _save_flat(flat, tmp_path, 2)
+    meta = update_ann_sidecar(tmp_path, flat, spec, added_ids=ids[2000:2100].tolist(), previous_source=previous)
+    assert meta["built_at"] == built["built_at"] and meta["drift"] == 100
+    index, kind = load_search_index(str(tmp_path))
+    assert kind == "hnsw" and index.ntotal == 2100
+    _, labels = index.search(vectors[2050:2051], 1)
+    assert int(labels[0][0]) == int(ids[2050])
+
+    # 누적 변경이 임계(20%) 초과 → 재구축
+    previous = flat_signature(tmp_path / "faiss.index")
+    flat.add_with_ids(vectors[2100:2500], ids[2100:2500])
+    _save_flat(flat, tmp_path, 3)
+    meta = update_ann_sidecar(tmp_path, flat, spec, added_ids=ids[2100:2500].tolist(), previous_source=previous)
+    assert meta["drift"] == 0 and meta["built_ntotal"] == 2500
+
+
+def test_sidecar_removes_from_ivf_and_rebuilds_when_stale(tmp_path: Path, vectors):
+    import numpy as np
+    from app.services.rag_index.index_factory import IndexSpec, flat_signature, update_ann_sidecar
+
+    spec = IndexSpec(kind="ivfpq", pq_m=8, nlist=16)
+    ids = np.arange(len(vectors), dtype=np.int64) + 10
+    flat = _idmap_flat(vectors, ids)
+    _save_flat(flat, tmp_path, 1)
+    built = update_ann_sidecar(tmp_path, flat, spec, rebuild=True)
+
+    previous = flat_signature(tmp_path / "faiss.index")
+    flat.remove_ids(ids[:50])
+    _save_flat(flat, tmp_path, 2)
+    meta = update_ann_sidecar(tmp_path, flat, spec, removed_ids=ids[:50].tolist(), previous_source=previous)
+    assert meta["built_at"] == built["built_at"] and meta["ntotal"] == len(vectors) - 50
+
+    # 사이드카가 직전 원본과 어긋나 있으면(외부에서 원본만 교체) 증분 대신 재구축
+    _save_flat(flat, tmp_path, 4)
+    meta = update_ann_sidecar(tmp_path, flat, spec, added_ids=[], previous_source={"size": 0, "mtime": 0})
+    assert meta["drift"] == 0 and meta["built_at"] != built["built_at"]
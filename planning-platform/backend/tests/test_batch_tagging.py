@@ -0,0 +1,174 @@
+"""
+배치 LLM 태깅 테스트 — chat_tagging_v2_prompt 배치 prompt, chat_tagging_service 배치 분석,
+llm_usage_logger 세션별 토큰 분배.
+
+가짜 llm_router 로 실제 LLM 없이
+요청 묶음/긴 세션 단건 처리/결과 누락 폴백/토큰 합계 보존을 확인한다.
+
+실행:
+    cd backend && python -m pytest tests/test_batch_tagging.py -v
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services import chat_tagging_service as cts
+from app.services import llm_router as llm_router_module
+from app.services.chat_tagging_v2_prompt import build_batch_prompt_v2, build_prompt_v2
+from app.services.gemini_service import GeminiResponse
+from app.services.llm_usage_logger import llm_usage_logger, split_tokens
+
+
+def _result(summary):
+    return {"summary": summary, "sentiment": "curious", "risk_level": "low"}
+
+
+def _item(key, text, turns=1):
+    messages = []
+    for i in range(turns):
+        messages += [{"role": "user", "content": f"{text} {i}"}, {"role": "assistant", "content": "네"}]
+    return {"key": key, "session_id": f"sess-{key}", "partner_id": "p", "messages": messages}
+
+
+class _FakeRouter:
+    """call_api 대역 — 배치 prompt 면 세션키별 결과, 단건이면 결과 1건"""
+
+    def __init__(self, drop_keys=()):
+        self.calls = []
+        self.drop_keys = set(drop_keys)
+
+    async def call_api(self, request, endpoint="default", session_id=None, **kwargs):
+        usage_split = kwargs.pop("usage_split", None)
+        self.calls.append({"prompt": request.prompt, "session_id": session_id,
+                           "max_tokens": request.max_tokens, "batched": usage_split is not None})
+        if usage_split is None:
+            body = _result(f"single:{session_id}")
+        else:
+            keys = [line.split("[세션 ")[1].split("]")[0]
+                    for line in request.prompt.splitlines()
+                    if line.startswith("=== [세션 ") and not line.endswith("끝] ===")]
+            body = {"results": {k: _result(f"batch:{k}") for k in keys if k not in self.drop_keys}}
+        resp = GeminiResponse(content=json.dumps(body, ensure_ascii=False), success=True,
+                              usage={"input_tokens": 1000, "output_tokens": 300})
+        if usage_split is not None:
+            self.calls[-1]["shares"] = usage_split(resp)
+        return resp
+
+
+@pytest.fixture
+def router(monkeypatch):
+    fake = _FakeRouter()
+    monkeypatch.setattr(llm_router_module, "llm_router", fake)
+    return fake
+
+
+def test_batch_prompt_shares_instructions_once():
+    single = build_prompt_v2("[환자 질문 #1] 혈압", 1, "[검진]", "")
+    batch = build_batch_prompt_v2([
+        {"key": "a", "conversation_text": "[환자 질문 #1] 혈압", "total_user_turns": 1, "context_section": "[검진]"},
+        {"key": "b", "conversation_text": "[환자 질문 #1] 혈당", "total_user_turns": 1},
+    ])
+    head = single.split("[검진]")[0].strip()
+    assert batch.startswith(head) and batch.count(head) == 1
+    assert "=== [세션 a] ===" in batch and "=== [세션 b] ===" in batch
+    assert '"a", "b"' in batch
+    assert len(batch) < 2 * len(single)
+
+
+def test_split_tokens_preserves_total():
+    assert split_tokens(10, [1, 1, 1]) == [4, 3, 3]
+    assert split_tokens(7, [0, 0]) == [4, 3]
+    assert split_tokens(0, [5, 1]) == [0, 0]
+    for total in (1, 99, 1001):
+        assert sum(split_tokens(total, [0.3, 2.5, 7, 0.01])) == total
+
+
+def test_log_split_writes_one_row_per_session(monkeypatch):
+    rows = []
+    monkeypatch.setattr(llm_usage_logger, "log", lambda **kw: rows.append(kw))
+    llm_usage_logger.log_split(
+        model="m", endpoint="chat_tagging",
+        shares={"s1": {"input": 3, "output": 1, "hospital_id": "H1"}, "s2": {"input": 1, "output": 3}},
+        partner_id="p", input_tokens=1001, output_tokens=401, cached_tokens=5, latency_ms=90,
+    )
+    assert [r["session_id"] for r in rows] == ["s1", "s2"]
+    assert sum(r["input_tokens"] for r in rows) == 1001
+    assert sum(r["output_tokens"] for r in rows) == 401
+    assert sum(r["cached_tokens"] for r in rows) == 5
+    assert rows[0]["input_tokens"] > rows[1]["input_tokens"]
+    assert rows[0]["output_tokens"] < rows[1]["output_tokens"]
+    assert rows[0]["hospital_id"] == "H1" and rows[1]["partner_id"] == "p"
+
+
+@pytest.mark.asyncio
+async def test_short_sessions_packed_long_sessions_single(router):
+    items = [_item(str(i), f"혈압 질문{i}") for i in range(5)] + [_item("long", "긴 질문 " * 80, turns=6)]
+    outcomes = await cts.llm_analyze_sessions_batch(items, batch_size=4)
+
+    batched = [c for c in router.calls if c["batched"]]
+    singles = [c for c in router.calls if not c["batched"]]
+    assert len(batched) == 1 and batched[0]["max_tokens"] == 8000
+    # 짧은 세션 5건 → 배치 4건 + 남은 1건 단건, 긴 세션 단건
+    assert sorted(c["session_id"] for c in singles) == ["sess-4", "sess-long"]
+    assert outcomes["0"][0]["summary"] == "batch:0" and outcomes["0"][1] == ""
+    assert outcomes["long"][0]["summary"] == "single:sess-long"
+    assert set(outcomes) == {"0", "1", "2", "3", "4", "long"}
+    # 정규화(v1 호환 필드)까지 단건과 같은 경로
+    assert isinstance(outcomes["2"][0]["interest_tags"], list)
+    assert outcomes["2"][0]["conversation_depth"] in ("deep", "moderate", "shallow")
+
+    shares = batched[0]["shares"]
+    assert list(shares) == ["sess-0", "sess-1", "sess-2", "sess-3"]
+    assert all(s["input"] > 0 and s["output"] > 0 for s in shares.values())
+
+
+@pytest.mark.asyncio
+async def test_missing_batch_result_falls_back_to_single(router):
+    router.drop_keys = {"1"}
+    outcomes = await cts.llm_analyze_sessions_batch([_item(str(i), "혈당") for i in range(3)], batch_size=3)
+    assert outcomes["1"][0]["summary"] == "single:sess-1"
+    assert outcomes["0"][0]["summary"] == "batch:0"
+    assert sum(1 for c in router.calls if not c["batched"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_tag_sessions_batch_shares_one_request(router, monkeypatch):
+    conversations = {
+        "a": [{"role": "user", "content": "혈압이 높게 나왔어요"}],
+        "b": [{"role": "user", "content": "안녕하세요"}],  # 인사 → LLM 없이 최소 태깅
+        "c": [{"role": "user", "content": "콜레스테롤 수치가 걱정돼요"}],
+    }
+    saved = []
+
+    async def _messages(session_id):
+        return conversations[session_id]
+
+    async def _context(session_id):
+        return {}
+
+    async def _save(tag_data):
+        saved.append(tag_data)
+
+    async def _revisit(tag_data, messages):
+        return None
+
+    monkeypatch.setattr(cts, "load_messages_from_db", _messages)
+    monkeypatch.setattr(cts, "load_session_context_from_db", _context)
+    monkeypatch.setattr(cts, "_save_tags_to_db", _save)
+    monkeypatch.setattr(cts, "generate_revisit_messages", _revisit)
+    monkeypatch.setattr(cts, "generate_conversation_summary", lambda messages: asyncio.sleep(0, ""))
+
+    results = await cts.tag_chat_sessions_batch(
+        [{"session_id": s, "partner_id": "p"} for s in ("a", "b", "c")], batch_size=4)
+
+    assert len(router.calls) == 1 and router.calls[0]["batched"]
+    assert results[0]["conversation_summary"] == "batch:0"
+    assert results[1]["tagging_model"] == "intent-filter"
+    assert results[2]["conversation_summary"] == "batch:2"
+    assert {t["session_id"] for t in saved} == {"a", "b", "c"}
@@ -0,0 +1,136 @@
+"""
+campaigns/report_cache.py 디스크 캐시 + Range/ETag 헬퍼 테스트.
+
+실행:
+    cd backend && python -m pytest tests/test_campaign_report_cache.py -v
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+try:
+    from app.services.campaigns.report_cache import (
+        ReportFileCache,
+        parse_range_header,
+        etag_matches,
+        iter_file_range,
+    )
+except Exception:  # pragma: no cover - 서버 의존성 미설치 환경
+    pytest.skip("report_cache import 실패 — 환경 의존성 미충족", allow_module_level=True)
+
+
+def _store(cache: ReportFileCache, oid: str, payload: bytes):
+    writer = cache.open_writer(oid)
+    for i in range(0, len(payload), 7):
+        writer.write(payload[i:i + 7])
+    return writer.commit("application/pdf")
+
+
+def test_commit_then_lookup(tmp_path: Path):
+    cache = ReportFileCache(tmp_path, max_bytes=1024)
+    stored = _store(cache, "OID-1", b"%PDF-1.4 hello")
+
+    hit = cache.lookup("OID-1")
+    assert hit is not None
+    assert hit.size == len(b"%PDF-1.4 hello")
+    assert hit.etag == stored.etag
+    assert hit.path.read_bytes() == b"%PDF-1.4 hello"
+    assert cache.lookup("OID-2") is None
+
+
+def test_aborted_stream_is_not_cached(tmp_path: Path):
+    cache = ReportFileCache(tmp_path, max_bytes=1024)
+    writer = cache.open_writer("OID-1")
+    writer.write(b"partial")
+    writer.abort()
+
+    assert cache.lookup("OID-1") is None
+    assert not list(tmp_path.glob("*.part"))
+
+
+def test_oversized_file_is_skipped(tmp_path: Path):
+    cache = ReportFileCache(tmp_path, max_bytes=10)
+    assert _store(cache, "OID-1", b"x" * 32) is None
+    assert cache.lookup("OID-1") is None
+
+
+def test_lru_eviction_keeps_recent(tmp_path: Path):
+    cache = ReportFileCache(tmp_path, max_bytes=25)
+    _store(cache, "old", b"a" * 10)
+    _store(cache, "used", b"b" * 10)
+    past = time.time() - 100
+    for p in tmp_path.glob("*.pdf"):
+        os.utime(p, (past, past))
+    cache.lookup("used")  # mtime 갱신
+
+    _store(cache, "new", b"c" * 10)
+
+    assert cache.lookup("old") is None
+    assert cache.lookup("used") is not None
+    assert cache.lookup("new") is not None
+
+
+def test_stale_part_files_are_swept(tmp_path: Path):
+    stale = tmp_path / "crashed.part"
+    stale.write_bytes(b"partial")
+    past = time.time() - 2 * 3600
+    os.utime(stale, (past, past))
+    ReportFileCache(tmp_path, max_bytes=1024)  # 시작 시 정리
+    assert not stale.exists()
+
+    cache = ReportFileCache(tmp_path, max_bytes=1024)
+    in_flight = cache.open_writer("OID-2")
+    in_flight.write(b"streaming")
+    stale.write_bytes(b"partial")
+    os.utime(stale, (past, past))
+    _store(cache, "OID-1", b"%PDF-1.4 hello")  # 커밋 시 정리
+
+    assert not stale.exists()
+    assert len(list(tmp_path.glob("*.part"))) == 1  # 진행 중인 전송은 유지
+    in_flight.abort()
+
+
+@pytest.mark.parametrize("header,expected", [
+    (None, None),
+    ("bytes=0-9", (0, 9)),
+    ("bytes=90-", (90, 99)),
+    ("bytes=-10", (90, 99)),
+    ("bytes=50-500", (50, 99)),
+    ("bytes=100-", (-1, -1)),
+    ("bytes=0-1,5-6", None),
+    ("items=0-1", None),
+])
+def test_parse_range_header(header, expected):
+    assert parse_range_header(header, 100) == expected
+
+
+def test_etag_matches():
+    assert etag_matches('"abc"', '"abc"')
+    assert etag_matches('W/"abc", "def"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches('"zzz"', '"abc"')
+    assert not etag_matches(None, '"abc"')
+
+
+def test_iter_file_range(tmp_path: Path):
+    f = tmp_path / "a.bin"
+    f.write_bytes(bytes(range(100)))
+    assert b"".join(iter_file_range(f, 10, 19, chunk_size=3)) == bytes(range(10, 20))
+
+
+def test_regenerated_report_url_misses(tmp_path: Path):
+    cache = ReportFileCache(tmp_path, max_bytes=1024)
+    writer = cache.open_writer("OID-1", source="https://s3/report-v1.pdf?sig=a")
+    writer.write(b"%PDF-1.4 old")
+    writer.commit("application/pdf")
+
+    assert cache.lookup("OID-1", "https://s3/report-v1.pdf?sig=a") is not None
+    assert cache.lookup("OID-1") is not None  # URL 모를 때는 그대로 서빙
+    assert cache.lookup("OID-1", "https://s3/report-v2.pdf?sig=b") is None
+    assert cache.lookup("OID-1") is None  # 이전 항목은 제거됨
@@ -0,0 +1,68 @@
+"""
+검진설계 STEP 2 분기 동시 실행 (_run_step2_branches) 테스트.
+
+Priority 1 / Upselling 분기가 동시에 돌고(총 시간 = 가장 긴 분기),
+분기별 타임아웃·실패가 다른 분기를 취소하지 않으며, 성공 분기만 부분 저장 콜백을 받는지 확인한다.
+
+실행:
+    cd backend && python -m pytest tests/test_checkup_step2_parallel.py -v
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.api.v1.endpoints.checkup_design import _run_step2_branches
+
+
+def _branch(delay, result=None, error=None):
+    async def _run():
+        await asyncio.sleep(delay)
+        if error:
+            raise error
+        return {"result": result, "elapsed": delay}
+    return _run
+
+
+@pytest.mark.asyncio
+async def test_branches_run_concurrently_and_report_partials():
+    saved = []
+
+    async def _on_done(name, result):
+        saved.append(name)
+
+    started = time.monotonic()
+    results = await _run_step2_branches({
+        "priority1": (_branch(0.1, {"priority_1": {}}), 5),
+        "upselling": (_branch(0.1, {"priority_2": []}), 5),
+    }, on_done=_on_done)
+
+    assert time.monotonic() - started < 0.18  # 합(0.2초)이 아니라 최댓값
+    assert results["priority1"]["result"] == {"priority_1": {}}
+    assert results["upselling"]["result"] == {"priority_2": []}
+    assert sorted(saved) == ["priority1", "upselling"]
+
+
+@pytest.mark.asyncio
+async def test_timeout_and_failure_are_isolated_per_branch():
+    saved = []
+
+    async def _on_done(name, result):
+        saved.append(name)
+        raise RuntimeError("db down")  # 저장 실패는 결과에 영향 없음
+
+    results = await _run_step2_branches({
+        "priority1": (_branch(0.02, {"ok": 1}), 5),
+        "upselling": (_branch(1.0, {"late": 1}), 0.05),
+        "broken": (_branch(0.01, error=ValueError("STEP 2-2 실패: quota")), 5),
+    }, on_done=_on_done)
+
+    assert results["priority1"]["result"] == {"ok": 1}
+    assert isinstance(results["upselling"], TimeoutError)
+    assert isinstance(results["broken"], ValueError)
+    assert saved == ["priority1"]
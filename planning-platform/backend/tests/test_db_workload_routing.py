@@ -0,0 +1,124 @@
+"""
+core/database.py 워크로드 라우팅 테스트.
+
+psycopg2.connect를 가짜로 바꿔 실제 DB 없이
+레플리카 우선/폴백, 세션 옵션, 라우트 의존성 전파를 확인한다.
+
+실행:
+    cd backend && python -m pytest tests/test_db_workload_routing.py -v
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import psycopg2
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import database
+from app.core.database import DatabaseManager, db_workload, use_workload
+
+
+class _FakeConnect:
+    def __init__(self, fail_hosts=()):
+        self.calls = []
+        self.fail_hosts = set(fail_hosts)
+
+    def __call__(self, **kwargs):
+        self.calls.append(kwargs)
+        if kwargs["host"] in self.fail_hosts:
+            raise psycopg2.OperationalError("connection refused")
+        return MagicMock()
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    monkeypatch.setattr(database.settings, "DB_HOST", "primary")
+    monkeypatch.setattr(database.settings, "DB_REPLICA_HOST", "replica")
+    fake = _FakeConnect()
+    monkeypatch.setattr(database.psycopg2, "connect", fake)
+    return DatabaseManager(), fake
+
+
+def test_default_workload_uses_primary(manager):
+    mgr, fake = manager
+    with mgr.get_connection():
+        pass
+    call = fake.calls[-1]
+    assert call["host"] == "primary"
+    assert call["application_name"].endswith(":default")
+    assert "default_transaction_read_only" not in call.get("options", "")
+
+
+def test_analytics_prefers_replica_with_session_options(manager):
+    mgr, fake = manager
+    with use_workload("analytics"):
+        with mgr.get_connection():
+            pass
+    call = fake.calls[-1]
+    assert call["host"] == "replica"
+    assert call["application_name"].endswith(":analytics")
+    assert "statement_timeout=" in call["options"]
+    assert "work_mem=" in call["options"]
+    assert "default_transaction_read_only=on" in call["options"]
+
+
+def test_replica_failure_falls_back_and_cools_down(manager):
+    mgr, fake = manager
+    fake.fail_hosts.add("replica")
+    with mgr.get_connection("analytics"):
+        pass
+    assert [c["host"] for c in fake.calls] == ["replica", "primary"]
+    # 쿨다운 동안은 레플리카 재시도 없이 바로 primary
+    with mgr.get_connection("analytics"):
+        pass
+    assert [c["host"] for c in fake.calls] == ["replica", "primary", "primary"]
+    # 폴백된 primary 연결도 분석 워크로드 설정 유지
+    assert "statement_timeout=" in fake.calls[-1]["options"]
+
+
+@pytest.mark.asyncio
+async def test_writes_always_go_to_primary(manager):
+    mgr, fake = manager
+    with use_workload("export"):
+        await mgr.execute_update("UPDATE t SET x = 1")
+    call = fake.calls[-1]
+    assert call["host"] == "primary"
+    assert call["application_name"].endswith(":default")
+
+
+@pytest.mark.asyncio
+async def test_returning_write_via_execute_one_goes_to_primary(manager):
+    mgr, fake = manager
+    with use_workload("analytics"):
+        await mgr.execute_one("INSERT INTO t (x) VALUES (1) RETURNING id")
+    call = fake.calls[-1]
+    assert call["host"] == "primary"
+    assert call["application_name"].endswith(":default")
+    assert "default_transaction_read_only" not in call.get("options", "")
+
+
+def test_route_dependency_sets_workload_for_endpoint():
+    app = FastAPI()
+
+    @app.get("/stats", dependencies=[Depends(db_workload("analytics"))])
+    async def stats():
+        return {"workload": database.current_workload().name}
+
+    @app.get("/chat")
+    async def chat():
+        return {"workload": database.current_workload().name}
+
+    client = TestClient(app)
+    assert client.get("/stats").json() == {"workload": "analytics"}
+    assert client.get("/chat").json() == {"workload": "default"}
+
+
+def test_unknown_workload_rejected():
+    with pytest.raises(ValueError):
+        db_workload("reporting")
@@ -0,0 +1,123 @@
+"""
+services/es_service.py ES 조회 계층 테스트.
+
+httpx.MockTransport 로 실제 ES 없이
+TTL 캐시(동시 조회 합치기, stale 반환 후 백그라운드 갱신), 병원 집계 캐시,
+webAppKey 별 _msearch 여정 건수/이름 조회를 확인한다.
+
+실행:
+    cd backend && python -m pytest tests/test_es_service.py -v
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services import es_service as es_module
+from app.services.es_service import ESService
+from app.utils.ttl_cache import TTLCache
+
+
+def _service(handler):
+    svc = ESService()
+    for url in (es_module.settings.elasticsearch_url, es_module.settings.es_business_url):
+        svc._clients[url] = httpx.AsyncClient(base_url=url.rstrip("/"), transport=httpx.MockTransport(handler))
+    return svc
+
+
+@pytest.mark.asyncio
+async def test_cache_coalesces_concurrent_loads_and_serves_stale():
+    cache = TTLCache()
+    calls = []
+
+    async def _load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return len(calls)
+
+    values = await asyncio.gather(*(cache.get_or_load("k", _load, ttl=60) for _ in range(5)))
+    assert values == [1] * 5 and len(calls) == 1
+
+    # 만료됐지만 stale 창 안쪽 → 이전 값 즉시 반환, 갱신은 백그라운드
+    cache._entries["k"] = (1, cache._entries["k"][1] - 120)
+    assert await cache.get_or_load("k", _load, ttl=60, stale_ttl=600) == 1
+    await asyncio.sleep(0.03)
+    assert len(calls) == 2
+    assert await cache.get_or_load("k", _load, ttl=60, stale_ttl=600) == 2
+
+
+@pytest.mark.asyncio
+async def test_hospital_behavior_cached_and_failures_return_none():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        body = json.loads(request.content)
+        if body["query"]["bool"]["must"][0]["term"]["header.hospital.id"] == "BAD":
+            return httpx.Response(500)
+        return httpx.Response(200, json={"aggregations": {
+            "unique_users": {"value": 12},
+            "events": {"buckets": [
+                {"key": "UserAction-ResultOpen", "doc_count": 30},
+                {"key": "UserAction-BannerClick", "doc_count": 4},
+            ]},
+        }})
+
+    svc = _service(handler)
+    first = await svc.hospital_behavior("H1")
+    second = await svc.hospital_behavior("H1")
+    assert first == second == {
+        "이 병원 활성 수검자 수": "12명", "결과 열람 총 횟수": "30회", "배너 클릭 총 횟수": "4회",
+    }
+    assert len(requests) == 1
+    assert requests[0].url.path == "/medilinx-logs-business/_search"
+    assert str(requests[0].url).startswith(es_module.settings.es_business_url.rstrip("/"))
+
+    assert await svc.hospital_behavior("BAD") is None
+    await svc.close()
+
+
+@pytest.mark.asyncio
+async def test_journey_summary_msearch_counts_and_names(monkeypatch):
+    monkeypatch.setattr(es_module, "MSEARCH_CHUNK", 3)
+    batches = []
+
+    def handler(request):
+        assert request.url.path == "/medilinx-logs-data/_msearch"
+        assert request.headers["content-type"] == "application/x-ndjson"
+        lines = request.content.decode().strip().split("\n")
+        bodies = [json.loads(line) for line in lines[1::2]]
+        batches.append(bodies)
+        responses = []
+        for body in bodies:
+            must = body["query"]["bool"]["must"]
+            key = must[1]["term"]["data.user.webAppKey.keyword"]
+            if body["size"] == 0:
+                assert must[2] == {"term": {"data.user.hospital.id.keyword": "H1"}}
+                responses.append({"hits": {"total": {"value": int(key[1:]) * 10}}})
+            elif key == "k2":
+                responses.append({"hits": {"hits": [
+                    {"_source": {"data": {"user": {"name": "김*수"}}}},
+                    {"_source": {"data": {"user": {"name": "김철수"}}}},
+                ]}})
+            else:
+                responses.append({"error": {"type": "search_phase_execution_exception"}})
+        return httpx.Response(200, json={"responses": responses})
+
+    svc = _service(handler)
+    counts, names = await svc.journey_summary(["k1", "k2", "k3", ""], hospital_id="H1", name_keys=["k2", "k3"])
+    assert counts == {"k1": 10, "k2": 20, "k3": 30}
+    assert names == {"k2": "김철수"}
+    assert [len(b) for b in batches] == [3, 2]  # 건수 3 + 이름 2 → 3개씩 _msearch
+
+    # 캐시된 키는 다시 조회하지 않음 (오류 난 이름 조회 k3 만 재시도)
+    counts, names = await svc.journey_summary(["k1", "k2"], hospital_id="H1", name_keys=["k2", "k3"])
+    assert counts == {"k1": 10, "k2": 20} and names == {"k2": "김철수"}
+    assert len(batches) == 3 and len(batches[-1]) == 1
+    await svc.close()
@@ -0,0 +1,163 @@
+"""
+rag_index/hospital_index.py 증분 인덱스 동기화 테스트.
+
+실제 OpenAI 호출 없이 결정적 가짜 임베딩 함수로
+문서 추가/삭제/변경 시 변경분만 임베딩되는지,
+생성된 인덱스가 FAISSVectorSearch와 호환되는지 확인한다.
+
+실행:
+    cd backend && python -m pytest tests/test_hospital_index_sync.py -v
+"""
+
+import hashlib
+import importlib
+import sys
+from pathlib import Path
+from typing import List
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+_DEPS_AVAILABLE = (
+    importlib.util.find_spec("faiss") is not None
+    and importlib.util.find_spec("numpy") is not None
+)
+pytestmark = pytest.mark.skipif(not _DEPS_AVAILABLE, reason="faiss/numpy 미설치 — 서버 환경에서 실행 필요")
+
+DIM = 4
+
+
+def _fake_vector(text: str) -> List[float]:
+    digest = hashlib.md5(text.encode("utf-8")).digest()
+    return [b / 255.0 for b in digest[:DIM]]
+
+
+class _CountingEmbedder:
+    def __init__(self):
+        self.texts: List[str] = []
+
+    def __call__(self, texts: List[str]) -> List[List[float]]:
+        self.texts.extend(texts)
+        return [_fake_vector(t) for t in texts]
+
+
+@pytest.fixture
+def env(tmp_path: Path):
+    from app.services.rag_index import HospitalIndexSync, EmbeddingCache
+
+    uploads = tmp_path / "H1" / "uploads"
+    uploads.mkdir(parents=True)
+    embedder = _CountingEmbedder()
+    cache = EmbeddingCache(tmp_path / "_cache.sqlite3", "fake-model")
+    syncer = HospitalIndexSync(tmp_path / "H1", "H1", embedder, cache, DIM)
+    return syncer, uploads, embedder
+
+
+def test_incremental_add_and_remove(env):
+    syncer, uploads, embedder = env
+    (uploads / "a.txt").write_text("고혈압 관리 안내", encoding="utf-8")
+    (uploads / "b.txt").write_text("당뇨 식단 안내", encoding="utf-8")
+
+    first = syncer.sync([("hospital", uploads)])
+    assert first["mode"] == "full"
+    assert first["vector_count"] == 2
+    assert len(embedder.texts) == 2
+
+    # 새 문서 1개 추가 → 해당 청크만 임베딩
+    (uploads / "c.txt").write_text("운동 가이드", encoding="utf-8")
+    second = syncer.sync([("hospital", uploads)])
+    assert second["mode"] == "incremental"
+    assert second["added_chunks"] == 1
+    assert second["unchanged_docs"] == 2
+    assert embedder.texts[-1] == "운동 가이드"
+    assert len(embedder.texts) == 3
+
+    # 비활성 처리 → 임베딩 없이 제거
+    third = syncer.sync([("hospital", uploads)], inactive={"a.txt"})
+    assert third["removed_chunks"] == 1
+    assert third["vector_count"] == 2
+    assert len(embedder.texts) == 3
+
+
+def test_no_changes_skips_save(env):
+    syncer, uploads, embedder = env
+    (uploads / "a.txt").write_text("고혈압 관리 안내", encoding="utf-8")
+    syncer.sync([("hospital", uploads)])
+
+    result = syncer.sync([("hospital", uploads)])
+    assert result["changed"] is False
+    assert result["embedded_chunks"] == 0
+
+
+def test_force_rebuild_reuses_cached_embeddings(env):
+    syncer, uploads, embedder = env
+    (uploads / "a.txt").write_text("고혈압 관리 안내", encoding="utf-8")
+    (uploads / "b.txt").write_text("당뇨 식단 안내", encoding="utf-8")
+    syncer.sync([("hospital", uploads)])
+
+    (uploads / "b.txt").write_text("당뇨 식단 안내 (개정)", encoding="utf-8")
+    result = syncer.sync([("hospital", uploads)], force=True)
+    assert result["mode"] == "full"
+    assert result["embedded_chunks"] == 1
+    assert result["reused_embeddings"] == 1
+    assert embedder.texts[-1] == "당뇨 식단 안내 (개정)"
+
+
+def test_all_inactive_clears_index(env):
+    syncer, uploads, embedder = env
+    (uploads / "a.txt").write_text("고혈압 관리 안내", encoding="utf-8")
+    syncer.sync([("hospital", uploads)])
+
+    result = syncer.sync([("hospital", uploads)], inactive={"a.txt"})
+    assert result["vector_count"] == 0
+    assert not (syncer.base / "faiss.index").exists()
+
+
+def test_index_readable_by_vector_search(env):
+    syncer, uploads, embedder = env
+    (uploads / "a.txt").write_text("고혈압 관리 안내", encoding="utf-8")
+    (uploads / "b.txt").write_text("당뇨 식단 안내", encoding="utf-8")
+    syncer.sync([("hospital", uploads)])
+    (uploads / "a.txt").unlink()
+    syncer.sync([("hospital", uploads)])
+
+    from app.services.checkup_design.vector_search import FAISSVectorSearch
+
+    mock_embedding = MagicMock()
+    mock_embedding.data = [MagicMock(embedding=_fake_vector("당뇨 식단 안내"))]
+    with patch("app.services.checkup_design.vector_search.OpenAI") as mock_openai_cls:
+        mock_openai_cls.return_value.embeddings.create.return_value = mock_embedding
+        vs = FAISSVectorSearch(faiss_dir=str(syncer.base), openai_api_key="test-key")
+        results = vs.search("당뇨", top_k=5)
+
+    assert [r["text"] for r in results] == ["당뇨 식단 안내"]
+    assert results[0]["metadata"]["file_name"] == "b.txt"
+
+
+def test_incremental_sync_updates_ann_sidecar_without_rebuild(tmp_path: Path):
+    import json
+    from app.services.rag_index import HospitalIndexSync, EmbeddingCache
+    from app.services.rag_index.index_factory import ANN_META_FILE, IndexSpec
+
+    uploads = tmp_path / "H1" / "uploads"
+    uploads.mkdir(parents=True)
+    cache = EmbeddingCache(tmp_path / "_cache.sqlite3", "fake-model")
+    syncer = HospitalIndexSync(tmp_path / "H1", "H1", _CountingEmbedder(), cache, DIM,
+                               ann_spec=IndexSpec(kind="hnsw", rebuild_drift=1.0))
+    (uploads / "a.txt").write_text("고혈압 관리 안내", encoding="utf-8")
+    (uploads / "b.txt").write_text("당뇨 식단 안내", encoding="utf-8")
+    syncer.sync([("hospital", uploads)])
+    built = json.loads((syncer.base / ANN_META_FILE).read_text(encoding="utf-8"))
+
+    (uploads / "c.txt").write_text("운동 가이드", encoding="utf-8")
+    syncer.sync([("hospital", uploads)])
+    meta = json.loads((syncer.base / ANN_META_FILE).read_text(encoding="utf-8"))
+    assert meta["built_at"] == built["built_at"]
+    assert meta["drift"] == 1 and meta["ntotal"] == 3
+
+    # 강제 전체 동기화는 항상 재구축
+    syncer.sync([("hospital", uploads)], force=True)
+    meta = json.loads((syncer.base / ANN_META_FILE).read_text(encoding="utf-8"))
+    assert meta["drift"] == 0 and meta["built_at"] != built["built_at"]
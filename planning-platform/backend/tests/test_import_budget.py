@@ -0,0 +1,95 @@
+"""
+콜드 스타트 import 예산 테스트 — app.main, core/warmup, /health/ready.
+
+새 프로세스에서 app.main 을 import 해 무거운 의존성(google-genai, openai, faiss, llama-index,
+sklearn, openpyxl)이 부팅 시점에 올라오지 않는지와 -X importtime 누적 시간이 예산 안인지,
+워밍업 단계 기록과 완료 전 readiness 503 을 확인한다.
+
+실행:
+    cd backend && python -m pytest tests/test_import_budget.py -v
+"""
+
+import asyncio
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.core.warmup import Warmup
+
+# 지연 import 대상 — 첫 사용 또는 워밍업에서만 로드되어야 함
+HEAVY_MODULES = ["google.genai", "openai", "faiss", "llama_index", "sklearn", "openpyxl"]
+
+# app.main import 누적 시간 상한 (초). 지연 import 적용 후 ~2-4s — 회귀 감지용으로 여유 있게
+IMPORT_BUDGET_SEC = 8.0
+
+_PROBE = (
+    "import json, sys; import app.main; "
+    f"print('LOADED=' + json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+)
+
+
+@pytest.fixture(scope="module")
+def cold_import():
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE],
+        cwd=BACKEND_DIR, capture_output=True, text=True, timeout=120,
+    )
+    if proc.returncode != 0:
+        pytest.skip(f"app.main import 불가 (의존성/환경): {proc.stderr.strip().splitlines()[-1:]}")
+    return proc
+
+
+def test_heavy_modules_not_loaded_at_boot(cold_import):
+    loaded = re.search(r"^LOADED=(.*)$", cold_import.stdout, re.M)
+    assert loaded and json.loads(loaded.group(1)) == []
+
+
+def test_app_main_import_within_budget(cold_import):
+    m = re.search(r"^import time:\s+\d+ \|\s+(\d+) \| app\.main$", cold_import.stderr, re.M)
+    assert m, "importtime 출력에 app.main 없음"
+    assert int(m.group(1)) / 1e6 < IMPORT_BUDGET_SEC
+
+
+@pytest.mark.asyncio
+async def test_warmup_records_steps_and_gates_readiness():
+    from app.api.v1.endpoints import health
+    from app.core import warmup as warmup_mod
+
+    gate = asyncio.Event()
+
+    async def _slow():
+        await gate.wait()
+
+    async def _boom():
+        raise RuntimeError("index missing")
+
+    async def _absent():
+        return "not_loaded"
+
+    w = Warmup([("slow", _slow), ("boom", _boom), ("absent", _absent)])
+    warmup_mod.warmup, saved = w, warmup_mod.warmup
+    try:
+        task = w.start()
+        await asyncio.sleep(0)
+        resp = health.Response()
+        body = await health.health_ready(resp)
+        assert resp.status_code == 503 and body["warmup"]["steps"]["slow"]["status"] == "running"
+
+        gate.set()
+        await task
+        resp = health.Response()
+        body = await health.health_ready(resp)
+        assert resp.status_code == 200 and body["ready"]
+        steps = body["warmup"]["steps"]
+        assert [s["status"] for s in steps.values()] == ["ok", "failed", "skipped"]
+        assert steps["boom"]["detail"] == "index missing" and all("ms" in s for s in steps.values())
+        assert w.start() is task  # 재실행 없음
+    finally:
+        warmup_mod.warmup = saved
@@ -0,0 +1,141 @@
+"""
+rag_index/ingest_pipeline.py 인제스트 파이프라인 테스트.
+
+실제 OpenAI 호출 없이 가짜 임베딩 함수로 배치 분할, 재시도,
+캐시 재사용, 단계별 메트릭 집계를 확인한다.
+
+실행:
+    cd backend && python -m pytest tests/test_ingest_pipeline.py -v
+"""
+
+import hashlib
+import importlib
+import sys
+import threading
+from pathlib import Path
+from typing import List
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+_DEPS_AVAILABLE = (
+    importlib.util.find_spec("faiss") is not None
+    and importlib.util.find_spec("numpy") is not None
+)
+pytestmark = pytest.mark.skipif(not _DEPS_AVAILABLE, reason="faiss/numpy 미설치 — 서버 환경에서 실행 필요")
+
+DIM = 4
+
+
+def _fake_vector(text: str) -> List[float]:
+    digest = hashlib.md5(text.encode("utf-8")).digest()
+    return [b / 255.0 for b in digest[:DIM]]
+
+
+class _FlakyEmbedder:
+    """처음 fail_times번은 429 흉내 예외, 이후 정상 응답"""
+
+    def __init__(self, fail_times: int = 0):
+        self.fail_times = fail_times
+        self.calls: List[List[str]] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, texts: List[str]) -> List[List[float]]:
+        with self._lock:
+            if self.fail_times > 0:
+                self.fail_times -= 1
+                err = RuntimeError("rate limited")
+                err.status_code = 429
+                raise err
+            self.calls.append(list(texts))
+        return [_fake_vector(t) for t in texts]
+
+
+def _docs(tmp_path: Path, n: int):
+    docs = []
+    for i in range(n):
+        path = tmp_path / f"doc{i}.txt"
+        path.write_text(f"문서 {i} 내용", encoding="utf-8")
+        docs.append((f"hospital/doc{i}.txt", path, "hospital"))
+    return docs
+
+
+def _run(pipeline, docs):
+    written, documents = [], {}
+    pipeline.run(
+        docs, "H1",
+        on_document=lambda key, chunks: documents.__setitem__(key, chunks),
+        on_batch=lambda chunks, vectors: written.append((chunks, vectors)),
+    )
+    return documents, written
+
+
+def test_split_oversized_keeps_page_labels():
+    from app.services.rag_index.ingest_pipeline import split_oversized
+
+    chunk = {"text": "\n".join(["가" * 40] * 5), "metadata": {"page_label": "3", "file_name": "a.pdf"}}
+    parts = split_oversized(chunk, max_chars=100)
+
+    assert len(parts) == 3
+    assert all(len(p["text"]) <= 100 for p in parts)
+    assert [p["metadata"]["page_label"] for p in parts] == ["3#1", "3#2", "3#3"]
+    assert split_oversized({"text": "짧음", "metadata": {"page_label": "1"}}, 100)[0]["text"] == "짧음"
+
+
+def test_batches_respect_item_and_token_limits(tmp_path: Path):
+    from app.services.rag_index import EmbeddingCache
+    from app.services.rag_index.ingest_pipeline import IngestPipeline
+
+    embedder = _FlakyEmbedder()
+    cache = EmbeddingCache(tmp_path / "_cache.sqlite3", "fake-model")
+    pipeline = IngestPipeline(embedder, cache, parse_workers=0, embed_workers=2,
+                              max_batch_items=3, max_batch_tokens=20)
+    documents, written = _run(pipeline, _docs(tmp_path, 7))
+
+    assert len(documents) == 7
+    assert sum(len(chunks) for chunks, _ in written) == 7
+    assert all(len(batch) <= 3 for batch in embedder.calls)
+    # "문서 N 내용" = 7토큰 추정 → 토큰 한도 20이면 배치당 최대 2개
+    assert max(len(batch) for batch in embedder.calls) == 2
+    metrics = pipeline.metrics.to_dict()
+    assert metrics["stages"]["parse"]["items"] == 7
+    assert metrics["stages"]["embed"]["items"] == 7
+    assert metrics["stages"]["write"]["items"] == 7
+    assert metrics["embed_requests"] == len(embedder.calls)
+
+
+def test_rate_limit_retry_and_cache_reuse(tmp_path: Path, monkeypatch):
+    from app.services.rag_index import EmbeddingCache
+    from app.services.rag_index import ingest_pipeline
+    from app.services.rag_index.ingest_pipeline import IngestPipeline
+
+    monkeypatch.setattr(ingest_pipeline.time, "sleep", lambda sec: None)
+    cache = EmbeddingCache(tmp_path / "_cache.sqlite3", "fake-model")
+    docs = _docs(tmp_path, 3)
+
+    embedder = _FlakyEmbedder(fail_times=2)
+    first = IngestPipeline(embedder, cache, parse_workers=0, embed_workers=1)
+    _, written = _run(first, docs)
+    assert first.metrics.embed_retries == 2
+    assert sum(len(chunks) for chunks, _ in written) == 3
+
+    # 같은 내용 재실행 → 전부 캐시 적중, 임베딩 호출 없음
+    again = _FlakyEmbedder()
+    second = IngestPipeline(again, cache, parse_workers=0)
+    _, written = _run(second, docs)
+    assert again.calls == []
+    assert second.metrics.cache_hits == 3
+    assert sum(len(chunks) for chunks, _ in written) == 3
+
+
+def test_parse_failure_skips_document(tmp_path: Path):
+    from app.services.rag_index import EmbeddingCache
+    from app.services.rag_index.ingest_pipeline import IngestPipeline
+
+    docs = _docs(tmp_path, 2) + [("hospital/missing.txt", tmp_path / "missing.txt", "hospital")]
+    pipeline = IngestPipeline(_FlakyEmbedder(), EmbeddingCache(tmp_path / "_c.sqlite3", "m"), parse_workers=0)
+    documents, _ = _run(pipeline, docs)
+
+    assert set(documents) == {"hospital/doc0.txt", "hospital/doc1.txt"}
+    assert pipeline.metrics.parse_failures == 1
@@ -0,0 +1,109 @@
+"""
+utils/keyword_matcher.py 다중 키워드 매처와 chat_tagging_service 규칙 태깅 테스트.
+
+키워드 조각을 섞은 무작위 대화로 기존 `kw in text` 반복 방식과
+한 번 스캔(scan) 결과가 같은지 확인한다.
+
+실행:
+    cd backend && python -m pytest tests/test_keyword_matcher.py -v
+"""
+
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services import chat_tagging_service as cts
+from app.utils.keyword_matcher import KeywordMatcher
+
+
+def test_shared_keywords_compiled_once():
+    matcher = KeywordMatcher({"f": {"a": ["he", "she"], "b": ["he", "his"]}, "g": {"c": ["she"]}})
+    assert matcher.vocabulary == ("he", "his", "she")
+    result = matcher.scan(["ushers", "his"])
+    assert result.counts == {"she": 1, "he": 1, "his": 1}
+    assert result.tags("f") == {"a": 2, "b": 2}
+    assert result.segment_tags(1, "f") == ["b"]
+    assert result.distinct("f") == 4  # tag 별로 셈 ("he" 는 a, b 양쪽)
+
+
+def test_match_across_separator_counts_only_for_joined_text():
+    matcher = KeywordMatcher({"f": {"x": ["안 돼"]}})
+    result = matcher.scan(["정말 안", "돼요"])
+    assert "안 돼" in result
+    assert result.segment_tags(0, "f") == [] and result.segment_tags(1, "f") == []
+
+
+def _vocabulary():
+    words = set()
+    for groups in (cts.INTEREST_KEYWORDS, cts.SENTIMENT_KEYWORDS, cts.NUTRITION_KEYWORDS, cts.INTENT_KEYWORDS):
+        for kws in groups.values():
+            words.update(kws)
+    words.update(cts.ACTION_INTENT_ACTIVE + cts.ACTION_INTENT_CONSIDERING)
+    words.update(cts.BUYING_SIGNAL_HIGH + cts.BUYING_SIGNAL_MID)
+    return sorted(words)
+
+
+def _random_conversation(rng, vocab):
+    filler = ["검진", "결과", "요", "네", " ", "수치가", "좀", "?", "어", "안", "돼"]
+    messages = []
+    for _ in range(rng.randint(0, 6)):
+        pieces = [rng.choice(vocab if rng.random() < 0.3 else filler) for _ in range(rng.randint(1, 8))]
+        messages.append({"role": rng.choice(["user", "user", "assistant"]), "content": "".join(pieces)})
+    return messages
+
+
+def _naive_engagement_topics(messages):
+    counts = {}
+    for msg in (m["content"] for m in messages if m.get("role") == "user"):
+        for tag, kws in cts.INTEREST_KEYWORDS.items():
+            if any(kw in msg for kw in kws):
+                counts[tag] = counts.get(tag, 0) + 1
+    return counts
+
+
+def test_rule_taggers_match_naive_scan():
+    rng = random.Random(7)
+    vocab = _vocabulary()
+    for _ in range(300):
+        messages = _random_conversation(rng, vocab)
+        user_msgs = [m["content"] for m in messages if m["role"] == "user"]
+        text = " ".join(user_msgs)
+        scanned = cts.scan(messages)
+
+        assert cts.extract_interest_tags(messages) == [
+            t for t, kws in cts.INTEREST_KEYWORDS.items() if any(kw in text for kw in kws)
+        ]
+        assert cts.extract_nutrition_tags(messages, scanned) == [
+            t for t, kws in cts.NUTRITION_KEYWORDS.items() if any(kw in text for kw in kws)
+        ]
+        assert set(cts.extract_keyword_tags(messages, scanned)) == {
+            kw for kws in cts.INTEREST_KEYWORDS.values() for kw in kws if kw in text
+        }
+        expected_action = ("active" if any(kw in text for kw in cts.ACTION_INTENT_ACTIVE)
+                           else "considering" if any(kw in text for kw in cts.ACTION_INTENT_CONSIDERING)
+                           else "passive")
+        assert cts.detect_action_intent(messages, scanned) == expected_action
+        expected_buying = ("high" if any(kw in text for kw in cts.BUYING_SIGNAL_HIGH)
+                           else "mid" if any(kw in text for kw in cts.BUYING_SIGNAL_MID) else "low")
+        assert cts.extract_buying_signal(messages, scanned) == expected_buying
+
+        expected_sentiment = "neutral"
+        if user_msgs:
+            expected_sentiment = next((s for s, kws in cts.SENTIMENT_KEYWORDS.items()
+                                       if any(kw in user_msgs[-1] for kw in kws)), "neutral")
+        assert cts.detect_sentiment(messages, scanned) == expected_sentiment
+
+        topics = {}
+        for i in range(len(scanned.texts)):
+            for tag in scanned.segment_tags(i, "interest"):
+                topics[tag] = topics.get(tag, 0) + 1
+        assert topics == _naive_engagement_topics(messages)
+
+
+def test_classify_conversation_intent():
+    assert cts.classify_conversation_intent([]) == "off_topic"
+    assert cts.classify_conversation_intent([{"role": "user", "content": "안녕하세요"}]) == "greeting"
+    assert cts.classify_conversation_intent([{"role": "user", "content": "다운로드 버튼이 먹통이에요"}]) == "ux_issue"
+    assert cts.classify_conversation_intent([{"role": "user", "content": "혈압 화면이 안 열려요"}]) == "health_question"
@@ -0,0 +1,97 @@
+"""
+llm_usage_logger 배치 기록 테스트.
+
+가짜 _write_sync 로 실제 DB 없이
+FLUSH_ROWS 도달 즉시 / FLUSH_INTERVAL_MS 경과 시 다중 행 flush, 기존 행 스키마 유지,
+DB 장애·버퍼 초과 시 버림 집계, 종료 시 남은 행 flush 를 확인한다.
+
+실행:
+    cd backend && python -m pytest tests/test_llm_usage_logger.py -v
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services import llm_usage_logger as mod
+from app.services.llm_usage_logger import llm_usage_logger
+
+
+@pytest.fixture
+def writes(monkeypatch):
+    batches = []
+    state = {"down": False}
+
+    def _write(rows):
+        if state["down"]:
+            raise ConnectionError("db down")
+        batches.append(list(rows))
+
+    llm_usage_logger._reset()
+    monkeypatch.setattr(mod.LLMUsageLogger, "_write_sync", staticmethod(_write))
+    monkeypatch.setattr(mod, "FLUSH_ROWS", 5)
+    monkeypatch.setattr(mod, "FLUSH_INTERVAL_MS", 50)
+    yield batches, state
+    if llm_usage_logger._flusher is not None:
+        llm_usage_logger._flusher.cancel()
+    llm_usage_logger._reset()
+
+
+def _log(i, **kw):
+    llm_usage_logger.log(model="gemini", endpoint="rag_chat", session_id=f"s{i}", input_tokens=i, **kw)
+
+
+@pytest.mark.asyncio
+async def test_rows_flushed_in_batches_by_size_and_interval(writes):
+    batches, _ = writes
+    for i in range(5):
+        _log(i)
+    await asyncio.sleep(0.01)
+    assert [len(b) for b in batches] == [5]  # FLUSH_ROWS 도달 — 주기 전 즉시 1회
+    assert batches[0][0] == ("gemini", "rag_chat", "s0", None, None, 0, 0, 0, None, True, None, None)
+    assert len(batches[0][0]) == len(mod._COLUMNS)
+
+    _log(9, ttft_ms=120, success=False, error_class="Timeout")
+    await asyncio.sleep(0.01)
+    assert len(batches) == 1
+    await asyncio.sleep(0.08)  # FLUSH_INTERVAL_MS 경과
+    assert batches[1] == [("gemini", "rag_chat", "s9", None, None, 9, 0, 0, None, False, "Timeout", 120)]
+    assert llm_usage_logger.stats() == {
+        "buffered": 0, "written": 6, "dropped": 0, "flushes": 2, "failed_flushes": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_db_down_and_overflow_drop_with_counter(writes, monkeypatch):
+    batches, state = writes
+    state["down"] = True
+    for i in range(7):
+        _log(i)
+    await asyncio.sleep(0.01)
+    # 실패한 묶음(5행)만 버림, 나머지는 다음 회차 대기
+    assert llm_usage_logger.stats()["dropped"] == 5 and llm_usage_logger.stats()["buffered"] == 2
+
+    monkeypatch.setattr(mod, "MAX_BUFFERED_ROWS", 3)
+    _log(7)
+    _log(8)  # 상한 초과 — 버림
+    assert llm_usage_logger.stats()["buffered"] == 3 and llm_usage_logger.dropped == 6
+
+    state["down"] = False
+    await llm_usage_logger.stop()
+    assert [r[2] for b in batches for r in b] == ["s5", "s6", "s7"]
+    assert llm_usage_logger.stats()["buffered"] == 0 and llm_usage_logger._flusher is None
+
+
+@pytest.mark.asyncio
+async def test_log_split_rows_go_through_buffer(writes):
+    batches, _ = writes
+    llm_usage_logger.log_split(
+        model="m", endpoint="chat_tagging", shares={"a": {"input": 1}, "b": {"input": 3}},
+        input_tokens=100, output_tokens=10,
+    )
+    await llm_usage_logger.stop()
+    assert [(r[2], r[5]) for r in batches[0]] == [("a", 25), ("b", 75)]
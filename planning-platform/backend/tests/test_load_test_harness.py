@@ -0,0 +1,175 @@
+"""
+오프라인 부하 테스트 하네스 테스트 — scripts/load_test (대역 + 드라이버).
+
+in-memory Redis 대역에 redis-py(동기/비동기)로 붙어 명령·파이프라인·pub/sub 을 확인하고,
+FakeLLM 의 지연·스트리밍 교체와 원복, 합성 FAISS 인덱스를 FAISSVectorSearch 로 읽는 경로,
+드라이버의 백분위·기준선 비교·closed-loop 실행(작은 ASGI 앱 대상)을 확인한다.
+
+실행:
+    cd backend && python -m pytest tests/test_load_test_harness.py -v
+"""
+
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.load_test import run as driver
+from scripts.load_test.scenarios import Patient, ScenarioMix, parse_mix, synthetic_patient
+from scripts.load_test.standins import FakeLLM, FakeOpenAI, InMemoryRedisServer, build_synthetic_faiss
+
+redis = pytest.importorskip("redis")
+
+
+@pytest.fixture(scope="module")
+def redis_standin():
+    server = InMemoryRedisServer()
+    server.start()
+    yield server
+    server.stop()
+
+
+def test_redis_standin_commands(redis_standin):
+    r = redis.Redis.from_url(redis_standin.url, decode_responses=True)
+    assert r.ping()
+    assert r.set("k", "v", ex=60) and r.get("k") == "v" and 0 < r.ttl("k") <= 60
+    assert r.set("k", "x", nx=True) is None and r.get("k") == "v"
+    assert r.incr("n") == 1 and r.incrby("n", 4) == 5
+    assert r.hset("h", mapping={"a": "1", "b": "2"}) == 2 and r.hgetall("h") == {"a": "1", "b": "2"}
+    assert r.rpush("l", "x", "y", "z") == 3 and r.lrange("l", 0, -1) == ["x", "y", "z"]
+    assert r.sadd("s", "a", "b") == 2 and r.smembers("s") == {"a", "b"}
+    assert sorted(r.keys("*")) == ["h", "k", "l", "n", "s"]
+    with pytest.raises(redis.ResponseError):
+        r.lpush("k", "x")  # WRONGTYPE
+    r.psetex("short", 50, "1")
+    time.sleep(0.08)
+    assert r.get("short") is None and r.exists("short") == 0
+
+    pipe = r.pipeline()  # MULTI/EXEC
+    pipe.set("p", "1").incr("p").get("p")
+    assert pipe.execute() == [True, 2, "2"]
+    assert r.delete("k", "h", "l", "n", "s", "p") == 6
+
+
+@pytest.mark.asyncio
+async def test_redis_standin_async_pubsub(redis_standin):
+    import redis.asyncio as aioredis
+
+    r = aioredis.from_url(redis_standin.url, decode_responses=True)
+    pubsub = r.pubsub()
+    await pubsub.subscribe("ch")
+    assert (await pubsub.get_message(timeout=1))["type"] == "subscribe"
+    assert await r.publish("ch", "hello") == 1
+    msg = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1)
+    assert msg["data"] == "hello"
+    await pubsub.unsubscribe("ch")
+    await pubsub.aclose() if hasattr(pubsub, "aclose") else await pubsub.close()
+    await r.aclose() if hasattr(r, "aclose") else await r.close()
+
+
+@pytest.mark.asyncio
+async def test_fake_llm_replaces_and_restores_services():
+    from app.services.gemini_service import GeminiRequest, GeminiService
+    from app.services.gpt_service import GPTRequest, GPTService
+
+    original = GeminiService.__dict__["call_api"]
+    llm = FakeLLM(ttft_ms=20, token_ms=2, tokens=10).install()
+    try:
+        gemini = GeminiService()
+        t0 = time.perf_counter()
+        resp = await gemini.call_api(GeminiRequest(prompt="x", response_format={"type": "json_object"}))
+        assert time.perf_counter() - t0 >= 0.04
+        assert resp.success and resp.content.startswith("{") and resp.usage["output_tokens"] == 10
+
+        t0 = time.perf_counter()
+        chunks, first = [], None
+        async for chunk in gemini.stream_api(GeminiRequest(prompt="x")):
+            first = first or time.perf_counter() - t0
+            chunks.append(chunk)
+        assert first >= 0.02 and len(chunks) >= 1 and "".join(chunks).strip()
+
+        gpt = GPTService()
+        await gpt.initialize()
+        out = await gpt.call_api(GPTRequest(system_message="s", user_message="u"))
+        assert out.success and out.model == "loadtest"
+        assert llm.calls == 3 and llm.streams == 1
+    finally:
+        llm.uninstall()
+    assert GeminiService.__dict__["call_api"] is original
+
+
+def test_synthetic_faiss_index_loads(tmp_path, monkeypatch):
+    pytest.importorskip("faiss")
+    from app.services.checkup_design import vector_search
+
+    build_synthetic_faiss(tmp_path, n_docs=200, dim=32)
+    monkeypatch.setattr(vector_search, "OpenAI", lambda api_key=None: FakeOpenAI(api_key, dim=32, latency_ms=0))
+    vs = vector_search.FAISSVectorSearch(faiss_dir=str(tmp_path), openai_api_key="sk-loadtest")
+    assert vs.index.ntotal == 200 and len(vs.docstore) == 200
+
+    query = vs.docstore["loadtest-000042"]["text"]  # 같은 텍스트 → 같은 임베딩 → 최근접 1위
+    hits = vs.search(query, top_k=3)
+    assert hits[0]["text"] == query and hits[0]["metadata"]["file_name"].startswith("loadtest_")
+
+
+def test_percentile_and_baseline_comparison():
+    values = list(range(1, 101))
+    assert driver.percentile(values, 50) == 50 and driver.percentile(values, 99) == 99
+    assert driver.percentile([], 95) is None
+
+    def _report(p95, err):
+        return {"scenarios": {"chat": {"latency_ms": {"p95": p95}, "error_rate": err}}}
+
+    assert driver.compare_to_baseline(_report(115, 0.0), _report(100, 0.0), 0.2) == []
+    regressions = driver.compare_to_baseline(_report(130, 0.05), _report(100, 0.0), 0.2)
+    assert len(regressions) == 2 and regressions[0].startswith("chat: p95")
+
+
+def test_scenario_mix_drops_unavailable_scenarios():
+    patient, initial = synthetic_patient(random.Random(1))
+    assert patient.uuid.startswith("loadtest-") and {"health_metrics", "patient_info"} <= set(initial)
+    mix = ScenarioMix([patient], weights=parse_mix("chat=2,report=1,checkup_design=1,partner_office=1"))
+    assert mix.weights == {"chat": 2, "report": 1}  # 실환자·토큰 없으면 제외
+    spec = mix.next(random.Random(0))
+    assert spec.scenario in ("chat", "report") and patient.uuid in str(spec.json or "") + spec.path
+    with pytest.raises(ValueError):
+        ScenarioMix([patient], weights={"unknown": 1})
+
+
+@pytest.mark.asyncio
+async def test_run_load_against_asgi_app():
+    app = FastAPI()
+
+    @app.post("/welno-api/v1/welno-rag-chat/message")
+    async def chat():
+        async def _gen():
+            await asyncio.sleep(0.01)
+            yield "data: a\n\n"
+            await asyncio.sleep(0.01)
+            yield "data: b\n\n"
+        return StreamingResponse(_gen(), media_type="text/event-stream", headers={"Server-Timing": "llm;dur=20"})
+
+    @app.get("/welno-api/v1/partner-office/mediarc-report/{uuid}")
+    async def mediarc_report(uuid: str):
+        await asyncio.sleep(0.005)
+        return {"uuid": uuid}
+
+    mix = ScenarioMix([Patient("loadtest-1", "H1")], weights={"chat": 1, "report": 1, "simulate": 1})
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+        result = await driver.run_load(client, mix, concurrency=4, duration_sec=0.5, warmup_sec=0.1, seed=3)
+
+    s = result["scenarios"]
+    assert set(s) == {"chat", "report", "simulate"} and result["requests"] > 10
+    assert s["chat"]["ttfb_ms"]["p50"] <= s["chat"]["latency_ms"]["p50"]
+    assert s["chat"]["server_timing_avg_ms"] == {"llm": 20.0}
+    assert s["simulate"]["status"] == {"404": s["simulate"]["requests"]} and s["simulate"]["error_rate"] == 0
+    assert result["config"]["concurrency"] == 4 and result["throughput_rps"] > 0
@@ -0,0 +1,120 @@
+"""
+마일스톤 시뮬레이션 그리드 테스트 — engine.compute_milestone_grid, POST /simulate/grid.
+
+엔진 내장 샘플 환자로 그리드 각 칸이 단건 compute_milestone_scenario 와 같은지,
+가짜 환자 조회 / db_manager 로 엔드포인트 캐시 저장·재사용과 칸 수 상한을 확인한다.
+
+실행:
+    cd backend && python -m pytest tests/test_milestone_grid.py -v
+"""
+
+import itertools
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.api.v1.endpoints import partner_office
+from app.services.report_engine import engine
+
+
+def _sample(variant):
+    name, patient = next(iter(engine.PATIENTS.items()))
+    p = dict(patient, **variant)
+    return p, engine.run_for_patient(name, p)["diseases"]
+
+
+@pytest.mark.parametrize("variant", [{}, {"smoking": "current", "drinking": "heavy", "tg": None, "hdl": None}])
+@pytest.mark.parametrize("axis", ["bmi", "weight"])
+def test_grid_cells_match_single_scenario(variant, axis):
+    patient, diseases = _sample(variant)
+    kw = dict(smoking_targets=[None, "quit"], drinking_targets=[None, "none"], time_horizons=[0, 6, 60],
+              exercise_target="light")
+    if axis == "bmi":
+        kw["bmi_targets"] = [None, 18.0, 22.9, 25.0, 29.9, 30.0, 33.5]
+    else:
+        kw["weight_deltas"] = [0, 2, 5, 10, 25]
+    grid = engine.compute_milestone_grid(patient, diseases, **kw)
+
+    B, S, D, T = grid["shape"]
+    assert grid["order"] == ["bmi", "smoking", "drinking", "time"]
+    for b, s, d, t in itertools.product(range(B), range(S), range(D), range(T)):
+        milestone = {
+            "smoking_target": grid["axes"]["smoking_target"][s],
+            "drinking_target": grid["axes"]["drinking_target"][d],
+            "time_horizon_months": grid["axes"]["time_horizon_months"][t],
+            "exercise_target": "light",
+        }
+        if axis == "bmi":
+            milestone["bmi_target"] = grid["axes"]["bmi_target"][b]
+        else:
+            milestone["weight_delta_kg"] = grid["axes"]["weight_delta_kg"][b]
+        single = engine.compute_milestone_scenario(patient, diseases, milestone)
+        idx = ((b * S + s) * D + d) * T + t
+        assert {k: v[idx] for k, v in grid["ratios"].items()} == single["ratios"], milestone
+        assert grid["improved_sbp"][b][d] == single["improved_sbp"]
+        assert grid["improved_dbp"][b][d] == single["improved_dbp"]
+        assert grid["improved_fbg"][b] == single["improved_fbg"]
+
+
+def test_grid_rejects_oversized_or_ambiguous_axes():
+    patient, diseases = _sample({})
+    with pytest.raises(ValueError):
+        engine.compute_milestone_grid(patient, diseases, bmi_targets=[20.0], weight_deltas=[1.0])
+    with pytest.raises(ValueError):
+        engine.compute_milestone_grid(
+            patient, diseases, bmi_targets=[15 + i * 0.01 for i in range(engine.MAX_GRID_CELLS)],
+            time_horizons=[0, 6],
+        )
+
+
+class _FakeDB:
+    def __init__(self):
+        self.rows = {}
+
+    async def execute_update(self, query, params=None):
+        uuid, hospital_id, digest, _input, result, _ver = params
+        self.rows[(uuid, hospital_id, digest)] = result
+        return 1
+
+    async def execute_query(self, query, params=None):
+        import json
+        hit = self.rows.get(params)
+        return [{"result_json": json.loads(hit), "input_json": {}, "generated_at": None}] if hit else []
+
+
+@pytest.mark.asyncio
+async def test_grid_endpoint_caches_by_digest(monkeypatch):
+    patient, diseases = _sample({})
+    calls = []
+
+    async def _fetch(uuid, hospital_id):
+        calls.append(uuid)
+        return patient, diseases
+
+    db = _FakeDB()
+    monkeypatch.setattr(partner_office, "ENGINE_AVAILABLE", True)
+    monkeypatch.setattr(partner_office, "_fetch_engine_patient_and_disease_results", _fetch)
+    monkeypatch.setattr(partner_office, "db_manager", db)
+
+    body = partner_office.SimulateGridRequest(
+        bmi_target={"start": 17.0, "stop": 40.0, "step": 0.1},
+        smoking_target=[None, "quit"], time_horizon_months=[0, 12],
+    )
+    first = await partner_office.post_simulate_grid("u1", body, hospital_id="H1")
+    assert first.shape == [231, 2, 1, 2] and not first.cached
+    assert all(len(v) == 231 * 4 for v in first.ratios.values())
+    assert len(db.rows) == 1
+
+    second = await partner_office.post_simulate_grid("u1", body, hospital_id="H1")
+    assert second.cached and second.ratios == first.ratios and second.input_digest == first.input_digest
+
+    with pytest.raises(HTTPException) as exc:
+        await partner_office.post_simulate_grid("u1", partner_office.SimulateGridRequest(
+            bmi_target={"start": 15.0, "stop": 45.0, "step": 0.01},
+            time_horizon_months=[0, 6],
+        ), hospital_id="H1")
+    assert exc.value.status_code == 400
@@ -0,0 +1,111 @@
+"""
+건기식 스토리 카탈로그 테스트.
+
+가짜 story_catalog / _gpt_story 로 실제 DB·GPT 없이
+메모리·카탈로그 적중 시 GPT 미호출, 미스만 세마포어 안에서 동시 생성 후 카탈로그 저장,
+실패(폴백)는 캐시하지 않음, 이름 없이 생성된 스토리의 환자 이름 치환을 확인한다.
+
+실행:
+    cd backend && python -m pytest tests/test_nutrition_story_catalog.py -v
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.report_engine import nutrition_service as ns
+from app.services.report_engine import story_catalog
+
+PATIENT = {"SBP": 145, "FBG": 112, "BMI": 27.4, "ALT": 38, "creatinine": 1.0, "age": 50, "sex": "M"}
+
+
+@pytest.fixture
+def env(monkeypatch):
+    catalog = {}
+    saved = []
+    prompts = []
+
+    async def _get(keys):
+        return {k: catalog[k] for k in keys if k in catalog}
+
+    async def _put(rows):
+        saved.extend(rows)
+        return len(rows)
+
+    async def _gpt(self, prompt):
+        prompts.append(prompt)
+        await asyncio.sleep(0.05)
+        return None if "실패" in prompt else f"고객님께 맞춘 이야기 #{len(prompts)}"
+
+    monkeypatch.setattr(story_catalog, "get_stories", _get)
+    monkeypatch.setattr(story_catalog, "put_stories", _put)
+    monkeypatch.setattr(ns.NutritionService, "_gpt_story", _gpt)
+    monkeypatch.setattr(ns, "_story_memory", ns.OrderedDict())
+    return catalog, saved, prompts
+
+
+def _req(i, prompt="프롬프트"):
+    return ns.StoryRequest(f"k{i}", "recommend", f"영양소{i}", (140, 110, 27, 30), prompt, f"기본 설명 {i}")
+
+
+@pytest.mark.asyncio
+async def test_hits_skip_gpt_and_misses_generate_concurrently(env):
+    catalog, saved, prompts = env
+    ns._remember_story("k0", "메모리 스토리")
+    catalog["k1"] = "카탈로그 스토리"
+
+    reqs = [_req(0), _req(1)] + [_req(i) for i in range(2, 8)]
+    t0 = time.perf_counter()
+    texts, stats = await ns.NutritionService().resolve_stories(reqs, concurrency=6)
+    elapsed = time.perf_counter() - t0
+
+    assert texts[:2] == ["메모리 스토리", "카탈로그 스토리"]
+    assert stats == {"memory_hits": 1, "catalog_hits": 1, "generated": 6, "fallbacks": 0}
+    assert len(prompts) == 6
+    assert elapsed < 0.05 * 6 * 0.7  # 순차(0.3초)보다 확실히 빠름 — 세마포어 6 안에서 동시 실행
+    assert sorted(r[0] for r in saved) == [f"k{i}" for i in range(2, 8)]
+    assert saved[0][1:4] == ("recommend", "영양소2", (140, 110, 27, 30))
+
+    # 두 번째 호출은 전부 메모리 적중 — GPT·카탈로그 저장 없음
+    _, stats = await ns.NutritionService().resolve_stories(reqs)
+    assert stats["memory_hits"] == 8 and len(prompts) == 6 and len(saved) == 6
+
+
+@pytest.mark.asyncio
+async def test_failed_generation_falls_back_without_caching(env):
+    _, saved, prompts = env
+    reqs = [_req(0, "실패 프롬프트"), _req(0, "실패 프롬프트"), _req(1)]
+
+    texts, stats = await ns.NutritionService().resolve_stories(reqs)
+    assert texts[0] == texts[1] == "기본 설명 0"
+    assert stats["fallbacks"] == 2 and stats["generated"] == 1
+    assert len(prompts) == 2  # 같은 키는 한 번만 생성 시도
+    assert [r[0] for r in saved] == ["k1"] and "k0" not in ns._story_memory
+
+
+@pytest.mark.asyncio
+async def test_recommend_personalizes_name_free_catalog_stories(env, monkeypatch):
+    _, saved, prompts = env
+
+    async def _no_rag(self, nutrient_name, rag_query):
+        return {}
+
+    monkeypatch.setattr(ns.NutritionService, "_fetch_rag_evidence", _no_rag)
+    result = await ns.NutritionService().recommend(PATIENT, {"고혈압": {"result": "이상"}}, name="김영희")
+
+    assert prompts and all("김영희" not in p and "환자 이름: 고객" in p for p in prompts)
+    assert all("김영희" not in row[4] for row in saved)
+    stories = [item["desc"] for item in result["recommend"] + result["caution"]]
+    assert stories and all(s.startswith("김영희님께") for s in stories)
+    assert result["meta"]["cached"] is False
+
+    # 같은 구간의 다른 환자는 카탈로그/메모리에서 그대로 재사용, 이름만 바뀜
+    other = dict(PATIENT, SBP=141, BMI=26.6)
+    again = await ns.NutritionService().recommend(other, {"고혈압": {"result": "이상"}}, name="박철수")
+    assert again["meta"]["cached"] is True and again["meta"]["stories"]["generated"] == 0
+    assert all(item["desc"].startswith("박철수님께") for item in again["recommend"])
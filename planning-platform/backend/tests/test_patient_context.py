@@ -0,0 +1,155 @@
+"""
+services/patient_context.py 검진설계 환자 컨텍스트 테스트.
+
+가짜 WelnoDataService 로 실제 DB 없이
+다섯 조회 동시 실행, hospital_id 자동 조회/일반검진 폴백 ID, 요청 내 재사용,
+TTL 캐시 적중, 저장 후 무효화(조회 중 저장 포함), 캐시·세대 보관 상한을 확인한다.
+
+실행:
+    cd backend && python -m pytest tests/test_patient_context.py -v
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services import patient_context
+from app.services.patient_context import (
+    GENERIC_HOSPITAL_ID,
+    invalidate_patient_context,
+    load_patient_context,
+    use_patient_context,
+)
+
+
+class _FakeDataService:
+    def __init__(self, delay=0.05, found_hospital_id="H1"):
+        self.delay = delay
+        self.found_hospital_id = found_hospital_id
+        self.calls = []
+        self.version = 1
+
+    async def _call(self, name, *args):
+        self.calls.append((name,) + args)
+        await asyncio.sleep(self.delay)
+
+    async def get_patient_by_uuid(self, uuid):
+        await self._call("patient", uuid)
+        return {"uuid": uuid, "name": "홍길동"}
+
+    async def find_hospital_id_by_uuid(self, uuid):
+        await self._call("find", uuid)
+        return self.found_hospital_id
+
+    async def get_hospital_by_id(self, hospital_id):
+        await self._call("hospital", hospital_id)
+        return {"hospital_id": hospital_id, "hospital_name": "A병원"}
+
+    async def get_patient_health_data(self, uuid, hospital_id):
+        version = self.version
+        await self._call("health", uuid, hospital_id)
+        return {"health_data": [{"year": "2025", "version": version}]}
+
+    async def get_patient_prescription_data(self, uuid, hospital_id):
+        await self._call("prescription", uuid, hospital_id)
+        return {"error": "처방전 없음"}
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache(monkeypatch):
+    monkeypatch.setattr(patient_context, "_cache", patient_context.TTLCache())
+    monkeypatch.setattr(patient_context, "_generations", patient_context.OrderedDict())
+    monkeypatch.setattr(patient_context.settings, "checkup_patient_context_ttl_sec", 60.0)
+
+
+@pytest.mark.asyncio
+async def test_lookups_run_concurrently_and_resolve_hospital():
+    svc = _FakeDataService(delay=0.05)
+    started = time.monotonic()
+    ctx = await load_patient_context(svc, "u1", "H9")
+    assert time.monotonic() - started < 0.09  # 4회 순차(0.2초)가 아니라 1회분
+    assert sorted(c[0] for c in svc.calls) == ["health", "hospital", "patient", "prescription"]
+    assert ctx.resolved_hospital_id == "H9" and ctx.hospital_info["hospital_name"] == "A병원"
+    assert ctx.health_data == [{"year": "2025", "version": 1}] and ctx.prescription_data == []
+
+    # hospital_id 없음: 자동 조회 후 나머지 동시 (2회분)
+    svc = _FakeDataService(delay=0.05)
+    ctx = await load_patient_context(svc, "u2")
+    assert ctx.resolved_hospital_id == "H1"
+    assert ("health", "u2", "H1") in svc.calls and ("hospital", "H1") in svc.calls
+
+    # 자동 조회도 실패: 병원 조회 생략, 건강/처방은 일반검진 폴백 ID 로
+    svc = _FakeDataService(delay=0, found_hospital_id=None)
+    ctx = await load_patient_context(svc, "u3")
+    assert ctx.resolved_hospital_id == GENERIC_HOSPITAL_ID and ctx.hospital_info == {}
+    assert all(c[0] != "hospital" for c in svc.calls)
+
+
+@pytest.mark.asyncio
+async def test_bound_context_and_cache_are_reused(monkeypatch):
+    svc = _FakeDataService(delay=0)
+    ctx = await load_patient_context(svc, "u1", "H1")
+    with use_patient_context(ctx):
+        assert await load_patient_context(svc, "u1", "H1") is ctx
+    assert len(svc.calls) == 4
+
+    # 요청 간: TTL 안쪽이면 캐시, 동시 요청은 조회 1회로 합침
+    svc = _FakeDataService(delay=0.02)
+    first, second = await asyncio.gather(
+        load_patient_context(svc, "u5", "H1"), load_patient_context(svc, "u5", "H1"),
+    )
+    assert first is second and len(svc.calls) == 4
+    assert await load_patient_context(svc, "u5", "H1") is first and len(svc.calls) == 4
+
+    # TTL 0 이면 요청 간 캐시 없음
+    monkeypatch.setattr(patient_context.settings, "checkup_patient_context_ttl_sec", 0)
+    await load_patient_context(svc, "u5", "H1")
+    assert len(svc.calls) == 8
+
+
+@pytest.mark.asyncio
+async def test_save_invalidates_including_inflight_load():
+    svc = _FakeDataService(delay=0)
+    ctx = await load_patient_context(svc, "u1", "H1")
+    svc.version = 2
+    invalidate_patient_context("u1")
+    fresh = await load_patient_context(svc, "u1", "H1")
+    assert fresh is not ctx and fresh.health_data[0]["version"] == 2
+    # 묶인 컨텍스트도 저장 이후엔 재사용하지 않음
+    invalidate_patient_context("u1")
+    with use_patient_context(fresh):
+        assert await load_patient_context(svc, "u1", "H1") is not fresh
+
+    # 조회 도중 저장 → 그 결과는 버리고 새로 조회
+    svc = _FakeDataService(delay=0.03)
+    task = asyncio.ensure_future(load_patient_context(svc, "u7", "H1"))
+    await asyncio.sleep(0.01)
+    svc.version = 3
+    invalidate_patient_context("u7")
+    ctx = await task
+    assert ctx.health_data[0]["version"] == 3
+
+
+def test_cache_and_generations_are_bounded(monkeypatch):
+    cache = patient_context.TTLCache(max_entries=2, max_age=60.0)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.peek("a", 60)[0]  # a 최근 사용
+    cache.put("c", 3)
+    assert not cache.peek("b", 60)[0] and cache.stats()["entries"] == 2
+
+    # 만료 항목은 다음 put 에서 정리
+    cache._entries["a"] = (1, time.monotonic() - 120)
+    cache.put("d", 4)
+    assert "a" not in cache._entries
+
+    monkeypatch.setattr(patient_context, "MAX_TRACKED_GENERATIONS", 2)
+    for uuid in ("u1", "u2", "u3"):
+        invalidate_patient_context(uuid)
+    assert list(patient_context._generations) == ["u2", "u3"]
+    assert len(set(patient_context._generations.values())) == 2
@@ -0,0 +1,121 @@
+"""
+services/patient_summary.py 환자 목록 (요약 테이블 키셋 페이지네이션) 테스트.
+
+가짜 db_manager / es_service 로 실제 DB·ES 없이
+필터·정렬 SQL 조립, 커서 왕복, 다음 페이지 판정, 오래된 행만 ES 갱신 + 되쓰기를 확인한다.
+
+실행:
+    cd backend && python -m pytest tests/test_patient_summary.py -v
+"""
+
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services import patient_summary
+from app.services.patient_summary import build_patient_list_query, decode_cursor, encode_cursor
+
+
+class _FakeDB:
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+        self.updates = []
+
+    async def execute_query(self, query, params=None):
+        self.queries.append((query, params))
+        if "DISTINCT hospital_name" in query:
+            return [{"hospital_name": "A병원"}, {"hospital_name": "B병원"}]
+        return [dict(r) for r in self.rows[:params[-1]]]
+
+    async def execute_one(self, query, params=None):
+        self.queries.append((query, params))
+        return {"total": len(self.rows)}
+
+    async def execute_update(self, query, params=None):
+        self.updates.append((query, params))
+        return 1
+
+
+class _FakeES:
+    def __init__(self):
+        self.calls = []
+
+    async def journey_summary(self, keys, hospital_id=None, name_keys=()):
+        keys = list(keys)
+        self.calls.append((keys, hospital_id, list(name_keys)))
+        return {k: 7 for k in keys}, {k: f"ES-{k}" for k in name_keys}
+
+    async def download_only_keys(self):
+        return {"k1"}
+
+
+def _row(i, refreshed=None, name="홍길동"):
+    return {
+        "web_app_key": f"k{i}", "patient_name": name, "chat_count": i, "survey_count": 0,
+        "journey_count": 1, "last_activity": datetime(2026, 1, 10 - i, tzinfo=timezone.utc),
+        "hospital_name": "A병원", "journey_refreshed_at": refreshed,
+    }
+
+
+def test_cursor_round_trip_and_invalid():
+    at = datetime(2026, 3, 1, 9, 30, tzinfo=timezone.utc)
+    assert decode_cursor(encode_cursor(at, "키-1")) == (at.isoformat(), "키-1")
+    assert decode_cursor(encode_cursor(12, "k")) == (12, "k")
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_query_applies_filters_and_keyset():
+    page_sql, params, count_sql, count_params = build_patient_list_query(
+        hospital_id="H1", search="50%_", hospital_name="A병원", date_from="2026-01-01",
+        date_to="2026-01-31", activity="survey", sort="chat_count", order="asc",
+        cursor=encode_cursor(3, "k3"), limit=20,
+    )
+    assert params[0] == "H1"
+    assert params[1] == "%50\\%\\_%"
+    assert params[4:7] == ("A병원", "2026-01-01", "2026-01-31")
+    assert "s.survey_count > 0" in page_sql
+    assert "(s.chat_count, s.web_app_key) > (%s::integer, %s)" in page_sql
+    assert "ORDER BY s.chat_count ASC, s.web_app_key ASC" in page_sql
+    assert params[-3:] == (3, "k3", 21)
+    # 건수 SQL 에는 커서/limit 이 빠진다
+    assert count_params == params[:-3] and "s.web_app_key) >" not in count_sql
+
+    page_sql, params, _, _ = build_patient_list_query()
+    assert params == ("", 101)  # 전체 병원 합산 행
+    with pytest.raises(ValueError):
+        build_patient_list_query(sort="web_app_key; DROP")
+
+
+@pytest.mark.asyncio
+async def test_list_patients_pages_and_refreshes_stale_rows(monkeypatch):
+    fresh = datetime.now(timezone.utc) - timedelta(seconds=10)
+    db = _FakeDB([_row(1, refreshed=fresh), _row(2, name=""), _row(3)])
+    es = _FakeES()
+    monkeypatch.setattr(patient_summary, "db_manager", db)
+    monkeypatch.setattr(patient_summary, "es_service", es)
+
+    result = await patient_summary.list_patients(hospital_id="H1", limit=2)
+
+    assert [p["web_app_key"] for p in result["patients"]] == ["k1", "k2"]
+    assert result["total"] == 3 and result["hospital_options"] == ["A병원", "B병원"]
+    assert decode_cursor(result["next_cursor"]) == (_row(2)["last_activity"].isoformat(), "k2")
+    # 최근 갱신된 k1 은 ES 조회 생략, 페이지 밖 k3 도 조회 안 함
+    assert es.calls == [(["k2"], "H1", ["k2"])]
+    k1, k2 = result["patients"]
+    assert k1["journey_count"] == 1 and k1["download_only"] is True
+    assert k2["journey_count"] == 7 and k2["patient_name"] == "ES-k2"
+    journey_sql, journey_params = db.updates[0]
+    assert journey_sql is patient_summary._JOURNEY_WRITEBACK_SQL
+    assert journey_params == (["k2"], [7], "H1")
+    assert db.updates[1] == (patient_summary._ES_NAME_WRITEBACK_SQL, (["k2"], ["ES-k2"]))
+
+    # 다음 페이지는 건수/병원 옵션을 다시 세지 않는다
+    db.queries.clear()
+    result = await patient_summary.list_patients(hospital_id="H1", limit=2, cursor=result["next_cursor"])
+    assert result["total"] is None and len(db.queries) == 1
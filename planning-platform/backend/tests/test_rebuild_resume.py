@@ -0,0 +1,70 @@
+"""
+병원 인덱스 재구축 중단 작업 재개 테스트 — api/v1/endpoints/embedding_management.py
+
+rebuild_status.json 에 running 으로 남은 작업 중 기록한 프로세스가 없는 것만
+같은 모드·파트너로 다시 실행되는지, 살아 있는 워커의 작업은 건드리지 않는지,
+상태 조회가 interrupted 를 올바르게 보고하는지 확인한다.
+
+실행:
+    cd backend && python -m pytest tests/test_rebuild_resume.py -v
+"""
+
+import inspect
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.api.v1.endpoints import embedding_management as em
+
+DEAD_PID = 2 ** 22 + 12345  # pid_max 초과 → 존재할 수 없는 프로세스
+
+
+@pytest.fixture
+def faiss_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(em, "LOCAL_FAISS_BY_HOSPITAL", str(tmp_path))
+    monkeypatch.setattr(em, "_rebuild_status", {})
+    return tmp_path
+
+
+def _write_status(root: Path, hospital_id: str, **status):
+    (root / hospital_id).mkdir(parents=True, exist_ok=True)
+    (root / hospital_id / em.REBUILD_STATUS_FILE).write_text(json.dumps(status), encoding="utf-8")
+
+
+def test_force_defaults_to_incremental():
+    assert inspect.signature(em.trigger_rebuild).parameters["force"].default is False
+
+
+def test_resume_only_interrupted_jobs(faiss_root, monkeypatch):
+    calls = []
+    done = threading.Event()
+
+    def _fake_run(hospital_id, partner_id="welno", force=False):
+        calls.append((hospital_id, partner_id, force))
+        done.set()
+
+    monkeypatch.setattr(em, "_run_rebuild_for_hospital", _fake_run)
+    _write_status(faiss_root, "H1", status="running", mode="full", partner_id="p1", pid=DEAD_PID)
+    _write_status(faiss_root, "H2", status="running", mode="incremental", pid=os.getppid())  # 다른 워커가 진행 중
+    _write_status(faiss_root, "H3", status="completed", mode="incremental", pid=DEAD_PID)
+
+    assert em.resume_interrupted_rebuilds() == ["H1"]
+    assert done.wait(5)
+    assert calls == [("H1", "p1", True)]
+    assert not list((faiss_root / "H1").glob("*.resume-*"))  # 선점 파일 정리
+    assert (faiss_root / "H2" / em.REBUILD_STATUS_FILE).exists()
+
+
+@pytest.mark.asyncio
+async def test_status_reports_interrupted_only_for_dead_writer(faiss_root):
+    _write_status(faiss_root, "H1", status="running", pid=DEAD_PID)
+    _write_status(faiss_root, "H2", status="running", pid=os.getppid())
+
+    assert (await em.get_rebuild_status("H1"))["status"] == "interrupted"
+    assert (await em.get_rebuild_status("H2"))["status"] == "running"
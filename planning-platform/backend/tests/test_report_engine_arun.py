@@ -0,0 +1,91 @@
+"""
+report_engine EngineFacade.arun (async 리포트 생성) 테스트.
+
+가짜 run_for_patient / NutritionService 로 실제 엔진·FAISS·GPT 없이
+결정적 계산이 워커 스레드에서 돌아 이벤트 루프를 막지 않는지, 공용 NutritionService 를
+직접 await 하는지, with_nutrition=False 생략, 추천 시간 초과 시 룰 폴백을 확인한다.
+
+실행:
+    cd backend && python -m pytest tests/test_report_engine_arun.py -v
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.report_engine import facade, nutrition_service
+from app.services.report_engine.facade import EngineFacade
+
+
+class _FakeNutrition:
+    def __init__(self):
+        self.calls = []
+
+    async def recommend_with_fallback(self, patient, diseases, name="", medications=None):
+        self.calls.append((patient, diseases, name))
+        return {"recommend": [{"name": "오메가3"}], "caution": []}
+
+
+@pytest.fixture
+def fake_engine(monkeypatch):
+    threads = []
+
+    def _run_for_patient(name, patient):
+        threads.append(threading.get_ident())
+        time.sleep(0.1)  # 무거운 동기 계산 흉내
+        return {"age": patient["age"], "sex": "M", "bodyage": 41.0, "bodyage_delta": 1.0,
+                "diseases": {"고혈압": {"rank": 10}, "당뇨": {"rank": 80}}}
+
+    monkeypatch.setattr(facade, "ENGINE_AVAILABLE", True)
+    monkeypatch.setattr(facade, "MODEL_LOADED", False)
+    monkeypatch.setattr(facade, "run_for_patient", _run_for_patient)
+    fake = _FakeNutrition()
+    monkeypatch.setattr(nutrition_service, "_shared_service", fake)
+    return threads, fake
+
+
+@pytest.mark.asyncio
+async def test_arun_offloads_engine_and_awaits_shared_nutrition(fake_engine):
+    threads, fake = fake_engine
+    ticks = 0
+
+    async def _ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticker = asyncio.ensure_future(_ticker())
+    report = await EngineFacade().arun(name="홍길동", patient={"age": 40, "sbp": 150})
+    ticker.cancel()
+
+    assert ticks >= 5  # 0.1초 동기 계산 동안 루프가 계속 돎
+    assert threads and threads[0] != threading.get_ident()
+    assert report["name"] == "홍길동" and report["bodyage"]["delta"] == 1.0
+    assert report["nutrition"] == {"recommend": [{"name": "오메가3"}], "caution": []}
+    patient, diseases, name = fake.calls[0]
+    assert patient == {"age": 40, "SBP": 150, "sex": "M"}
+    assert diseases == {"고혈압": {"result": "이상"}, "당뇨": {"result": "정상"}}
+    assert nutrition_service.get_nutrition_service() is fake
+
+    report = await EngineFacade().arun(name="홍길동", patient={"age": 40}, with_nutrition=False)
+    assert report["nutrition"] is None and len(fake.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_recommend_timeout_falls_back_to_rules(monkeypatch):
+    svc = nutrition_service.NutritionService()
+
+    async def _slow(*args, **kwargs):
+        await asyncio.sleep(1)
+
+    monkeypatch.setattr(svc, "recommend", _slow)
+    result = await svc.recommend_with_fallback({"SBP": 150, "age": 40, "sex": "M"}, {}, timeout=0.02)
+    assert result["meta"]["fallback"] is True
+    assert isinstance(result["recommend"], list) and isinstance(result["caution"], list)
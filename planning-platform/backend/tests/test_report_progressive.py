@@ -0,0 +1,171 @@
+"""
+mediArc 리포트 2단계 전달 (progressive) 테스트.
+
+가짜 엔진 / db_manager 로 실제 엔진·DB·GPT 없이
+엔진 블록 즉시 반환 + 캐시, nutrition 백그라운드 작업 합치기·완료 후 캐시 행 갱신,
+같은 input_digest 폴링, 엔진 블록만 캐시된 행의 작업 재시작(리포트 재조회·폴링)을 확인한다.
+
+실행:
+    cd backend && python -m pytest tests/test_report_progressive.py -v
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.api.v1.endpoints import partner_office
+from app.services.report_engine import nutrition_jobs as nj
+
+
+class _FakeEngine:
+    def __init__(self):
+        self.arun_calls = []
+        self.nutrition_calls = 0
+        self.release = asyncio.Event()
+
+    async def arun(self, name, patient, with_nutrition=True):
+        self.arun_calls.append(with_nutrition)
+        return {"group": "A", "bodyage": {"bodyage": 41, "delta": 1, "bioage_gb": None},
+                "rank": 30, "diseases": {"고혈압": {"rank": 10}}, "gauges": {},
+                "nutrition": {"recommend": ["동기"]} if with_nutrition else None}
+
+    async def anutrition(self, name, patient, diseases):
+        self.nutrition_calls += 1
+        await self.release.wait()
+        return {"recommend": [{"name": "오메가3"}], "caution": []}
+
+
+class _FakeDB:
+    def __init__(self):
+        self.updates = []
+        self.state_row = None
+
+    async def execute_update(self, query, params=None):
+        self.updates.append((query, params))
+        return 1
+
+    async def execute_one(self, query, params=None):
+        self.state_params = params
+        return self.state_row
+
+
+@pytest.fixture
+def env(monkeypatch):
+    engine = _FakeEngine()
+    db = _FakeDB()
+    cache = {}
+
+    async def _detail(uuid):
+        return {"name": "홍길동", "hospital_id": "H1", "birth_date": "1985-01-01",
+                "gender": "M", "health_data": {"bmi": 24}}
+
+    async def _get_cached(uuid, hospital_id):
+        return cache.get((uuid, hospital_id))
+
+    monkeypatch.setattr(partner_office, "ENGINE_AVAILABLE", True)
+    monkeypatch.setattr(partner_office, "EngineFacade", lambda: engine)
+    monkeypatch.setattr(partner_office, "to_engine_patient", lambda hd, age, sex: {"bmi": hd["bmi"]})
+    monkeypatch.setattr(partner_office, "mediarc_patient_detail", _detail)
+    monkeypatch.setattr(partner_office, "_report_get_cached", _get_cached)
+    monkeypatch.setattr(partner_office, "_build_ratio_table", lambda p, d: {})
+    monkeypatch.setattr(partner_office, "db_manager", db)
+    monkeypatch.setattr(nj, "nutrition_jobs", nj.NutritionJobs())
+    return engine, db, cache
+
+
+@pytest.mark.asyncio
+async def test_progressive_returns_engine_block_then_nutrition(env):
+    engine, db, _ = env
+    resp = await partner_office.mediarc_report_alias("u1", progressive=True)
+
+    assert engine.arun_calls == [False]
+    assert resp["nutrition"] is None and resp["nutrition_status"] == "pending"
+    assert resp["diseases"] == {"고혈압": {"rank": 10}}
+    digest = resp["input_digest"]
+    upsert_sql, upsert_params = db.updates[0]
+    assert "welno_mediarc_report_cache" in upsert_sql and upsert_params[2] == digest
+
+    state = await partner_office.mediarc_report_nutrition("u1", digest=digest, wait=0)
+    assert state["status"] == "pending"
+
+    engine.release.set()
+    state = await partner_office.mediarc_report_nutrition("u1", digest=digest, wait=1)
+    assert state == {"status": "ready", "nutrition": {"recommend": [{"name": "오메가3"}], "caution": []},
+                     "input_digest": digest}
+    await asyncio.sleep(0)
+    sql, params = db.updates[-1]
+    assert sql is partner_office._REPORT_NUTRITION_SQL
+    assert params[1:] == ("u1", "H1", digest)
+    assert engine.nutrition_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_pending_cache_row_restarts_job_once(env):
+    engine, db, cache = env
+    digest = partner_office._compute_report_digest({"bmi": 24})
+    cache[("u2", "H1")] = {
+        "input_digest": digest, "generated_at": None,
+        "result_json": {"diseases": {"당뇨": {"rank": 80}}, "nutrition": None, "nutrition_status": "pending"},
+    }
+
+    first = await partner_office.mediarc_report_alias("u2", progressive=True)
+    second = await partner_office.mediarc_report_alias("u2", progressive=True)
+    assert first["cached"] and first["nutrition_status"] == "pending" and second["input_digest"] == digest
+    assert engine.arun_calls == []  # 엔진 블록은 캐시 재사용
+    await asyncio.sleep(0)
+    assert engine.nutrition_calls == 1  # 같은 digest 작업은 1개
+
+    # 비-progressive 호출자는 nutrition 완료까지 기다려 받는다
+    engine.release.set()
+    full = await partner_office.mediarc_report_alias("u2", progressive=False)
+    assert full["nutrition"]["recommend"] == [{"name": "오메가3"}] and full["nutrition_status"] == "ready"
+
+    # 작업이 없는(재시작 후) 폴링은 캐시 행 상태로 응답
+    db.state_row = {"nutrition": {"recommend": []}, "nutrition_status": "ready"}
+    state = await partner_office._report_nutrition_state("u9", "d9")
+    assert state["status"] == "ready" and state["nutrition"] == {"recommend": []}
+    assert db.state_params == ("u9", "H1", "d9")  # hospital_id 필터
+    db.state_row = None
+    assert (await partner_office._report_nutrition_state("u9", "d9"))["status"] == "missing"
+
+
+@pytest.mark.asyncio
+async def test_pending_row_without_job_restarts_from_poll(env):
+    """PM2 재시작 후: 메모리 작업 없음 + 캐시 행 pending → 폴링이 작업을 다시 시작."""
+    engine, db, _ = env
+    digest = partner_office._compute_report_digest({"bmi": 24})
+    db.state_row = {"nutrition": None, "nutrition_status": "pending", "diseases": {"당뇨": {"rank": 80}}}
+
+    state = await partner_office._report_nutrition_state("u3", digest)
+    await asyncio.sleep(0)
+    assert state["status"] == "pending" and engine.nutrition_calls == 1
+
+    engine.release.set()
+    state = await partner_office._report_nutrition_state("u3", digest, wait=1)
+    assert state["status"] == "ready" and state["nutrition"]["recommend"] == [{"name": "오메가3"}]
+
+    # 검진 데이터가 바뀐(digest 불일치) 행은 재시작하지 않음 → missing (FE 가 리포트 재조회)
+    assert (await partner_office._report_nutrition_state("u4", "stale"))["status"] == "missing"
+    assert engine.nutrition_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_job_is_restarted():
+    jobs = nj.NutritionJobs()
+    calls = []
+
+    async def _boom():
+        calls.append(1)
+        raise RuntimeError("gpt down")
+
+    task = jobs.start("k", _boom)
+    await asyncio.wait({task})
+    assert jobs.peek("k") == (nj.FAILED, None)
+    task2 = jobs.start("k", _boom)
+    assert task2 is not task
+    await asyncio.wait({task2})
+    assert len(calls) == 2
@@ -0,0 +1,199 @@
+"""
+요청별 지연 분해 테스트 — core/tracing (span, traced, trace_http_request, instrument_redis).
+
+작은 FastAPI 앱에 트레이스 미들웨어를 걸고 db/redis/llm/faiss 구간을 흉내 내어
+Server-Timing 헤더의 카테고리별 self time, 스레드·gather 로 나뉜 span 합산, 샘플링 JSON 로그,
+DatabaseManager / redis-py 계측 지점을 확인한다.
+
+실행:
+    cd backend && python -m pytest tests/test_request_tracing.py -v
+"""
+
+import asyncio
+import json
+import logging
+import re
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core import tracing
+from app.core.config import settings
+from app.core.tracing import RequestTrace, span, traced
+
+
+@traced("faiss", "search")
+def _search():
+    time.sleep(0.03)
+    return ["doc"]
+
+
+@traced("llm")
+async def _llm(delay):
+    await asyncio.sleep(delay)
+    return "answer"
+
+
+@traced("llm", "stream")
+async def _stream():
+    for chunk in ("a", "b"):
+        await asyncio.sleep(0.01)
+        yield chunk
+
+
+def _app():
+    app = FastAPI()
+
+    @app.middleware("http")
+    async def _mw(request: Request, call_next):
+        return await tracing.trace_http_request(request, call_next)
+
+    @app.get("/report")
+    async def report():
+        with span("db", "default"):
+            time.sleep(0.02)
+            with span("redis", "GET"):
+                time.sleep(0.02)
+        docs = await asyncio.to_thread(_search)
+        answers = await asyncio.gather(_llm(0.03), _llm(0.03))
+        chunks = [c async for c in _stream()]
+        return {"docs": docs, "answers": answers, "chunks": chunks}
+
+    @app.get("/plain")
+    async def plain():
+        return {}
+
+    @app.get("/sse")
+    async def sse():
+        with span("db", "default"):
+            time.sleep(0.01)
+
+        async def _body():
+            docs = await asyncio.to_thread(_search)
+            async for chunk in _stream():
+                yield f"data: {chunk}\n\n"
+            yield f"data: {len(docs)}\n\n"
+
+        return StreamingResponse(_body(), media_type="text/event-stream")
+
+    return app
+
+
+def _timing(header):
+    out = {}
+    for part in header.split(", "):
+        m = re.match(r'(\w+);dur=([\d.]+)(?:;desc="(\d+)x")?$', part)
+        assert m, part
+        out[m.group(1)] = (float(m.group(2)), int(m.group(3) or 0))
+    return out
+
+
+def test_server_timing_breaks_down_request(monkeypatch, caplog):
+    monkeypatch.setattr(settings, "tracing_log_sample_rate", 1.0)
+    client = TestClient(_app())
+    with caplog.at_level(logging.INFO, logger=tracing.__name__):
+        resp = client.get("/report")
+    assert resp.status_code == 200 and resp.json()["chunks"] == ["a", "b"]
+
+    t = _timing(resp.headers["Server-Timing"])
+    assert set(t) == {"db", "redis", "faiss", "llm", "app", "total"}
+    # db 는 자식 redis 구간을 뺀 self time
+    assert 15 <= t["db"][0] < 35 and 15 <= t["redis"][0] < 35
+    assert t["faiss"][1] == 1 and t["faiss"][0] >= 25  # to_thread 안에서 돈 span 도 합산
+    assert t["llm"][1] == 3 and t["llm"][0] >= 75  # gather 2건(각각 합산) + 스트림 1건
+    assert t["total"][0] >= 100 and t["app"][0] == 0  # 동시 구간 합이 total 을 넘으면 app 0 하한
+
+    line = next(r.getMessage() for r in caplog.records if r.getMessage().startswith("[trace]"))
+    log = json.loads(line[len("[trace] "):])
+    assert log["path"] == "/report" and log["status"] == 200
+    assert log["counts"] == {"db": 1, "redis": 1, "faiss": 1, "llm": 3}
+    assert [s["cat"] for s in log["spans"]][:2] == ["redis", "db"]  # 종료 순서 기록
+
+
+def test_streaming_body_spans_are_logged_after_body(monkeypatch, caplog):
+    monkeypatch.setattr(settings, "tracing_log_sample_rate", 1.0)
+    with caplog.at_level(logging.INFO, logger=tracing.__name__):
+        resp = TestClient(_app()).get("/sse")
+    assert resp.status_code == 200 and "data: b" in resp.text
+
+    # 헤더는 본문 전에 나감 — 헤더 전 구간(db)만
+    t = _timing(resp.headers["Server-Timing"])
+    assert set(t) == {"db", "app", "total"}
+
+    line = next(r.getMessage() for r in caplog.records if r.getMessage().startswith("[trace]"))
+    log = json.loads(line[len("[trace] "):])
+    assert log["path"] == "/sse" and log["counts"] == {"db": 1, "faiss": 1, "llm": 1}
+    assert log["ms"]["total"] >= log["headers_ms"] + 40  # 스트리밍 구간(faiss 30ms + llm 20ms) 포함
+
+
+def test_untraced_request_and_sampling(monkeypatch, caplog):
+    monkeypatch.setattr(settings, "tracing_log_sample_rate", 0.0)
+    monkeypatch.setattr(settings, "tracing_slow_ms", 10 ** 6)
+    with caplog.at_level(logging.INFO, logger=tracing.__name__):
+        resp = TestClient(_app()).get("/plain")
+    assert set(_timing(resp.headers["Server-Timing"])) == {"app", "total"}
+    assert not [r for r in caplog.records if r.getMessage().startswith("[trace]")]
+    # 트레이스 밖 (백그라운드 등) 에서는 no-op
+    with span("db"):
+        pass
+    assert tracing.current_trace() is None
+
+
+def test_span_limit_keeps_totals():
+    trace = RequestTrace()
+    token = tracing._trace.set(trace)
+    try:
+        for _ in range(tracing.MAX_SPANS + 5):
+            with span("redis"):
+                pass
+    finally:
+        tracing._trace.reset(token)
+    assert trace.totals["redis"][0] == tracing.MAX_SPANS + 5
+    assert len(trace.spans) == tracing.MAX_SPANS and trace.dropped == 5
+
+
+@pytest.mark.asyncio
+async def test_database_and_redis_instrumentation(monkeypatch):
+    redis = pytest.importorskip("redis")
+    from app.core.database import db_manager
+
+    class _Cursor:
+        def execute(self, q, p):
+            time.sleep(0.01)
+
+        def fetchall(self):
+            return [{"n": 1}]
+
+        def close(self):
+            pass
+
+    class _Conn:
+        def cursor(self, cursor_factory=None):
+            return _Cursor()
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(db_manager, "_connect", lambda workload: _Conn())
+    assert tracing.instrument_redis() and tracing.instrument_redis()
+
+    trace = RequestTrace("GET", "/x")
+    token = tracing._trace.set(trace)
+    try:
+        assert await db_manager.execute_query("SELECT 1") == [{"n": 1}]
+        client = redis.Redis(host="127.0.0.1", port=1, socket_connect_timeout=0.2, retry_on_timeout=False)
+        with pytest.raises(redis.ConnectionError):
+            client.ping()
+    finally:
+        tracing._trace.reset(token)
+
+    db, rds = trace.spans[0], trace.spans[-1]
+    assert (db["cat"], db["name"]) == ("db", "default") and db["ms"] >= 9
+    assert (rds["cat"], rds["name"], rds["error"]) == ("redis", "PING", "ConnectionError")
@@ -0,0 +1,119 @@
+"""
+재방문 후보 인덱스 (welno.tb_revisit_candidate_index) 테스트.
+
+가짜 db_manager 로 실제 DB 없이
+태그 저장·대화 로그 추가 시 인덱스 갱신, 갱신 실패 무시, 목록이 인덱스만 읽는지,
+상세 필드 지연/일괄 조회를 확인한다.
+
+실행:
+    cd backend && python -m pytest tests/test_revisit_candidate_index.py -v
+"""
+
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.api.v1.endpoints import partner_office
+from app.services import chat_tagging_service
+
+
+class _FakeDB:
+    def __init__(self, fail_refresh=False):
+        self.fail_refresh = fail_refresh
+        self.queries = []
+        self.updates = []
+
+    async def execute_update(self, query, params=None):
+        if query is chat_tagging_service._REFRESH_REVISIT_SQL and self.fail_refresh:
+            raise RuntimeError("function does not exist")
+        self.updates.append((query, params))
+        return 1
+
+    async def execute_one(self, query, params=None):
+        self.queries.append((query, params))
+        if "FROM welno.tb_partner_rag_chat_log" in query:
+            return {"conversation": [{"role": "user", "content": "안녕하세요"}], "message_count": 1}
+        return {"total": 1, "high_risk_count": 1, "avg_engagement": 42.0}
+
+    async def execute_query(self, query, params=None):
+        self.queries.append((query, params))
+        if "tb_revisit_candidate_index" in query:
+            return [{
+                "session_id": "s1", "patient_name": "홍길동", "hospital_name": "A병원",
+                "user_phone": "010", "checkup_date": "2026-01-02",
+                "interest_tags": '[{"topic": "혈압", "intensity": "high"}]', "medical_tags": ["당뇨"],
+                "risk_level": "high", "engagement_score": 42, "prospect_type": "needs_visit",
+                "partner_type": "hospital", "classification_confidence": 0.9,
+                "follow_up_needed": True, "consultation_requested": False,
+                "last_chat_at": datetime(2026, 1, 5, tzinfo=timezone.utc), "days_since_chat": 3,
+            }]
+        return [{
+            "session_id": "s1", "suggested_revisit_messages": {"care_message": "안부"},
+            "conversation_summary": "요약", "counselor_recommendations": '["내원"]',
+            "key_concerns": None, "lifestyle_tags": ["운동"], "health_metrics": {"bmi": 24},
+        }]
+
+
+@pytest.mark.asyncio
+async def test_save_tags_refreshes_index_and_tolerates_failure(monkeypatch):
+    db = _FakeDB()
+    monkeypatch.setattr(chat_tagging_service, "db_manager", db)
+    await chat_tagging_service._save_tags_to_db({"session_id": "s1", "partner_id": "p"})
+    assert db.updates[-1] == (chat_tagging_service._REFRESH_REVISIT_SQL, ("s1",))
+
+    db = _FakeDB(fail_refresh=True)
+    monkeypatch.setattr(chat_tagging_service, "db_manager", db)
+    await chat_tagging_service._save_tags_to_db({"session_id": "s2", "partner_id": "p"})
+    assert len(db.updates) == 1  # 태그 upsert 는 성공, 인덱스 실패는 무시
+
+
+@pytest.mark.asyncio
+async def test_new_chat_message_refreshes_last_chat_at(monkeypatch):
+    from app.services import welno_rag_chat_service
+
+    db = _FakeDB()
+    monkeypatch.setattr(welno_rag_chat_service, "db_manager", db)
+    monkeypatch.setattr(chat_tagging_service, "db_manager", db)
+    service = welno_rag_chat_service.WelnoRagChatService.__new__(welno_rag_chat_service.WelnoRagChatService)
+    await service.save_chat_log("p", "H1", "u1", "s1", "혈압약 계속 먹어야 하나요?", "user")
+
+    update_sql, _ = db.updates[-2]
+    assert "updated_at = NOW()" in update_sql
+    assert db.updates[-1] == (chat_tagging_service._REFRESH_REVISIT_SQL, ("s1",))
+    # 인덱스의 last_chat_at 은 대화 로그의 최근 갱신 시각에서 가져온다
+    migration = (Path(__file__).parent.parent / "migrations" / "add_revisit_candidate_index.sql").read_text(encoding="utf-8")
+    assert "COALESCE(c.updated_at, c.created_at) AS last_chat_at" in migration
+
+
+@pytest.mark.asyncio
+async def test_list_reads_index_only_and_details_are_lazy(monkeypatch):
+    db = _FakeDB()
+    monkeypatch.setattr(partner_office, "db_manager", db)
+
+    req = partner_office.RevisitCandidatesRequest(hospital_id="H1", filter_type="ai_recommended")
+    result = await partner_office.revisit_candidates(req)
+
+    assert all("tb_partner_rag_chat_log" not in q for q, _ in db.queries)
+    list_sql, params = db.queries[-1]
+    assert "ORDER BY i.sort_score DESC NULLS LAST" in list_sql
+    assert "i.consultation_requested = false" in list_sql
+    assert params == ["H1", 30, 50]
+    c = result["candidates"][0]
+    assert c["health_concerns"] == ["당뇨", "혈압"]
+    assert c["recommended_action"] == "위험수치 확인, 진료 예약 권유"
+    assert c["last_chat_date"] == "2026-01-05"
+    assert "message_variants" not in c
+
+    detail = await partner_office.revisit_candidate_detail("s1")
+    assert detail["message_variants"] == {"care_message": "안부"}
+    assert detail["counselor_recommendations"] == ["내원"] and detail["key_concerns"] == []
+    assert detail["health_metrics"] == {"bmi": 24}
+
+    req = partner_office.RevisitCandidatesRequest(include_details=True)
+    result = await partner_office.revisit_candidates(req)
+    assert result["candidates"][0]["conversation_summary"] == "요약"
+    assert db.queries[-1][1] == (["s1"],)
@@ -0,0 +1,169 @@
+"""
+RAG 채팅 시맨틱 답변 캐시 테스트 — app/services/semantic_answer_cache.py
+
+in-memory Redis 대역(scripts/load_test/standins)에 붙어 유사 질문 hit / 임계값 미만 miss,
+개인화·짧은 답변 저장 제외, 인덱스 파일 변경 시 세대 교체, 병원 단위 무효화,
+범위당 상한 초과 시 오래된 항목 정리, 워커 간 로컬 행렬 갱신을 확인한다.
+
+실행:
+    cd backend && python -m pytest tests/test_semantic_answer_cache.py -v
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+np = pytest.importorskip("numpy")
+redis = pytest.importorskip("redis")
+
+from app.core.config import settings
+from app.services import semantic_answer_cache as semcache
+from app.services.semantic_answer_cache import (
+    SemanticAnswerCache,
+    context_fingerprint,
+    is_personalized,
+    replay_chunks,
+)
+from scripts.load_test.standins import InMemoryRedisServer
+
+ANSWER = (
+    "공복혈당이 높게 나왔다면 식후 혈당과 당화혈색소를 함께 확인하는 것이 좋습니다. "
+    "정제 탄수화물을 줄이고 식후 가벼운 걷기를 꾸준히 하시면 도움이 됩니다. "
+    "증상이 지속되면 내과 진료를 권해 드립니다."
+)
+
+
+@pytest.fixture(scope="module")
+def redis_server():
+    server = InMemoryRedisServer()
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def cache(redis_server, tmp_path, monkeypatch):
+    from app.services.checkup_design import rag_service
+
+    monkeypatch.setattr(rag_service, "LOCAL_FAISS_DIR", str(tmp_path / "global"))
+    monkeypatch.setattr(rag_service, "LOCAL_FAISS_BY_HOSPITAL", str(tmp_path / "hospitals"))
+    monkeypatch.setattr(settings, "rag_semantic_cache_threshold", 0.97)
+    monkeypatch.setattr(settings, "rag_semantic_cache_max_entries", 500)
+    client = redis.Redis.from_url(redis_server.url)
+    client.flushall()
+    return SemanticAnswerCache(client=client)
+
+
+def _vec(seed, dim=64):
+    return np.random.default_rng(seed).normal(size=dim).astype(np.float32)
+
+
+def _near(vec, eps=0.01, seed=99):
+    return vec + eps * np.random.default_rng(seed).normal(size=vec.shape[0]).astype(np.float32)
+
+
+def _scope(cache, hospital="H1", stage="normal"):
+    return cache.scope("welno", hospital, context_fingerprint(True, chat_stage=stage, alert_fields=["fbs"]))
+
+
+def test_store_and_lookup_similar_question(cache):
+    scope = _scope(cache)
+    q = _vec(1)
+    assert cache.store(scope, q, "공복혈당 높으면 어떻게 해요?", ANSWER,
+                       sources=[{"title": "당뇨 지침"}], suggestions=["식단은?"], chat_stage="normal")
+
+    hit = cache.lookup(scope, _near(q))
+    assert hit is not None and hit.answer == ANSWER and hit.similarity >= 0.97
+    assert hit.sources == [{"title": "당뇨 지침"}] and hit.suggestions == ["식단은?"] and hit.chat_stage == "normal"
+
+    assert cache.lookup(scope, _vec(2)) is None  # 다른 질문
+    assert cache.lookup(_scope(cache, stage="initial"), q) is None  # 다른 맥락 지문
+    assert cache.stats["hits"] == 1 and cache.stats["misses"] == 2
+
+
+def test_store_skips_personalized_short_and_duplicate(cache):
+    scope = _scope(cache)
+    q = _vec(3)
+    assert not cache.store(scope, q, "q", "짧은 답변", [], [])
+    assert not cache.store(scope, q, "q", "죄송합니다. " + ANSWER, [], [])
+    assert not cache.store(scope, q, "q", "홍길동님, " + ANSWER, [], [], personal_names=["홍길동"])
+    assert not cache.store(scope, q, "q", ANSWER + " 측정값 126 기준입니다.", [], [],
+                           personal_context="- 공복혈당: 126 mg/dL")
+    assert cache.stats["skipped"] == 4 and cache.lookup(scope, q) is None
+
+    assert cache.store(scope, q, "q", ANSWER, [], [])
+    assert not cache.store(scope, _near(q), "q2", ANSWER, [], [])  # 이미 같은 질문 저장됨
+
+
+def test_is_personalized_ignores_generic_names():
+    assert not is_personalized(ANSWER, ["고객"], "")
+    assert not is_personalized("하루 30분 걷기", [], "- 나이: 5")  # 한 자리 숫자는 비교 안 함
+    assert is_personalized("LDL 160 은 높습니다", [], "LDL 160 mg/dL")
+
+
+def test_generation_changes_when_index_rebuilt(cache, tmp_path):
+    hospital_dir = tmp_path / "hospitals" / "H1"
+    hospital_dir.mkdir(parents=True)
+    index_file = hospital_dir / "faiss.index"
+    index_file.write_bytes(b"v1")
+
+    scope = _scope(cache)
+    q = _vec(4)
+    assert cache.store(scope, q, "q", ANSWER, [], [])
+    assert cache.lookup(_scope(cache), q) is not None
+
+    index_file.write_bytes(b"v2-rebuilt")
+    st = index_file.stat()
+    os.utime(index_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    new_scope = _scope(cache)
+    assert new_scope.generation != scope.generation
+    assert cache.lookup(new_scope, q) is None
+
+
+def test_invalidate_hospital_only(cache):
+    q = _vec(5)
+    h1, h2 = _scope(cache, "H1"), _scope(cache, "H2")
+    assert cache.store(h1, q, "q", ANSWER, [], []) and cache.store(h2, q, "q", ANSWER, [], [])
+
+    assert cache.invalidate("H1") > 0
+    assert cache.lookup(h1, q) is None
+    assert cache.lookup(h2, q) is not None
+
+
+def test_max_entries_evicts_oldest(cache, monkeypatch):
+    monkeypatch.setattr(settings, "rag_semantic_cache_max_entries", 2)
+    scope = _scope(cache)
+    vecs = [_vec(10 + i) for i in range(3)]
+    for i, v in enumerate(vecs):
+        assert cache.store(scope, v, f"q{i}", ANSWER, [], [])
+
+    assert cache.lookup(scope, vecs[0]) is None
+    assert cache.lookup(scope, vecs[1]).question == "q1"
+    assert cache.lookup(scope, vecs[2]).question == "q2"
+
+
+def test_other_worker_sees_new_entries(cache, redis_server):
+    other = SemanticAnswerCache(client=redis.Redis.from_url(redis_server.url))
+    scope = _scope(cache)
+    q = _vec(6)
+    assert other.lookup(scope, q) is None  # 빈 행렬 로컬 보관
+
+    assert cache.store(scope, q, "q", ANSWER, [], [])
+    assert other.lookup(scope, q) is not None  # ver 변경 → 재로딩
+
+
+def test_lookup_is_miss_when_redis_down():
+    broken = SemanticAnswerCache(client=redis.Redis(host="127.0.0.1", port=1, socket_connect_timeout=0.2))
+    scope = semcache.CacheScope("H1", "g", "d")
+    assert broken.lookup(scope, _vec(7)) is None and broken.stats["errors"] == 1
+    assert not broken.store(scope, _vec(7), "q", ANSWER, [], [])
+
+
+def test_replay_chunks_reassemble():
+    chunks = replay_chunks(ANSWER, size=20)
+    assert "".join(chunks) == ANSWER and all(len(c) <= 20 for c in chunks)
+    assert replay_chunks("") == []
@@ -0,0 +1,177 @@
+"""
+services/streaming_export.py 스트리밍 내보내기 테스트.
+
+DB 대신 메모리 행 목록으로 iter_section_rows 를 대체해
+형식별 직렬화, keyset 재개 토큰, gzip 을 확인한다.
+
+실행:
+    cd backend && python -m pytest tests/test_streaming_export.py -v
+"""
+
+import csv
+import gzip
+import io
+import json
+import sys
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services import streaming_export
+from app.services.streaming_export import (
+    ExportSection, csv_stream, gzip_stream, json_document_stream, ndjson_stream,
+)
+
+BASE = datetime(2026, 5, 1, 12, 0, 0)
+
+
+def _rows(n):
+    # created_at DESC, id DESC 순서
+    return [{"id": n - i, "created_at": BASE - timedelta(minutes=i), "tags": ["a", "b"]} for i in range(n)]
+
+
+@pytest.fixture
+def fake_rows(monkeypatch):
+    data = {"chat_logs": _rows(7), "tagging": _rows(3)}
+
+    def _iter(section, after=None, batch_size=0):
+        rows = [r for r in data[section.name]
+                if not after or (r["created_at"].isoformat(), r["id"]) < (after[0], after[1])]
+        for row in rows[:section.limit] if section.limit else rows:
+            yield dict(row)
+
+    monkeypatch.setattr(streaming_export, "iter_section_rows", _iter)
+    monkeypatch.setattr(streaming_export, "CHECKPOINT_EVERY", 3)
+    return data
+
+
+def _sections():
+    return [ExportSection("chat_logs", "SELECT 1 WHERE TRUE"), ExportSection("tagging", "SELECT 1 WHERE TRUE")]
+
+
+def _lines(chunks):
+    return [json.loads(l) for l in b"".join(chunks).decode("utf-8").splitlines()]
+
+
+def test_query_appends_keyset_order_and_limit():
+    section = ExportSection("x", "SELECT * FROM t WHERE a = %s", ("v",),
+                            order_keys=("t.created_at", "t.id"), limit=10)
+    sql, params = section.query(["2026-05-01T00:00:00", 5])
+    assert sql.endswith("AND (t.created_at, t.id) < (%s, %s) ORDER BY t.created_at DESC, t.id DESC LIMIT %s")
+    assert params == ("v", "2026-05-01T00:00:00", 5, 10)
+
+
+def test_json_document_matches_legacy_shape(fake_rows):
+    body = b"".join(json_document_stream(_sections(), {"filters": {"hospital_id": None}}))
+    doc = json.loads(body)
+    assert doc["filters"] == {"hospital_id": None}
+    assert doc["chat_logs"]["count"] == 7
+    assert doc["tagging"]["count"] == 3
+    assert doc["chat_logs"]["data"][0]["created_at"] == BASE.isoformat()
+
+
+def test_ndjson_checkpoint_resumes_after_last_row(fake_rows):
+    lines = _lines(ndjson_stream(_sections(), {"k": 1}))
+    assert lines[0] == {"meta": {"k": 1}}
+    assert lines[-1] == {"done": True, "counts": {"chat_logs": 7, "tagging": 3}}
+    rows = [l for l in lines if "section" in l]
+    assert len(rows) == 10
+
+    # chat_logs 3번째 행 뒤 체크포인트에서 재개 → 나머지 4행 + tagging 전체
+    token = next(l["cursor"] for l in lines if "cursor" in l)
+    resumed = [l for l in _lines(ndjson_stream(_sections(), {}, token)) if "section" in l]
+    assert [r["data"]["id"] for r in resumed if r["section"] == "chat_logs"] == [4, 3, 2, 1]
+    assert sum(r["section"] == "tagging" for r in resumed) == 3
+
+
+def test_bad_cursor_rejected_before_streaming(fake_rows):
+    from fastapi import HTTPException
+
+    with pytest.raises(HTTPException) as exc:
+        ndjson_stream(_sections(), {}, "not-a-token")
+    assert exc.value.status_code == 400
+
+
+def test_csv_stream_with_bom_and_gzip(fake_rows):
+    section = _sections()[1]
+    body = gzip.decompress(b"".join(gzip_stream(csv_stream(section))))
+    text = body.decode("utf-8")
+    assert text.startswith("﻿")
+    rows = list(csv.reader(io.StringIO(text.lstrip("﻿"))))
+    assert rows[0] == ["id", "created_at", "tags"]
+    assert len(rows) == 4
+    assert json.loads(rows[1][2]) == ["a", "b"]
+
+
+def test_xlsx_stream_write_only(fake_rows):
+    openpyxl = pytest.importorskip("openpyxl")
+    chunks = streaming_export.xlsx_stream(
+        _sections()[0], "시트", ["ID", "생성일"], lambda r: [r["id"], str(r["created_at"])],
+    )
+    wb = openpyxl.load_workbook(io.BytesIO(b"".join(chunks)))
+    ws = wb["시트"]
+    assert ws.max_row == 8
+    assert [c.value for c in ws[1]] == ["ID", "생성일"]
+
+
+def test_xlsx_info_sheet_cursor_resumes_next_page(fake_rows):
+    openpyxl = pytest.importorskip("openpyxl")
+    section = _sections()[0]
+    section.limit = 4
+
+    def _page(cursor=None):
+        chunks = streaming_export.xlsx_stream(section, "시트", ["ID"], lambda r: [r["id"]], cursor)
+        wb = openpyxl.load_workbook(io.BytesIO(b"".join(chunks)))
+        info = dict(wb[streaming_export.XLSX_INFO_SHEET].values)
+        return [r[0] for r in wb["시트"].iter_rows(min_row=2, values_only=True)], info
+
+    ids, info = _page()
+    assert ids == [7, 6, 5, 4] and info["rows"] == 4
+
+    ids, info = _page(info["cursor"])
+    assert ids == [3, 2, 1] and info["rows"] == 3
+
+    ids, info = _page(info["cursor"])
+    assert ids == [] and info["cursor"] is None
+
+
+def test_iter_section_rows_uses_named_cursor(monkeypatch):
+    opened = {}
+
+    class _Cursor:
+        itersize = None
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def execute(self, sql, params):
+            opened["sql"] = sql
+
+        def __iter__(self):
+            opened["itersize"] = self.itersize
+            return iter([{"id": 1}])
+
+    class _Conn:
+        def cursor(self, name=None, cursor_factory=None):
+            opened["name"] = name
+            return _Cursor()
+
+    @contextmanager
+    def _get_connection(workload=None):
+        opened["workload"] = workload
+        yield _Conn()
+
+    monkeypatch.setattr(streaming_export.db_manager, "get_connection", _get_connection)
+    rows = list(streaming_export.iter_section_rows(ExportSection("chats", "SELECT 1 WHERE TRUE"), batch_size=50))
+
+    assert rows == [{"id": 1}]
+    assert opened["name"].startswith("export_chats_")
+    assert opened["itersize"] == 50
+    assert opened["workload"] == "export"
@@ -0,0 +1,217 @@
+"""
+services/tagging_queue.py 태깅 작업 큐 테스트.
+
+가짜 db_manager 로 실제 DB 없이
+적재 중복 제거, 워커 병렬 처리(단건/배치 claim), 재시도/최종 실패, quota 일시정지, 토큰 버킷을 확인한다.
+
+실행:
+    cd backend && python -m pytest tests/test_tagging_queue.py -v
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services import chat_tagging_service, llm_router as llm_router_module, tagging_queue
+from app.services.tagging_queue import AsyncTokenBucket, TaggingQueueWorker
+
+
+class _FakeDB:
+    """db_manager 대역 — claim 은 jobs 에서 1건씩, 상태 변경은 updates 에 기록"""
+
+    def __init__(self, jobs=()):
+        self.jobs = list(jobs)
+        self.one_calls = []
+        self.updates = []
+
+    async def execute_one(self, query, params=None):
+        self.one_calls.append((query, params))
+        if query is tagging_queue._CLAIM_SQL:
+            if not self.jobs:
+                return None
+            job = self.jobs.pop(0)
+            job["attempts"] += 1
+            return dict(job)
+        if query is tagging_queue._CLAIM_BATCH_SQL:
+            taken, self.jobs = self.jobs[:params[1]], self.jobs[params[1]:]
+            for job in taken:
+                job["attempts"] += 1
+            return {"jobs": [dict(j) for j in taken]}
+        if "WITH candidates" in query:
+            return {"candidates": 5, "enqueued": 3}
+        return None
+
+    async def execute_update(self, query, params=None):
+        self.updates.append((query, params))
+        return 0
+
+    async def execute_query(self, query, params=None):
+        return []
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    db = _FakeDB()
+    monkeypatch.setattr(tagging_queue, "db_manager", db)
+    return db
+
+
+@pytest.fixture
+def quota(monkeypatch):
+    state = {"ok": True}
+    monkeypatch.setattr(llm_router_module.llm_router, "has_quota", lambda endpoint: state["ok"])
+    return state
+
+
+def _job(i, attempts=0):
+    return {"id": i, "session_id": f"s{i}", "partner_id": "p", "attempts": attempts}
+
+
+@pytest.mark.asyncio
+async def test_enqueue_reports_duplicates_and_recovery_keeps_failed(fake_db):
+    result = await tagging_queue.enqueue_sessions(hospital_id="H1", force=False)
+    assert result == {"candidates": 5, "enqueued": 3, "duplicates": 2}
+    sql, params = fake_db.one_calls[-1]
+    assert params == ("H1", "retag")
+    assert "q.status IN ('done', 'failed')" in sql
+    assert "t.tagging_model IS NULL" in sql
+
+    await tagging_queue.enqueue_sessions(force=True, source="recovery")
+    sql, params = fake_db.one_calls[-1]
+    assert params == ("recovery",)
+    assert "q.status = 'done'" in sql
+    assert "tb_chat_session_tags t" in sql and "t.tagging_model IS NULL" not in sql
+
+
+@pytest.mark.asyncio
+async def test_retag_all_sessions_enqueues_and_returns(fake_db):
+    result = await chat_tagging_service.retag_all_sessions(force=True)
+    assert result == {"total": 5, "enqueued": 3, "duplicates": 2}
+
+
+@pytest.mark.asyncio
+async def test_workers_drain_queue_concurrently(fake_db, quota, monkeypatch):
+    fake_db.jobs = [_job(i) for i in range(6)]
+    active = {"now": 0, "max": 0}
+
+    async def _tag(session_id, partner_id):
+        active["now"] += 1
+        active["max"] = max(active["max"], active["now"])
+        await asyncio.sleep(0.02)
+        active["now"] -= 1
+        return {"session_id": session_id}
+
+    monkeypatch.setattr(chat_tagging_service, "tag_chat_session", _tag)
+    monkeypatch.setattr(tagging_queue, "POLL_INTERVAL_SEC", 0.01)
+    monkeypatch.setattr(tagging_queue.settings, "tagging_queue_quota_share", 1000.0)
+    monkeypatch.setattr(tagging_queue.settings, "chat_tagging_batch_size", 1)
+
+    worker = TaggingQueueWorker()
+    await worker.start(workers=3)
+    for _ in range(100):
+        if worker.counters["succeeded"] == 6:
+            break
+        await asyncio.sleep(0.01)
+    await worker.stop()
+
+    assert worker.counters["succeeded"] == 6
+    assert active["max"] > 1
+    done = [p for q, p in fake_db.updates if q is tagging_queue._DONE_SQL]
+    assert sorted(p[1] for p in done) == list(range(6))
+
+
+@pytest.mark.asyncio
+async def test_batch_mode_claims_several_jobs_per_call(fake_db, quota, monkeypatch):
+    fake_db.jobs = [_job(i) for i in range(5)]
+    calls = []
+
+    async def _tag_batch(sessions, batch_size=None):
+        calls.append([s["session_id"] for s in sessions])
+        return [None if s["session_id"] == "s1" else {"ok": True} for s in sessions]
+
+    monkeypatch.setattr(chat_tagging_service, "tag_chat_sessions_batch", _tag_batch)
+    monkeypatch.setattr(tagging_queue, "POLL_INTERVAL_SEC", 0.01)
+    monkeypatch.setattr(tagging_queue.settings, "tagging_queue_quota_share", 1000.0)
+    monkeypatch.setattr(tagging_queue.settings, "chat_tagging_batch_size", 3)
+
+    worker = TaggingQueueWorker()
+    await worker.start(workers=1)
+    for _ in range(100):
+        if worker.counters["succeeded"] + worker.counters["retried"] == 5:
+            break
+        await asyncio.sleep(0.01)
+    await worker.stop()
+
+    assert calls[0] == ["s0", "s1", "s2"]
+    assert worker.counters["claimed"] == 5
+    assert worker.counters["succeeded"] == 4 and worker.counters["retried"] == 1
+    retry = [p for q, p in fake_db.updates if q is tagging_queue._RETRY_SQL]
+    assert [p[3] for p in retry] == [1]
+
+
+@pytest.mark.asyncio
+async def test_failure_retries_with_backoff_then_fails(fake_db, monkeypatch):
+    async def _tag(session_id, partner_id):
+        return None  # LLM 실패 → 태깅 스킵
+
+    monkeypatch.setattr(chat_tagging_service, "tag_chat_session", _tag)
+    monkeypatch.setattr(tagging_queue.settings, "tagging_queue_max_attempts", 3)
+    monkeypatch.setattr(tagging_queue.settings, "tagging_queue_backoff_base_sec", 60)
+    worker = TaggingQueueWorker()
+
+    await worker._run_job(_job(1, attempts=2))
+    query, params = fake_db.updates[-1]
+    assert query is tagging_queue._RETRY_SQL
+    assert 96 <= params[0] <= 144  # 60 × 2^(2-1) ± 20%
+    assert params[1] == "tagging_returned_none"
+
+    await worker._run_job(_job(1, attempts=3))
+    assert fake_db.updates[-1][0] is tagging_queue._FAILED_SQL
+    assert worker.counters == {"claimed": 0, "succeeded": 0, "retried": 1, "failed": 1}
+
+
+@pytest.mark.asyncio
+async def test_quota_exhausted_pauses_without_claiming(fake_db, quota, monkeypatch):
+    quota["ok"] = False
+    fake_db.jobs = [_job(1)]
+    monkeypatch.setattr(tagging_queue, "QUOTA_PAUSE_SEC", 0.01)
+
+    worker = TaggingQueueWorker()
+    await worker.start(workers=1)
+    await asyncio.sleep(0.05)
+    assert worker.snapshot()["paused_reason"] == "quota_exhausted"
+    assert fake_db.jobs  # claim 안 함
+    await worker.stop()
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_limits_rate_and_refunds():
+    bucket = AsyncTokenBucket(per_hour=3600 * 50, capacity=2)  # 초당 50
+    await bucket.acquire(2)
+    started = time.monotonic()
+    await bucket.acquire(2)
+    assert time.monotonic() - started >= 0.03
+
+    bucket.refund(2)
+    started = time.monotonic()
+    await bucket.acquire(2)
+    assert time.monotonic() - started < 0.02
+
+
+def test_rate_limit_from_router_ceilings(monkeypatch):
+    monkeypatch.setattr(llm_router_module.llm_router, "quota_ceilings", lambda endpoint: (2000, 300))
+    monkeypatch.setattr(tagging_queue.settings, "tagging_queue_quota_share", 0.5)
+    monkeypatch.setattr(tagging_queue.settings, "tagging_queue_calls_per_session", 2)
+    monkeypatch.setattr(tagging_queue.settings, "chat_tagging_batch_size", 1)
+    limits = TaggingQueueWorker().rate_limit()
+    assert limits["calls_per_hour"] == 150
+    assert limits["sessions_per_hour"] == 75
+
+    # 배치 4건: 묶음 분석 1회 + 재방문 메시지 4회 = 세션당 1.25 호출
+    monkeypatch.setattr(tagging_queue.settings, "chat_tagging_batch_size", 4)
+    assert TaggingQueueWorker().rate_limit()["sessions_per_hour"] == 120
@@ -0,0 +1,110 @@
+"""
+WebSocket 알림 워커 간 팬아웃 테스트 — services/ws_fanout, websocket_auth.notify_*.
+
+InMemoryBroker 를 공유하는 SessionFanout 두 개(=워커 2개)와 가짜 소켓 전달로
+다른 워커 소켓 전달, 로컬 전달 시 발행 생략, 반환값 = 로컬 전달 여부, 브로커 장애 시 로컬 전달 유지,
+리스너 재연결을 확인한다.
+
+실행:
+    cd backend && python -m pytest tests/test_ws_fanout.py -v
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services import ws_fanout
+from app.services.ws_fanout import InMemoryBroker, SessionFanout
+
+
+class _Worker:
+    """소켓을 가진 세션만 전달하는 가짜 ConnectionManager."""
+
+    def __init__(self, broker, sessions):
+        self.sessions = set(sessions)
+        self.sent = []
+        self.fanout = SessionFanout(broker, self.deliver)
+
+    async def deliver(self, message, session_id):
+        if session_id not in self.sessions:
+            return False
+        self.sent.append((session_id, message["type"]))
+        return True
+
+
+async def _drain():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_status_reaches_socket_on_other_worker():
+    broker = InMemoryBroker()
+    a, b = _Worker(broker, {"s-local"}), _Worker(broker, {"s-remote"})
+    await a.fanout.start()
+    await b.fanout.start()
+    try:
+        # 이 워커에 소켓 없음 → False (다른 워커로 발행만)
+        assert await a.fanout.publish("s-remote", {"type": "auth_completed"}) is False
+        # 로컬 전달 성공 → True, 발행 생략
+        assert await a.fanout.publish("s-local", {"type": "streaming_status"}) is True
+        await _drain()
+        assert b.sent == [("s-remote", "auth_completed")]
+        assert a.sent == [("s-local", "streaming_status")]
+        assert a.fanout.stats()["published"] == 1
+        assert b.fanout.stats()["delivered_remote"] == 1 and a.fanout.stats()["received"] == 0
+    finally:
+        await a.fanout.stop()
+        await b.fanout.stop()
+    assert broker._queues == []
+
+
+class _DownBroker(InMemoryBroker):
+    def __init__(self):
+        super().__init__()
+        self.listen_calls = 0
+
+    async def publish(self, data):
+        raise ConnectionError("redis down")
+
+    async def listen(self, on_message):
+        self.listen_calls += 1
+        raise ConnectionError("redis down")
+
+
+@pytest.mark.asyncio
+async def test_broker_down_keeps_local_delivery_and_retries(monkeypatch):
+    monkeypatch.setattr(ws_fanout, "RECONNECT_BASE_SEC", 0.01)
+    broker = _DownBroker()
+    w = _Worker(broker, {"s1"})
+    await w.fanout.start()
+    try:
+        assert await w.fanout.publish("s1", {"type": "error"}) is True
+        assert await w.fanout.publish("s2", {"type": "error"}) is False
+        assert w.sent == [("s1", "error")] and w.fanout.publish_errors == 1  # s1 은 발행 안 함
+        await asyncio.sleep(0.05)
+        assert broker.listen_calls >= 2  # 구독 실패 후 백오프 재연결
+    finally:
+        await w.fanout.stop()
+
+
+@pytest.mark.asyncio
+async def test_notify_functions_go_through_fanout(monkeypatch):
+    from app.api.v1.endpoints import websocket_auth
+
+    broker = InMemoryBroker()
+    remote = _Worker(broker, {"sess"})
+    local = SessionFanout(broker, websocket_auth.manager.send_personal_message)
+    monkeypatch.setattr(websocket_auth, "fanout", local)
+    await remote.fanout.start()
+    try:
+        assert await websocket_auth.notify_error("sess", "틸코 오류") is False  # 이 워커엔 소켓 없음
+        await websocket_auth.notify_auth_waiting("sess")
+        await _drain()
+        assert remote.sent == [("sess", "error"), ("sess", "streaming_status")]
+    finally:
+        await remote.fanout.stop()
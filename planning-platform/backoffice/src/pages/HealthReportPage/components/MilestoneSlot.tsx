@@ -2,15 +2,27 @@
  * MilestoneSlot — Phase 3-B Action 섹션 전면 재작성
  * - 5개 BMI 마일스톤 카드 (현재 / -2kg / -5kg / -10kg / 정상 BMI 22.9)
  * - BmiSlider: 자유 BMI 목표 입력 (debounce 300ms)
- * - useSimulation hook 으로 각 카드 초기 로드 + 슬라이더 실시간 계산
+ * - useSimulation hook 으로 각 카드 초기 로드
+ * - 슬라이더: useSimulationGrid 로 BMI 전 구간 1회 로드 후 로컬 보간 (그리드 실패 시 simulate 호출 폴백)
  */
-import { useEffect, useState, useCallback, useRef } from 'react';
-import { useSimulation, SimulationResult } from '../hooks/useSimulation';
+import { useEffect, useState, useCallback, useRef, useMemo } from 'react';
+import {
+  useSimulation,
+  useSimulationGrid,
+  interpolateGrid,
+  SimulationResult,
+  GridPoint,
+} from '../hooks/useSimulation';
 import MilestoneCard from './MilestoneCard';
 import BmiSlider from './BmiSlider';
 import Term from './Term';
 
 type CardState = 'idle' | 'loading' | 'ok' | 'error';
+
+// 슬라이더 BMI 범위 — 그리드도 같은 간격으로 받아 위치별 값이 simulate 결과와 같다
+const SLIDER_MIN = 17.0;
+const SLIDER_MAX = 40.0;
+const SLIDER_STEP = 0.1;
 type MilestoneKey = 'current' | 'minus2' | 'minus5' | 'minus10' | 'normal';
 
 interface MilestoneAnchor {
@@ -72,6 +84,12 @@ export default function MilestoneSlot({
   const [selectedKey, setSelectedKey] = useState<MilestoneKey>('current');
   const [sliderBmi, setSliderBmi] = useState<number>(baseBmi);
   const sliderHook = useSimulation(patientUuid, hospitalIdStr);
+  const gridInput = useMemo(() => ({
+    bmi_target: { start: SLIDER_MIN, stop: SLIDER_MAX, step: SLIDER_STEP },
+    time_horizon_months: [timeHorizonMonths],
+  }), [timeHorizonMonths]);
+  const { grid } = useSimulationGrid(patientUuid, hospitalIdStr, gridInput);
+  const [gridPoint, setGridPoint] = useState<GridPoint | null>(null);
   const debounceRef = useRef<ReturnType<typeof setTimeout> | null>(null);
 
   // 카드 5장 병렬 초기 로드
@@ -127,14 +145,20 @@ export default function MilestoneSlot({
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, [patientUuid, hospitalIdStr, timeHorizonMonths]);
 
-  // 슬라이더 debounce 300ms
+  useEffect(() => { setGridPoint(null); }, [grid]);
+
+  // 그리드가 있으면 즉시 로컬 보간, 없으면 simulate 호출 (debounce 300ms)
   const handleSliderChange = useCallback((bmi: number) => {
     setSliderBmi(bmi);
+    if (grid) {
+      setGridPoint(interpolateGrid(grid, bmi));
+      return;
+    }
     if (debounceRef.current) clearTimeout(debounceRef.current);
     debounceRef.current = setTimeout(() => {
       sliderHook.call({ bmi_target: bmi, time_horizon_months: timeHorizonMonths });
     }, 300);
-  }, [sliderHook, timeHorizonMonths]);
+  }, [grid, sliderHook, timeHorizonMonths]);
 
   useEffect(() => () => {
     if (debounceRef.current) clearTimeout(debounceRef.current);
@@ -152,6 +176,21 @@ export default function MilestoneSlot({
     if (vals.length === 0) return null;
     return parseFloat((vals.reduce((a, b) => a + b, 0) / vals.length).toFixed(1));
   };
+  const gridAvgArr = (pt: GridPoint): number | null => {
+    const vals = Object.values(pt.arr_pct);
+    if (vals.length === 0) return null;
+    return parseFloat((vals.reduce((a, b) => a + b, 0) / vals.length).toFixed(1));
+  };
+  const sliderSummary = gridPoint
+    ? { arr: gridAvgArr(gridPoint), sbp: gridPoint.improved_sbp, dbp: gridPoint.improved_dbp, fbg: gridPoint.improved_fbg }
+    : sliderHook.result
+      ? {
+          arr: calcAvgArr(sliderHook.result),
+          sbp: sliderHook.result.improved_sbp,
+          dbp: sliderHook.result.improved_dbp,
+          fbg: sliderHook.result.improved_fbg,
+        }
+      : null;
 
   return (
     <div className="report-view__milestone-slot">
@@ -188,22 +227,22 @@ export default function MilestoneSlot({
 
       {/* 슬라이더 구간 */}
       <BmiSlider
-        min={17.0}
-        max={40.0}
-        step={0.1}
+        min={SLIDER_MIN}
+        max={SLIDER_MAX}
+        step={SLIDER_STEP}
         value={sliderBmi}
         onChange={handleSliderChange}
         disabled={sliderHook.loading}
       />
 
       {/* 슬라이더 결과 요약 */}
-      {sliderHook.result && (
+      {sliderSummary && (
         <div style={{ marginTop: '0.75rem', fontSize: '0.85rem', color: '#444' }}>
           <strong>BMI {sliderBmi.toFixed(1)} 시나리오</strong>
           {' '}—{' '}
-          평균 ARR {calcAvgArr(sliderHook.result) ?? '-'}%,
-          SBP {sliderHook.result.improved_sbp} / DBP {sliderHook.result.improved_dbp},
-          FBG {sliderHook.result.improved_fbg}
+          평균 ARR {sliderSummary.arr ?? '-'}%,
+          SBP {sliderSummary.sbp} / DBP {sliderSummary.dbp},
+          FBG {sliderSummary.fbg}
         </div>
       )}
       {sliderHook.error && (
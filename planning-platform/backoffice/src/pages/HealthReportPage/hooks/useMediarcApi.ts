@@ -173,6 +173,15 @@ export interface ReportData {
    * 키: "current" | "minus2kg" | "minus5kg" | "minus10kg" | "normal_bmi"
    */
   milestones?: Record<string, SimulateResponse>;
+  /** progressive 조회 시 'pending' → fetchReportNutrition 으로 nutrition 수신 */
+  nutrition_status?: 'pending' | 'ready' | 'failed';
+  input_digest?: string;
+}
+
+export interface NutritionState {
+  status: 'pending' | 'ready' | 'failed' | 'missing';
+  nutrition: ReportData['nutrition'];
+  input_digest: string;
 }
 
 export interface ComparisonItem {
@@ -222,11 +231,20 @@ export const fetchPatients = async (limit = 200) => {
   return r.json() as Promise<{ patients: PatientListItem[]; total: number }>;
 };
 
-export const fetchReport = async (uuid: string) => {
-  const r = await fetchWithAuth(`${API}/partner-office/mediarc-report/${uuid}`);
+// progressive=true: 엔진 블록 먼저 (nutrition 은 fetchReportNutrition 으로)
+export const fetchReport = async (uuid: string, progressive = false) => {
+  const qs = progressive ? '?progressive=1' : '';
+  const r = await fetchWithAuth(`${API}/partner-office/mediarc-report/${uuid}${qs}`);
   return r.json() as Promise<ReportData>;
 };
 
+// 롱폴링: 완료되거나 wait 초가 지나면 응답
+export const fetchReportNutrition = async (uuid: string, digest: string, wait = 20) => {
+  const qs = new URLSearchParams({ digest, wait: String(wait) });
+  const r = await fetchWithAuth(`${API}/partner-office/mediarc-report/${uuid}/nutrition?${qs}`);
+  return r.json() as Promise<NutritionState>;
+};
+
 export const fetchComparison = async (uuid: string) => {
   const r = await fetchWithAuth(`${API}/partner-office/mediarc-report/${uuid}/compare`);
   return r.json() as Promise<ComparisonData>;
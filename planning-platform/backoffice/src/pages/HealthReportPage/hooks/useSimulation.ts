@@ -84,3 +84,110 @@ export function useSimulation(uuid: string, hospitalId?: string) {
 
   return { call, result, loading, error, reset };
 }
+
+// ── 시뮬레이션 그리드 (POST .../simulate/grid) — 슬라이더 위치별 호출 대신 1회 로드 후 로컬 보간 ──
+
+export interface SimulationGrid {
+  input_digest: string;
+  /** 축 순서 — ['bmi', 'smoking', 'drinking', 'time'] */
+  order: string[];
+  shape: [number, number, number, number];
+  axes: {
+    bmi_target: (number | null)[];
+    smoking_target: ('current' | 'quit' | null)[];
+    drinking_target: ('none' | null)[];
+    time_horizon_months: number[];
+  };
+  diseases: string[];
+  orig_ratios: Record<string, number>;
+  /** 질환별 shape 순서 row-major 평탄 배열 */
+  ratios: Record<string, number[]>;
+  improved_sbp: number[][];
+  improved_dbp: number[][];
+  improved_fbg: number[];
+}
+
+export interface GridPoint {
+  ratios: Record<string, number>;
+  improved_sbp: number;
+  improved_dbp: number;
+  improved_fbg: number;
+  /** 질환별 ARR % — will_rogers.arr_pct 와 같은 식 */
+  arr_pct: Record<string, number>;
+}
+
+/** BMI 축 선형 보간 (나머지 축은 인덱스 지정). 그리드 밖 BMI 는 양 끝값. */
+export function interpolateGrid(
+  grid: SimulationGrid,
+  bmi: number,
+  idx: { smoking?: number; drinking?: number; time?: number } = {},
+): GridPoint {
+  const [B, S, D, T] = grid.shape;
+  const s = idx.smoking ?? 0;
+  const d = idx.drinking ?? 0;
+  const t = idx.time ?? 0;
+  const xs = grid.axes.bmi_target.map((v) => v ?? NaN);
+  let lo = 0;
+  while (lo < B - 2 && xs[lo + 1] <= bmi) lo += 1;
+  const hi = Math.min(lo + 1, B - 1);
+  const span = xs[hi] - xs[lo];
+  const w = span > 0 ? Math.min(Math.max((bmi - xs[lo]) / span, 0), 1) : 0;
+  const mix = (a: number, b: number) => a + (b - a) * w;
+  const at = (b: number) => ((b * S + s) * D + d) * T + t;
+
+  const ratios: Record<string, number> = {};
+  const arr_pct: Record<string, number> = {};
+  for (const disease of grid.diseases) {
+    const r = Math.round(mix(grid.ratios[disease][at(lo)], grid.ratios[disease][at(hi)]) * 100) / 100;
+    const orig = grid.orig_ratios[disease] ?? 1;
+    ratios[disease] = r;
+    arr_pct[disease] = orig > 0 ? Math.round(((orig - r) / orig) * 1000) / 10 : 0;
+  }
+  const round1 = (v: number) => Math.round(v * 10) / 10;
+  return {
+    ratios,
+    arr_pct,
+    improved_sbp: round1(mix(grid.improved_sbp[lo][d], grid.improved_sbp[hi][d])),
+    improved_dbp: round1(mix(grid.improved_dbp[lo][d], grid.improved_dbp[hi][d])),
+    improved_fbg: round1(mix(grid.improved_fbg[lo], grid.improved_fbg[hi])),
+  };
+}
+
+export interface SimulationGridInput {
+  bmi_target?: { start: number; stop: number; step: number };
+  weight_delta_kg?: { start: number; stop: number; step: number };
+  smoking_target?: ('current' | 'quit' | null)[];
+  drinking_target?: ('none' | null)[];
+  time_horizon_months?: (0 | 6 | 12 | 60)[];
+}
+
+export function useSimulationGrid(uuid: string, hospitalId: string | undefined, input: SimulationGridInput | null) {
+  const [grid, setGrid] = useState<SimulationGrid | null>(null);
+  const [error, setError] = useState<Error | null>(null);
+  const key = input ? JSON.stringify(input) : '';
+
+  useEffect(() => {
+    if (!uuid || !key) return;
+    const ctrl = new AbortController();
+    setGrid(null);
+    setError(null);
+    const qs = hospitalId ? `?hospital_id=${encodeURIComponent(hospitalId)}` : '';
+    fetchWithAuth(`${getApiBase()}/partner-office/mediarc-report/${uuid}/simulate/grid${qs}`, {
+      method: 'POST',
+      body: key,
+      headers: { 'Content-Type': 'application/json' },
+      signal: ctrl.signal,
+    })
+      .then(async (r) => {
+        if (!r.ok) throw new Error(`simulate/grid 실패 (HTTP ${r.status})`);
+        const data = (await r.json()) as SimulationGrid;
+        if (!ctrl.signal.aborted) setGrid(data);
+      })
+      .catch((e) => {
+        if (!ctrl.signal.aborted) setError(e as Error);
+      });
+    return () => ctrl.abort();
+  }, [uuid, hospitalId, key]);
+
+  return { grid, error };
+}
@@ -2,10 +2,11 @@
  * HealthReportPage — Phase 2 재작성
  * PageLayout / PageHeader / KpiGrid / KpiCard / TabBar / FilterBar / Drawer / HospitalSearch 표준 적용
  */
-import React, { useState, useEffect, useCallback, useMemo } from 'react';
+import React, { useState, useEffect, useCallback, useMemo, useRef } from 'react';
 import {
   fetchPatients,
   fetchReport,
+  fetchReportNutrition,
   fetchEngineStats,
   fetchVerifyAll,
   PatientListItem,
@@ -58,6 +59,8 @@ const HealthReportPage: React.FC = () => {
   const [report, setReport] = useState<ReportData | null>(null);
   const [detailLoading, setDetailLoading] = useState(false);
   const [reportError, setReportError] = useState<string | null>(null);
+  // 늦게 도착한 nutrition 이 다른 환자 Drawer 에 섞이지 않도록 현재 uuid 추적
+  const openUuidRef = useRef<string | null>(null);
 
   // 검증 탭
   const [verification, setVerification] = useState<VerificationData | null>(null);
@@ -97,19 +100,50 @@ const HealthReportPage: React.FC = () => {
     return opts;
   }, [patients]);
 
+  // nutrition 은 엔진 블록 렌더 후 롱폴링으로 채움 (최대 3회)
+  // missing(작업·캐시 행 없음, 검진 데이터 변경) 이면 리포트를 1회 재조회 → 서버가 작업 재시작
+  const loadNutrition = useCallback(async (uuid: string, digest: string) => {
+    let refetched = false;
+    for (let attempt = 0; attempt < 3; attempt += 1) {
+      const state = await fetchReportNutrition(uuid, digest).catch(() => null);
+      if (openUuidRef.current !== uuid || !state) return;
+      if (state.status === 'pending') continue;
+      if (state.status === 'missing' && !refetched) {
+        refetched = true;
+        const rData = await fetchReport(uuid, true).catch(() => null);
+        if (openUuidRef.current !== uuid || !rData || (rData as any).detail) return;
+        setReport(rData);
+        if (rData.nutrition_status !== 'pending' || !rData.input_digest) return;
+        digest = rData.input_digest;
+        continue;
+      }
+      if (state.status === 'ready') {
+        setReport(prev => (prev && prev.input_digest === digest
+          ? { ...prev, nutrition: state.nutrition, nutrition_status: 'ready' }
+          : prev));
+      }
+      return;
+    }
+  }, []);
+
   // 행 클릭 → Drawer
   const openDrawer = useCallback((uuid: string) => {
+    openUuidRef.current = uuid;
     setExpandedUuid(uuid);
     setDetailLoading(true);
     setReport(null);
 
     setReportError(null);
-    fetchReport(uuid)
+    fetchReport(uuid, true)
       .then(rData => {
+        if (openUuidRef.current !== uuid) return;
         if (!rData || (rData as any).detail) {
           setReportError((rData as any)?.detail || '리포트 데이터를 불러올 수 없습니다.');
         } else {
           setReport(rData);
+          if (rData.nutrition_status === 'pending' && rData.input_digest) {
+            loadNutrition(uuid, rData.input_digest);
+          }
         }
       })
       .catch(e => {
@@ -119,9 +153,10 @@ const HealthReportPage: React.FC = () => {
         setReportError(msg);
       })
       .finally(() => setDetailLoading(false));
-  }, []);
+  }, [loadNutrition]);
 
   const closeDrawer = useCallback(() => {
+    openUuidRef.current = null;
     setExpandedUuid(null);
     setReport(null);
   }, []);
@@ -1,4 +1,4 @@
-import React, { useEffect, useState, useCallback, useMemo } from 'react';
+import React, { useEffect, useState, useCallback, useRef } from 'react';
 import { useAuth } from '../../contexts/AuthContext';
 import { useSearchParams } from 'react-router-dom';
 import { getApiBase, fetchWithAuth } from '../../utils/api';
@@ -98,6 +98,8 @@ const maskKey = (key: string) => {
   return `${key.slice(0, 4)}****${key.slice(-4)}`;
 };
 
+const PAGE_SIZE = 100;
+
 const DETAIL_TABS: { key: DetailTab; label: string }[] = [
   { key: 'chats', label: '상담' },
   { key: 'surveys', label: '서베이' },
@@ -113,9 +115,13 @@ const PatientPage: React.FC = () => {
 
   const [patients, setPatients] = useState<Patient[]>([]);
   const [total, setTotal] = useState(0);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [loading, setLoading] = useState(false);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState<string | null>(null);
   const [search, setSearch] = useState('');
+  const [debouncedSearch, setDebouncedSearch] = useState('');
+  const [hospitalOptions, setHospitalOptions] = useState<{ value: string; label: string }[]>([]);
 
   // 필터 상태
   const [filterHospital, setFilterHospital] = useState('');
@@ -131,25 +137,65 @@ const PatientPage: React.FC = () => {
   const [expandedChat, setExpandedChat] = useState<string | null>(null);
   const [expandedSurvey, setExpandedSurvey] = useState<number | null>(null);
 
+  // 검색어 debounce 300ms
+  const searchTimerRef = useRef<ReturnType<typeof setTimeout> | null>(null);
   useEffect(() => {
-    setLoading(true);
-    setError(null);
-    fetchWithAuth(`${API}/partner-office/patients`, {
+    if (searchTimerRef.current) clearTimeout(searchTimerRef.current);
+    searchTimerRef.current = setTimeout(() => setDebouncedSearch(search.trim()), 300);
+    return () => { if (searchTimerRef.current) clearTimeout(searchTimerRef.current); };
+  }, [search]);
+
+  // 필터/정렬/페이지네이션은 서버(요약 테이블)에서 처리 — cursor 없으면 첫 페이지
+  const fetchPage = useCallback((cursor: string | null) => {
+    return fetchWithAuth(`${API}/partner-office/patients`, {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
-      body: JSON.stringify({ hospital_id: hospitalId || null }),
-    })
-      .then(r => {
-        if (!r.ok) throw new Error(`서버 오류 (${r.status})`);
-        return r.json();
-      })
+      body: JSON.stringify({
+        hospital_id: hospitalId || null,
+        limit: PAGE_SIZE,
+        cursor,
+        search: debouncedSearch || null,
+        hospital_name: filterHospital || null,
+        date_from: filterDateFrom || null,
+        date_to: filterDateTo || null,
+        activity: filterActivity,
+      }),
+    }).then(r => {
+      if (!r.ok) throw new Error(`서버 오류 (${r.status})`);
+      return r.json();
+    });
+  }, [hospitalId, debouncedSearch, filterHospital, filterDateFrom, filterDateTo, filterActivity]);
+
+  useEffect(() => {
+    let cancelled = false;
+    setLoading(true);
+    setError(null);
+    fetchPage(null)
       .then(d => {
+        if (cancelled) return;
         setPatients(d.patients || []);
         setTotal(d.total || 0);
+        setNextCursor(d.next_cursor || null);
+        if (d.hospital_options && !filterHospital) {
+          setHospitalOptions((d.hospital_options as string[]).map(name => ({ value: name, label: name })));
+        }
+      })
+      .catch(e => { if (!cancelled) setError(e instanceof Error ? e.message : '환자 목록 조회 실패'); })
+      .finally(() => { if (!cancelled) setLoading(false); });
+    return () => { cancelled = true; };
+  }, [fetchPage]); // eslint-disable-line react-hooks/exhaustive-deps
+
+  const loadMore = () => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    fetchPage(nextCursor)
+      .then(d => {
+        setPatients(prev => [...prev, ...(d.patients || [])]);
+        setNextCursor(d.next_cursor || null);
       })
       .catch(e => { setError(e instanceof Error ? e.message : '환자 목록 조회 실패'); })
-      .finally(() => setLoading(false));
-  }, [hospitalId]);
+      .finally(() => setLoadingMore(false));
+  };
 
   // 환자 상세 조회
   const loadDetail = useCallback((webAppKey: string) => {
@@ -172,41 +218,10 @@ const PatientPage: React.FC = () => {
       .finally(() => setDetailLoading(false));
   }, []);
 
-  // 병원 옵션 목록 (환자 데이터에서 추출)
-  const hospitalOptions = useMemo(() => {
-    const map = new Map<string, string>();
-    patients.forEach(p => { if (p.hospital_name) map.set(p.hospital_name, p.hospital_name); });
-    return Array.from(map.values()).sort().map(name => ({ value: name, label: name }));
-  }, [patients]);
-
-  const filtered = useMemo(() => {
-    return patients.filter(p => {
-      // 텍스트 검색
-      if (search) {
-        const q = search.toLowerCase();
-        if (
-          !p.web_app_key.toLowerCase().includes(q) &&
-          !p.hospital_name.toLowerCase().includes(q) &&
-          !(p.patient_name && p.patient_name.toLowerCase().includes(q))
-        ) return false;
-      }
-      // 병원 필터
-      if (filterHospital && p.hospital_name !== filterHospital) return false;
-      // 날짜 범위 필터 (last_activity 기준)
-      if (filterDateFrom && p.last_activity && p.last_activity < filterDateFrom) return false;
-      if (filterDateTo && p.last_activity && p.last_activity > filterDateTo + 'T23:59:59') return false;
-      // 활동 유형 필터
-      if (filterActivity === 'chat' && p.chat_count === 0) return false;
-      if (filterActivity === 'survey' && p.survey_count === 0) return false;
-      if (filterActivity === 'journey' && (p.journey_count || 0) === 0) return false;
-      return true;
-    });
-  }, [patients, search, filterHospital, filterDateFrom, filterDateTo, filterActivity]);
-
   const handleExcelExport = () => {
     const sheets = [{
       name: '환자목록',
-      data: filtered.map((p, i) => ({
+      data: patients.map((p, i) => ({
         '#': i + 1,
         수검자명: p.patient_name || '-',
         web_app_key: p.web_app_key,
@@ -591,11 +606,11 @@ const PatientPage: React.FC = () => {
             >초기화</button>
           )}
           <span className="patient-page__count">
-            {filtered.length.toLocaleString()}명{(search || filterHospital || filterDateFrom || filterDateTo || filterActivity !== 'all') ? ` / ${total.toLocaleString()}` : ''}
+            {total.toLocaleString()}명{nextCursor ? ` (${patients.length.toLocaleString()}명 표시)` : ''}
           </span>
           <ExportButtons
             onExcel={handleExcelExport}
-            onJson={() => downloadJson({ exported_at: new Date().toISOString(), patients: filtered }, `환자목록_${dateSuffix()}.json`)}
+            onJson={() => downloadJson({ exported_at: new Date().toISOString(), patients }, `환자목록_${dateSuffix()}.json`)}
             disabled={loading}
           />
         </div>
@@ -624,10 +639,10 @@ const PatientPage: React.FC = () => {
                     <Spinner message="환자 데이터를 불러오는 중..." />
                   </td></tr>
                 )}
-                {filtered.length === 0 && !loading && (
+                {patients.length === 0 && !loading && (
                   <tr><td colSpan={8} className="patient-page__empty">데이터가 없습니다</td></tr>
                 )}
-                {filtered.map((p, i) => (
+                {patients.map((p, i) => (
                   <tr
                     key={p.web_app_key}
                     className={`patient-page__row${selectedKey === p.web_app_key ? ' patient-page__row--selected' : ''}`}
@@ -648,6 +663,11 @@ const PatientPage: React.FC = () => {
                 ))}
               </tbody>
             </table>
+            {nextCursor && !loading && (
+              <button className="patient-page__load-more" onClick={loadMore} disabled={loadingMore}>
+                {loadingMore ? '불러오는 중...' : '더 보기'}
+              </button>
+            )}
           </div>
         </div>
 
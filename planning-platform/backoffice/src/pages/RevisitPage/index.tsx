@@ -30,15 +30,10 @@ interface Candidate {
   hospital_name: string;
   user_phone?: string | null;
   checkup_date?: string | null;
-  health_metrics?: Record<string, any> | null;
   interest_tags: Array<{ topic: string; intensity: string }>;
   risk_level: string;
   action_intent: string;
   follow_up_needed: boolean;
-  message_variants: MessageVariants;
-  conversation_summary: string | null;
-  counselor_recommendations: string[];
-  key_concerns: string[];
   engagement_score: number;
   buying_signal: string;
   days_since_chat: number;
@@ -48,7 +43,6 @@ interface Candidate {
   // v3 — B2B CRM 차원 (Fix 3-10 후 노출)
   composite_risk?: { overall?: string; reason?: string } | null;
   industry_scores?: Record<string, { score?: number; stage?: string }> | null;
-  lifestyle_tags?: string[];
   medical_urgency?: string;
   anxiety_level?: string;
   prospect_type?: string;
@@ -67,6 +61,21 @@ interface Candidate {
   consultation_consent_at?: string;
 }
 
+/** 후보 상세 — 목록에서 빠진 무거운 필드, /revisit-candidates/{id}/detail 에서 지연 조회 */
+interface CandidateDetail {
+  message_variants: MessageVariants;
+  conversation_summary: string | null;
+  counselor_recommendations: string[];
+  key_concerns: string[];
+  lifestyle_tags: string[];
+  health_metrics: Record<string, any> | null;
+}
+
+const EMPTY_DETAIL: CandidateDetail = {
+  message_variants: {}, conversation_summary: null, counselor_recommendations: [],
+  key_concerns: [], lifestyle_tags: [], health_metrics: null,
+};
+
 const RISK_COLORS: Record<string, string> = { high: '#dc2626', medium: '#d97706', low: '#059669' };
 const RISK_LABELS: Record<string, string> = { high: '고위험', medium: '중위험', low: '저위험' };
 const INTENT_LABELS: Record<string, string> = { active: '적극적', considering: '고려중', passive: '소극적' };
@@ -144,6 +153,7 @@ const RevisitPage: React.FC = () => {
   const [chatMessages, setChatMessages] = useState<ChatMessage[]>([]);
   const [sessionTags, setSessionTags] = useState<SessionTags | null>(null);
   const [chatLoading, setChatLoading] = useState(false);
+  const [details, setDetails] = useState<Record<string, CandidateDetail>>({});
 
   const hospitalId = searchParams.get('hospital_id') || embedParams.hospitalId || '';
 
@@ -158,6 +168,7 @@ const RevisitPage: React.FC = () => {
       });
       const data = await res.json();
       setCandidates(data.candidates || []);
+      setDetails({});
       setTotal(data.total || 0);
       setHighRisk(data.high_risk_count || 0);
       setAvgEngagement(data.avg_engagement || 0);
@@ -252,7 +263,23 @@ const RevisitPage: React.FC = () => {
     return list;
   }, [candidates, riskFilter, intentFilter, daysFilter, prospectFilter, search, sortKey, sortDir, isHospitalMode]);
 
-  const selected = useMemo(() => filtered.find(c => c.session_id === selectedId), [filtered, selectedId]);
+  const selected = useMemo(() => {
+    const c = filtered.find(x => x.session_id === selectedId);
+    return c ? { ...c, ...(details[c.session_id] || EMPTY_DETAIL) } : undefined;
+  }, [filtered, selectedId, details]);
+
+  // 선택 시 상세 필드 지연 조회 (세션별 캐시)
+  useEffect(() => {
+    if (!selectedId || details[selectedId]) return;
+    const fetcher = isEmbedMode ? fetch : fetchWithAuth;
+    fetcher(`${API}/partner-office/revisit-candidates/${encodeURIComponent(selectedId)}/detail`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+    })
+      .then(r => (r.ok ? r.json() : null))
+      .then(d => { if (d) setDetails(prev => ({ ...prev, [selectedId]: d })); })
+      .catch(() => { /* ignore */ });
+  }, [API, isEmbedMode, selectedId, details]);
 
   // 키보드 방향키 네비게이션
   useEffect(() => {
@@ -283,8 +310,21 @@ const RevisitPage: React.FC = () => {
     setTimeout(() => setCopiedKey(''), 2000);
   };
 
-  const handleExcel = () => {
-    const data = filtered.map(c => ({
+  const handleExcel = async () => {
+    // 상세 필드(메시지/요약)는 목록에 없으므로 include_details 로 한 번에 조회
+    let detailMap: Record<string, CandidateDetail> = details;
+    try {
+      const fetcher = isEmbedMode ? fetch : fetchWithAuth;
+      const res = await fetcher(`${API}/partner-office/revisit-candidates`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ hospital_id: hospitalId, days: 30, limit: 100, filter_type: filterType, include_details: true }),
+      });
+      const data = await res.json();
+      detailMap = { ...details };
+      (data.candidates || []).forEach((c: Candidate & CandidateDetail) => { detailMap[c.session_id] = c; });
+    } catch { /* ignore — 상세 없이 내보냄 */ }
+    const data = filtered.map(c => ({ ...c, ...(detailMap[c.session_id] || EMPTY_DETAIL) })).map(c => ({
       '환자명': c.patient_name || '-',
       '전화번호': c.user_phone || '-',
       '병원명': c.hospital_name || '-',